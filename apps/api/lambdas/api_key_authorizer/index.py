@@ -16,6 +16,8 @@ Features:
 - Handles invalid/expired/revoked keys with 401
 - Supports rate limiting (Task 14.2)
 - Audit logging for key usage (Task 14.3)
+- Warm-container cache of validated key context and negative lookups
+- Write-behind buffering of lastUsedAt updates and audit log rows
 
 Requirements validated:
 - 7.1: Lambda authorizer validates keys correctly
@@ -28,25 +30,325 @@ Requirements validated:
 import hashlib
 import logging
 import os
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Any
 
 import boto3
-from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+# Import from organization security layer
+import sys
+
+sys.path.append("/opt/python")
+from cache_ttl import capped_ttl_seconds
+from rate_limiter import TokenBucketRateLimiter
+from rotation_lookup import RotationKeyLookup
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-# Rate limiting configuration
-RATE_LIMIT_WINDOW_SECONDS = 60  # 1 minute window
+# Rate limiting configuration (requests per minute per key)
 RATE_LIMIT_MAX_REQUESTS = int(os.environ.get("RATE_LIMIT_MAX_REQUESTS", "100"))
 
+# Key cache configuration (the capped positive TTL bounds revocation latency)
+KEY_CACHE_MAX_TTL_SECONDS = 60
+KEY_CACHE_TTL_SECONDS = capped_ttl_seconds(
+    "API_KEY_CACHE_TTL_SECONDS", "30", KEY_CACHE_MAX_TTL_SECONDS
+)
+KEY_CACHE_NEGATIVE_TTL_SECONDS = int(os.environ.get("API_KEY_CACHE_NEGATIVE_TTL_SECONDS", "30"))
+KEY_CACHE_MAX_ENTRIES = int(os.environ.get("API_KEY_CACHE_MAX_ENTRIES", "10000"))
+
+# Write-behind configuration for usage tracking. lastUsedAt is written at most
+# once per key per interval; audit rows are flushed in batch_write_item chunks.
+# Buffered usage is lost if the container is reclaimed before it is flushed,
+# so the loss window is bounded by USAGE_FLUSH_INTERVAL_SECONDS and
+# AUDIT_BATCH_SIZE (see UsageWriteBuffer). AUDIT_BUFFER_MAX_ROWS caps memory
+# when writes fall behind; the oldest rows are dropped first.
+LAST_USED_MIN_INTERVAL_SECONDS = int(os.environ.get("LAST_USED_MIN_INTERVAL_SECONDS", "60"))
+USAGE_FLUSH_INTERVAL_SECONDS = int(os.environ.get("USAGE_FLUSH_INTERVAL_SECONDS", "10"))
+AUDIT_BATCH_SIZE = int(os.environ.get("AUDIT_BATCH_SIZE", "25"))
+AUDIT_BUFFER_MAX_ROWS = int(os.environ.get("AUDIT_BUFFER_MAX_ROWS", "1000"))
+
+
+class KeyContextCache:
+    """Bounded LRU cache of key lookups keyed by SHA-256 key hash.
+
+    Holds the validated key context for known keys and ``None`` for hashes
+    that did not resolve to a usable key (unknown, revoked or expired), so
+    repeated invalid-key probes don't reach DynamoDB either. Entries expire
+    after a TTL and never outlive the key's own ``expiresAt``.
+
+    The cache is per-Lambda-instance and persists across warm invocations.
+    Revocation and rotation are not pushed to it: a revoked key is denied
+    once its entry expires, within KEY_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = KEY_CACHE_TTL_SECONDS,
+        negative_ttl_seconds: int = KEY_CACHE_NEGATIVE_TTL_SECONDS,
+        max_entries: int = KEY_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self._entries: OrderedDict[str, tuple[dict[str, Any] | None, float]] = OrderedDict()
+        self._hashes_by_key_id: dict[str, set[str]] = {}
+        self._ttl_seconds = ttl_seconds
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, key_hash: str) -> tuple[bool, dict[str, Any] | None]:
+        """Look up a key hash.
+
+        Returns:
+            Tuple of (hit, context). ``context`` is None for a cached negative.
+        """
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is None:
+                return False, None
+            context, expires_at = entry
+            if time.time() >= expires_at:
+                self._remove(key_hash)
+                return False, None
+            self._entries.move_to_end(key_hash)
+            return True, context
+
+    def set(
+        self,
+        key_hash: str,
+        context: dict[str, Any] | None,
+        key_expires_at: int | None = None,
+    ) -> None:
+        """Cache a lookup result; ``context=None`` records a negative result."""
+        now = time.time()
+        ttl = self._ttl_seconds if context is not None else self._negative_ttl_seconds
+        expires_at = now + ttl
+        if key_expires_at:
+            expires_at = min(expires_at, float(key_expires_at))
+        if expires_at <= now:
+            return
+
+        with self._lock:
+            self._remove(key_hash)
+            self._entries[key_hash] = (context, expires_at)
+            if context is not None:
+                key_id = context["applicationApiKeyId"]
+                self._hashes_by_key_id.setdefault(key_id, set()).add(key_hash)
+            while len(self._entries) > self._max_entries:
+                oldest_hash = next(iter(self._entries))
+                self._remove(oldest_hash)
+
+    def invalidate(self, key_hash: str | None = None, key_id: str | None = None) -> int:
+        """Drop cached entries for a key hash and/or every hash of a key ID.
+
+        Called when this container finds that a key has expired.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            hashes = set(self._hashes_by_key_id.get(key_id, ())) if key_id else set()
+            if key_hash:
+                hashes.add(key_hash)
+            removed = 0
+            for cached_hash in hashes:
+                if self._remove(cached_hash):
+                    removed += 1
+            return removed
+
+    def clear(self) -> None:
+        """Clear all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self._hashes_by_key_id.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key_hash: str) -> bool:
+        """Remove a hash and its reverse-index entry. Caller holds the lock."""
+        entry = self._entries.pop(key_hash, None)
+        if entry is None:
+            return False
+        context = entry[0]
+        if context is not None:
+            key_id = context["applicationApiKeyId"]
+            hashes = self._hashes_by_key_id.get(key_id)
+            if hashes is not None:
+                hashes.discard(key_hash)
+                if not hashes:
+                    del self._hashes_by_key_id[key_id]
+        return True
+
+
+# Global cache instance (persists across Lambda invocations within same instance)
+_key_cache = KeyContextCache()
+_rotation_lookup = RotationKeyLookup()
+
+
+class UsageWriteBuffer:
+    """Write-behind buffer for lastUsedAt updates and audit log rows.
+
+    Keeps usage writes off the authorization path:
+    - lastUsedAt is coalesced per key to the latest timestamp and written at
+      most once per ``last_used_interval`` seconds per key
+    - Audit rows are accumulated and written with batch_write_item
+
+    ``flush_if_due`` starts a flush on a background thread once the audit
+    buffer reaches ``audit_batch_size`` rows or ``flush_interval`` seconds
+    have passed since the last flush, so the writes do not delay the
+    authorization response. A flush still in flight when the handler returns
+    is frozen with the container and finishes on the next invocation.
+
+    Nothing flushes on shutdown: Lambda only signals shutdown to functions
+    with a registered extension. Usage buffered when an idle container is
+    reclaimed is lost. That is at most ``audit_batch_size`` audit rows from
+    the ``flush_interval`` seconds before the container's last invocation,
+    plus lastUsedAt updates held back by ``last_used_interval``, which is
+    acceptable for usage tracking. ``max_audit_rows`` bounds the buffer if
+    writes fall behind.
+    """
+
+    def __init__(
+        self,
+        api_keys_table: Any,
+        audit_log_table: Any | None,
+        last_used_interval: int = LAST_USED_MIN_INTERVAL_SECONDS,
+        flush_interval: int = USAGE_FLUSH_INTERVAL_SECONDS,
+        audit_batch_size: int = AUDIT_BATCH_SIZE,
+        max_audit_rows: int = AUDIT_BUFFER_MAX_ROWS,
+    ) -> None:
+        self.api_keys_table = api_keys_table
+        self.audit_log_table = audit_log_table
+        self._last_used_interval = last_used_interval
+        self._flush_interval = flush_interval
+        self._audit_batch_size = audit_batch_size
+        self._max_audit_rows = max_audit_rows
+        self._pending_last_used: dict[str, int] = {}
+        self._last_used_written: dict[str, int] = {}
+        self._pending_audit: list[dict[str, Any]] = []
+        self._last_flush = time.time()
+        self._lock = threading.Lock()
+        self._flush_thread: threading.Thread | None = None
+
+    def record_last_used(self, key_id: str, timestamp: int) -> None:
+        """Record a key use; only the latest timestamp per key is kept."""
+        with self._lock:
+            if timestamp > self._pending_last_used.get(key_id, 0):
+                self._pending_last_used[key_id] = timestamp
+
+    def record_audit(self, item: dict[str, Any]) -> None:
+        """Buffer an audit log row."""
+        if self.audit_log_table is None:
+            return
+        with self._lock:
+            self._pending_audit.append(item)
+            if len(self._pending_audit) > self._max_audit_rows:
+                del self._pending_audit[0]
+                logger.warning("Audit buffer full, dropped the oldest row")
+
+    def flush_if_due(self) -> threading.Thread | None:
+        """Start a background flush when the batch is full or the interval elapsed.
+
+        Returns:
+            The flush thread, or None if no flush was due or one is running
+        """
+        with self._lock:
+            if self._flush_thread is not None and self._flush_thread.is_alive():
+                return None
+            has_pending = bool(self._pending_audit or self._writable_last_used())
+            due = len(self._pending_audit) >= self._audit_batch_size or (
+                has_pending and time.time() - self._last_flush >= self._flush_interval
+            )
+            if not due:
+                return None
+            self._flush_thread = threading.Thread(target=self.flush, daemon=True)
+            self._flush_thread.start()
+            return self._flush_thread
+
+    def _writable_last_used(self, force: bool = False) -> dict[str, int]:
+        """Pending lastUsedAt updates not held back by the per-key interval.
+
+        An update is held back while both it and the current time are within
+        ``last_used_interval`` of the key's last write. Must be called with
+        the lock held.
+        """
+        cutoff = time.time() - self._last_used_interval
+        writable = {}
+        for key_id, timestamp in self._pending_last_used.items():
+            written_at = self._last_used_written.get(key_id)
+            if (
+                force
+                or written_at is None
+                or written_at <= cutoff
+                or timestamp - written_at >= self._last_used_interval
+            ):
+                writable[key_id] = timestamp
+        return writable
+
+    def flush(self, force: bool = False) -> None:
+        """Write buffered usage to DynamoDB.
+
+        Args:
+            force: Write every pending lastUsedAt regardless of the per-key
+                minimum interval
+        """
+        with self._lock:
+            audit_items = self._pending_audit
+            self._pending_audit = []
+            last_used = self._writable_last_used(force)
+            for key_id, timestamp in last_used.items():
+                del self._pending_last_used[key_id]
+                self._last_used_written[key_id] = timestamp
+            self._last_flush = time.time()
+            # Writes older than the interval no longer hold anything back
+            cutoff = self._last_flush - self._last_used_interval
+            for key_id in [k for k, t in self._last_used_written.items() if t <= cutoff]:
+                del self._last_used_written[key_id]
+
+        for key_id, timestamp in last_used.items():
+            self._write_last_used(key_id, timestamp)
+
+        if audit_items:
+            self._write_audit_items(audit_items)
+
+    def _write_last_used(self, key_id: str, timestamp: int) -> None:
+        """Update the lastUsedAt timestamp, never moving it backwards."""
+        try:
+            self.api_keys_table.update_item(
+                Key={"applicationApiKeyId": key_id},
+                UpdateExpression="SET lastUsedAt = :now",
+                ConditionExpression="attribute_exists(applicationApiKeyId) AND "
+                "(attribute_not_exists(lastUsedAt) OR lastUsedAt < :now)",
+                ExpressionAttributeValues={":now": timestamp},
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                logger.error(f"Error updating last used: {e}")
+        except Exception as e:
+            logger.error(f"Error updating last used: {e}")
+
+    def _write_audit_items(self, items: list[dict[str, Any]]) -> None:
+        """Write audit rows with batch_write_item (unprocessed items are retried)."""
+        try:
+            # logId has one-second resolution; later rows win, as with put_item
+            with self.audit_log_table.batch_writer(overwrite_by_pkeys=["logId"]) as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+        except Exception as e:
+            logger.error(f"Error logging usage: {e}")
+            # Don't fail the request if logging fails
+
 
 class ApiKeyAuthorizer:
     """Lambda authorizer for API key validation."""
 
-    def __init__(self) -> None:
+    def __init__(self, key_cache: KeyContextCache | None = None) -> None:
+        self.key_cache = key_cache if key_cache is not None else _key_cache
         self.dynamodb = boto3.resource("dynamodb")
         self.api_keys_table = self.dynamodb.Table(
             os.environ.get(
@@ -58,11 +360,15 @@ class ApiKeyAuthorizer:
         self.rate_limit_table = (
             self.dynamodb.Table(self.rate_limit_table_name) if self.rate_limit_table_name else None
         )
+        self.rate_limiter = (
+            TokenBucketRateLimiter(self.rate_limit_table) if self.rate_limit_table else None
+        )
         # Optional: Audit log table
         self.audit_log_table_name = os.environ.get("AUDIT_LOG_TABLE")
         self.audit_log_table = (
             self.dynamodb.Table(self.audit_log_table_name) if self.audit_log_table_name else None
         )
+        self.usage_buffer = UsageWriteBuffer(self.api_keys_table, self.audit_log_table)
 
     def authorize(self, event: dict[str, Any]) -> dict[str, Any]:
         """Main authorization handler.
@@ -90,6 +396,9 @@ class ApiKeyAuthorizer:
                 logger.warning(f"Rate limit exceeded for key {key_context['applicationApiKeyId']}")
                 return self._deny_policy(event, "Rate limit exceeded", status_code=429)
 
+            # Update last used
+            self._update_last_used(key_context["applicationApiKeyId"])
+
             # Log the usage
             self._log_usage(key_context, event)
 
@@ -136,130 +445,109 @@ class ApiKeyAuthorizer:
     def _validate_key(self, api_key: str) -> dict[str, Any] | None:
         """Validate an API key and return context.
 
-        Returns None if key is invalid, expired, or revoked.
+        Serves repeat lookups from the warm-container key cache. Returns None
+        if key is invalid, expired, or revoked.
         """
         try:
             # Hash the key
             key_hash = self._hash_key(api_key)
 
-            # Look up by hash
-            response = self.api_keys_table.query(
-                IndexName="KeyLookupIndex",
-                KeyConditionExpression=Key("keyHash").eq(key_hash),
-            )
+            hit, cached_context = self.key_cache.get(key_hash)
+            if hit:
+                return cached_context
 
-            items = response.get("Items", [])
+            key_context, key_expires_at = self._lookup_key(key_hash)
+            self.key_cache.set(key_hash, key_context, key_expires_at)
+            return key_context
 
-            if not items:
-                # Check if it's a rotation key
-                return self._check_rotation_key(key_hash)
+        except Exception as e:
+            logger.error(f"Error validating key: {e}")
+            return None
 
-            key_record = items[0]
-            status = key_record.get("status")
+    def _lookup_key(self, key_hash: str) -> tuple[dict[str, Any] | None, int | None]:
+        """Resolve a key hash against DynamoDB.
 
-            # Check status
-            if status == "REVOKED":
-                logger.info(f"Revoked key attempted: {key_record.get('keyPrefix')}")
-                return None
+        Errors are raised rather than swallowed so that transient failures
+        are never cached as negative results.
 
-            if status == "EXPIRED":
-                logger.info(f"Expired key attempted: {key_record.get('keyPrefix')}")
-                return None
+        Returns:
+            Tuple of (key context or None, key expiresAt or None)
+        """
+        # Look up by hash
+        response = self.api_keys_table.query(
+            IndexName="KeyLookupIndex",
+            KeyConditionExpression=Key("keyHash").eq(key_hash),
+        )
 
-            # Check expiration timestamp
-            expires_at = key_record.get("expiresAt")
-            if expires_at:
-                now = int(datetime.now(tz=timezone.utc).timestamp())
-                if now > expires_at:
-                    # Mark as expired
-                    self._mark_key_expired(key_record["applicationApiKeyId"])
-                    return None
+        items = response.get("Items", [])
 
-            # Update last used
-            self._update_last_used(key_record["applicationApiKeyId"])
+        if not items:
+            # Check if it's a rotation key
+            return self._check_rotation_key(key_hash)
+
+        key_record = items[0]
+        status = key_record.get("status")
+
+        # Check status
+        if status == "REVOKED":
+            logger.info(f"Revoked key attempted: {key_record.get('keyPrefix')}")
+            return None, None
+
+        if status == "EXPIRED":
+            logger.info(f"Expired key attempted: {key_record.get('keyPrefix')}")
+            return None, None
+
+        # Check expiration timestamp
+        expires_at = key_record.get("expiresAt")
+        if expires_at:
+            now = int(datetime.now(tz=timezone.utc).timestamp())
+            if now > expires_at:
+                # Mark as expired
+                self._mark_key_expired(key_record["applicationApiKeyId"])
+                return None, None
 
+        return {
+            "applicationApiKeyId": key_record.get("applicationApiKeyId"),
+            "applicationId": key_record.get("applicationId"),
+            "organizationId": key_record.get("organizationId"),
+            "environment": key_record.get("environment"),
+            "status": status,
+        }, expires_at
+
+    def _check_rotation_key(self, key_hash: str) -> tuple[dict[str, Any] | None, int | None]:
+        """Check if a key hash matches a nextKeyHash during rotation.
+
+        Resolves the hash through the rotation-lookup item written by
+        rotateKey (see rotation_lookup in the organizations-security layer).
+        """
+        key_record, _ = _rotation_lookup.find(self.api_keys_table, key_hash)
+        if key_record:
             return {
                 "applicationApiKeyId": key_record.get("applicationApiKeyId"),
                 "applicationId": key_record.get("applicationId"),
                 "organizationId": key_record.get("organizationId"),
                 "environment": key_record.get("environment"),
-                "status": status,
-            }
-
-        except Exception as e:
-            logger.error(f"Error validating key: {e}")
-            return None
+                "status": "ROTATING",
+                "isRotationKey": True,
+            }, key_record.get("expiresAt")
 
-    def _check_rotation_key(self, key_hash: str) -> dict[str, Any] | None:
-        """Check if a key hash matches a nextKeyHash during rotation."""
-        try:
-            response = self.api_keys_table.scan(
-                FilterExpression=Attr("status").eq("ROTATING") & Attr("nextKeyHash").eq(key_hash),
-            )
-
-            items = response.get("Items", [])
-            if items:
-                key_record = items[0]
-                self._update_last_used(key_record["applicationApiKeyId"])
-
-                return {
-                    "applicationApiKeyId": key_record.get("applicationApiKeyId"),
-                    "applicationId": key_record.get("applicationId"),
-                    "organizationId": key_record.get("organizationId"),
-                    "environment": key_record.get("environment"),
-                    "status": "ROTATING",
-                    "isRotationKey": True,
-                }
-
-            return None
-
-        except Exception as e:
-            logger.error(f"Error checking rotation key: {e}")
-            return None
+        return None, None
 
     def _check_rate_limit(self, key_id: str) -> bool:
         """Check if the key has exceeded rate limits.
 
+        Most requests are served from a locally leased token budget; see
+        rate_limiter.TokenBucketRateLimiter.
+
         Returns True if within limits, False if exceeded.
         """
-        if not self.rate_limit_table:
+        if not self.rate_limiter:
             # Rate limiting not configured
             return True
 
         try:
-            now = int(time.time())
-            window_start = now - RATE_LIMIT_WINDOW_SECONDS
-
-            # Get current count for this window
-            response = self.rate_limit_table.get_item(
-                Key={
-                    "keyId": key_id,
-                    "windowStart": window_start,
-                }
-            )
-
-            item = response.get("Item", {})
-            current_count = item.get("requestCount", 0)
-
-            if current_count >= RATE_LIMIT_MAX_REQUESTS:
-                return False
-
-            # Increment counter
-            self.rate_limit_table.update_item(
-                Key={
-                    "keyId": key_id,
-                    "windowStart": window_start,
-                },
-                UpdateExpression="SET requestCount = if_not_exists(requestCount, :zero) + :inc, "
-                "expiresAt = :ttl",
-                ExpressionAttributeValues={
-                    ":zero": 0,
-                    ":inc": 1,
-                    ":ttl": now + RATE_LIMIT_WINDOW_SECONDS * 2,  # TTL for cleanup
-                },
-            )
-
-            return True
+            result = self.rate_limiter.check(f"authorizer#{key_id}", RATE_LIMIT_MAX_REQUESTS)
+            return result["allowed"]
 
         except Exception as e:
             logger.error(f"Error checking rate limit: {e}")
@@ -267,7 +555,7 @@ class ApiKeyAuthorizer:
             return True
 
     def _log_usage(self, key_context: dict[str, Any], event: dict[str, Any]) -> None:
-        """Log API key usage for audit purposes."""
+        """Buffer an API key usage row for audit purposes."""
         if not self.audit_log_table:
             # Audit logging not configured
             return
@@ -281,8 +569,8 @@ class ApiKeyAuthorizer:
             path = event.get("path") or event.get("requestContext", {}).get("path")
             method = event.get("httpMethod") or event.get("requestContext", {}).get("httpMethod")
 
-            self.audit_log_table.put_item(
-                Item={
+            self.usage_buffer.record_audit(
+                {
                     "logId": f"{key_context['applicationApiKeyId']}#{now}",
                     "applicationApiKeyId": key_context["applicationApiKeyId"],
                     "applicationId": key_context["applicationId"],
@@ -306,16 +594,9 @@ class ApiKeyAuthorizer:
         return hashlib.sha256(key.encode()).hexdigest()
 
     def _update_last_used(self, key_id: str) -> None:
-        """Update the lastUsedAt timestamp."""
-        try:
-            now = int(datetime.now(tz=timezone.utc).timestamp())
-            self.api_keys_table.update_item(
-                Key={"applicationApiKeyId": key_id},
-                UpdateExpression="SET lastUsedAt = :now",
-                ExpressionAttributeValues={":now": now},
-            )
-        except Exception as e:
-            logger.error(f"Error updating last used: {e}")
+        """Buffer a lastUsedAt update for the key."""
+        now = int(datetime.now(tz=timezone.utc).timestamp())
+        self.usage_buffer.record_last_used(key_id, now)
 
     def _mark_key_expired(self, key_id: str) -> None:
         """Mark a key as expired."""
@@ -330,6 +611,7 @@ class ApiKeyAuthorizer:
                     ":now": now,
                 },
             )
+            self.key_cache.invalidate(key_id=key_id)
         except Exception as e:
             logger.error(f"Error marking key expired: {e}")
 
@@ -392,10 +674,28 @@ class ApiKeyAuthorizer:
         }
 
 
+# Global authorizer instance (reuses the boto3 resource and Table objects
+# across invocations within the same Lambda instance)
+_authorizer: ApiKeyAuthorizer | None = None
+
+
+def get_authorizer() -> ApiKeyAuthorizer:
+    """Return the module-level authorizer, creating it on first use."""
+    global _authorizer
+    if _authorizer is None:
+        _authorizer = ApiKeyAuthorizer()
+    return _authorizer
+
+
 # Lambda handler
 def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """Main Lambda handler for API key authorization."""
     logger.info(f"Authorizer invoked with event type: {event.get('type', 'unknown')}")
 
-    authorizer = ApiKeyAuthorizer()
-    return authorizer.authorize(event)
+    authorizer = get_authorizer()
+    result = authorizer.authorize(event)
+
+    # Buffered usage is written in the background, off the response path
+    authorizer.usage_buffer.flush_if_due()
+
+    return result
@@ -26,7 +26,9 @@ import hashlib
 import json
 import logging
 import os
+import re
 import secrets
+import time
 import uuid
 from datetime import datetime, timezone
 from typing import Any
@@ -35,6 +37,14 @@ import boto3
 from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 
+# Import from organization security layer
+import sys
+
+sys.path.append("/opt/python")
+from cache_ttl import capped_ttl_seconds
+from rate_limiter import TokenBucketRateLimiter
+from rotation_lookup import RotationKeyLookup, rotation_lookup_key, scan_rotating_keys
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
@@ -59,6 +69,101 @@ KEY_TYPE_PREFIXES = {
     "SECRET": "sk",  # Backend-only, full permissions
 }
 
+# Default rate limits when an environment has no config
+DEFAULT_RATE_LIMIT_PER_MINUTE = 60
+DEFAULT_RATE_LIMIT_PER_DAY = 10000
+
+# Per-container environment config cache TTL, capped (older name: RATE_LIMIT_CONFIG_TTL_SECONDS)
+ENVIRONMENT_CONFIG_MAX_TTL_SECONDS = 60
+ENVIRONMENT_CONFIG_TTL_SECONDS = capped_ttl_seconds(
+    "ENVIRONMENT_CONFIG_TTL_SECONDS",
+    os.environ.get("RATE_LIMIT_CONFIG_TTL_SECONDS", "30"),
+    ENVIRONMENT_CONFIG_MAX_TTL_SECONDS,
+)
+
+# Environments that allow localhost origins
+LOCALHOST_ALLOWED_ENVS = {"DEVELOPMENT", "TEST"}
+
+# Localhost pattern
+LOCALHOST_PATTERN = re.compile(r"^https?://(localhost|127\.0\.0\.1)(:\d+)?$")
+
+# Prefix of wildcard-subdomain origins: https://*.example.com
+WILDCARD_ORIGIN_PREFIX = "https://*."
+
+
+# Per-container state (persists across Lambda invocations within same instance)
+_rate_limiter: TokenBucketRateLimiter | None = None
+_environment_config_cache: dict[tuple[str, str], tuple["EnvironmentConfig", float]] = {}
+_rotation_lookup = RotationKeyLookup()
+
+
+class OriginMatcher:
+    """An environment's allowedOrigins, compiled once for fast origin checks.
+
+    Exact origins are kept in a hash set and wildcard origins as a set of
+    base domains, so a check costs a few set lookups (one per label of the
+    request host) however many origins are configured.
+
+    Supports:
+    - Exact matches: https://example.com
+    - Wildcard subdomains: https://*.example.com (also matches the base domain)
+    - Localhost (only for DEVELOPMENT/TEST): http://localhost:3000
+    """
+
+    __slots__ = ("exact", "wildcard_domains", "localhost")
+
+    def __init__(self, allowed_origins: list[str], environment: str) -> None:
+        self.exact: set[str] = set()
+        self.wildcard_domains: set[str] = set()
+        self.localhost: set[str] = set()
+
+        for allowed in allowed_origins:
+            if LOCALHOST_PATTERN.match(allowed):
+                # Only allow localhost in non-production environments
+                if environment in LOCALHOST_ALLOWED_ENVS:
+                    self.localhost.add(allowed)
+            elif allowed.startswith(WILDCARD_ORIGIN_PREFIX):
+                self.wildcard_domains.add(allowed[len(WILDCARD_ORIGIN_PREFIX) :])
+            else:
+                self.exact.add(allowed)
+
+    def matches(self, request_origin: str) -> bool:
+        """Check if a request origin matches any allowed origin."""
+        if LOCALHOST_PATTERN.match(request_origin):
+            return request_origin in self.localhost
+
+        if request_origin in self.exact:
+            return True
+
+        # Wildcard match: the request host or any parent domain is a base domain
+        if self.wildcard_domains and request_origin.startswith("https://"):
+            domain = request_origin[8:]  # Remove "https://"
+            while True:
+                if domain in self.wildcard_domains:
+                    return True
+                _, dot, domain = domain.partition(".")
+                if not dot:
+                    return False
+
+        return False
+
+
+class EnvironmentConfig:
+    """The parts of an environment config row that key validation needs."""
+
+    __slots__ = ("exists", "origins", "rate_limits")
+
+    def __init__(self, item: dict[str, Any] | None, environment: str) -> None:
+        config = item or {}
+        self.exists = item is not None
+        allowed_origins = config.get("allowedOrigins") or []
+        # None when no origins are configured (no origin restrictions)
+        self.origins = OriginMatcher(allowed_origins, environment) if allowed_origins else None
+        self.rate_limits = (
+            int(config.get("rateLimitPerMinute", DEFAULT_RATE_LIMIT_PER_MINUTE)),
+            int(config.get("rateLimitPerDay", DEFAULT_RATE_LIMIT_PER_DAY)),
+        )
+
 
 class ApiKeyService:
     """Service for managing application API keys."""
@@ -306,7 +411,8 @@ class ApiKeyService:
     def rotate_key(self, event: dict[str, Any]) -> dict[str, Any]:
         """Rotate an API key.
 
-        Creates a new key and stores its hash in nextKeyHash.
+        Creates a new key and stores its hash in nextKeyHash, plus a
+        rotation-lookup item so the new key resolves with one keyed read.
         Both the current key and the new key are valid during rotation.
         Preserves the key type (PUBLISHABLE or SECRET).
 
@@ -344,6 +450,10 @@ class ApiKeyService:
 
             now = int(datetime.now(tz=timezone.utc).timestamp())
 
+            # Write the lookup item first so the new key validates as soon as
+            # the record is marked ROTATING
+            self._put_rotation_lookup(current_key["applicationApiKeyId"], new_key_hash, now)
+
             # Update the record with new key hash and ROTATING status
             self.api_keys_table.update_item(
                 Key={"applicationApiKeyId": current_key["applicationApiKeyId"]},
@@ -357,6 +467,12 @@ class ApiKeyService:
                 },
             )
 
+            # A re-rotation replaces the pending next key. Its lookup item is
+            # only removed once the record no longer points at it.
+            previous_next_hash = current_key.get("nextKeyHash")
+            if previous_next_hash and previous_next_hash != new_key_hash:
+                self._delete_rotation_lookup(previous_next_hash)
+
             logger.info(
                 f"Rotating {existing_key_type} API key {current_key['applicationApiKeyId']} "
                 f"for app {application_id}"
@@ -426,6 +542,9 @@ class ApiKeyService:
                 },
             )
 
+            # The new key is now found through KeyLookupIndex
+            self._delete_rotation_lookup(next_key_hash)
+
             logger.info(f"Completed rotation for API key {key_id}")
 
             return {
@@ -484,6 +603,9 @@ class ApiKeyService:
                 },
             )
 
+            if key_record.get("nextKeyHash"):
+                self._delete_rotation_lookup(key_record["nextKeyHash"])
+
             logger.info(f"Revoked API key {actual_key_id}")
 
             return {
@@ -610,17 +732,14 @@ class ApiKeyService:
     def _check_rotation_key(
         self, key_hash: str, key_type: str | None = None, request_origin: str | None = None
     ) -> dict[str, Any]:
-        """Check if a key hash matches a nextKeyHash during rotation."""
-        try:
-            # Scan for keys in ROTATING status with matching nextKeyHash
-            # Note: In production, consider a GSI on nextKeyHash for efficiency
-            response = self.api_keys_table.scan(
-                FilterExpression=Attr("status").eq("ROTATING") & Attr("nextKeyHash").eq(key_hash),
-            )
+        """Check if a key hash matches a nextKeyHash during rotation.
 
-            items = response.get("Items", [])
-            if items:
-                key_record = items[0]
+        Resolves the hash through the rotation-lookup item written by
+        rotate_key (see rotation_lookup in the organizations-security layer).
+        """
+        try:
+            key_record = self._get_rotating_key(key_hash)
+            if key_record:
                 record_key_type = key_record.get("keyType", "SECRET")
 
                 # For PUBLISHABLE keys, validate origin
@@ -658,6 +777,64 @@ class ApiKeyService:
             logger.error(f"Error checking rotation key: {e}")
             return self._error_response("AAM008", "Invalid API key")
 
+    def _get_rotating_key(self, key_hash: str) -> dict[str, Any] | None:
+        """Get the ROTATING key record whose nextKeyHash matches a hash.
+
+        A key found by the fallback scan gets its missing lookup item written.
+        """
+        key_record, has_lookup = _rotation_lookup.find(self.api_keys_table, key_hash)
+        if key_record and not has_lookup:
+            self._put_rotation_lookup(
+                key_record["applicationApiKeyId"],
+                key_hash,
+                int(datetime.now(tz=timezone.utc).timestamp()),
+            )
+        return key_record
+
+    def backfill_rotation_lookups(self) -> dict[str, Any]:
+        """Write the rotation-lookup item of every ROTATING key that lacks one.
+
+        One-off migration for keys rotated before lookup items existed.
+        Safe to run repeatedly; existing lookup items are left alone.
+        """
+        now = int(datetime.now(tz=timezone.utc).timestamp())
+        rotating = scan_rotating_keys(self.api_keys_table)
+        written = 0
+        for next_key_hash, key_id in rotating.items():
+            try:
+                self.api_keys_table.put_item(
+                    Item={
+                        **rotation_lookup_key(next_key_hash),
+                        "rotatingKeyId": key_id,
+                        "createdAt": now,
+                    },
+                    ConditionExpression="attribute_not_exists(applicationApiKeyId)",
+                )
+                written += 1
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+
+        logger.info(f"Backfilled {written} of {len(rotating)} rotation lookups")
+        return {"rotatingKeys": len(rotating), "lookupsWritten": written}
+
+    def _put_rotation_lookup(self, key_id: str, next_key_hash: str, now: int) -> None:
+        """Write the rotation-lookup item mapping a nextKeyHash to its key record."""
+        self.api_keys_table.put_item(
+            Item={
+                **rotation_lookup_key(next_key_hash),
+                "rotatingKeyId": key_id,
+                "createdAt": now,
+            }
+        )
+
+    def _delete_rotation_lookup(self, next_key_hash: str) -> None:
+        """Delete a rotation-lookup item once its key is no longer pending."""
+        try:
+            self.api_keys_table.delete_item(Key=rotation_lookup_key(next_key_hash))
+        except Exception as e:
+            logger.error(f"Error deleting rotation lookup: {e}")
+
     def _update_last_used(self, key_id: str) -> None:
         """Update the lastUsedAt timestamp for a key."""
         try:
@@ -716,20 +893,8 @@ class ApiKeyService:
             dict with 'valid' (bool) and 'message' (str) keys
         """
         try:
-            # Get environment config
-            config_table = self.dynamodb.Table(
-                os.environ.get(
-                    "ENVIRONMENT_CONFIG_TABLE",
-                    "orb-integration-hub-dev-table-applicationenvironmentconfig",
-                )
-            )
-
-            response = config_table.get_item(
-                Key={"applicationId": application_id, "environment": environment}
-            )
-
-            config = response.get("Item")
-            if not config:
+            config = self._get_environment_config(application_id, environment)
+            if not config.exists:
                 # No config means no origin restrictions (allow for backward compat)
                 logger.warning(
                     f"No environment config found for {application_id}/{environment}, "
@@ -737,10 +902,8 @@ class ApiKeyService:
                 )
                 return {"valid": True, "message": ""}
 
-            allowed_origins = config.get("allowedOrigins", [])
-
             # If no origins configured, allow all (backward compat)
-            if not allowed_origins:
+            if config.origins is None:
                 return {"valid": True, "message": ""}
 
             # Origin is required for publishable keys when origins are configured
@@ -750,10 +913,8 @@ class ApiKeyService:
                     "message": "Origin header required for publishable keys",
                 }
 
-            # Check if origin matches any allowed origin
-            for allowed in allowed_origins:
-                if self._origin_matches(request_origin, allowed, environment):
-                    return {"valid": True, "message": ""}
+            if config.origins.matches(request_origin):
+                return {"valid": True, "message": ""}
 
             return {
                 "valid": False,
@@ -765,51 +926,14 @@ class ApiKeyService:
             # Fail open for errors to avoid breaking existing integrations
             return {"valid": True, "message": ""}
 
-    def _origin_matches(self, request_origin: str, allowed_origin: str, environment: str) -> bool:
-        """Check if a request origin matches an allowed origin pattern.
-
-        Supports:
-        - Exact matches: https://example.com
-        - Wildcard subdomains: https://*.example.com
-        - Localhost (only for DEVELOPMENT/TEST): http://localhost:3000
-        """
-        import re
-
-        # Localhost check
-        localhost_pattern = re.compile(r"^https?://(localhost|127\.0\.0\.1)(:\d+)?$")
-        if localhost_pattern.match(request_origin):
-            # Only allow localhost in non-production environments
-            if environment in {"DEVELOPMENT", "TEST"}:
-                # Check if localhost is in allowed origins
-                for allowed in [allowed_origin]:
-                    if localhost_pattern.match(allowed):
-                        return request_origin == allowed
-            return False
-
-        # Wildcard subdomain match
-        if allowed_origin.startswith("https://*."):
-            base_domain = allowed_origin[10:]  # Remove "https://*."
-            # Request origin should be https://{subdomain}.{base_domain}
-            if request_origin.startswith("https://"):
-                origin_domain = request_origin[8:]  # Remove "https://"
-                # Check if it ends with .base_domain (subdomain match)
-                if origin_domain.endswith(f".{base_domain}"):
-                    return True
-                # Also allow exact base domain match
-                if origin_domain == base_domain:
-                    return True
-            return False
-
-        # Exact match
-        return request_origin == allowed_origin
-
     def _check_rate_limit(
         self, application_id: str, environment: str, key_id: str
     ) -> dict[str, Any]:
         """Check rate limits for an API key.
 
-        Uses DynamoDB atomic counters for rate limiting.
-        Tracks requests per minute and per day.
+        Uses a token bucket per key for requests per minute and per day,
+        reserved with a single conditional update and leased to this
+        container in chunks (see rate_limiter.TokenBucketRateLimiter).
 
         Args:
             application_id: The application ID
@@ -820,126 +944,68 @@ class ApiKeyService:
             dict with 'allowed' (bool), 'message' (str), and 'headers' (dict) keys
         """
         try:
-            # Get environment config for rate limits
-            config_table = self.dynamodb.Table(
-                os.environ.get(
-                    "ENVIRONMENT_CONFIG_TABLE",
-                    "orb-integration-hub-dev-table-applicationenvironmentconfig",
-                )
+            rate_limit_per_minute, rate_limit_per_day = self._get_rate_limits(
+                application_id, environment
             )
-
-            response = config_table.get_item(
-                Key={"applicationId": application_id, "environment": environment}
+            return self._get_rate_limiter().check(
+                f"apikey#{key_id}", rate_limit_per_minute, rate_limit_per_day
             )
 
-            config = response.get("Item")
-            if not config:
-                # No config means default rate limits
-                rate_limit_per_minute = 60
-                rate_limit_per_day = 10000
-            else:
-                rate_limit_per_minute = config.get("rateLimitPerMinute", 60)
-                rate_limit_per_day = config.get("rateLimitPerDay", 10000)
-
-            # Get current timestamp info
-            now = datetime.now(tz=timezone.utc)
-            current_minute = now.strftime("%Y%m%d%H%M")
-            current_day = now.strftime("%Y%m%d")
-
-            # Calculate reset timestamps
-            minute_reset = int((now.replace(second=0, microsecond=0).timestamp()) + 60)
-            day_reset = int(
-                (now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()) + 86400
-            )
+        except Exception as e:
+            logger.error(f"Error checking rate limit: {e}")
+            # Fail open for errors to avoid breaking existing integrations
+            return {
+                "allowed": True,
+                "message": "",
+                "headers": {},
+            }
 
-            # Get or create rate limit counter table
+    def _get_rate_limiter(self) -> TokenBucketRateLimiter:
+        """Return the per-container rate limiter, creating it on first use."""
+        global _rate_limiter
+        if _rate_limiter is None:
             rate_limit_table = self.dynamodb.Table(
                 os.environ.get(
                     "RATE_LIMIT_TABLE",
                     "orb-integration-hub-dev-rate-limits",
                 )
             )
+            _rate_limiter = TokenBucketRateLimiter(rate_limit_table)
+        return _rate_limiter
 
-            # Check minute rate limit
-            minute_key = f"{key_id}#minute#{current_minute}"
-            try:
-                minute_response = rate_limit_table.update_item(
-                    Key={"rateLimitKey": minute_key},
-                    UpdateExpression="SET #count = if_not_exists(#count, :zero) + :one, "
-                    "#ttl = :ttl",
-                    ExpressionAttributeNames={"#count": "count", "#ttl": "ttl"},
-                    ExpressionAttributeValues={
-                        ":zero": 0,
-                        ":one": 1,
-                        ":ttl": minute_reset + 60,  # TTL 1 minute after reset
-                    },
-                    ReturnValues="UPDATED_NEW",
-                )
-                minute_count = int(minute_response["Attributes"]["count"])
-            except ClientError as e:
-                # If table doesn't exist, skip rate limiting
-                logger.warning(f"Rate limit table error: {e}")
-                minute_count = 0
+    def _get_rate_limits(self, application_id: str, environment: str) -> tuple[int, int]:
+        """Get (rateLimitPerMinute, rateLimitPerDay) for an environment."""
+        return self._get_environment_config(application_id, environment).rate_limits
 
-            # Check day rate limit
-            day_key = f"{key_id}#day#{current_day}"
-            try:
-                day_response = rate_limit_table.update_item(
-                    Key={"rateLimitKey": day_key},
-                    UpdateExpression="SET #count = if_not_exists(#count, :zero) + :one, "
-                    "#ttl = :ttl",
-                    ExpressionAttributeNames={"#count": "count", "#ttl": "ttl"},
-                    ExpressionAttributeValues={
-                        ":zero": 0,
-                        ":one": 1,
-                        ":ttl": day_reset + 3600,  # TTL 1 hour after reset
-                    },
-                    ReturnValues="UPDATED_NEW",
-                )
-                day_count = int(day_response["Attributes"]["count"])
-            except ClientError as e:
-                logger.warning(f"Rate limit table error: {e}")
-                day_count = 0
-
-            # Build rate limit headers
-            headers = {
-                "X-RateLimit-Limit-Minute": str(rate_limit_per_minute),
-                "X-RateLimit-Remaining-Minute": str(max(0, rate_limit_per_minute - minute_count)),
-                "X-RateLimit-Reset-Minute": str(minute_reset),
-                "X-RateLimit-Limit-Day": str(rate_limit_per_day),
-                "X-RateLimit-Remaining-Day": str(max(0, rate_limit_per_day - day_count)),
-                "X-RateLimit-Reset-Day": str(day_reset),
-            }
+    def _get_environment_config(self, application_id: str, environment: str) -> EnvironmentConfig:
+        """Get the compiled environment config for an application/environment.
 
-            # Check if rate limited
-            if minute_count > rate_limit_per_minute:
-                return {
-                    "allowed": False,
-                    "message": f"Rate limit exceeded: {minute_count}/{rate_limit_per_minute} requests per minute",
-                    "headers": headers,
-                }
+        Cached per container for ENVIRONMENT_CONFIG_TTL_SECONDS, including
+        missing configs, so validating a key reads the row at most once.
+        Config changes take effect once the entry expires.
+        """
+        cache_key = (application_id, environment)
+        cached = _environment_config_cache.get(cache_key)
+        if cached and time.time() < cached[1]:
+            return cached[0]
 
-            if day_count > rate_limit_per_day:
-                return {
-                    "allowed": False,
-                    "message": f"Rate limit exceeded: {day_count}/{rate_limit_per_day} requests per day",
-                    "headers": headers,
-                }
+        config_table = self.dynamodb.Table(
+            os.environ.get(
+                "ENVIRONMENT_CONFIG_TABLE",
+                "orb-integration-hub-dev-table-applicationenvironmentconfig",
+            )
+        )
 
-            return {
-                "allowed": True,
-                "message": "",
-                "headers": headers,
-            }
+        response = config_table.get_item(
+            Key={"applicationId": application_id, "environment": environment}
+        )
 
-        except Exception as e:
-            logger.error(f"Error checking rate limit: {e}")
-            # Fail open for errors to avoid breaking existing integrations
-            return {
-                "allowed": True,
-                "message": "",
-                "headers": {},
-            }
+        config = EnvironmentConfig(response.get("Item"), environment)
+        _environment_config_cache[cache_key] = (
+            config,
+            time.time() + ENVIRONMENT_CONFIG_TTL_SECONDS,
+        )
+        return config
 
     def _error_response(self, code: str, message: str) -> dict[str, Any]:
         """Generate standardized error response."""
@@ -953,7 +1019,15 @@ class ApiKeyService:
 
 # Lambda handler
 def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
-    """Main Lambda handler for ApplicationApiKeys GraphQL operations."""
+    """Main Lambda handler for ApplicationApiKeys GraphQL operations.
+
+    Direct invocations with ``type == "BACKFILL_ROTATION_LOOKUPS"`` write
+    missing rotation-lookup items (run once per environment) instead of
+    resolving a GraphQL field.
+    """
+    if event.get("type") == "BACKFILL_ROTATION_LOOKUPS":
+        return ApiKeyService().backfill_rotation_lookups()
+
     try:
         logger.info(f"ApplicationApiKeys resolver invoked with event: {json.dumps(event)}")
 
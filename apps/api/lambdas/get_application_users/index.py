@@ -5,15 +5,31 @@
 #              Returns users who have role assignments in applications, with support for
 #              filtering by organization, application, and environment.
 
+import base64
+import bisect
+import hashlib
+import hmac
+import json
 import os
 import logging
-from typing import Any, Dict, List, Optional
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 from dataclasses import dataclass
 from enum import Enum
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+# Import from organization security layer
+import sys
+
+sys.path.append("/opt/python")
+from cache_ttl import capped_ttl_seconds
+
 
 # Query strategy enum
 class QueryStrategy(Enum):
@@ -23,21 +39,66 @@ class QueryStrategy(Enum):
     SCAN_WITH_AUTH = "SCAN_WITH_AUTH"
 
 
+# Environment variables
+LOGGING_LEVEL = os.getenv("LOGGING_LEVEL", "INFO")
+
+# Maximum number of GSI queries (per application / per organization) in flight
+QUERY_CONCURRENCY = max(1, int(os.getenv("QUERY_CONCURRENCY", "8")))
+
+# How long a container reuses the pagination token signing key before
+# re-reading it from Secrets Manager (picks up rotations)
+PAGINATION_TOKEN_SECRET_TTL_SECONDS = 300
+
+# BatchGetItem retry budget for UnprocessedKeys (per chunk) and backoff bounds
+BATCH_GET_MAX_RETRIES = int(os.getenv("BATCH_GET_MAX_RETRIES", "8"))
+BATCH_GET_BASE_DELAY_SECONDS = 0.05
+BATCH_GET_MAX_DELAY_SECONDS = 2.0
+
+# DynamoDB BatchGetItem accepts at most 100 keys per request
+BATCH_GET_CHUNK_SIZE = 100
+
+# Minimum items evaluated per role-assignment query or scan page. Filtered
+# rows and repeat users make pages come up short of the requested limit, so
+# reading at least this many avoids a round trip per missing user; the
+# resume-from-item cursor trims the page to the limit.
+MIN_ROLE_PAGE_READ = 25
+
+# How long a container reuses a CUSTOMER caller's owned organization IDs (capped)
+OWNED_ORGS_CACHE_MAX_TTL_SECONDS = 60
+OWNED_ORGS_CACHE_TTL_SECONDS = capped_ttl_seconds(
+    "OWNED_ORGS_CACHE_TTL_SECONDS", "30", OWNED_ORGS_CACHE_MAX_TTL_SECONDS
+)
+
+# Per-container cache of owned organization IDs: userId -> (expires_at, orgIds)
+_owned_orgs_cache: Dict[str, Tuple[float, List[str]]] = {}
+_owned_orgs_cache_lock = threading.Lock()
+
+# Per-container cache of the pagination token signing key: (expires_at, key)
+_pagination_token_key: Optional[Tuple[float, bytes]] = None
+
 # AWS clients - created lazily to support mocking in tests
 _dynamodb = None
 
 
 def get_dynamodb_resource():
-    """Get DynamoDB resource, creating it lazily."""
+    """
+    Get DynamoDB resource, creating it lazily.
+
+    The client uses botocore's adaptive retry mode, which backs off and
+    rate-limits client-side when DynamoDB throttles the concurrent fan-out
+    queries. The connection pool is sized to the query concurrency.
+    """
     global _dynamodb
     if _dynamodb is None:
-        _dynamodb = boto3.resource("dynamodb")
+        _dynamodb = boto3.resource(
+            "dynamodb",
+            config=Config(
+                retries={"max_attempts": 10, "mode": "adaptive"},
+                max_pool_connections=max(10, QUERY_CONCURRENCY),
+            ),
+        )
     return _dynamodb
 
-
-# Environment variables
-LOGGING_LEVEL = os.getenv("LOGGING_LEVEL", "INFO")
-
 # Setting up logging
 logger = logging.getLogger()
 logger.setLevel(LOGGING_LEVEL)
@@ -53,6 +114,11 @@ def get_users_table_name() -> Optional[str]:
     return os.getenv("USERS_TABLE_NAME")
 
 
+def get_organization_users_table_name() -> Optional[str]:
+    """Get the OrganizationUsers table name from environment variable."""
+    return os.getenv("ORGANIZATION_USERS_TABLE_NAME")
+
+
 def get_organizations_table_name() -> Optional[str]:
     """Get the Organizations table name from environment variable."""
     return os.getenv("ORGANIZATIONS_TABLE_NAME")
@@ -63,6 +129,11 @@ def get_applications_table_name() -> Optional[str]:
     return os.getenv("APPLICATIONS_TABLE_NAME")
 
 
+def get_pagination_token_secret_name() -> Optional[str]:
+    """Get the pagination token signing secret name from environment variable."""
+    return os.getenv("PAGINATION_TOKEN_SECRET_NAME")
+
+
 # Input/Output Interfaces
 
 @dataclass
@@ -116,6 +187,7 @@ class ErrorCode:
     VAL_ENVIRONMENT_REQUIRES_FILTER = "ORB-VAL-001"
     VAL_INVALID_LIMIT = "ORB-VAL-002"
     VAL_INVALID_ENVIRONMENT = "ORB-VAL-003"
+    VAL_INVALID_NEXT_TOKEN = "ORB-VAL-004"
     
     # Authorization errors
     AUTH_NO_TOKEN = "ORB-AUTH-001"
@@ -155,6 +227,132 @@ class DatabaseError(Exception):
 VALID_ENVIRONMENTS = {"PRODUCTION", "STAGING", "DEVELOPMENT", "TEST", "PREVIEW"}
 
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def run_concurrently(fn: Callable[[T], R], items: List[T], max_workers: int = QUERY_CONCURRENCY) -> List[R]:
+    """
+    Apply fn to every item on a bounded thread pool.
+    
+    Results are returned in input order so downstream processing stays
+    deterministic. The first exception raised by fn is re-raised.
+    
+    Args:
+        fn: Function to apply (typically one paginated DynamoDB query)
+        items: Inputs to fan out over
+        max_workers: Maximum concurrent calls
+        
+    Returns:
+        List of results in the same order as items
+    """
+    if len(items) <= 1 or max_workers <= 1:
+        return [fn(item) for item in items]
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(fn, items))
+
+
+def query_all_pages(table_name: str, **query_kwargs: Any) -> List[Dict[str, Any]]:
+    """
+    Run a DynamoDB query and follow LastEvaluatedKey until exhausted.
+    
+    Safe to call from worker threads: each call builds its own Table on the
+    shared (thread-safe) client.
+    
+    Args:
+        table_name: Table to query
+        **query_kwargs: Arguments passed to Table.query
+        
+    Returns:
+        All items across every page
+    """
+    table = get_dynamodb_resource().Table(table_name)
+    items: List[Dict[str, Any]] = []
+    
+    response = table.query(**query_kwargs)
+    items.extend(response.get("Items", []))
+    
+    while "LastEvaluatedKey" in response:
+        response = table.query(ExclusiveStartKey=response["LastEvaluatedKey"], **query_kwargs)
+        items.extend(response.get("Items", []))
+    
+    return items
+
+
+def batch_get_all(
+    table_name: str,
+    keys: List[Dict[str, Any]],
+    projection_expression: Optional[str] = None,
+    expression_attribute_names: Optional[Dict[str, str]] = None,
+    max_retries: int = BATCH_GET_MAX_RETRIES
+) -> List[Dict[str, Any]]:
+    """
+    Fetch items by key with BatchGetItem, chunked and concurrent.
+    
+    Duplicate keys are requested once. Keys are split into 100-key chunks
+    sent on the bounded thread pool; each chunk retries its UnprocessedKeys
+    with jittered exponential backoff until they are drained or the retry
+    budget is spent.
+    
+    Args:
+        table_name: Table to read
+        keys: Primary keys to fetch
+        projection_expression: Optional ProjectionExpression
+        expression_attribute_names: Optional ExpressionAttributeNames
+        max_retries: Retries allowed per chunk for UnprocessedKeys
+        
+    Returns:
+        Items found (missing keys are simply absent)
+        
+    Raises:
+        ClientError: If a BatchGetItem request fails
+        DatabaseError: If UnprocessedKeys remain after the retry budget
+    """
+    unique_keys = list({tuple(sorted(key.items())): key for key in keys}.values())
+    chunks = [
+        unique_keys[i:i + BATCH_GET_CHUNK_SIZE]
+        for i in range(0, len(unique_keys), BATCH_GET_CHUNK_SIZE)
+    ]
+    
+    request_template: Dict[str, Any] = {}
+    if projection_expression:
+        request_template["ProjectionExpression"] = projection_expression
+    if expression_attribute_names:
+        request_template["ExpressionAttributeNames"] = expression_attribute_names
+    
+    def get_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        dynamodb = get_dynamodb_resource()
+        items: List[Dict[str, Any]] = []
+        request_items = {table_name: {"Keys": chunk, **request_template}}
+        
+        for attempt in range(max_retries + 1):
+            if attempt:
+                # Full jitter spreads retries from concurrent chunks apart
+                delay = min(BATCH_GET_MAX_DELAY_SECONDS, BATCH_GET_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+                time.sleep(random.uniform(0, delay))
+            
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            items.extend(response.get("Responses", {}).get(table_name, []))
+            
+            request_items = response.get("UnprocessedKeys") or {}
+            if not request_items:
+                return items
+        
+        remaining = len(request_items.get(table_name, {}).get("Keys", []))
+        logger.error(f"BatchGetItem on {table_name} left {remaining} keys unprocessed "
+                     f"after {max_retries} retries")
+        raise DatabaseError(
+            ErrorCode.DB_BATCH_GET_FAILED,
+            "Failed to retrieve all requested items. Please try again."
+        )
+    
+    results: List[Dict[str, Any]] = []
+    for items in run_concurrently(get_chunk, chunks):
+        results.extend(items)
+    return results
+
+
 def validate_input(query_input: GetApplicationUsersInput) -> None:
     """
     Validate input parameters.
@@ -197,8 +395,11 @@ def get_owned_organization_ids(user_id: str) -> List[str]:
     """
     Get organization IDs owned by the specified user.
     
-    Queries the OrganizationUsers table to find organizations where the user
-    has the OWNER role.
+    Queries the OrganizationUsers table's UserOrganizationsIndex (userId,
+    role) for the user's OWNER memberships, following pagination. Results
+    are cached per container for OWNED_ORGS_CACHE_TTL_SECONDS so repeated
+    page loads by the same customer skip the lookup; ownership changes take
+    effect once the entry expires.
     
     Args:
         user_id: User ID to query
@@ -209,34 +410,41 @@ def get_owned_organization_ids(user_id: str) -> List[str]:
     Raises:
         DatabaseError: If query fails
     """
-    organizations_table_name = get_organizations_table_name()
-    if not organizations_table_name:
-        logger.error("ORGANIZATIONS_TABLE_NAME environment variable not set")
+    now = time.time()
+    with _owned_orgs_cache_lock:
+        cached = _owned_orgs_cache.get(user_id)
+    if cached and cached[0] > now:
+        return list(cached[1])
+    
+    org_users_table_name = get_organization_users_table_name()
+    if not org_users_table_name:
+        logger.error("ORGANIZATION_USERS_TABLE_NAME environment variable not set")
         raise DatabaseError(
             ErrorCode.DB_QUERY_FAILED,
-            "Organizations table not configured"
+            "Organization users table not configured"
         )
     
     try:
-        # Query OrganizationUsers table using UserOrgIndex GSI
-        # Note: This assumes OrganizationUsers has a GSI on userId
-        # We'll need to filter for OWNER role
-        org_users_table = get_dynamodb_resource().Table("orb-integration-hub-dev-organization-users")
-        
-        response = org_users_table.query(
-            IndexName="UserOrgIndex",
-            KeyConditionExpression="userId = :userId",
-            FilterExpression="#role = :role",
+        # role is the index sort key, so OWNER is matched in the key condition
+        # rather than filtered after the read
+        items = query_all_pages(
+            org_users_table_name,
+            IndexName="UserOrganizationsIndex",
+            KeyConditionExpression="userId = :userId AND #role = :role",
             ExpressionAttributeNames={"#role": "role"},
             ExpressionAttributeValues={
                 ":userId": user_id,
                 ":role": "OWNER"
-            }
+            },
+            ProjectionExpression="organizationId"
         )
         
-        organization_ids = [item["organizationId"] for item in response.get("Items", [])]
+        organization_ids = list(dict.fromkeys(item["organizationId"] for item in items))
         logger.info(f"User {user_id} owns {len(organization_ids)} organizations")
-        return organization_ids
+        
+        with _owned_orgs_cache_lock:
+            _owned_orgs_cache[user_id] = (now + OWNED_ORGS_CACHE_TTL_SECONDS, organization_ids)
+        return list(organization_ids)
         
     except ClientError as e:
         logger.error(f"Failed to query owned organizations: {e.response['Error']['Code']}")
@@ -378,20 +586,20 @@ def get_application_ids_for_organizations(organization_ids: List[str]) -> List[s
             "Applications table not configured"
         )
     
+    def query_organization(org_id: str) -> List[Dict[str, Any]]:
+        return query_all_pages(
+            applications_table_name,
+            IndexName="OrgAppIndex",
+            KeyConditionExpression="organizationId = :orgId",
+            ExpressionAttributeValues={":orgId": org_id},
+            ProjectionExpression="applicationId"
+        )
+    
     try:
-        applications_table = get_dynamodb_resource().Table(applications_table_name)
+        # Query Applications table for each organization concurrently
         application_ids = []
-        
-        # Query Applications table for each organization
-        for org_id in organization_ids:
-            response = applications_table.query(
-                IndexName="OrgAppIndex",
-                KeyConditionExpression="organizationId = :orgId",
-                ExpressionAttributeValues={":orgId": org_id},
-                ProjectionExpression="applicationId"
-            )
-            
-            for item in response.get("Items", []):
+        for items in run_concurrently(query_organization, organization_ids):
+            for item in items:
                 application_ids.append(item["applicationId"])
         
         logger.info(f"Found {len(application_ids)} applications for {len(organization_ids)} organizations")
@@ -405,22 +613,296 @@ def get_application_ids_for_organizations(organization_ids: List[str]) -> List[s
         )
 
 
-def query_application_user_roles(
+def _scope_digest(query_input: GetApplicationUsersInput, strategy: QueryStrategy) -> str:
+    """
+    Fingerprint the authorized query scope a pagination token belongs to.
+    
+    Computed after authorization, so a token issued for one caller's scope
+    (or one set of filters) is rejected when replayed against another.
+    """
+    scope = {
+        "strategy": strategy.value,
+        "organizationIds": sorted(query_input.organizationIds or []),
+        "applicationIds": sorted(query_input.applicationIds or []),
+        "environment": query_input.environment,
+    }
+    encoded = json.dumps(scope, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def get_pagination_token_key() -> bytes:
+    """
+    Get the key pagination tokens are signed with, cached per container.
+    
+    The key is the ``secret_key`` field of the Secrets Manager secret named
+    by PAGINATION_TOKEN_SECRET_NAME. There is no fallback key: without the
+    secret, tokens can be neither issued nor accepted.
+    
+    Raises:
+        RuntimeError: If PAGINATION_TOKEN_SECRET_NAME is not set
+    """
+    global _pagination_token_key
+    now = time.time()
+    if _pagination_token_key is not None and now < _pagination_token_key[0]:
+        return _pagination_token_key[1]
+    
+    secret_name = get_pagination_token_secret_name()
+    if not secret_name:
+        logger.error("PAGINATION_TOKEN_SECRET_NAME environment variable not set")
+        raise RuntimeError("Pagination token secret not configured")
+    
+    response = boto3.client("secretsmanager").get_secret_value(SecretId=secret_name)
+    key = json.loads(response["SecretString"])["secret_key"].encode("utf-8")
+    _pagination_token_key = (now + PAGINATION_TOKEN_SECRET_TTL_SECONDS, key)
+    return key
+
+
+def _token_signature(payload: bytes) -> bytes:
+    """HMAC-SHA256 over the encoded token payload, truncated to 128 bits."""
+    return hmac.new(get_pagination_token_key(), payload, hashlib.sha256).digest()[:16]
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def encode_next_token(scope: str, source: Optional[str], start_key: Dict[str, Any]) -> str:
+    """
+    Encode a pagination position as an opaque, signed token.
+    
+    Args:
+        scope: Scope digest from _scope_digest
+        source: applicationId whose AppEnvUserIndex partition to resume in
+            (None for table scans)
+        start_key: ExclusiveStartKey to resume that source from
+        
+    Returns:
+        Token of the form "<payload>.<signature>" (base64url)
+    """
+    payload = json.dumps(
+        {"v": 1, "q": scope, "s": source, "k": start_key},
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return f"{_b64encode(payload)}.{_b64encode(_token_signature(payload))}"
+
+
+def decode_next_token(token: str, scope: str) -> Dict[str, Any]:
+    """
+    Verify and decode a pagination token.
+    
+    Args:
+        token: Token from a previous response's nextToken
+        scope: Scope digest of the current request
+        
+    Returns:
+        Dict with "source" and "start_key" keys
+        
+    Raises:
+        ValidationError: If the token is malformed, tampered with, or was
+            issued for a different query scope
+    """
+    invalid = ValidationError(ErrorCode.VAL_INVALID_NEXT_TOKEN, "Invalid pagination token")
+    try:
+        encoded_payload, encoded_signature = token.split(".", 1)
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except (ValueError, TypeError, AttributeError):
+        raise invalid
+    
+    if not hmac.compare_digest(signature, _token_signature(payload)):
+        raise invalid
+    
+    try:
+        position = json.loads(payload)
+    except ValueError:
+        raise invalid
+    
+    if position.get("v") != 1 or position.get("q") != scope or not isinstance(position.get("k"), dict):
+        raise invalid
+    
+    return {"source": position.get("s"), "start_key": position["k"]}
+
+
+def list_role_sources(
     query_input: GetApplicationUsersInput,
     strategy: QueryStrategy
-) -> List[Dict[str, Any]]:
+) -> List[Optional[str]]:
     """
-    Query ApplicationUserRoles table using the selected strategy.
+    List the sources role assignments are paged from, in page order.
+    
+    Application strategies read one AppEnvUserIndex partition per
+    application, in applicationId order so positions stay stable between
+    requests. The scan strategy has a single source, represented as None.
     
     Args:
         query_input: Input parameters with filters
         strategy: Query strategy to use
         
     Returns:
-        List of role assignment items from DynamoDB
+        Ordered list of applicationIds (or [None] for a table scan)
+    """
+    if strategy == QueryStrategy.APP_ENV_USER_INDEX:
+        return sorted(set(query_input.applicationIds or []))
+    
+    if strategy == QueryStrategy.ORG_TO_APP_TO_ROLES:
+        application_ids = get_application_ids_for_organizations(query_input.organizationIds or [])
+        if not application_ids:
+            logger.info("No applications found for specified organizations")
+        return sorted(set(application_ids))
+    
+    return [None]
+
+
+def _status_filter(environment: Optional[str], include_environment: bool) -> Dict[str, Any]:
+    """Build the ACTIVE status (and optional environment) filter arguments."""
+    # "status" is a DynamoDB reserved keyword — alias it to avoid
+    # ValidationException in FilterExpression / scan expressions.
+    filter_expression = "#status = :status"
+    values: Dict[str, Any] = {":status": "ACTIVE"}
+    if environment and include_environment:
+        filter_expression += " AND environment = :env"
+        values[":env"] = environment
+    return {
+        "FilterExpression": filter_expression,
+        "ExpressionAttributeNames": {"#status": "status"},
+        "ExpressionAttributeValues": values,
+    }
+
+
+def read_role_assignments_page(
+    table_name: str,
+    source: Optional[str],
+    environment: Optional[str],
+    start_key: Optional[Dict[str, Any]],
+    limit: int
+) -> Dict[str, Any]:
+    """
+    Read one DynamoDB page of ACTIVE role assignments from a source.
+    
+    Args:
+        table_name: ApplicationUserRoles table name
+        source: applicationId to query AppEnvUserIndex for, or None to scan
+        environment: Optional environment filter
+        start_key: ExclusiveStartKey to resume from
+        limit: Maximum items DynamoDB evaluates for this page
+        
+    Returns:
+        Raw query/scan response (Items and optional LastEvaluatedKey)
+    """
+    table = get_dynamodb_resource().Table(table_name)
+    kwargs: Dict[str, Any] = {"Limit": limit}
+    if start_key:
+        kwargs["ExclusiveStartKey"] = start_key
+    
+    if source is None:
+        kwargs.update(_status_filter(environment, include_environment=True))
+        return table.scan(**kwargs)
+    
+    kwargs.update(_status_filter(environment, include_environment=False))
+    key_condition = "applicationId = :appId"
+    kwargs["ExpressionAttributeValues"][":appId"] = source
+    
+    # Environment is the index sort key, so it narrows the key condition
+    if environment:
+        key_condition += " AND environment = :env"
+        kwargs["ExpressionAttributeValues"][":env"] = environment
+    
+    return table.query(IndexName="AppEnvUserIndex", KeyConditionExpression=key_condition, **kwargs)
+
+
+def get_user_role_assignments(
+    table_name: str,
+    user_ids: List[str],
+    sources: List[Optional[str]],
+    environment: Optional[str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch each user's ACTIVE role assignments within the query scope.
+    
+    Queries UserAppIndex once per user concurrently and keeps only roles in
+    the paged sources (any application for a scan) and environment.
+    
+    Args:
+        table_name: ApplicationUserRoles table name
+        user_ids: Users to fetch
+        sources: Sources from list_role_sources
+        environment: Optional environment filter
+        
+    Returns:
+        Dictionary mapping userId to their in-scope role assignments
+    """
+    source_set = None if sources == [None] else set(sources)
+    
+    def query_user(user_id: str) -> List[Dict[str, Any]]:
+        filter_args = _status_filter(environment, include_environment=True)
+        filter_args["ExpressionAttributeValues"][":userId"] = user_id
+        items = query_all_pages(
+            table_name,
+            IndexName="UserAppIndex",
+            KeyConditionExpression="userId = :userId",
+            **filter_args
+        )
+        if source_set is None:
+            return items
+        return [item for item in items if item.get("applicationId") in source_set]
+    
+    return dict(zip(user_ids, run_concurrently(query_user, user_ids)))
+
+
+def _ordering_key(assignment: Dict[str, Any]) -> tuple:
+    """Position of a role assignment in source order, used to pick where a user is listed."""
+    return (
+        assignment.get("applicationId", ""),
+        assignment.get("environment", ""),
+        assignment.get("applicationUserRoleId", ""),
+    )
+
+
+def _start_key_for(assignment: Dict[str, Any], source: Optional[str]) -> Dict[str, Any]:
+    """Build the ExclusiveStartKey that resumes a source right after an item."""
+    if source is None:
+        return {"applicationUserRoleId": assignment["applicationUserRoleId"]}
+    return {
+        "applicationUserRoleId": assignment["applicationUserRoleId"],
+        "applicationId": assignment["applicationId"],
+        "environment": assignment["environment"],
+    }
+
+
+def query_users_page(
+    query_input: GetApplicationUsersInput,
+    strategy: QueryStrategy,
+    scope: str,
+    position: Optional[Dict[str, Any]]
+) -> tuple:
+    """
+    Collect one page of users and their role assignments.
+    
+    Role assignments are read source by source in index order. A user with
+    several assignments is listed exactly once: at their first assignment in
+    source order (lowest applicationId, environment, applicationUserRoleId),
+    which is found by fetching the user's in-scope assignments from
+    UserAppIndex. Only as many assignments are read as are needed to fill
+    the page, so the cost of a page does not grow with the total number of
+    users.
+    
+    Args:
+        query_input: Input parameters with filters
+        strategy: Query strategy to use
+        scope: Scope digest for the next token
+        position: Decoded nextToken, or None for the first page
+        
+    Returns:
+        Tuple of (dict mapping userId to role assignments in listing order,
+        nextToken or None)
         
     Raises:
-        DatabaseError: If query fails
+        DatabaseError: If a query fails
     """
     table_name = get_application_user_roles_table_name()
     if not table_name:
@@ -430,121 +912,66 @@ def query_application_user_roles(
             "ApplicationUserRoles table not configured"
         )
     
+    limit = query_input.limit
+    
     try:
-        table = get_dynamodb_resource().Table(table_name)
-        all_items = []
-        
-        # "status" is a DynamoDB reserved keyword — alias it to avoid
-        # ValidationException in FilterExpression / scan expressions.
-        status_attr_names = {"#status": "status"}
-
-        if strategy == QueryStrategy.APP_ENV_USER_INDEX:
-            # Query using AppEnvUserIndex GSI for each applicationId
-            for app_id in (query_input.applicationIds or []):
-                # Build key condition
-                key_condition = "applicationId = :appId"
-                expr_attr_values = {":appId": app_id}
-                
-                # Add environment to sort key if provided
-                if query_input.environment:
-                    key_condition += " AND environment = :env"
-                    expr_attr_values[":env"] = query_input.environment
-                
-                # Add status filter
-                expr_attr_values[":status"] = "ACTIVE"
-                
-                # Query the GSI
-                response = table.query(
-                    IndexName="AppEnvUserIndex",
-                    KeyConditionExpression=key_condition,
-                    ExpressionAttributeValues=expr_attr_values,
-                    ExpressionAttributeNames=status_attr_names,
-                    FilterExpression="#status = :status"
-                )
-                
-                all_items.extend(response.get("Items", []))
-                
-                # Handle pagination if needed
-                while "LastEvaluatedKey" in response:
-                    response = table.query(
-                        IndexName="AppEnvUserIndex",
-                        KeyConditionExpression=key_condition,
-                        ExpressionAttributeValues=expr_attr_values,
-                        ExpressionAttributeNames=status_attr_names,
-                        FilterExpression="#status = :status",
-                        ExclusiveStartKey=response["LastEvaluatedKey"]
-                    )
-                    all_items.extend(response.get("Items", []))
+        sources = list_role_sources(query_input, strategy)
         
-        elif strategy == QueryStrategy.ORG_TO_APP_TO_ROLES:
-            # First get applicationIds for the organizations
-            application_ids = get_application_ids_for_organizations(query_input.organizationIds or [])
+        source_index = 0
+        start_key: Optional[Dict[str, Any]] = None
+        if position:
+            if strategy == QueryStrategy.SCAN_WITH_AUTH:
+                start_key = position["start_key"]
+            else:
+                # Sources are sorted; if the resumed application no longer
+                # exists, continue with the next one in order
+                source_index = bisect.bisect_left(sources, position["source"] or "")
+                if source_index < len(sources) and sources[source_index] == position["source"]:
+                    start_key = position["start_key"]
+        
+        page_users: Dict[str, List[Dict[str, Any]]] = {}
+        user_roles: Dict[str, List[Dict[str, Any]]] = {}
+        
+        while source_index < len(sources):
+            source = sources[source_index]
+            response = read_role_assignments_page(
+                table_name, source, query_input.environment, start_key,
+                max(limit, MIN_ROLE_PAGE_READ)
+            )
+            items = [item for item in response.get("Items", []) if item.get("userId")]
             
-            if not application_ids:
-                logger.info("No applications found for specified organizations")
-                return []
+            new_user_ids = list(dict.fromkeys(
+                item["userId"] for item in items if item["userId"] not in user_roles
+            ))
+            user_roles.update(get_user_role_assignments(
+                table_name, new_user_ids, sources, query_input.environment
+            ))
             
-            # Now query using AppEnvUserIndex for each application
-            for app_id in application_ids:
-                key_condition = "applicationId = :appId"
-                expr_attr_values = {":appId": app_id}
-                
-                if query_input.environment:
-                    key_condition += " AND environment = :env"
-                    expr_attr_values[":env"] = query_input.environment
-                
-                # Add status filter
-                expr_attr_values[":status"] = "ACTIVE"
+            last_key = response.get("LastEvaluatedKey")
+            for i, item in enumerate(items):
+                roles = user_roles.get(item["userId"])
+                if not roles or min(map(_ordering_key, roles)) != _ordering_key(item):
+                    continue
+                page_users[item["userId"]] = roles
                 
-                response = table.query(
-                    IndexName="AppEnvUserIndex",
-                    KeyConditionExpression=key_condition,
-                    ExpressionAttributeValues=expr_attr_values,
-                    ExpressionAttributeNames=status_attr_names,
-                    FilterExpression="#status = :status"
-                )
-                
-                all_items.extend(response.get("Items", []))
-                
-                # Handle pagination
-                while "LastEvaluatedKey" in response:
-                    response = table.query(
-                        IndexName="AppEnvUserIndex",
-                        KeyConditionExpression=key_condition,
-                        ExpressionAttributeValues=expr_attr_values,
-                        ExpressionAttributeNames=status_attr_names,
-                        FilterExpression="#status = :status",
-                        ExclusiveStartKey=response["LastEvaluatedKey"]
+                if len(page_users) == limit:
+                    at_end = (
+                        i == len(items) - 1
+                        and not last_key
+                        and source_index == len(sources) - 1
                     )
-                    all_items.extend(response.get("Items", []))
-        
-        elif strategy == QueryStrategy.SCAN_WITH_AUTH:
-            # Scan the table with status filter
-            # Note: This is the least efficient strategy
-            filter_expression = "#status = :status"
-            scan_expr_attr_values: Dict[str, str] = {":status": "ACTIVE"}
-            
-            if query_input.environment:
-                filter_expression += " AND environment = :env"
-                scan_expr_attr_values[":env"] = query_input.environment
-            
-            scan_kwargs: Dict[str, Any] = {
-                "FilterExpression": filter_expression,
-                "ExpressionAttributeValues": scan_expr_attr_values,
-                "ExpressionAttributeNames": status_attr_names,
-            }
-            
-            response = table.scan(**scan_kwargs)
-            all_items.extend(response.get("Items", []))
+                    next_token = None if at_end else encode_next_token(
+                        scope, source, _start_key_for(item, source)
+                    )
+                    return page_users, next_token
             
-            # Handle pagination
-            while "LastEvaluatedKey" in response:
-                scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
-                response = table.scan(**scan_kwargs)
-                all_items.extend(response.get("Items", []))
+            if last_key:
+                start_key = last_key
+            else:
+                source_index += 1
+                start_key = None
         
-        logger.info(f"Retrieved {len(all_items)} role assignments from ApplicationUserRoles")
-        return all_items
+        return page_users, None
         
     except ClientError as e:
         logger.error(f"Failed to query ApplicationUserRoles: {e.response['Error']['Code']}")
@@ -603,42 +1030,16 @@ def enrich_users_from_users_table(user_ids: List[str]) -> Dict[str, Dict[str, An
         )
     
     try:
-        dynamodb = get_dynamodb_resource()
-        users_map: Dict[str, Dict[str, Any]] = {}
-        
-        # DynamoDB BatchGetItem supports max 100 keys per request.
-        # We chunk the user IDs to stay within this limit and retry
-        # any UnprocessedKeys (which occur under heavy throughput).
-        chunk_size = 100
-        for i in range(0, len(user_ids), chunk_size):
-            chunk = user_ids[i:i + chunk_size]
-            
-            keys = [{"userId": user_id} for user_id in chunk]
-            
-            # Project only the fields needed for the response to minimize
-            # read capacity consumption. "status" is a DynamoDB reserved word,
-            # so we alias it via ExpressionAttributeNames.
-            response = dynamodb.batch_get_item(
-                RequestItems={
-                    users_table_name: {
-                        "Keys": keys,
-                        "ProjectionExpression": "userId, firstName, lastName, #status",
-                        "ExpressionAttributeNames": {"#status": "status"}
-                    }
-                }
-            )
-            
-            for item in response.get("Responses", {}).get(users_table_name, []):
-                users_map[item["userId"]] = item
-            
-            # Retry loop: DynamoDB may return UnprocessedKeys when provisioned
-            # throughput is exceeded. We keep retrying until all keys are fetched.
-            unprocessed = response.get("UnprocessedKeys", {})
-            while unprocessed:
-                response = dynamodb.batch_get_item(RequestItems=unprocessed)
-                for item in response.get("Responses", {}).get(users_table_name, []):
-                    users_map[item["userId"]] = item
-                unprocessed = response.get("UnprocessedKeys", {})
+        # Project only the fields needed for the response to minimize
+        # read capacity consumption. "status" is a DynamoDB reserved word,
+        # so we alias it via ExpressionAttributeNames.
+        items = batch_get_all(
+            users_table_name,
+            [{"userId": user_id} for user_id in user_ids],
+            projection_expression="userId, firstName, lastName, #status",
+            expression_attribute_names={"#status": "status"}
+        )
+        users_map: Dict[str, Dict[str, Any]] = {item["userId"]: item for item in items}
         
         logger.info(f"Retrieved {len(users_map)} user details from Users table")
         
@@ -740,12 +1141,11 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     This Lambda function:
     1. Validates input parameters
     2. Applies authorization rules based on caller's Cognito groups
-    3. Queries ApplicationUserRoles with appropriate filters
-    4. Deduplicates users by userId
-    5. Enriches user data from Users table
-    6. Groups role assignments by user
-    7. Sorts results by user name
-    8. Returns paginated results
+    3. Reads one page of ApplicationUserRoles, resuming from nextToken
+    4. Lists each user once, with all their in-scope role assignments
+    5. Enriches the page's users from the Users table
+    6. Sorts the page by user name
+    7. Returns the page and a signed nextToken for the next one
     
     Args:
         event: AppSync event containing input with filters
@@ -793,34 +1193,28 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # or fall back to a table scan.
         strategy = select_query_strategy(query_input)
         
-        # Step 4: Execute the DynamoDB query using the chosen strategy.
-        # Returns raw role assignment items (one per user-app-env-role combo).
-        role_assignments = query_application_user_roles(query_input, strategy)
+        # Step 4: Resume from the signed nextToken, if any. The token is bound
+        # to the authorized scope, so it cannot widen what the caller sees.
+        scope = _scope_digest(query_input, strategy)
+        position = None
+        if query_input.nextToken:
+            position = decode_next_token(query_input.nextToken, scope)
         
-        # Step 5: Group role assignments by userId so each user appears once
-        # with all their roles collected under a single record.
-        user_roles_map = deduplicate_and_group_by_user(role_assignments)
+        # Step 5: Read just enough role assignments to fill the page; each
+        # user comes back once with all of their in-scope roles.
+        user_roles_map, next_token = query_users_page(query_input, strategy, scope, position)
         
-        # Step 6: Enrich — batch-get user profiles (firstName, lastName, status)
-        # from the Users table to complement the role data.
+        # Step 6: Enrich — batch-get profiles (firstName, lastName, status)
+        # for the users on this page only.
         user_ids = list(user_roles_map.keys())
-        users_map = enrich_users_from_users_table(user_ids)
+        users_map = enrich_users_from_users_table(user_ids) if user_ids else {}
         
         # Step 7: Merge role assignments with user profiles into the response shape.
         users_with_roles = build_users_with_roles(user_roles_map, users_map)
         
-        # Step 8: Sort alphabetically by lastName, firstName for consistent ordering.
-        users_with_roles = sort_users_by_name(users_with_roles)
-        
-        # Apply pagination limit
-        paginated_users = users_with_roles[:query_input.limit]
-        
-        # Determine if there are more results
-        next_token = None
-        if len(users_with_roles) > query_input.limit:
-            # For simplicity, we'll use the count as the token
-            # In production, this should be a proper pagination token
-            next_token = str(query_input.limit)
+        # Step 8: Sort the page alphabetically by lastName, firstName. Pages
+        # themselves follow index order.
+        paginated_users = sort_users_by_name(users_with_roles)
         
         logger.info(f"Returning {len(paginated_users)} users")
         
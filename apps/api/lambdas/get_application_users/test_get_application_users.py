@@ -6,13 +6,21 @@
 
 import importlib.util
 import sys
+import time
 from pathlib import Path
 
+import pytest
+
 
 # Add the lambda directory to path for imports
 lambda_dir = Path(__file__).parent
 sys.path.insert(0, str(lambda_dir))
 
+# Add the organizations_security layer directory to path for the lambda's layer imports
+layer_path = lambda_dir.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
 # Import with explicit module reference to avoid conflicts with other index.py files
 _spec = importlib.util.spec_from_file_location(
     "get_application_users_index", lambda_dir / "index.py"
@@ -151,3 +159,71 @@ def test_select_query_strategy_prefers_application_ids():
     strategy = select_query_strategy(query_input)
     
     assert strategy == QueryStrategy.APP_ENV_USER_INDEX
+
+
+def test_run_concurrently_preserves_input_order():
+    """Test concurrent fan-out returns results in input order."""
+    def slow_double(value):
+        # Later items finish first
+        time.sleep((10 - value) * 0.001)
+        return value * 2
+
+    result = index.run_concurrently(slow_double, list(range(10)), max_workers=4)
+    assert result == [value * 2 for value in range(10)]
+
+
+def test_run_concurrently_propagates_errors():
+    """Test an error from any worker is raised to the caller."""
+    def fail_on_three(value):
+        if value == 3:
+            raise ValueError("boom")
+        return value
+
+    with pytest.raises(ValueError):
+        index.run_concurrently(fail_on_three, [1, 2, 3, 4], max_workers=2)
+
+
+class _FakeBatchDynamoDB:
+    """Fake resource whose batch_get_item leaves the first key unprocessed N times."""
+
+    def __init__(self, unprocessed_rounds):
+        self.unprocessed_rounds = unprocessed_rounds
+        self.requests = []
+
+    def batch_get_item(self, RequestItems):
+        self.requests.append(RequestItems)
+        table_name, request = next(iter(RequestItems.items()))
+        keys = request["Keys"]
+        if self.unprocessed_rounds > 0:
+            self.unprocessed_rounds -= 1
+            return {
+                "Responses": {table_name: [dict(key) for key in keys[1:]]},
+                "UnprocessedKeys": {table_name: {**request, "Keys": keys[:1]}},
+            }
+        return {"Responses": {table_name: [dict(key) for key in keys]}}
+
+
+def test_batch_get_all_dedupes_chunks_and_retries(monkeypatch):
+    """Test keys are deduplicated, chunked by 100, and unprocessed keys retried."""
+    fake = _FakeBatchDynamoDB(unprocessed_rounds=2)
+    monkeypatch.setattr(index, "get_dynamodb_resource", lambda: fake)
+    monkeypatch.setattr(index.time, "sleep", lambda seconds: None)
+
+    keys = [{"userId": f"user-{i}"} for i in range(150)] + [{"userId": "user-0"}]
+    items = index.batch_get_all("users", keys, max_retries=3)
+
+    assert sorted(item["userId"] for item in items) == sorted(f"user-{i}" for i in range(150))
+    sizes = sorted(len(r["users"]["Keys"]) for r in fake.requests)
+    assert sizes == [1, 1, 50, 100]
+    assert len(fake.requests) == 4
+
+
+def test_batch_get_all_enforces_retry_budget(monkeypatch):
+    """Test a DatabaseError is raised once the retry budget is spent."""
+    fake = _FakeBatchDynamoDB(unprocessed_rounds=10)
+    monkeypatch.setattr(index, "get_dynamodb_resource", lambda: fake)
+    monkeypatch.setattr(index.time, "sleep", lambda seconds: None)
+
+    with pytest.raises(index.DatabaseError):
+        index.batch_get_all("users", [{"userId": "user-1"}], max_retries=2)
+    assert len(fake.requests) == 3
@@ -16,6 +16,11 @@ from hypothesis import given, strategies as st, settings, assume
 lambda_dir = Path(__file__).parent
 sys.path.insert(0, str(lambda_dir))
 
+# Add the organizations_security layer directory to path for the lambda's layer imports
+layer_path = lambda_dir.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
 # Import with explicit module reference to avoid conflicts with other index.py files
 _spec = importlib.util.spec_from_file_location(
     "get_application_users_index", lambda_dir / "index.py"
@@ -548,7 +553,7 @@ def test_property_pagination_limit_placeholder(limit):
     with actual query results.
     """
     # This property requires integration testing
-    # The lambda_handler applies the limit: paginated_users = users_with_roles[:query_input.limit]
+    # query_users_page stops reading role assignments once the page holds `limit` users
     # Integration tests will verify the actual pagination behavior
     assert True
 
@@ -14,6 +14,11 @@ import time
 from pathlib import Path
 from decimal import Decimal
 
+import base64
+import hashlib
+import hmac
+import json
+
 import boto3
 import pytest
 from moto import mock_aws
@@ -24,6 +29,11 @@ from moto import mock_aws
 lambda_dir = Path(__file__).parent
 sys.path.insert(0, str(lambda_dir))
 
+# Add the organizations_security layer directory to path for the lambda's layer imports
+layer_path = lambda_dir.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
 _spec = importlib.util.spec_from_file_location(
     "get_application_users_index", lambda_dir / "index.py"
 )
@@ -38,10 +48,11 @@ lambda_handler = index.lambda_handler
 # Constants – table names used across all fixtures
 # ---------------------------------------------------------------------------
 APP_USER_ROLES_TABLE = "test-application-user-roles"
+PAGINATION_SECRET_NAME = "test/project/dev/secrets/pagination-token"
 USERS_TABLE = "test-users"
 ORGANIZATIONS_TABLE = "test-organizations"
 APPLICATIONS_TABLE = "test-applications"
-ORG_USERS_TABLE = "orb-integration-hub-dev-organization-users"
+ORG_USERS_TABLE = "test-organization-users"
 
 NOW = int(time.time())
 
@@ -129,19 +140,20 @@ def _create_org_users_table(dynamodb):
     dynamodb.create_table(
         TableName=ORG_USERS_TABLE,
         KeySchema=[
-            {"AttributeName": "organizationUserId", "KeyType": "HASH"},
+            {"AttributeName": "userId", "KeyType": "HASH"},
+            {"AttributeName": "organizationId", "KeyType": "RANGE"},
         ],
         AttributeDefinitions=[
-            {"AttributeName": "organizationUserId", "AttributeType": "S"},
             {"AttributeName": "userId", "AttributeType": "S"},
             {"AttributeName": "organizationId", "AttributeType": "S"},
+            {"AttributeName": "role", "AttributeType": "S"},
         ],
         GlobalSecondaryIndexes=[
             {
-                "IndexName": "UserOrgIndex",
+                "IndexName": "UserOrganizationsIndex",
                 "KeySchema": [
                     {"AttributeName": "userId", "KeyType": "HASH"},
-                    {"AttributeName": "organizationId", "KeyType": "RANGE"},
+                    {"AttributeName": "role", "KeyType": "RANGE"},
                 ],
                 "Projection": {"ProjectionType": "ALL"},
             },
@@ -208,9 +220,8 @@ def _seed_applications(dynamodb):
 def _seed_org_users(dynamodb, owner_user_id, owned_org_ids):
     """Seed the OrganizationUsers table with ownership records."""
     table = dynamodb.Table(ORG_USERS_TABLE)
-    for i, org_id in enumerate(owned_org_ids):
+    for org_id in owned_org_ids:
         table.put_item(Item={
-            "organizationUserId": f"org-user-{i}",
             "userId": owner_user_id,
             "organizationId": org_id,
             "role": "OWNER",
@@ -377,6 +388,7 @@ def aws_env(monkeypatch):
     with mock_aws():
         # Reset the module-level DynamoDB resource so moto intercepts it
         index._dynamodb = None
+        index._owned_orgs_cache.clear()
 
         dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
 
@@ -396,8 +408,17 @@ def aws_env(monkeypatch):
         monkeypatch.setenv("APPLICATION_USER_ROLES_TABLE_NAME", APP_USER_ROLES_TABLE)
         monkeypatch.setenv("USERS_TABLE_NAME", USERS_TABLE)
         monkeypatch.setenv("ORGANIZATIONS_TABLE_NAME", ORGANIZATIONS_TABLE)
+        monkeypatch.setenv("ORGANIZATION_USERS_TABLE_NAME", ORG_USERS_TABLE)
         monkeypatch.setenv("APPLICATIONS_TABLE_NAME", APPLICATIONS_TABLE)
 
+        # Pagination tokens are signed with a key from Secrets Manager
+        boto3.client("secretsmanager", region_name="us-east-1").create_secret(
+            Name=PAGINATION_SECRET_NAME,
+            SecretString=json.dumps({"secret_key": "test-pagination-key"}),
+        )
+        monkeypatch.setenv("PAGINATION_TOKEN_SECRET_NAME", PAGINATION_SECRET_NAME)
+        index._pagination_token_key = None
+
         yield dynamodb
 
         # Reset the cached resource after the test
@@ -633,6 +654,97 @@ class TestPagination:
         assert len(result["users"]) == 1
         assert result["nextToken"] is not None
 
+    def test_small_limit_reads_full_page(self, aws_env, monkeypatch):
+        """A small limit still reads MIN_ROLE_PAGE_READ items per round trip."""
+        reads = []
+        read_page = index.read_role_assignments_page
+
+        def recording_read(table_name, source, environment, start_key, limit):
+            reads.append(limit)
+            return read_page(table_name, source, environment, start_key, limit)
+
+        monkeypatch.setattr(index, "read_role_assignments_page", recording_read)
+        result = lambda_handler(_build_event(input_data={"limit": 1}), None)
+
+        assert len(result["users"]) == 1
+        assert result["nextToken"] is not None
+        assert reads == [index.MIN_ROLE_PAGE_READ]
+
+    @pytest.mark.parametrize("input_data", [
+        {},
+        {"applicationIds": ["app-1", "app-3"]},
+        {"organizationIds": ["org-1", "org-2"]},
+    ])
+    @pytest.mark.parametrize("limit", [1, 2, 3])
+    def test_pages_cover_every_user_once(self, aws_env, input_data, limit):
+        """Following nextToken returns every user exactly once with all their roles."""
+        full = lambda_handler(_build_event(input_data={**input_data, "limit": 100}), None)
+        expected = {u["userId"]: len(u["roleAssignments"]) for u in full["users"]}
+
+        seen = {}
+        next_token = None
+        for _ in range(10):
+            page_input = {**input_data, "limit": limit}
+            if next_token:
+                page_input["nextToken"] = next_token
+            result = lambda_handler(_build_event(input_data=page_input), None)
+
+            assert len(result["users"]) <= limit
+            for user in result["users"]:
+                assert user["userId"] not in seen
+                seen[user["userId"]] = len(user["roleAssignments"])
+
+            next_token = result["nextToken"]
+            if next_token is None:
+                break
+
+        assert next_token is None
+        assert seen == expected
+
+    def test_tampered_token_rejected(self, aws_env):
+        """A modified nextToken fails signature verification."""
+        first = lambda_handler(_build_event(input_data={"limit": 1}), None)
+        payload, signature = first["nextToken"].split(".")
+        tampered = payload[:-2] + ("AA" if payload[-2:] != "AA" else "BB")
+
+        event = _build_event(input_data={"limit": 1, "nextToken": f"{tampered}.{signature}"})
+        with pytest.raises(Exception, match="ORB-VAL-004"):
+            lambda_handler(event, None)
+
+    def test_token_signed_with_table_name_rejected(self, aws_env):
+        """A token signed with the public table name is not accepted."""
+        first = lambda_handler(_build_event(input_data={"limit": 1}), None)
+        payload = first["nextToken"].split(".")[0]
+        raw_payload = base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        forged = hmac.new(
+            APP_USER_ROLES_TABLE.encode("utf-8"), raw_payload, hashlib.sha256
+        ).digest()[:16]
+        signature = base64.urlsafe_b64encode(forged).decode("ascii").rstrip("=")
+
+        event = _build_event(input_data={"limit": 1, "nextToken": f"{payload}.{signature}"})
+        with pytest.raises(Exception, match="ORB-VAL-004"):
+            lambda_handler(event, None)
+
+    def test_missing_signing_secret_fails_closed(self, aws_env, monkeypatch):
+        """Without the signing secret, pages that need a token are refused."""
+        monkeypatch.delenv("PAGINATION_TOKEN_SECRET_NAME")
+        index._pagination_token_key = None
+
+        with pytest.raises(Exception, match="Service temporarily unavailable"):
+            lambda_handler(_build_event(input_data={"limit": 1}), None)
+
+    def test_token_bound_to_query_scope(self, aws_env):
+        """A nextToken cannot be replayed with different filters."""
+        first = lambda_handler(
+            _build_event(input_data={"applicationIds": ["app-1"], "limit": 1}), None
+        )
+
+        event = _build_event(input_data={
+            "applicationIds": ["app-3"], "limit": 1, "nextToken": first["nextToken"]
+        })
+        with pytest.raises(Exception, match="ORB-VAL-004"):
+            lambda_handler(event, None)
+
 
 class TestValidationErrors:
     """Verify validation errors are raised correctly through the handler."""
@@ -708,6 +820,33 @@ class TestCustomerAuthorization:
                 org_ids.add(ra["organizationId"])
         assert org_ids == {"org-1"}
 
+    def test_owned_orgs_cached_until_ttl_expires(self, aws_env, monkeypatch):
+        """Owned org IDs are reused across requests until the cache TTL runs out."""
+        _seed_org_users(aws_env, "growing-customer", ["org-1"])
+        event = _build_event(
+            input_data={},
+            caller_user_id="growing-customer",
+            groups=["USER", "CUSTOMER"],
+        )
+
+        def org_ids(result):
+            return {ra["organizationId"] for u in result["users"] for ra in u["roleAssignments"]}
+
+        assert org_ids(lambda_handler(event, None)) == {"org-1"}
+
+        _seed_org_users(aws_env, "growing-customer", ["org-2"])
+        assert org_ids(lambda_handler(event, None)) == {"org-1"}
+
+        real_time = time.time
+        monkeypatch.setattr(
+            index.time, "time", lambda: real_time() + index.OWNED_ORGS_CACHE_TTL_SECONDS + 1
+        )
+        assert org_ids(lambda_handler(event, None)) == {"org-1", "org-2"}
+
+    def test_owned_orgs_ttl_is_capped(self):
+        """Ownership revocation latency never exceeds the TTL cap."""
+        assert index.OWNED_ORGS_CACHE_TTL_SECONDS <= index.OWNED_ORGS_CACHE_MAX_TTL_SECONDS
+
 
 class TestEmployeeFullAccess:
     """Verify EMPLOYEE/OWNER see all organizations."""
@@ -5,8 +5,12 @@
 
 import json
 import logging
+import os
+import random
+import time
 import boto3
 from datetime import datetime
+from typing import Any, Dict, List
 
 # Import from organization security layer
 import sys
@@ -17,67 +21,173 @@ from kms_manager import OrganizationKMSManager
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+ORGANIZATIONS_TABLE = os.environ.get("ORGANIZATIONS_TABLE_NAME", "Organizations")
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_CHUNK_SIZE = 100
+BATCH_GET_MAX_RETRIES = 5
+
+# Aliases read per page; one page is one checkpoint
+KEY_PAGE_SIZE = 100
+
+# Stop and continue in a new invocation when less time than this remains
+CHECKPOINT_MIN_REMAINING_MS = int(
+    os.environ.get("KMS_CLEANUP_CHECKPOINT_MIN_REMAINING_MS", "60000")
+)
+
+
+def get_organization_statuses(dynamodb, organization_ids: List[str]) -> Dict[str, str]:
+    """
+    Batch-get organization statuses, 100 keys per request.
+
+    Organizations that do not exist are absent from the result.
+    """
+    statuses: Dict[str, str] = {}
+    unique_ids = list(dict.fromkeys(organization_ids))
+
+    for start in range(0, len(unique_ids), BATCH_GET_CHUNK_SIZE):
+        request_items: Dict[str, Any] = {
+            ORGANIZATIONS_TABLE: {
+                "Keys": [
+                    {"organizationId": organization_id}
+                    for organization_id in unique_ids[start : start + BATCH_GET_CHUNK_SIZE]
+                ],
+                "ProjectionExpression": "organizationId, #status",
+                "ExpressionAttributeNames": {"#status": "status"},
+            }
+        }
+
+        for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+            if attempt:
+                time.sleep(random.uniform(0, min(2.0, 0.05 * 2**attempt)))
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            for item in response.get("Responses", {}).get(ORGANIZATIONS_TABLE, []):
+                statuses[item["organizationId"]] = item.get("status", "UNKNOWN")
+            request_items = response.get("UnprocessedKeys") or {}
+            if not request_items:
+                break
+        else:
+            raise RuntimeError("Organization lookup left unprocessed keys after retries")
+
+    return statuses
+
+
+def sweep_page(kms_manager, dynamodb, org_keys: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Schedule deletion of keys on one page whose organization is missing or deleted."""
+    cleaned_up = 0
+    errors = []
+
+    statuses = get_organization_statuses(dynamodb, [k["organizationId"] for k in org_keys])
+
+    for key_info in org_keys:
+        organization_id = key_info["organizationId"]
+
+        try:
+            # Check if organization exists and is not deleted
+            org_exists = organization_id in statuses
+            org_deleted = org_exists and statuses[organization_id] == "DELETED"
+
+            # If organization doesn't exist or is deleted, schedule key deletion
+            if not org_exists or org_deleted:
+                success = kms_manager.delete_organization_key(
+                    organization_id,
+                    pending_window_days=7,  # Shorter window for orphaned keys
+                )
+
+                if success:
+                    cleaned_up += 1
+                    status = "deleted" if org_deleted else "missing"
+                    logger.info(
+                        f"Scheduled cleanup of key for {status} organization {organization_id}"
+                    )
+                else:
+                    errors.append(
+                        {
+                            "organizationId": organization_id,
+                            "error": "Key deletion scheduling failed",
+                        }
+                    )
+
+        except Exception as e:
+            errors.append({"organizationId": organization_id, "error": str(e)})
+            logger.error(f"Error processing organization {organization_id}: {str(e)}")
+
+    return {"keysChecked": len(org_keys), "cleanedUp": cleaned_up, "errors": errors}
+
+
+def continue_in_new_invocation(context, marker: str, totals: Dict[str, int]) -> None:
+    """Checkpoint: re-invoke this function asynchronously from the marker."""
+    boto3.client("lambda").invoke(
+        FunctionName=context.invoked_function_arn,
+        InvocationType="Event",
+        Payload=json.dumps({"marker": marker, "totals": totals}).encode("utf-8"),
+    )
+    logger.info(f"Checkpointed KMS cleanup at marker {marker}; continuing asynchronously")
+
 
 def lambda_handler(event, context):
     """
     Simple scheduled function to clean up KMS keys for deleted organizations.
     Triggered by CloudWatch Events (e.g., daily or weekly).
+
+    Keys are processed a page at a time. When the invocation runs low on
+    time, progress is checkpointed by re-invoking the function with the
+    next page marker and the running totals. If that invoke fails, the
+    sweep carries on in this invocation.
     """
     try:
+        event = event or {}
         kms_manager = OrganizationKMSManager()
         dynamodb = boto3.resource("dynamodb")
-        organizations_table = dynamodb.Table("Organizations")
-
-        # Get all organization KMS keys
-        org_keys = kms_manager.list_organization_keys()
 
+        marker = event.get("marker")
+        totals = {"keysChecked": 0, "cleanedUp": 0, "errors": 0}
+        totals.update(event.get("totals") or {})
+        page_keys_checked = 0
         cleaned_up = 0
-        errors = []
-
-        logger.info(f"Checking {len(org_keys)} organization keys for cleanup")
-
-        for key_info in org_keys:
-            organization_id = key_info["organizationId"]
+        error_count = 0
+        continued = False
+        continue_inline = False
 
-            try:
-                # Check if organization exists and is not deleted
-                response = organizations_table.get_item(Key={"organizationId": organization_id})
+        logger.info(f"Checking organization keys for cleanup (marker: {marker})")
 
-                org_exists = "Item" in response
-                org_deleted = False
-
-                if org_exists:
-                    org_status = response["Item"].get("status", "UNKNOWN")
-                    org_deleted = org_status == "DELETED"
-
-                # If organization doesn't exist or is deleted, schedule key deletion
-                if not org_exists or org_deleted:
-                    success = kms_manager.delete_organization_key(
-                        organization_id,
-                        pending_window_days=7,  # Shorter window for orphaned keys
+        while True:
+            org_keys, marker = kms_manager.list_organization_keys_page(
+                marker=marker, page_size=KEY_PAGE_SIZE
+            )
+            result = sweep_page(kms_manager, dynamodb, org_keys)
+            page_keys_checked += result["keysChecked"]
+            cleaned_up += result["cleanedUp"]
+            error_count += len(result["errors"])
+
+            if not marker:
+                break
+            if (
+                context is not None
+                and not continue_inline
+                and context.get_remaining_time_in_millis() < CHECKPOINT_MIN_REMAINING_MS
+            ):
+                try:
+                    continue_in_new_invocation(
+                        context,
+                        marker,
+                        {
+                            "keysChecked": totals["keysChecked"] + page_keys_checked,
+                            "cleanedUp": totals["cleanedUp"] + cleaned_up,
+                            "errors": totals["errors"] + error_count,
+                        },
                     )
-
-                    if success:
-                        cleaned_up += 1
-                        status = "deleted" if org_deleted else "missing"
-                        logger.info(
-                            f"Scheduled cleanup of key for {status} organization {organization_id}"
-                        )
-                    else:
-                        errors.append(
-                            {
-                                "organizationId": organization_id,
-                                "error": "Key deletion scheduling failed",
-                            }
-                        )
-
-            except Exception as e:
-                errors.append({"organizationId": organization_id, "error": str(e)})
-                logger.error(f"Error processing organization {organization_id}: {str(e)}")
+                    continued = True
+                    break
+                except Exception as e:
+                    # A timeout from here on leaves the rest for the next scheduled run
+                    logger.error(f"Failed to checkpoint KMS cleanup; continuing inline: {e}")
+                    continue_inline = True
 
         # Log summary
         logger.info(
-            f"Cleanup complete: {cleaned_up} keys scheduled for deletion, {len(errors)} errors"
+            f"Cleanup {'checkpointed' if continued else 'complete'}: {cleaned_up} keys "
+            f"scheduled for deletion, {error_count} errors in this invocation"
         )
 
         # Send CloudWatch metrics
@@ -94,7 +204,7 @@ def lambda_handler(event, context):
                     },
                     {
                         "MetricName": "CleanupErrors",
-                        "Value": len(errors),
+                        "Value": error_count,
                         "Unit": "Count",
                         "Timestamp": datetime.now(),
                     },
@@ -107,10 +217,11 @@ def lambda_handler(event, context):
             "statusCode": 200,
             "body": json.dumps(
                 {
-                    "message": "KMS cleanup completed",
-                    "totalKeysChecked": len(org_keys),
-                    "keysScheduledForDeletion": cleaned_up,
-                    "errors": len(errors),
+                    "message": "KMS cleanup checkpointed" if continued else "KMS cleanup completed",
+                    "totalKeysChecked": totals["keysChecked"] + page_keys_checked,
+                    "keysScheduledForDeletion": totals["cleanedUp"] + cleaned_up,
+                    "errors": totals["errors"] + error_count,
+                    "nextMarker": marker if continued else None,
                     "timestamp": datetime.now().isoformat(),
                 }
             ),
@@ -17,6 +17,7 @@ import sys
 sys.path.append("/opt/python")
 from security_manager import OrganizationSecurityManager
 from kms_manager import OrganizationKMSManager
+from membership_resolver import get_membership_resolver
 from rbac_manager import (
     OrganizationRBACManager,
     OrganizationPermissions,
@@ -30,6 +31,7 @@ from context_middleware import (
 from aws_audit_logger import (
     AuditEventType,
     ComplianceFlag,
+    flush_audit_log,
     log_organization_audit_event,
     state_tracker,
 )
@@ -316,6 +318,7 @@ class OrganizationsResolver:
                 update_params["ExpressionAttributeNames"] = expression_names
 
             response = self.organizations_table.update_item(**update_params)
+            get_membership_resolver().invalidate(organization_id=organization_id)
 
             # Log audit event for organization update with state changes
             try:
@@ -403,6 +406,7 @@ class OrganizationsResolver:
                 ReturnValues="ALL_NEW",
                 ConditionExpression="attribute_exists(organizationId) AND #status <> :deleted_status",
             )
+            get_membership_resolver().invalidate(organization_id=organization_id)
 
             # Schedule KMS key deletion (30-day pending window for compliance)
             try:
@@ -637,3 +641,6 @@ def lambda_handler(event, context):
     except Exception as e:
         logger.error(f"Unhandled error in Organizations resolver: {str(e)}")
         return {"statusCode": 500, "body": {"error": "Internal server error"}}
+    finally:
+        # Audit events are buffered; ship them before the container freezes
+        flush_audit_log()
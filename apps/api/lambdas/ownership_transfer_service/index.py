@@ -22,6 +22,7 @@ import sys
 sys.path.append("/opt/python")
 from rbac_manager import OrganizationRBACManager
 from kms_manager import OrganizationKMSManager
+from membership_resolver import get_membership_resolver
 from context_middleware import (
     requires_organization_owner,
     organization_context_required,
@@ -29,6 +30,7 @@ from context_middleware import (
 from aws_audit_logger import (
     AuditEventType,
     ComplianceFlag,
+    flush_audit_log,
     log_organization_audit_event,
 )
 
@@ -675,6 +677,7 @@ class OwnershipTransferResolver:
                 ConditionExpression="ownerId = :current_owner",
                 ExpressionAttributeNames={":current_owner": current_owner},
             )
+            get_membership_resolver().invalidate(organization_id=org_id)
 
             # Create completed transfer record
             transfer_id = str(uuid.uuid4())
@@ -853,6 +856,7 @@ class OwnershipTransferResolver:
                 ConditionExpression="ownerId = :current_owner",
                 ExpressionAttributeNames={":current_owner": transfer_request["currentOwnerId"]},
             )
+            get_membership_resolver().invalidate(organization_id=transfer_request["organizationId"])
 
             # Update transfer request status
             self.transfer_requests_table.update_item(
@@ -1141,3 +1145,6 @@ def lambda_handler(event, context):
     except Exception as e:
         logger.error(f"Unhandled error in ownership transfer service: {str(e)}")
         return {"statusCode": 500, "body": {"error": "Internal server error"}}
+    finally:
+        # Audit events are buffered; ship them before the container freezes
+        flush_audit_log()
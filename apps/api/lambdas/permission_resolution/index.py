@@ -20,7 +20,11 @@ Provides permission resolution operations:
 import json
 import logging
 import os
+import random
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any
 
@@ -36,36 +40,83 @@ VALID_ENVIRONMENTS = {"PRODUCTION", "STAGING", "DEVELOPMENT", "TEST", "PREVIEW"}
 # Cache TTL in seconds (default 5 minutes)
 CACHE_TTL_SECONDS = int(os.environ.get("PERMISSION_CACHE_TTL_SECONDS", "300"))
 
+# Cache bounds: entry count and approximate serialized size of cached results
+CACHE_MAX_ENTRIES = int(os.environ.get("PERMISSION_CACHE_MAX_ENTRIES", "10000"))
+CACHE_MAX_BYTES = int(os.environ.get("PERMISSION_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Maximum concurrent GroupEnvRoleIndex queries per resolution
+GROUP_QUERY_CONCURRENCY = max(1, int(os.environ.get("GROUP_QUERY_CONCURRENCY", "8")))
+
+# BatchGetItem limits: keys per request and retries for UnprocessedKeys
+BATCH_GET_CHUNK_SIZE = 100
+BATCH_GET_MAX_RETRIES = 5
+
+
+CacheKey = tuple[str, str, str]
+
+
+class GroupLookupError(Exception):
+    """Groups or their role assignments could not be loaded completely."""
+
 
 class PermissionCache:
-    """Simple in-memory cache with TTL for resolved permissions.
+    """Bounded in-memory LRU cache with TTL for resolved permissions.
+
+    Entries are bounded by count and by approximate size (the length of the
+    JSON-serialized result); the least recently used entries are evicted
+    first. Expired entries are swept from the oldest end on every write, so
+    idle entries don't accumulate. Secondary indexes by user and by
+    (user, application) make invalidation proportional to the entries
+    removed.
 
     This cache is per-Lambda-instance and will be cleared when the instance
     is recycled. For production use with multiple Lambda instances, consider
     using ElastiCache/Redis for shared caching.
     """
 
-    def __init__(self, ttl_seconds: int = CACHE_TTL_SECONDS) -> None:
-        self._cache: dict[str, tuple[dict[str, Any], float]] = {}
+    def __init__(
+        self,
+        ttl_seconds: int = CACHE_TTL_SECONDS,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES,
+    ) -> None:
+        # LRU order: least recently used first
+        self._cache: OrderedDict[CacheKey, tuple[dict[str, Any], float, int]] = OrderedDict()
+        # Expiry order: entries expire in write order since the TTL is fixed
+        self._expiry: OrderedDict[CacheKey, float] = OrderedDict()
+        self._by_user: dict[str, set[str]] = {}
+        self._by_user_app: dict[tuple[str, str], set[CacheKey]] = {}
         self._ttl_seconds = ttl_seconds
-
-    def _make_key(self, user_id: str, application_id: str, environment: str) -> str:
-        """Create a cache key from the resolution parameters."""
-        return f"{user_id}:{application_id}:{environment}"
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._lock = threading.Lock()
 
     def get(self, user_id: str, application_id: str, environment: str) -> dict[str, Any] | None:
         """Get cached permissions if not expired."""
-        key = self._make_key(user_id, application_id, environment)
-        if key in self._cache:
-            data, timestamp = self._cache[key]
-            if time.time() - timestamp < self._ttl_seconds:
-                logger.debug(f"Cache hit for {key}")
-                return data
-            else:
-                # Expired - remove from cache
-                del self._cache[key]
+        key = (user_id, application_id, environment)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            data, expires_at, _ = entry
+            if time.time() >= expires_at:
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
                 logger.debug(f"Cache expired for {key}")
-        return None
+                return None
+
+            self._cache.move_to_end(key)
+            self._hits += 1
+            logger.debug(f"Cache hit for {key}")
+            return data
 
     def set(
         self,
@@ -75,8 +126,28 @@ class PermissionCache:
         data: dict[str, Any],
     ) -> None:
         """Cache resolved permissions."""
-        key = self._make_key(user_id, application_id, environment)
-        self._cache[key] = (data, time.time())
+        key = (user_id, application_id, environment)
+        size = len(json.dumps(data, default=str))
+
+        now = time.time()
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+            # Too large to cache: the entry it replaces is stale either way
+            if size > self._max_bytes or self._max_entries < 1:
+                return
+            self._sweep_expired(now)
+
+            self._cache[key] = (data, now + self._ttl_seconds, size)
+            self._expiry[key] = now + self._ttl_seconds
+            self._bytes += size
+            self._by_user.setdefault(user_id, set()).add(application_id)
+            self._by_user_app.setdefault((user_id, application_id), set()).add(key)
+
+            while len(self._cache) > self._max_entries or self._bytes > self._max_bytes:
+                oldest = next(iter(self._cache))
+                self._remove(oldest)
+                self._evictions += 1
         logger.debug(f"Cached permissions for {key}")
 
     def invalidate(self, user_id: str, application_id: str) -> None:
@@ -84,28 +155,79 @@ class PermissionCache:
 
         Called when roles or group memberships change.
         """
-        prefix = f"{user_id}:{application_id}:"
-        keys_to_remove = [k for k in self._cache if k.startswith(prefix)]
-        for key in keys_to_remove:
-            del self._cache[key]
-        if keys_to_remove:
-            logger.info(f"Invalidated {len(keys_to_remove)} cache entries for {prefix}")
+        with self._lock:
+            count = self._invalidate_user_app(user_id, application_id)
+        if count:
+            logger.info(f"Invalidated {count} cache entries for {user_id}:{application_id}")
 
     def invalidate_all_for_user(self, user_id: str) -> None:
         """Invalidate all cached permissions for a user across all applications."""
-        prefix = f"{user_id}:"
-        keys_to_remove = [k for k in self._cache if k.startswith(prefix)]
-        for key in keys_to_remove:
-            del self._cache[key]
-        if keys_to_remove:
-            logger.info(f"Invalidated {len(keys_to_remove)} cache entries for user {user_id}")
+        with self._lock:
+            count = 0
+            for application_id in list(self._by_user.get(user_id, ())):
+                count += self._invalidate_user_app(user_id, application_id)
+        if count:
+            logger.info(f"Invalidated {count} cache entries for user {user_id}")
 
     def clear(self) -> None:
         """Clear all cached permissions."""
-        count = len(self._cache)
-        self._cache.clear()
+        with self._lock:
+            count = len(self._cache)
+            self._cache.clear()
+            self._expiry.clear()
+            self._by_user.clear()
+            self._by_user_app.clear()
+            self._bytes = 0
         logger.info(f"Cleared {count} cache entries")
 
+    def stats(self) -> dict[str, int]:
+        """Return cache size and hit/miss/eviction counters for metrics."""
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+    def _invalidate_user_app(self, user_id: str, application_id: str) -> int:
+        """Remove every entry for a (user, application) pair. Caller holds the lock."""
+        keys = list(self._by_user_app.get((user_id, application_id), ()))
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def _sweep_expired(self, now: float) -> None:
+        """Drop expired entries from the oldest end. Caller holds the lock."""
+        while self._expiry:
+            key, expires_at = next(iter(self._expiry.items()))
+            if expires_at > now:
+                break
+            self._remove(key)
+            self._expirations += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        """Remove an entry and its index references. Caller holds the lock."""
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return
+        self._expiry.pop(key, None)
+        self._bytes -= entry[2]
+
+        user_id, application_id, _ = key
+        user_app_keys = self._by_user_app.get((user_id, application_id))
+        if user_app_keys is not None:
+            user_app_keys.discard(key)
+            if not user_app_keys:
+                del self._by_user_app[(user_id, application_id)]
+                applications = self._by_user.get(user_id)
+                if applications is not None:
+                    applications.discard(application_id)
+                    if not applications:
+                        del self._by_user[user_id]
+
 
 # Global cache instance (persists across Lambda invocations within same instance)
 _permission_cache = PermissionCache()
@@ -117,7 +239,8 @@ class PermissionResolutionService:
     Resolution algorithm:
     1. Collect direct ApplicationUserRole assignments for the user
     2. Collect user's group memberships (ApplicationGroupUser)
-    3. For each group, collect ApplicationGroupRole assignments
+    3. For each group, collect ApplicationGroupRole assignments (groups are
+       loaded with BatchGetItem and their roles queried concurrently)
     4. Merge all permissions (union)
     5. Direct roles take priority over group roles on conflict
 
@@ -313,7 +436,8 @@ class PermissionResolutionService:
         Queries ApplicationUserRoles table for ACTIVE assignments.
         """
         try:
-            response = self.user_roles_table.query(
+            items = self._query_all(
+                self.user_roles_table,
                 IndexName="UserEnvRoleIndex",
                 KeyConditionExpression=Key("userId").eq(user_id)
                 & Key("environment").eq(environment),
@@ -322,7 +446,7 @@ class PermissionResolutionService:
             )
 
             roles = []
-            for item in response.get("Items", []):
+            for item in items:
                 roles.append(
                     {
                         "applicationUserRoleId": item.get("applicationUserRoleId"),
@@ -345,83 +469,139 @@ class PermissionResolutionService:
     def _get_user_groups(self, user_id: str, application_id: str) -> list[dict[str, Any]]:
         """Get all active group memberships for a user in an application.
 
-        Queries ApplicationGroupUsers table and filters by application.
+        Queries ApplicationGroupUsers table for the user's memberships in the
+        application, then loads the groups with BatchGetItem.
         """
         try:
-            # Get all group memberships for this user
-            response = self.group_users_table.query(
+            # Get all group memberships for this user in this application
+            memberships = self._query_all(
+                self.group_users_table,
                 IndexName="UserGroupsIndex",
                 KeyConditionExpression=Key("userId").eq(user_id),
-                FilterExpression=Attr("status").eq("ACTIVE"),
+                FilterExpression=Attr("status").eq("ACTIVE")
+                & Attr("applicationId").eq(application_id),
             )
 
+            group_ids = [item.get("applicationGroupId") for item in memberships]
+            groups_by_id = self._get_groups([group_id for group_id in group_ids if group_id])
+
             groups = []
-            for item in response.get("Items", []):
-                # Filter by application (membership has applicationId)
-                if item.get("applicationId") == application_id:
-                    group_id = item.get("applicationGroupId")
-                    # Get group details
-                    group = self._get_group(group_id)
-                    if group and group.get("status") == "ACTIVE":
-                        groups.append(
-                            {
-                                "applicationGroupId": group_id,
-                                "groupName": group.get("name", ""),
-                                "membershipId": item.get("applicationGroupUserId"),
-                            }
-                        )
+            for item in memberships:
+                group_id = item.get("applicationGroupId")
+                group = groups_by_id.get(group_id)
+                if group and group.get("status") == "ACTIVE":
+                    groups.append(
+                        {
+                            "applicationGroupId": group_id,
+                            "groupName": group.get("name", ""),
+                            "membershipId": item.get("applicationGroupUserId"),
+                        }
+                    )
 
             # Sort by groupId for deterministic ordering (Property 4)
             groups.sort(key=lambda x: x.get("applicationGroupId", ""))
 
             return groups
 
+        except GroupLookupError:
+            # A partial group list must fail the resolution, not be cached
+            raise
         except Exception as e:
             logger.error(f"Error getting user groups: {e}")
             return []
 
-    def _get_group(self, group_id: str) -> dict[str, Any] | None:
-        """Get a group by ID."""
-        try:
-            response = self.groups_table.get_item(Key={"applicationGroupId": group_id})
-            return response.get("Item")
-        except Exception as e:
-            logger.error(f"Error getting group {group_id}: {e}")
-            return None
+    def _get_groups(self, group_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Get groups by ID with BatchGetItem.
+
+        Keys are deduplicated and sent in chunks of 100. UnprocessedKeys are
+        retried with jittered exponential backoff.
+
+        Returns:
+            Dict mapping applicationGroupId to group item
+
+        Raises:
+            GroupLookupError: If groups are still unprocessed after the last retry
+        """
+        unique_ids = sorted(set(group_ids))
+        if not unique_ids:
+            return {}
+
+        table_name = self.groups_table.name
+        groups: dict[str, dict[str, Any]] = {}
+
+        for i in range(0, len(unique_ids), BATCH_GET_CHUNK_SIZE):
+            request_items: dict[str, Any] = {
+                table_name: {
+                    "Keys": [
+                        {"applicationGroupId": group_id}
+                        for group_id in unique_ids[i : i + BATCH_GET_CHUNK_SIZE]
+                    ]
+                }
+            }
+
+            for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+                if attempt:
+                    time.sleep(random.uniform(0, min(1.0, 0.05 * 2 ** (attempt - 1))))
+
+                response = self.dynamodb.batch_get_item(RequestItems=request_items)
+                for item in response.get("Responses", {}).get(table_name, []):
+                    groups[item["applicationGroupId"]] = item
+
+                request_items = response.get("UnprocessedKeys") or {}
+                if not request_items:
+                    break
+            else:
+                unprocessed = len(request_items.get(table_name, {}).get("Keys", []))
+                raise GroupLookupError(f"Could not load {unprocessed} groups after retries")
+
+        return groups
 
     def _get_group_roles(
         self, user_groups: list[dict[str, Any]], environment: str
     ) -> list[dict[str, Any]]:
         """Get role assignments for all groups in a specific environment.
 
-        For each group the user belongs to, get the role assignment for the environment.
+        For each group the user belongs to, get the role assignments for the
+        environment. Groups are queried concurrently.
+
+        Raises:
+            GroupLookupError: If any group's role assignments cannot be queried
         """
-        try:
-            group_roles = []
 
-            for group in user_groups:
-                group_id = group.get("applicationGroupId")
+        def query_group(group: dict[str, Any]) -> list[dict[str, Any]]:
+            group_id = group.get("applicationGroupId")
 
-                # Query role assignment for this group in this environment
-                response = self.group_roles_table.query(
-                    IndexName="GroupEnvRoleIndex",
-                    KeyConditionExpression=Key("applicationGroupId").eq(group_id)
-                    & Key("environment").eq(environment),
-                    FilterExpression=Attr("status").eq("ACTIVE"),
-                )
+            # Query role assignments for this group in this environment
+            items = self._query_all(
+                self.group_roles_table,
+                IndexName="GroupEnvRoleIndex",
+                KeyConditionExpression=Key("applicationGroupId").eq(group_id)
+                & Key("environment").eq(environment),
+                FilterExpression=Attr("status").eq("ACTIVE"),
+            )
 
-                for item in response.get("Items", []):
-                    group_roles.append(
-                        {
-                            "applicationGroupRoleId": item.get("applicationGroupRoleId"),
-                            "applicationGroupId": group_id,
-                            "groupName": group.get("groupName", ""),
-                            "roleId": item.get("roleId"),
-                            "roleName": item.get("roleName", ""),
-                            "permissions": item.get("permissions", []),
-                            "source": "group",
-                        }
-                    )
+            return [
+                {
+                    "applicationGroupRoleId": item.get("applicationGroupRoleId"),
+                    "applicationGroupId": group_id,
+                    "groupName": group.get("groupName", ""),
+                    "roleId": item.get("roleId"),
+                    "roleName": item.get("roleName", ""),
+                    "permissions": item.get("permissions", []),
+                    "source": "group",
+                }
+                for item in items
+            ]
+
+        try:
+            if len(user_groups) > 1 and GROUP_QUERY_CONCURRENCY > 1:
+                workers = min(GROUP_QUERY_CONCURRENCY, len(user_groups))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(query_group, user_groups))
+            else:
+                results = [query_group(group) for group in user_groups]
+
+            group_roles = [role for roles in results for role in roles]
 
             # Sort by groupId then roleId for deterministic ordering (Property 4)
             group_roles.sort(key=lambda x: (x.get("applicationGroupId", ""), x.get("roleId", "")))
@@ -429,8 +609,18 @@ class PermissionResolutionService:
             return group_roles
 
         except Exception as e:
+            # A partial role list must fail the resolution, not be cached
             logger.error(f"Error getting group roles: {e}")
-            return []
+            raise GroupLookupError(f"Could not load group role assignments: {e}") from e
+
+    def _query_all(self, table: Any, **kwargs: Any) -> list[dict[str, Any]]:
+        """Run a query and follow LastEvaluatedKey until all pages are read."""
+        response = table.query(**kwargs)
+        items = list(response.get("Items", []))
+        while "LastEvaluatedKey" in response:
+            response = table.query(ExclusiveStartKey=response["LastEvaluatedKey"], **kwargs)
+            items.extend(response.get("Items", []))
+        return items
 
     def _merge_permissions(
         self,
@@ -532,7 +722,9 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
 
         handler = handlers.get(field_name)
         if handler:
-            return handler(event)
+            response = handler(event)
+            logger.info(f"Permission cache stats: {json.dumps(_permission_cache.stats())}")
+            return response
 
         return {
             "code": 400,
@@ -5,11 +5,17 @@
 
 import json
 import logging
+import os
+import tempfile
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from decimal import Decimal
+from typing import Dict, Any, Iterator, List, Optional
 
 import boto3
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError, HTTPClientError
+from botocore.exceptions import ConnectionError as BotocoreConnectionError
 
 # Import from organization security layer
 import sys
@@ -19,27 +25,130 @@ from privacy_rights_manager import (
     PrivacyRequestType,
     PrivacyRequestStatus,
     LegalBasis,
-    discover_personal_data,
-    execute_privacy_data_deletion,
+    DataDiscoveryEngine,
+    DeletionProgress,
+    PersonalDataRecord,
+    PortableDataExporter,
+    PrivacyDeletionEngine,
+    json_default,
 )
 from context_middleware import organization_context_required
 from aws_audit_logger import (
     AuditEventType,
     ComplianceFlag,
+    flush_audit_log,
     log_organization_audit_event,
 )
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Direct invocations with this type continue processing a privacy request
+PROCESS_REQUEST_EVENT_TYPE = "PROCESS_PRIVACY_REQUEST"
+
+# Scheduled invocations with this type re-drive requests whose processing
+# stopped (an invocation that died mid-request)
+RESUME_STALE_REQUESTS_EVENT_TYPE = "RESUME_STALE_PRIVACY_REQUESTS"
+
+# A RECEIVED or PROCESSING request untouched for this long is re-driven. Every
+# checkpoint refreshes updatedAt, so this must exceed the Lambda timeout.
+STALE_REQUEST_MINUTES = int(os.environ.get("PRIVACY_STALE_REQUEST_MINUTES", "20"))
+
+# Errors that leave a request PROCESSING at its last checkpoint, for the stale
+# request sweep to re-drive, instead of failing it: throttling, transient
+# service errors and an oversized checkpoint item
+RETRYABLE_ERROR_CODES = {
+    "InternalError",
+    "InternalServerError",
+    "KMSInternalException",
+    "LimitExceededException",
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "RequestTimeout",
+    "ServiceUnavailable",
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "TransactionConflictException",
+}
+
+# A request that hits this many retryable errors is failed after all
+MAX_PROCESSING_RETRIES = int(os.environ.get("PRIVACY_MAX_PROCESSING_RETRIES", "10"))
+
+# Request types processed in checkpointed chunks
+CHUNKED_REQUEST_TYPES = {
+    PrivacyRequestType.DATA_ACCESS.value,
+    PrivacyRequestType.DATA_DELETION.value,
+    PrivacyRequestType.DATA_PORTABILITY.value,
+}
+
+# Stop and continue in a new invocation when less time than this remains
+CHECKPOINT_MIN_REMAINING_MS = int(os.environ.get("PRIVACY_CHECKPOINT_MIN_REMAINING_MS", "60000"))
+
+# Discovered records are staged in PrivacyRequests items of at most this many
+# bytes of JSON (items are limited to 400 KB)
+RECORD_PART_MAX_BYTES = 300_000
+
+# Staged-record items are keyed {requestId}{separator}{part number}. They carry
+# no requestType/dataSubjectEmail/organizationId/status, so they stay out of
+# every GSI.
+RECORD_PART_KEY_SEPARATOR = "#RECORDS#"
+
+# Access reports and portability exports are written as NDJSON to this bucket,
+# under {requestId}/, gzip-compressed unless PRIVACY_EXPORT_GZIP is "false".
+# Required: the bucket holds personal data, so there is no default.
+PRIVACY_EXPORT_BUCKET_NAME = os.environ.get("PRIVACY_EXPORT_BUCKET_NAME")
+PRIVACY_EXPORT_GZIP = os.environ.get("PRIVACY_EXPORT_GZIP", "true").lower() == "true"
+
+
+class CheckpointConflictError(Exception):
+    """Another invocation advanced the request's checkpoint first."""
+
+
+class ExportNotConfiguredError(Exception):
+    """The export bucket is not configured; retryable once it is deployed."""
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Whether processing that failed with error can resume from its checkpoint."""
+    if isinstance(error, (ExportNotConfiguredError, BotocoreConnectionError, HTTPClientError)):
+        return True
+    if not isinstance(error, ClientError):
+        return False
+    code = error.response.get("Error", {}).get("Code", "")
+    message = error.response.get("Error", {}).get("Message", "")
+    if code == "ValidationException":
+        # DynamoDB's 400 KB item size limit
+        return "item size" in message.lower()
+    return code in RETRYABLE_ERROR_CODES
+
+
+def continue_in_new_invocation(context, request_id: str) -> None:
+    """Checkpoint: re-invoke this function asynchronously to continue a request."""
+    boto3.client("lambda").invoke(
+        FunctionName=context.invoked_function_arn,
+        InvocationType="Event",
+        Payload=json.dumps({"type": PROCESS_REQUEST_EVENT_TYPE, "requestId": request_id}).encode(
+            "utf-8"
+        ),
+    )
+    logger.info(f"Checkpointed privacy request {request_id}; continuing asynchronously")
+
 
 class PrivacyRightsResolver:
     """Lambda resolver for GDPR/CCPA privacy rights requests."""
 
-    def __init__(self):
+    def __init__(self, context=None):
         self.dynamodb = boto3.resource("dynamodb")
         self.privacy_requests_table = self.dynamodb.Table("PrivacyRequests")
         self.ses_client = boto3.client("ses")
+        self.s3_client = boto3.client("s3")
+        self.discovery_engine = DataDiscoveryEngine()
+        self.deletion_engine = PrivacyDeletionEngine()
+        # Lambda context; None outside Lambda, where requests run to completion inline
+        self.context = context
+        # Set once a self-invoke fails; processing then continues in this invocation
+        self.continue_inline = False
 
     def submit_privacy_request(self, event: Dict[str, Any]) -> Dict[str, Any]:
         """Submit a new privacy rights request."""
@@ -137,13 +246,14 @@ class PrivacyRightsResolver:
                     f"AUDIT_LOGGING_FAILURE for privacy request {request_id}: {str(audit_error)}"
                 )
 
-            # Start automated processing based on request type
-            if request_type_enum == PrivacyRequestType.DATA_ACCESS:
-                self._process_data_access_request(request_id)
-            elif request_type_enum == PrivacyRequestType.DATA_DELETION:
-                self._process_data_deletion_request(request_id)
-            elif request_type_enum == PrivacyRequestType.DATA_PORTABILITY:
-                self._process_data_portability_request(request_id)
+            # Start automated processing based on request type. Processing
+            # runs in its own invocation so this call returns promptly, or
+            # inline if that invocation cannot be started.
+            if request_type_enum.value in CHUNKED_REQUEST_TYPES:
+                try:
+                    self._start_processing(request_id)
+                except Exception as e:
+                    logger.error(f"Failed to start processing privacy request {request_id}: {e}")
 
             # Send confirmation email
             self._send_request_confirmation(data_subject_email, request_id, deadline)
@@ -234,191 +344,533 @@ class PrivacyRightsResolver:
             logger.error(f"Error listing organization privacy requests: {str(e)}")
             return self._error_response(f"Internal error: {str(e)}")
 
-    def _process_data_access_request(self, request_id: str):
-        """Process data access request (GDPR Article 15)."""
+    def process_privacy_request(self, request_id: str) -> Dict[str, Any]:
+        """Drive a privacy request forward from its last checkpoint.
+
+        Discovery is planned as per-table work units, read a page at a time.
+        Each page is deleted (DATA_DELETION) or staged for the report or
+        export (DATA_ACCESS, DATA_PORTABILITY). After every page the
+        checkpoint is saved under processingState on the request item: the
+        current unit, its LastEvaluatedKey and running totals. When the
+        invocation runs low on time it re-invokes itself to continue, or
+        keeps going inline if that invoke fails; the request completes once
+        every unit is done.
+
+        A retryable error (see is_retryable_error) leaves the request at its
+        last checkpoint for the stale request sweep to re-drive, up to
+        MAX_PROCESSING_RETRIES times; any other error fails the request and
+        removes its staged records. If that removal fails, the request keeps
+        its processingState and the stale request sweep removes them.
+
+        Returns:
+            dict with 'requestId' and the request 'status' after this call
+        """
+        state: Optional[Dict[str, Any]] = None
         try:
-            # Get request details
             response = self.privacy_requests_table.get_item(Key={"requestId": request_id})
             if "Item" not in response:
-                return
+                return {"requestId": request_id, "status": "NOT_FOUND"}
 
             request_data = response["Item"]
+            if request_data["status"] not in (
+                PrivacyRequestStatus.RECEIVED.value,
+                PrivacyRequestStatus.PROCESSING.value,
+            ):
+                return {"requestId": request_id, "status": request_data["status"]}
+
+            state = request_data.get("processingState")
+            if state is None:
+                state = self._start_checkpoint(request_data)
+
+            while int(state["unitIndex"]) < len(state["units"]):
+                self._process_next_page(request_data, state)
+                self._save_checkpoint(request_id, state)
+
+                if int(state["unitIndex"]) < len(state["units"]) and self._should_checkpoint():
+                    try:
+                        continue_in_new_invocation(self.context, request_id)
+                        return {
+                            "requestId": request_id,
+                            "status": PrivacyRequestStatus.PROCESSING.value,
+                        }
+                    except Exception as e:
+                        # The checkpoint is saved, so a timeout from here on
+                        # leaves the request for the stale request sweep
+                        logger.error(
+                            f"Failed to continue privacy request {request_id}; "
+                            f"continuing inline: {e}"
+                        )
+                        self.continue_inline = True
+
+            self._complete_request(request_data, state)
+            return {"requestId": request_id, "status": PrivacyRequestStatus.COMPLETED.value}
+
+        except CheckpointConflictError:
+            logger.info(f"Privacy request {request_id} is being processed by another invocation")
+            return {"requestId": request_id, "status": PrivacyRequestStatus.PROCESSING.value}
 
-            # Update status to processing
-            self.privacy_requests_table.update_item(
-                Key={"requestId": request_id},
-                UpdateExpression="SET #status = :processing, updatedAt = :updated",
-                ExpressionAttributeNames={"#status": "status"},
-                ExpressionAttributeValues={
-                    ":processing": PrivacyRequestStatus.PROCESSING.value,
-                    ":updated": datetime.utcnow().isoformat(),
-                },
-            )
+        except Exception as e:
+            if is_retryable_error(e) and self._record_retry(request_id):
+                logger.warning(
+                    f"Retryable error processing privacy request {request_id}; "
+                    f"leaving it for the stale request sweep: {str(e)}"
+                )
+                return {"requestId": request_id, "status": PrivacyRequestStatus.PROCESSING.value}
 
-            # Discover personal data
-            discovery_result = discover_personal_data(
-                request_data["dataSubjectEmail"], request_data.get("organizationId")
+            logger.error(f"Error processing privacy request {request_id}: {str(e)}")
+            self._update_request_status(request_id, PrivacyRequestStatus.FAILED, str(e))
+            if state is not None:
+                # FAILED is terminal, so nothing would read the staged records again
+                try:
+                    self._delete_staged_records(request_id, int(state["partCount"]))
+                    self._clear_processing_state(request_id)
+                except Exception as cleanup_error:
+                    logger.error(
+                        f"Failed to delete staged records of privacy request {request_id}: "
+                        f"{str(cleanup_error)}"
+                    )
+            return {"requestId": request_id, "status": PrivacyRequestStatus.FAILED.value}
+
+    def resume_stale_privacy_requests(self) -> Dict[str, Any]:
+        """Re-drive RECEIVED and PROCESSING requests that stopped making progress.
+
+        Queries StatusIndex for each status and resumes every chunked request
+        whose updatedAt is older than STALE_REQUEST_MINUTES. The checkpoint's
+        sequence condition keeps a re-driven request from being processed
+        twice. Then removes the staged records left behind by failed
+        requests (see _clean_up_failed_requests). Meant to run on a schedule.
+
+        Returns:
+            dict with the IDs of the 'resumed' requests
+        """
+        cutoff = (datetime.utcnow() - timedelta(minutes=STALE_REQUEST_MINUTES)).isoformat()
+        resumed: List[str] = []
+
+        for status in (PrivacyRequestStatus.RECEIVED, PrivacyRequestStatus.PROCESSING):
+            query_kwargs: Dict[str, Any] = {
+                "IndexName": "StatusIndex",
+                "KeyConditionExpression": Key("status").eq(status.value),
+                "FilterExpression": Attr("updatedAt").lt(cutoff)
+                & Attr("requestType").is_in(sorted(CHUNKED_REQUEST_TYPES)),
+                "ProjectionExpression": "requestId",
+            }
+            while True:
+                response = self.privacy_requests_table.query(**query_kwargs)
+                for item in response.get("Items", []):
+                    try:
+                        self._start_processing(item["requestId"])
+                        resumed.append(item["requestId"])
+                    except Exception as e:
+                        logger.error(f"Failed to resume privacy request {item['requestId']}: {e}")
+                if "LastEvaluatedKey" not in response:
+                    break
+                query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+        if resumed:
+            logger.warning(f"Resumed {len(resumed)} stale privacy requests: {resumed}")
+        self._clean_up_failed_requests(cutoff)
+        return {"resumed": resumed}
+
+    def _clean_up_failed_requests(self, cutoff: str):
+        """Remove staged records of FAILED requests that still hold a checkpoint.
+
+        A failed request keeps its processingState until its staged records
+        are deleted, so any FAILED request with one may still have them.
+        COMPLETED requests need no cleanup: their staged records are deleted
+        before processingState is removed with the status change.
+        """
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": "StatusIndex",
+            "KeyConditionExpression": Key("status").eq(PrivacyRequestStatus.FAILED.value),
+            "FilterExpression": Attr("updatedAt").lt(cutoff) & Attr("processingState").exists(),
+            "ProjectionExpression": "requestId, processingState.partCount",
+        }
+        while True:
+            response = self.privacy_requests_table.query(**query_kwargs)
+            for item in response.get("Items", []):
+                request_id = item["requestId"]
+                try:
+                    part_count = int(item["processingState"].get("partCount", 0))
+                    self._delete_staged_records(request_id, part_count)
+                    self._clear_processing_state(request_id)
+                    logger.info(f"Removed staged records of failed privacy request {request_id}")
+                except Exception as e:
+                    logger.error(
+                        f"Failed to remove staged records of privacy request {request_id}: {e}"
+                    )
+            if "LastEvaluatedKey" not in response:
+                break
+            query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def _start_processing(self, request_id: str):
+        """Hand a request to the checkpointed driver, inline if it cannot be invoked."""
+        if self.context is not None and not self.continue_inline:
+            try:
+                continue_in_new_invocation(self.context, request_id)
+                return
+            except Exception as e:
+                logger.error(
+                    f"Failed to invoke processing of privacy request {request_id}; "
+                    f"processing inline: {e}"
+                )
+                self.continue_inline = True
+        self.process_privacy_request(request_id)
+
+    def _should_checkpoint(self) -> bool:
+        """Whether this invocation should stop and continue in a new one."""
+        return (
+            self.context is not None
+            and not self.continue_inline
+            and self.context.get_remaining_time_in_millis() < CHECKPOINT_MIN_REMAINING_MS
+        )
+
+    def _start_checkpoint(self, request_data: Dict) -> Dict[str, Any]:
+        """Plan the request's work units and store the initial checkpoint."""
+        plan = self.discovery_engine.plan_discovery(request_data["dataSubjectEmail"])
+        state: Dict[str, Any] = {
+            "sequence": 0,
+            "userId": plan["userId"],
+            "units": plan["units"],
+            "unitIndex": 0,
+            "lastEvaluatedKey": None,
+            "recordsFound": 0,
+            "partCount": 0,
+        }
+        if request_data["requestType"] == PrivacyRequestType.DATA_DELETION.value:
+            state["deletionId"] = self.deletion_engine.new_deletion_id(
+                request_data["dataSubjectEmail"]
             )
+            state["deletion"] = DeletionProgress().to_state()
 
-            # Generate data access report
-            access_report = self._generate_data_access_report(discovery_result, request_data)
-
-            # Update request with completion
+        try:
             self.privacy_requests_table.update_item(
-                Key={"requestId": request_id},
-                UpdateExpression="SET #status = :completed, completedAt = :completed_at, accessReport = :report, updatedAt = :updated",
+                Key={"requestId": request_data["requestId"]},
+                UpdateExpression="SET #status = :processing, processingState = :state, updatedAt = :updated",
+                ConditionExpression="attribute_not_exists(processingState)",
                 ExpressionAttributeNames={"#status": "status"},
                 ExpressionAttributeValues={
-                    ":completed": PrivacyRequestStatus.COMPLETED.value,
-                    ":completed_at": datetime.utcnow().isoformat(),
-                    ":report": access_report,
+                    ":processing": PrivacyRequestStatus.PROCESSING.value,
+                    ":state": state,
                     ":updated": datetime.utcnow().isoformat(),
                 },
             )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise CheckpointConflictError(request_data["requestId"]) from e
+            raise
+
+        logger.info(
+            f"Planned {len(state['units'])} discovery units for privacy request "
+            f"{request_data['requestId']}"
+        )
+        return state
+
+    def _process_next_page(self, request_data: Dict, state: Dict[str, Any]):
+        """Read the next page of the current unit and act on its records."""
+        unit = state["units"][int(state["unitIndex"])]
+        records, last_evaluated_key = self.discovery_engine.discover_page(
+            unit, state["lastEvaluatedKey"]
+        )
+
+        if request_data["requestType"] == PrivacyRequestType.DATA_DELETION.value:
+            progress = DeletionProgress.from_state(state["deletion"])
+            self.deletion_engine.delete_records(records, progress)
+            state["deletion"] = progress.to_state()
+        else:
+            state["partCount"] = int(state["partCount"]) + self._stage_records(
+                request_data["requestId"], int(state["partCount"]), records
+            )
 
-            # Send completion email with report
-            self._send_data_access_completion(request_data["dataSubjectEmail"], access_report)
-
-            # Log completion audit event
-            self._log_privacy_request_completion(request_id, "DATA_ACCESS")
-
-        except Exception as e:
-            logger.error(f"Error processing data access request {request_id}: {str(e)}")
-            self._update_request_status(request_id, PrivacyRequestStatus.FAILED, str(e))
+        state["recordsFound"] = int(state["recordsFound"]) + len(records)
+        state["lastEvaluatedKey"] = last_evaluated_key
+        if last_evaluated_key is None:
+            state["unitIndex"] = int(state["unitIndex"]) + 1
 
-    def _process_data_deletion_request(self, request_id: str):
-        """Process data deletion request (GDPR Article 17)."""
+    def _save_checkpoint(self, request_id: str, state: Dict[str, Any]):
+        """Store the checkpoint, failing if another invocation stored one first."""
+        expected_sequence = int(state["sequence"])
+        state["sequence"] = expected_sequence + 1
         try:
-            # Get request details
-            response = self.privacy_requests_table.get_item(Key={"requestId": request_id})
-            if "Item" not in response:
-                return
-
-            request_data = response["Item"]
-
-            # Update status to processing
             self.privacy_requests_table.update_item(
                 Key={"requestId": request_id},
-                UpdateExpression="SET #status = :processing, updatedAt = :updated",
-                ExpressionAttributeNames={"#status": "status"},
+                UpdateExpression="SET processingState = :state, updatedAt = :updated",
+                ConditionExpression="processingState.#sequence = :expected",
+                ExpressionAttributeNames={"#sequence": "sequence"},
                 ExpressionAttributeValues={
-                    ":processing": PrivacyRequestStatus.PROCESSING.value,
+                    ":state": state,
+                    ":expected": expected_sequence,
                     ":updated": datetime.utcnow().isoformat(),
                 },
             )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise CheckpointConflictError(request_id) from e
+            raise
 
-            # Execute data deletion
-            deletion_result = execute_privacy_data_deletion(
-                request_data["dataSubjectEmail"], request_data.get("organizationId")
-            )
+    def _record_retry(self, request_id: str) -> bool:
+        """Count a retryable error; returns whether the request may be retried.
 
-            # Update request with deletion results
-            self.privacy_requests_table.update_item(
+        Also refreshes updatedAt, so the stale request sweep waits
+        STALE_REQUEST_MINUTES before re-driving the request.
+        """
+        try:
+            response = self.privacy_requests_table.update_item(
                 Key={"requestId": request_id},
-                UpdateExpression="SET #status = :completed, completedAt = :completed_at, deletionResult = :result, updatedAt = :updated",
-                ExpressionAttributeNames={"#status": "status"},
+                UpdateExpression="ADD processingRetries :one SET updatedAt = :updated",
                 ExpressionAttributeValues={
-                    ":completed": PrivacyRequestStatus.COMPLETED.value,
-                    ":completed_at": datetime.utcnow().isoformat(),
-                    ":result": deletion_result,
+                    ":one": 1,
                     ":updated": datetime.utcnow().isoformat(),
                 },
+                ReturnValues="UPDATED_NEW",
             )
-
-            # Send deletion confirmation
-            self._send_data_deletion_completion(request_data["dataSubjectEmail"], deletion_result)
-
-            # Log completion audit event
-            self._log_privacy_request_completion(request_id, "DATA_DELETION")
-
         except Exception as e:
-            logger.error(f"Error processing data deletion request {request_id}: {str(e)}")
-            self._update_request_status(request_id, PrivacyRequestStatus.FAILED, str(e))
-
-    def _process_data_portability_request(self, request_id: str):
-        """Process data portability request (GDPR Article 20)."""
-        try:
-            # Get request details
-            response = self.privacy_requests_table.get_item(Key={"requestId": request_id})
-            if "Item" not in response:
-                return
-
-            request_data = response["Item"]
+            # Left as it is, the request is still re-driven once it goes stale
+            logger.error(f"Failed to record retry of privacy request {request_id}: {str(e)}")
+            return True
+        return int(response["Attributes"]["processingRetries"]) <= MAX_PROCESSING_RETRIES
+
+    def _stage_records(
+        self, request_id: str, first_part: int, records: List[PersonalDataRecord]
+    ) -> int:
+        """Store records in staged-record items; returns the number of parts written."""
+        parts_written = 0
+        encoded_records: List[str] = []
+        encoded_size = 0
+
+        def write_part():
+            self.privacy_requests_table.put_item(
+                Item={
+                    "requestId": f"{request_id}{RECORD_PART_KEY_SEPARATOR}{first_part + parts_written:06d}",
+                    "records": "[" + ",".join(encoded_records) + "]",
+                }
+            )
 
-            # Update status to processing
-            self.privacy_requests_table.update_item(
-                Key={"requestId": request_id},
-                UpdateExpression="SET #status = :processing, updatedAt = :updated",
-                ExpressionAttributeNames={"#status": "status"},
-                ExpressionAttributeValues={
-                    ":processing": PrivacyRequestStatus.PROCESSING.value,
-                    ":updated": datetime.utcnow().isoformat(),
-                },
+        for record in records:
+            encoded = json.dumps(record.to_dict(), default=json_default)
+            if encoded_records and encoded_size + len(encoded) > RECORD_PART_MAX_BYTES:
+                write_part()
+                parts_written += 1
+                encoded_records, encoded_size = [], 0
+            encoded_records.append(encoded)
+            encoded_size += len(encoded) + 1
+
+        if encoded_records:
+            write_part()
+            parts_written += 1
+
+        return parts_written
+
+    def _load_staged_records(
+        self, request_id: str, part_count: int
+    ) -> Iterator[PersonalDataRecord]:
+        """Read staged records back, one part at a time."""
+        for part in range(part_count):
+            response = self.privacy_requests_table.get_item(
+                Key={"requestId": f"{request_id}{RECORD_PART_KEY_SEPARATOR}{part:06d}"},
+                ConsistentRead=True,
             )
+            for data in json.loads(response["Item"]["records"], parse_float=Decimal):
+                yield PersonalDataRecord.from_dict(data)
+
+    def _delete_staged_records(self, request_id: str, part_count: int):
+        """Remove a request's staged-record items."""
+        with self.privacy_requests_table.batch_writer() as batch:
+            for part in range(part_count):
+                batch.delete_item(
+                    Key={"requestId": f"{request_id}{RECORD_PART_KEY_SEPARATOR}{part:06d}"}
+                )
 
-            # Discover personal data
-            discovery_result = discover_personal_data(
-                request_data["dataSubjectEmail"], request_data.get("organizationId")
+    def _clear_processing_state(self, request_id: str):
+        """Drop a failed request's checkpoint once its staged records are gone."""
+        self.privacy_requests_table.update_item(
+            Key={"requestId": request_id},
+            UpdateExpression="REMOVE processingState",
+        )
+
+    def _complete_request(self, request_data: Dict, state: Dict[str, Any]):
+        """Finish a request once every discovery unit has been processed."""
+        request_id = request_data["requestId"]
+        request_type = request_data["requestType"]
+
+        if request_type == PrivacyRequestType.DATA_DELETION.value:
+            deletion_result = self.deletion_engine.complete_deletion(
+                state["deletionId"],
+                request_data["dataSubjectEmail"],
+                int(state["recordsFound"]),
+                DeletionProgress.from_state(state["deletion"]),
+            )
+            self._complete_data_deletion_request(request_data, deletion_result)
+            return
+
+        # The export is checkpointed before the staged records are removed,
+        # so a resumed request completes without reading them again
+        part_count = int(state["partCount"])
+        export = state.get("export")
+        if export is None:
+            export = self._export_staged_records(request_data, part_count)
+            state["export"] = export
+            self._save_checkpoint(request_id, state)
+
+        self._delete_staged_records(request_id, part_count)
+
+        if request_type == PrivacyRequestType.DATA_ACCESS.value:
+            self._complete_data_access_request(request_data, export)
+        else:
+            self._complete_data_portability_request(request_data, export)
+
+    def _export_staged_records(self, request_data: Dict, part_count: int) -> Dict[str, Any]:
+        """Stream a request's staged records to an NDJSON export in S3.
+
+        Records are read back a part at a time and written through the
+        exporter to a temporary file, which is uploaded with its manifest.
+        Memory use is bounded by one staged part whatever the export size.
+
+        Returns:
+            dict with the export's 'bucket', 'key', 'manifestKey' and 'manifest'
+        """
+        request_id = request_data["requestId"]
+        if not PRIVACY_EXPORT_BUCKET_NAME:
+            logger.error("PRIVACY_EXPORT_BUCKET_NAME environment variable not set")
+            raise ExportNotConfiguredError("Privacy export bucket not configured")
+
+        extension = ".ndjson.gz" if PRIVACY_EXPORT_GZIP else ".ndjson"
+        key = f"{request_id}/records{extension}"
+        manifest_key = f"{request_id}/manifest.json"
+
+        with tempfile.TemporaryFile() as sink:
+            exporter = PortableDataExporter(sink, compress=PRIVACY_EXPORT_GZIP)
+            exporter.write_records(self._load_staged_records(request_id, part_count))
+            manifest = exporter.close()
+
+            sink.seek(0)
+            self.s3_client.upload_fileobj(
+                sink,
+                PRIVACY_EXPORT_BUCKET_NAME,
+                key,
+                ExtraArgs={"ContentType": PortableDataExporter.CONTENT_TYPE},
             )
 
-            # Generate portable data export
-            portable_data = self._generate_portable_data_export(discovery_result, request_data)
+        self.s3_client.put_object(
+            Bucket=PRIVACY_EXPORT_BUCKET_NAME,
+            Key=manifest_key,
+            Body=json.dumps(manifest, sort_keys=True).encode("utf-8"),
+            ContentType="application/json",
+        )
+
+        logger.info(
+            f"Exported {manifest['total_records']} records for privacy request {request_id} "
+            f"to s3://{PRIVACY_EXPORT_BUCKET_NAME}/{key}"
+        )
+        return {
+            "bucket": PRIVACY_EXPORT_BUCKET_NAME,
+            "key": key,
+            "manifestKey": manifest_key,
+            "manifest": manifest,
+        }
 
-            # Update request with completion
-            self.privacy_requests_table.update_item(
-                Key={"requestId": request_id},
-                UpdateExpression="SET #status = :completed, completedAt = :completed_at, portableData = :data, updatedAt = :updated",
-                ExpressionAttributeNames={"#status": "status"},
-                ExpressionAttributeValues={
-                    ":completed": PrivacyRequestStatus.COMPLETED.value,
-                    ":completed_at": datetime.utcnow().isoformat(),
-                    ":data": portable_data,
-                    ":updated": datetime.utcnow().isoformat(),
-                },
-            )
+    def _complete_data_access_request(self, request_data: Dict, export: Dict[str, Any]):
+        """Complete data access request (GDPR Article 15)."""
+        request_id = request_data["requestId"]
+
+        # Generate data access report
+        access_report = self._generate_data_access_report(export, request_data)
+
+        # Update request with completion
+        self.privacy_requests_table.update_item(
+            Key={"requestId": request_id},
+            UpdateExpression="SET #status = :completed, completedAt = :completed_at, accessReport = :report, updatedAt = :updated REMOVE processingState",
+            ExpressionAttributeNames={"#status": "status"},
+            ExpressionAttributeValues={
+                ":completed": PrivacyRequestStatus.COMPLETED.value,
+                ":completed_at": datetime.utcnow().isoformat(),
+                ":report": access_report,
+                ":updated": datetime.utcnow().isoformat(),
+            },
+        )
+
+        # Send completion email with report
+        self._send_data_access_completion(request_data["dataSubjectEmail"], access_report)
+
+        # Log completion audit event
+        self._log_privacy_request_completion(request_id, "DATA_ACCESS")
+
+    def _complete_data_deletion_request(self, request_data: Dict, deletion_result: Dict):
+        """Complete data deletion request (GDPR Article 17)."""
+        request_id = request_data["requestId"]
+
+        # Update request with deletion results
+        self.privacy_requests_table.update_item(
+            Key={"requestId": request_id},
+            UpdateExpression="SET #status = :completed, completedAt = :completed_at, deletionResult = :result, updatedAt = :updated REMOVE processingState",
+            ExpressionAttributeNames={"#status": "status"},
+            ExpressionAttributeValues={
+                ":completed": PrivacyRequestStatus.COMPLETED.value,
+                ":completed_at": datetime.utcnow().isoformat(),
+                ":result": deletion_result,
+                ":updated": datetime.utcnow().isoformat(),
+            },
+        )
+
+        # Send deletion confirmation
+        self._send_data_deletion_completion(request_data["dataSubjectEmail"], deletion_result)
+
+        # Log completion audit event
+        self._log_privacy_request_completion(request_id, "DATA_DELETION")
+
+    def _complete_data_portability_request(self, request_data: Dict, export: Dict[str, Any]):
+        """Complete data portability request (GDPR Article 20)."""
+        request_id = request_data["requestId"]
+
+        # Generate portable data export
+        portable_data = self._generate_portable_data_export(export, request_data)
+
+        # Update request with completion
+        self.privacy_requests_table.update_item(
+            Key={"requestId": request_id},
+            UpdateExpression="SET #status = :completed, completedAt = :completed_at, portableData = :data, updatedAt = :updated REMOVE processingState",
+            ExpressionAttributeNames={"#status": "status"},
+            ExpressionAttributeValues={
+                ":completed": PrivacyRequestStatus.COMPLETED.value,
+                ":completed_at": datetime.utcnow().isoformat(),
+                ":data": portable_data,
+                ":updated": datetime.utcnow().isoformat(),
+            },
+        )
 
-            # Send completion email with download link
-            self._send_data_portability_completion(request_data["dataSubjectEmail"], portable_data)
+        # Send completion email with download link
+        self._send_data_portability_completion(request_data["dataSubjectEmail"], portable_data)
 
-            # Log completion audit event
-            self._log_privacy_request_completion(request_id, "DATA_PORTABILITY")
+        # Log completion audit event
+        self._log_privacy_request_completion(request_id, "DATA_PORTABILITY")
 
-        except Exception as e:
-            logger.error(f"Error processing data portability request {request_id}: {str(e)}")
-            self._update_request_status(request_id, PrivacyRequestStatus.FAILED, str(e))
+    def _generate_data_access_report(
+        self, export: Dict[str, Any], request_data: Dict
+    ) -> Dict[str, Any]:
+        """Generate data access report.
 
-    def _generate_data_access_report(self, discovery_result, request_data: Dict) -> Dict[str, Any]:
-        """Generate comprehensive data access report."""
+        The records themselves are in the NDJSON export; the report carries
+        the export's location and manifest (record counts and hashes per
+        table), which stay small however much data was found.
+        """
+        manifest = export["manifest"]
 
-        # Group records by data category
         records_by_category = {}
-        for record in discovery_result.records_found:
-            category = record.data_category.value
-            if category not in records_by_category:
-                records_by_category[category] = []
-            records_by_category[category].append(
-                {
-                    "system": record.system_name,
-                    "table": record.table_name,
-                    "data_fields": record.data_fields,
-                    "created_at": (record.created_at.isoformat() if record.created_at else None),
-                    "last_updated": (
-                        record.last_updated.isoformat() if record.last_updated else None
-                    ),
-                    "retention_policy": record.retention_policy,
-                    "legal_basis": record.legal_basis,
-                }
-            )
+        for table in manifest["tables"]:
+            for category in table["data_categories"]:
+                records_by_category.setdefault(category, []).append(table["table"])
 
         return {
             "report_id": f"access_report_{request_data['requestId']}",
             "data_subject_email": request_data["dataSubjectEmail"],
             "report_generated_at": datetime.utcnow().isoformat(),
             "legal_basis": request_data["legalBasis"],
-            "total_records_found": discovery_result.total_records,
-            "systems_scanned": discovery_result.systems_scanned,
-            "data_categories_found": [cat.value for cat in discovery_result.data_categories],
-            "records_by_category": records_by_category,
+            "total_records_found": manifest["total_records"],
+            "systems_scanned": list(self.discovery_engine.data_mappers),
+            "data_categories_found": sorted(records_by_category),
+            "tables_by_category": records_by_category,
+            "records_location": {"bucket": export["bucket"], "key": export["key"]},
+            "manifest_location": {"bucket": export["bucket"], "key": export["manifestKey"]},
+            "manifest": manifest,
             "privacy_rights_available": {
                 "right_to_rectification": "Contact support to update incorrect information",
                 "right_to_erasure": "Submit deletion request via privacy portal",
@@ -429,43 +881,24 @@ class PrivacyRightsResolver:
         }
 
     def _generate_portable_data_export(
-        self, discovery_result, request_data: Dict
+        self, export: Dict[str, Any], request_data: Dict
     ) -> Dict[str, Any]:
         """Generate machine-readable data export for portability."""
+        manifest = export["manifest"]
 
-        portable_data = {
+        return {
             "export_id": f"export_{request_data['requestId']}",
             "data_subject_email": request_data["dataSubjectEmail"],
             "export_generated_at": datetime.utcnow().isoformat(),
-            "format": "JSON",
+            "format": manifest["format"],
+            "compression": manifest["compression"],
             "legal_basis": request_data["legalBasis"],
-            "data_export": {},
+            "total_records": manifest["total_records"],
+            "records_location": {"bucket": export["bucket"], "key": export["key"]},
+            "manifest_location": {"bucket": export["bucket"], "key": export["manifestKey"]},
+            "manifest": manifest,
         }
 
-        # Organize data by system and table
-        for record in discovery_result.records_found:
-            system_key = f"{record.system_name}_{record.table_name}"
-            if system_key not in portable_data["data_export"]:
-                portable_data["data_export"][system_key] = []
-
-            portable_data["data_export"][system_key].append(
-                {
-                    "record_id": record.record_id,
-                    "data": record.data_fields,
-                    "metadata": {
-                        "created_at": (
-                            record.created_at.isoformat() if record.created_at else None
-                        ),
-                        "last_updated": (
-                            record.last_updated.isoformat() if record.last_updated else None
-                        ),
-                        "data_category": record.data_category.value,
-                    },
-                }
-            )
-
-        return portable_data
-
     def _calculate_response_deadline(self, legal_basis: LegalBasis) -> datetime:
         """Calculate response deadline based on legal framework."""
 
@@ -653,11 +1086,22 @@ class PrivacyRightsResolver:
 
 # Lambda handler
 def lambda_handler(event, context):
-    """Main Lambda handler for Privacy Rights operations."""
+    """Main Lambda handler for Privacy Rights operations.
+
+    Direct invocations with ``type == "PROCESS_PRIVACY_REQUEST"`` continue
+    processing ``requestId`` from its checkpoint instead of resolving a
+    GraphQL field. Scheduled invocations with
+    ``type == "RESUME_STALE_PRIVACY_REQUESTS"`` re-drive stalled requests.
+    """
     try:
         logger.info(f"Privacy rights resolver invoked with event: {json.dumps(event)}")
 
-        resolver = PrivacyRightsResolver()
+        resolver = PrivacyRightsResolver(context)
+
+        if event.get("type") == PROCESS_REQUEST_EVENT_TYPE:
+            return resolver.process_privacy_request(event["requestId"])
+        if event.get("type") == RESUME_STALE_REQUESTS_EVENT_TYPE:
+            return resolver.resume_stale_privacy_requests()
 
         # Extract operation type from event
         field_name = event.get("info", {}).get("fieldName")
@@ -678,3 +1122,6 @@ def lambda_handler(event, context):
     except Exception as e:
         logger.error(f"Unhandled error in Privacy Rights resolver: {str(e)}")
         return {"statusCode": 500, "body": {"error": "Internal server error"}}
+    finally:
+        # Audit events are buffered; ship them before the container freezes
+        flush_audit_log()
@@ -12,13 +12,17 @@ import hmac
 import json
 import logging
 import os
+import random
+import threading
 import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
 
 import boto3
+import urllib3  # ships with botocore
 
 # Configure logging
 logger = logging.getLogger()
@@ -28,10 +32,50 @@ logger.setLevel(os.environ.get("LOGGING_LEVEL", "INFO"))
 ENVIRONMENT_CONFIG_TABLE_NAME = os.environ.get("ENVIRONMENT_CONFIG_TABLE_NAME", "")
 METRICS_NAMESPACE = os.environ.get("METRICS_NAMESPACE", "Webhooks")
 
+# Delivery concurrency: records in flight per invocation, and per endpoint
+# host so one slow tenant cannot take every worker. Each host's records are
+# queued separately and drained by at most ENDPOINT_CONCURRENCY workers.
+DELIVERY_CONCURRENCY = int(os.environ.get("WEBHOOK_DELIVERY_CONCURRENCY", "10"))
+ENDPOINT_CONCURRENCY = int(os.environ.get("WEBHOOK_ENDPOINT_CONCURRENCY", "4"))
+DELIVERY_TIMEOUT_SECONDS = float(os.environ.get("WEBHOOK_TIMEOUT_SECONDS", "10"))
+
+# Time kept back from the Lambda deadline to report batch failures
+TIME_RESERVE_MS = int(os.environ.get("WEBHOOK_TIME_RESERVE_MS", "2000"))
+
+# Resolved webhook configs are reused for this long in a warm container;
+# environments without webhooks (disabled, no URL, no config) are
+# remembered for a shorter time
+CONFIG_CACHE_TTL_SECONDS = int(os.environ.get("WEBHOOK_CONFIG_CACHE_TTL_SECONDS", "60"))
+CONFIG_NEGATIVE_CACHE_TTL_SECONDS = int(
+    os.environ.get("WEBHOOK_CONFIG_NEGATIVE_CACHE_TTL_SECONDS", "30")
+)
+CONFIG_CACHE_MAX_ENTRIES = 1000
+
+# Metric datums per PutMetricData call, and distinct values per
+# distribution datum (the API allows at most 150)
+METRIC_DATA_PER_REQUEST = 100
+METRIC_VALUES_PER_DATUM = 150
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_CHUNK_SIZE = 100
+BATCH_GET_MAX_RETRIES = 5
+
 # AWS clients
 dynamodb = boto3.resource("dynamodb")
 cloudwatch = boto3.client("cloudwatch")
 
+# Keep-alive connection pools per endpoint host, reused across warm invocations
+http = urllib3.PoolManager(
+    num_pools=50,
+    maxsize=ENDPOINT_CONCURRENCY,
+    block=False,
+    retries=False,
+)
+
+# (applicationId, environment) -> (config or None, expires_at)
+_config_cache: dict[tuple[str, str], tuple[dict[str, Any] | None, float]] = {}
+_config_cache_lock = threading.Lock()
+
 
 def generate_signature(payload: str, secret: str) -> str:
     """Generate HMAC-SHA256 signature for webhook payload.
@@ -50,8 +94,126 @@ def generate_signature(payload: str, secret: str) -> str:
     ).hexdigest()
 
 
+def _resolve_webhook_config(
+    item: dict[str, Any] | None, application_id: str, environment: str
+) -> dict[str, Any] | None:
+    """Build the webhook config from an environment-config item.
+
+    Returns:
+        Webhook configuration dict or None if not found/disabled
+    """
+    if not item:
+        logger.warning(
+            f"No config found for app={application_id}, env={environment}"
+        )
+        return None
+
+    # Check if webhooks are enabled
+    if not item.get("webhookEnabled", False):
+        logger.info(
+            f"Webhooks disabled for app={application_id}, env={environment}"
+        )
+        return None
+
+    # Check if webhook URL is configured
+    webhook_url = item.get("webhookUrl")
+    if not webhook_url:
+        logger.warning(
+            f"No webhook URL for app={application_id}, env={environment}"
+        )
+        return None
+
+    return {
+        "url": webhook_url,
+        "secret": item.get("webhookSecret", ""),
+        "events": item.get("webhookEvents", []),
+        "maxRetries": item.get("webhookMaxRetries", 3),
+        "retryDelaySeconds": item.get("webhookRetryDelaySeconds", 60),
+    }
+
+
+def _cache_webhook_config(key: tuple[str, str], config: dict[str, Any] | None) -> None:
+    """Remember a resolved config (or its absence) for this container."""
+    ttl = CONFIG_CACHE_TTL_SECONDS if config else CONFIG_NEGATIVE_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return
+    now = time.time()
+    with _config_cache_lock:
+        _config_cache.pop(key, None)
+        _config_cache[key] = (config, now + ttl)
+        if len(_config_cache) > CONFIG_CACHE_MAX_ENTRIES:
+            for stale in [k for k, (_, expires_at) in _config_cache.items() if expires_at <= now]:
+                del _config_cache[stale]
+            while len(_config_cache) > CONFIG_CACHE_MAX_ENTRIES:
+                del _config_cache[next(iter(_config_cache))]
+
+
+def _cached_webhook_config(key: tuple[str, str]) -> tuple[bool, dict[str, Any] | None]:
+    """Look up a cached config. Returns (hit, config)."""
+    with _config_cache_lock:
+        entry = _config_cache.get(key)
+        if entry is None:
+            return False, None
+        if entry[1] <= time.time():
+            del _config_cache[key]
+            return False, None
+        return True, entry[0]
+
+
+def prefetch_webhook_configs(keys: list[tuple[str, str]]) -> None:
+    """Load configs for a batch of events with deduplicated BatchGetItem calls.
+
+    Configs already cached are skipped; the rest are fetched 100 keys per
+    request and cached (including negative results), so the per-event
+    get_webhook_config calls that follow are served from the cache.
+
+    Args:
+        keys: (applicationId, environment) pairs referenced by the batch
+    """
+    if not ENVIRONMENT_CONFIG_TABLE_NAME:
+        return
+
+    missing = [key for key in dict.fromkeys(keys) if not _cached_webhook_config(key)[0]]
+
+    for start in range(0, len(missing), BATCH_GET_CHUNK_SIZE):
+        chunk = missing[start : start + BATCH_GET_CHUNK_SIZE]
+        request_items: dict[str, Any] = {
+            ENVIRONMENT_CONFIG_TABLE_NAME: {
+                "Keys": [
+                    {"applicationId": application_id, "environment": environment}
+                    for application_id, environment in chunk
+                ]
+            }
+        }
+        items: dict[tuple[str, str], dict[str, Any]] = {}
+
+        try:
+            for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+                if attempt:
+                    time.sleep(random.uniform(0, min(2.0, 0.05 * 2**attempt)))
+                response = dynamodb.batch_get_item(RequestItems=request_items)
+                for item in response.get("Responses", {}).get(ENVIRONMENT_CONFIG_TABLE_NAME, []):
+                    items[(item["applicationId"], item["environment"])] = item
+                request_items = response.get("UnprocessedKeys") or {}
+                if not request_items:
+                    break
+        except Exception as e:
+            # get_webhook_config falls back to single reads
+            logger.warning(f"Error prefetching webhook configs: {e}")
+            continue
+
+        # Keys still unprocessed after retries are left uncached
+        unprocessed = {
+            (key["applicationId"], key["environment"])
+            for key in request_items.get(ENVIRONMENT_CONFIG_TABLE_NAME, {}).get("Keys", [])
+        }
+        for key in chunk:
+            if key not in unprocessed:
+                _cache_webhook_config(key, _resolve_webhook_config(items.get(key), *key))
+
+
 def get_webhook_config(application_id: str, environment: str) -> dict[str, Any] | None:
-    """Get webhook configuration from DynamoDB.
+    """Get webhook configuration, from the container cache or DynamoDB.
 
     Args:
         application_id: Application ID
@@ -64,6 +226,11 @@ def get_webhook_config(application_id: str, environment: str) -> dict[str, Any]
         logger.error("ENVIRONMENT_CONFIG_TABLE_NAME not configured")
         return None
 
+    key = (application_id, environment)
+    hit, config = _cached_webhook_config(key)
+    if hit:
+        return config
+
     table = dynamodb.Table(ENVIRONMENT_CONFIG_TABLE_NAME)
 
     try:
@@ -73,47 +240,21 @@ def get_webhook_config(application_id: str, environment: str) -> dict[str, Any]
                 "environment": environment,
             }
         )
-
-        item = response.get("Item")
-        if not item:
-            logger.warning(
-                f"No config found for app={application_id}, env={environment}"
-            )
-            return None
-
-        # Check if webhooks are enabled
-        if not item.get("webhookEnabled", False):
-            logger.info(
-                f"Webhooks disabled for app={application_id}, env={environment}"
-            )
-            return None
-
-        # Check if webhook URL is configured
-        webhook_url = item.get("webhookUrl")
-        if not webhook_url:
-            logger.warning(
-                f"No webhook URL for app={application_id}, env={environment}"
-            )
-            return None
-
-        return {
-            "url": webhook_url,
-            "secret": item.get("webhookSecret", ""),
-            "events": item.get("webhookEvents", []),
-            "maxRetries": item.get("webhookMaxRetries", 3),
-            "retryDelaySeconds": item.get("webhookRetryDelaySeconds", 60),
-        }
+        config = _resolve_webhook_config(response.get("Item"), application_id, environment)
 
     except Exception as e:
         logger.error(f"Error getting webhook config: {e}")
         return None
 
+    _cache_webhook_config(key, config)
+    return config
+
 
 def deliver_webhook(
     url: str,
     payload: dict[str, Any],
     secret: str,
-    timeout: int = 10,
+    timeout: float = DELIVERY_TIMEOUT_SECONDS,
 ) -> tuple[bool, int, str]:
     """Deliver webhook to endpoint.
 
@@ -139,59 +280,156 @@ def deliver_webhook(
     }
 
     try:
-        request = Request(
+        response = http.request(
+            "POST",
             url,
-            data=payload_json.encode("utf-8"),
+            body=payload_json.encode("utf-8"),
             headers=headers,
-            method="POST",
+            timeout=urllib3.Timeout(total=timeout),
+            redirect=False,
         )
+        status_code = response.status
+        if 200 <= status_code < 300:
+            return True, status_code, ""
+        return False, status_code, response.reason or f"Unexpected status: {status_code}"
 
-        with urlopen(request, timeout=timeout) as response:
-            status_code = response.status
-            if 200 <= status_code < 300:
-                return True, status_code, ""
-            return False, status_code, f"Unexpected status: {status_code}"
-
-    except HTTPError as e:
-        return False, e.code, str(e.reason)
-    except URLError as e:
-        return False, 0, str(e.reason)
-    except TimeoutError:
+    except urllib3.exceptions.TimeoutError:
         return False, 0, "Request timed out"
+    except urllib3.exceptions.HTTPError as e:
+        return False, 0, str(e)
     except Exception as e:
         return False, 0, str(e)
 
 
+class MetricsAggregator:
+    """Accumulates webhook metrics for one invocation and emits them in bulk.
+
+    Counts are aggregated per (metric, dimensions) into sample count, sum,
+    minimum and maximum and sent as StatisticValues;
+    observations such as latency keep their distribution and are sent as
+    Values/Counts so CloudWatch can compute percentiles. flush() sends
+    everything with as few PutMetricData calls as the API limits allow.
+    Safe to use from concurrent delivery threads.
+    """
+
+    def __init__(self, namespace: str) -> None:
+        self.namespace = namespace
+        # (metric, dimensions) -> [sample count, sum, minimum, maximum]
+        self._counts: dict[tuple[str, tuple], list[float]] = {}
+        self._observations: dict[tuple[str, str, tuple], Counter] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _dimension_key(dimensions: list[dict]) -> tuple:
+        return tuple((d["Name"], d["Value"]) for d in dimensions)
+
+    def count(self, metric_name: str, dimensions: list[dict], value: float = 1) -> None:
+        """Add to a count metric."""
+        key = (metric_name, self._dimension_key(dimensions))
+        with self._lock:
+            stats = self._counts.get(key)
+            if stats is None:
+                self._counts[key] = [1, value, value, value]
+            else:
+                stats[0] += 1
+                stats[1] += value
+                stats[2] = min(stats[2], value)
+                stats[3] = max(stats[3], value)
+
+    def observe(
+        self, metric_name: str, dimensions: list[dict], value: float, unit: str = "Milliseconds"
+    ) -> None:
+        """Record one observation of a distribution metric."""
+        key = (metric_name, unit, self._dimension_key(dimensions))
+        with self._lock:
+            self._observations.setdefault(key, Counter())[round(value)] += 1
+
+    def flush(self) -> int:
+        """Send accumulated metrics and reset.
+
+        Returns:
+            Number of PutMetricData calls made
+        """
+        with self._lock:
+            counts, self._counts = self._counts, {}
+            observations, self._observations = self._observations, {}
+
+        timestamp = datetime.now(timezone.utc)
+        metric_data = []
+        for (metric_name, dimension_key), (samples, total, minimum, maximum) in counts.items():
+            metric_data.append(
+                {
+                    "MetricName": metric_name,
+                    "Dimensions": [{"Name": n, "Value": v} for n, v in dimension_key],
+                    "StatisticValues": {
+                        "SampleCount": samples,
+                        "Sum": total,
+                        "Minimum": minimum,
+                        "Maximum": maximum,
+                    },
+                    "Unit": "Count",
+                    "Timestamp": timestamp,
+                }
+            )
+        for (metric_name, unit, dimension_key), distribution in observations.items():
+            values = sorted(distribution)
+            for start in range(0, len(values), METRIC_VALUES_PER_DATUM):
+                chunk = values[start : start + METRIC_VALUES_PER_DATUM]
+                metric_data.append(
+                    {
+                        "MetricName": metric_name,
+                        "Dimensions": [{"Name": n, "Value": v} for n, v in dimension_key],
+                        "Values": [float(v) for v in chunk],
+                        "Counts": [float(distribution[v]) for v in chunk],
+                        "Unit": unit,
+                        "Timestamp": timestamp,
+                    }
+                )
+
+        calls = 0
+        for start in range(0, len(metric_data), METRIC_DATA_PER_REQUEST):
+            try:
+                cloudwatch.put_metric_data(
+                    Namespace=self.namespace,
+                    MetricData=metric_data[start : start + METRIC_DATA_PER_REQUEST],
+                )
+                calls += 1
+            except Exception as e:
+                logger.warning(f"Failed to put webhook metrics: {e}")
+        return calls
+
+
+# Metrics for the current invocation, flushed by lambda_handler
+metrics = MetricsAggregator(METRICS_NAMESPACE)
+
+
 def put_metric(metric_name: str, value: float, dimensions: list[dict]) -> None:
-    """Put CloudWatch metric for webhook delivery.
+    """Record a CloudWatch count metric for webhook delivery.
+
+    Buffered in the invocation's MetricsAggregator and sent when the
+    handler finishes.
 
     Args:
         metric_name: Name of the metric
         value: Metric value
         dimensions: List of dimension dicts with Name and Value
     """
-    try:
-        cloudwatch.put_metric_data(
-            Namespace=METRICS_NAMESPACE,
-            MetricData=[
-                {
-                    "MetricName": metric_name,
-                    "Value": value,
-                    "Unit": "Count",
-                    "Dimensions": dimensions,
-                    "Timestamp": datetime.now(timezone.utc),
-                }
-            ],
-        )
-    except Exception as e:
-        logger.warning(f"Failed to put metric {metric_name}: {e}")
+    metrics.count(metric_name, dimensions, value)
+
+
+def _remaining_seconds(deadline: float | None) -> float | None:
+    """Seconds left before the deadline (never negative), or None if unbounded."""
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.time())
 
 
-def process_webhook_event(event_data: dict[str, Any]) -> bool:
+def process_webhook_event(event_data: dict[str, Any], deadline: float | None = None) -> bool:
     """Process a single webhook event.
 
     Args:
         event_data: Webhook event data from SQS message
+        deadline: time.time() by which delivery must finish, or None
 
     Returns:
         True if delivery succeeded, False otherwise
@@ -223,17 +461,28 @@ def process_webhook_event(event_data: dict[str, Any]) -> bool:
         {"Name": "EventType", "Value": event_type},
     ]
 
-    # Deliver webhook
+    # Deliver webhook within the remaining time budget
+    timeout = DELIVERY_TIMEOUT_SECONDS
+    if deadline is not None:
+        timeout = min(timeout, _remaining_seconds(deadline))
+    if timeout <= 0:
+        logger.warning(
+            f"Webhook deferred (time budget exhausted): app={application_id}, "
+            f"env={environment}, event={event_type}"
+        )
+        return False
     start_time = time.time()
     success, status_code, error = deliver_webhook(
         url=config["url"],
         payload=event_data,
         secret=config["secret"],
+        timeout=timeout,
     )
     duration_ms = (time.time() - start_time) * 1000
 
     # Record metrics
     put_metric("DeliveryAttempts", 1, dimensions)
+    metrics.observe("DeliveryLatency", dimensions, duration_ms)
     if success:
         put_metric("DeliverySuccess", 1, dimensions)
         logger.info(
@@ -250,12 +499,90 @@ def process_webhook_event(event_data: dict[str, Any]) -> bool:
     return success
 
 
+def _parse_record(record: dict[str, Any]) -> dict[str, Any] | None:
+    """Parse an SQS record body. Returns None for invalid JSON."""
+    try:
+        return json.loads(record.get("body", "{}"))
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JSON in message {record.get('messageId')}: {e}")
+        return None
+
+
+def _process_record(
+    record: dict[str, Any], body: dict[str, Any] | None, deadline: float | None
+) -> bool:
+    """Process one parsed SQS record. Returns False if the message should be retried."""
+    if body is None:
+        # Don't retry invalid JSON - it will never succeed
+        return True
+
+    try:
+        # Process the webhook event
+        return process_webhook_event(body, deadline)
+    except Exception as e:
+        logger.error(f"Error processing message {record.get('messageId')}: {e}")
+        return False
+
+
+def _delivery_host(body: dict[str, Any] | None) -> str | None:
+    """Endpoint host a parsed record would be delivered to, or None if none."""
+    if not isinstance(body, dict) or not body.get("applicationId") or not body.get("environment"):
+        return None
+    config = get_webhook_config(body["applicationId"], body["environment"])
+    if not config or not config.get("url"):
+        return None
+    return urlsplit(config["url"]).netloc.lower()
+
+
+def _process_records_by_host(
+    records: list[dict[str, Any]], bodies: list[dict[str, Any] | None], deadline: float | None
+) -> list[bool]:
+    """Process records concurrently with a queue per endpoint host.
+
+    Each host's queue is drained by at most ENDPOINT_CONCURRENCY tasks, so a
+    slow host holds at most that many workers and no worker ever waits for a
+    host's capacity while other hosts have records ready. Drain tasks are
+    interleaved across hosts so every host starts on the first wave. Records
+    that make no request (invalid, unconfigured) are each a task of their own.
+
+    Returns:
+        Per-record success, in record order
+    """
+    host_queues: dict[str, deque[int]] = {}
+    tasks: list[deque[int]] = []
+    for index, body in enumerate(bodies):
+        host = _delivery_host(body)
+        if host is None:
+            tasks.append(deque([index]))
+        else:
+            host_queues.setdefault(host, deque()).append(index)
+
+    for wave in range(ENDPOINT_CONCURRENCY):
+        tasks.extend(queue for queue in host_queues.values() if wave < len(queue))
+
+    results = [False] * len(records)
+
+    def drain(queue: deque[int]) -> None:
+        while True:
+            try:
+                index = queue.popleft()
+            except IndexError:
+                return
+            results[index] = _process_record(records[index], bodies[index], deadline)
+
+    workers = max(1, min(DELIVERY_CONCURRENCY, len(tasks)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(drain, tasks))
+    return results
+
+
 def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """Lambda handler for webhook delivery.
 
     Processes SQS messages containing webhook events and delivers them
-    to configured endpoints. Supports partial batch response for
-    individual message failure handling.
+    to configured endpoints concurrently. Supports partial batch response
+    for individual message failure handling; deliveries that cannot finish
+    before the Lambda deadline are reported as failures so SQS retries them.
 
     Args:
         event: SQS event with Records
@@ -264,33 +591,40 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     Returns:
         Batch item failures response for SQS
     """
-    logger.info(f"Processing {len(event.get('Records', []))} webhook events")
+    records = event.get("Records", [])
+    logger.info(f"Processing {len(records)} webhook events")
+
+    deadline = None
+    if context is not None and hasattr(context, "get_remaining_time_in_millis"):
+        deadline = time.time() + (context.get_remaining_time_in_millis() - TIME_RESERVE_MS) / 1000
 
     batch_item_failures = []
 
-    for record in event.get("Records", []):
-        message_id = record.get("messageId")
+    if records:
+        bodies = [_parse_record(record) for record in records]
 
-        try:
-            # Parse SQS message body
-            body = json.loads(record.get("body", "{}"))
+        # One deduplicated config fetch for the whole batch
+        prefetch_webhook_configs(
+            [
+                (body["applicationId"], body["environment"])
+                for body in bodies
+                if isinstance(body, dict) and body.get("applicationId") and body.get("environment")
+            ]
+        )
 
-            # Process the webhook event
-            success = process_webhook_event(body)
+        try:
+            results = _process_records_by_host(records, bodies, deadline)
+        finally:
+            # One set of metric calls for the whole batch
+            metrics.flush()
 
+        for record, success in zip(records, results):
             if not success:
                 # Add to failures for retry
-                batch_item_failures.append({"itemIdentifier": message_id})
-
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in message {message_id}: {e}")
-            # Don't retry invalid JSON - it will never succeed
-        except Exception as e:
-            logger.error(f"Error processing message {message_id}: {e}")
-            batch_item_failures.append({"itemIdentifier": message_id})
+                batch_item_failures.append({"itemIdentifier": record.get("messageId")})
 
     logger.info(
-        f"Processed {len(event.get('Records', []))} events, "
+        f"Processed {len(records)} events, "
         f"{len(batch_item_failures)} failures"
     )
 
@@ -7,12 +7,16 @@ Used by other Lambda functions to trigger webhook deliveries.
 _Requirements: 20.1, 20.2, 20.3_
 """
 
+import contextvars
 import json
 import logging
 import os
+import random
+import time
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterator
 
 import boto3
 
@@ -21,9 +25,24 @@ logger = logging.getLogger(__name__)
 # Environment variable for webhook queue URL
 WEBHOOK_QUEUE_URL = os.environ.get("WEBHOOK_QUEUE_URL", "")
 
+# SendMessageBatch limits: 10 entries and 256 KiB of payload per call
+SEND_BATCH_MAX_ENTRIES = 10
+SEND_BATCH_MAX_BYTES = 262144
+
+# Retries for entries SQS reports as failed without a sender fault
+PUBLISH_MAX_RETRIES = 3
+
+# Buffered events are flushed early once this many are pending
+MAX_BUFFERED_EVENTS = 100
+
 # SQS client (lazy initialization)
 _sqs_client = None
 
+# Buffer for the active buffered_webhook_events() scope, if any
+_active_buffer: contextvars.ContextVar = contextvars.ContextVar(
+    "webhook_event_buffer", default=None
+)
+
 
 def get_sqs_client():
     """Get or create SQS client."""
@@ -51,6 +70,180 @@ class WebhookEventType:
     ROLE_REVOKED = "ROLE_REVOKED"
 
 
+def _message_size(entry: dict[str, Any]) -> int:
+    """Bytes an entry counts against the SendMessageBatch payload limit."""
+    return len(entry["MessageBody"].encode("utf-8"))
+
+
+class WebhookEventBuffer:
+    """Buffers webhook events and publishes them with SendMessageBatch.
+
+    Events are sent in batches of up to 10 entries within the 256 KiB
+    payload limit. Entries SQS reports as failed without a sender fault are
+    retried with backoff. Usable as a context manager that flushes on exit.
+    """
+
+    def __init__(self, queue_url: str | None = None) -> None:
+        self.queue_url = queue_url if queue_url is not None else WEBHOOK_QUEUE_URL
+        self._entries: list[dict[str, Any]] = []
+
+    def __enter__(self) -> "WebhookEventBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.flush()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, event: dict[str, Any]) -> bool:
+        """Buffer an event built by build_webhook_event.
+
+        Returns:
+            False if the event can never be sent (too large), True otherwise
+        """
+        entry = {
+            "MessageBody": json.dumps(event, default=str),
+            "MessageGroupId": event["applicationId"],  # For FIFO queues (if used)
+            "MessageDeduplicationId": event["eventId"],
+        }
+        if _message_size(entry) > SEND_BATCH_MAX_BYTES:
+            logger.error(f"Webhook event {event['eventId']} exceeds the SQS message size limit")
+            return False
+
+        self._entries.append(entry)
+        if len(self._entries) >= MAX_BUFFERED_EVENTS:
+            self.flush()
+        return True
+
+    def flush(self) -> list[str]:
+        """Publish all buffered events.
+
+        Returns:
+            Deduplication IDs (event IDs) of events that could not be published
+        """
+        entries, self._entries = self._entries, []
+        if not entries:
+            return []
+        if not self.queue_url:
+            logger.warning("WEBHOOK_QUEUE_URL not configured, skipping webhook events")
+            return [entry["MessageDeduplicationId"] for entry in entries]
+
+        failed: list[str] = []
+        for batch in self._batches(entries):
+            failed.extend(self._send_batch(batch))
+
+        logger.info(f"Published {len(entries) - len(failed)} webhook events, {len(failed)} failed")
+        return failed
+
+    @staticmethod
+    def _batches(entries: list[dict[str, Any]]) -> Iterator[list[dict[str, Any]]]:
+        """Split entries into SendMessageBatch calls by count and payload size."""
+        batch: list[dict[str, Any]] = []
+        batch_bytes = 0
+        for entry in entries:
+            size = _message_size(entry)
+            if batch and (
+                len(batch) >= SEND_BATCH_MAX_ENTRIES or batch_bytes + size > SEND_BATCH_MAX_BYTES
+            ):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append({**entry, "Id": str(len(batch))})
+            batch_bytes += size
+        if batch:
+            yield batch
+
+    def _send_batch(self, batch: list[dict[str, Any]]) -> list[str]:
+        """Send one batch, retrying failed entries. Returns IDs that failed."""
+        pending = batch
+        failed: list[str] = []
+        for attempt in range(PUBLISH_MAX_RETRIES + 1):
+            if attempt:
+                time.sleep(random.uniform(0, min(1.0, 0.05 * 2**attempt)))
+
+            try:
+                response = get_sqs_client().send_message_batch(
+                    QueueUrl=self.queue_url, Entries=pending
+                )
+            except Exception as e:
+                logger.error(f"Failed to publish webhook events: {e}")
+                continue
+
+            by_id = {entry["Id"]: entry for entry in pending}
+            retry = []
+            for failure in response.get("Failed", []):
+                entry = by_id[failure["Id"]]
+                if failure.get("SenderFault"):
+                    # The request itself is invalid; retrying cannot help
+                    logger.error(
+                        f"Webhook event {entry['MessageDeduplicationId']} rejected: "
+                        f"{failure.get('Code')} {failure.get('Message', '')}"
+                    )
+                    failed.append(entry["MessageDeduplicationId"])
+                else:
+                    retry.append(entry)
+
+            pending = retry
+            if not pending:
+                return failed
+
+        return failed + [entry["MessageDeduplicationId"] for entry in pending]
+
+
+@contextmanager
+def buffered_webhook_events(queue_url: str | None = None) -> Iterator[WebhookEventBuffer]:
+    """Buffer webhook events published in this scope and batch-send them on exit.
+
+    Wrap a resolver (or a bulk operation) so each publish_* call inside it
+    costs no SQS round trip of its own. Nested scopes share the outermost
+    buffer.
+
+    Example:
+        with buffered_webhook_events():
+            for user_id in user_ids:
+                publish_role_event(...)
+    """
+    buffer = _active_buffer.get()
+    if buffer is not None:
+        yield buffer
+        return
+
+    buffer = WebhookEventBuffer(queue_url)
+    token = _active_buffer.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _active_buffer.reset(token)
+        buffer.flush()
+
+
+def build_webhook_event(
+    application_id: str,
+    organization_id: str,
+    environment: str,
+    event_type: str,
+    resource_type: str,
+    resource_id: str,
+    data: dict[str, Any] | None = None,
+    actor_id: str | None = None,
+) -> dict[str, Any]:
+    """Build the webhook event envelope delivered to subscribers."""
+    return {
+        "eventId": str(uuid.uuid4()),
+        "eventType": event_type,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "applicationId": application_id,
+        "organizationId": organization_id,
+        "environment": environment,
+        "resource": {
+            "type": resource_type,
+            "id": resource_id,
+        },
+        "data": data or {},
+        "actor": {"id": actor_id} if actor_id else None,
+    }
+
+
 def publish_webhook_event(
     application_id: str,
     organization_id: str,
@@ -73,27 +266,30 @@ def publish_webhook_event(
         data: Additional event data
         actor_id: ID of the user who triggered the event
 
+    Inside a buffered_webhook_events() scope the event is buffered and
+    sent with SendMessageBatch when the scope exits.
+
     Returns:
-        True if event was published successfully, False otherwise
+        True if event was published (or buffered) successfully, False otherwise
     """
-    if not WEBHOOK_QUEUE_URL:
+    buffer = _active_buffer.get()
+    if not (buffer.queue_url if buffer is not None else WEBHOOK_QUEUE_URL):
         logger.warning("WEBHOOK_QUEUE_URL not configured, skipping webhook event")
         return False
 
-    event = {
-        "eventId": str(uuid.uuid4()),
-        "eventType": event_type,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "applicationId": application_id,
-        "organizationId": organization_id,
-        "environment": environment,
-        "resource": {
-            "type": resource_type,
-            "id": resource_id,
-        },
-        "data": data or {},
-        "actor": {"id": actor_id} if actor_id else None,
-    }
+    event = build_webhook_event(
+        application_id=application_id,
+        organization_id=organization_id,
+        environment=environment,
+        event_type=event_type,
+        resource_type=resource_type,
+        resource_id=resource_id,
+        data=data,
+        actor_id=actor_id,
+    )
+
+    if buffer is not None:
+        return buffer.add(event)
 
     try:
         sqs = get_sqs_client()
@@ -8,6 +8,10 @@ from .rbac_manager import (
     OrganizationPermissions,
     OrganizationRole,
 )
+from .rate_limiter import TokenBucketRateLimiter
+from .rotation_lookup import RotationKeyLookup
+from .cache_ttl import capped_ttl_seconds
+from .membership_resolver import OrganizationMembershipResolver
 
 __all__ = [
     "OrganizationSecurityManager",
@@ -15,4 +19,8 @@ __all__ = [
     "OrganizationRBACManager",
     "OrganizationPermissions",
     "OrganizationRole",
+    "TokenBucketRateLimiter",
+    "RotationKeyLookup",
+    "capped_ttl_seconds",
+    "OrganizationMembershipResolver",
 ]
@@ -5,17 +5,36 @@
 
 import json
 import logging
+import threading
 import time
 import hashlib
 import os
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set, Tuple
 from enum import Enum
 
 import boto3
 
 logger = logging.getLogger(__name__)
 
+# Buffered events are shipped by a background thread at this interval, and
+# by flush_audit_log() at the end of each invocation
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1.0"))
+
+# Wake the background thread early once this many events are buffered
+AUDIT_FLUSH_THRESHOLD_EVENTS = int(os.getenv("AUDIT_FLUSH_THRESHOLD_EVENTS", "500"))
+
+# PutLogEvents limits: 10,000 events and 1,048,576 bytes per call, where each
+# event counts its UTF-8 message size plus 26 bytes
+PUT_LOG_EVENTS_MAX_COUNT = 10000
+PUT_LOG_EVENTS_MAX_BYTES = 1048576
+PUT_LOG_EVENTS_EVENT_OVERHEAD = 26
+
+# Process-wide setup state, shared by every AWSAuditLogger in the container
+_setup_lock = threading.Lock()
+_log_groups_ready = False
+_known_streams: Set[Tuple[str, str]] = set()
+
 
 class AuditEventType(Enum):
     """Comprehensive audit event classification."""
@@ -153,8 +172,23 @@ class AWSAuditLogger:
             "/audit/api": 365,  # 1 year (PCI DSS compliant)
         }
 
-        # Ensure log groups exist with proper retention
-        self._setup_log_groups()
+        # Pending events keyed by (log group, log stream)
+        self._buffer: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._buffered_events = 0
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def _ensure_log_groups(self):
+        """Set up log groups once per container, on first shipment."""
+        global _log_groups_ready
+        if _log_groups_ready:
+            return
+        with _setup_lock:
+            if not _log_groups_ready:
+                self._setup_log_groups()
+                _log_groups_ready = True
 
     def _setup_log_groups(self):
         """Setup CloudWatch log groups with AWS-managed retention."""
@@ -214,8 +248,8 @@ class AWSAuditLogger:
             # Create log stream for organization (for efficient querying)
             log_stream = self._get_log_stream_name(target_context.get("organization_id"))
 
-            # Send to CloudWatch - AWS manages retention, archival, lifecycle
-            self._send_to_cloudwatch(log_group, log_stream, audit_entry)
+            # Buffer for CloudWatch - shipped in batches off the request path
+            self._enqueue(log_group, log_stream, audit_entry)
 
             return event_id
 
@@ -366,33 +400,131 @@ class AWSAuditLogger:
 
         return "STANDARD_7_YEARS"
 
-    def _send_to_cloudwatch(self, log_group: str, log_stream: str, audit_entry: Dict[str, Any]):
-        """Send audit entry to CloudWatch with automatic retry."""
+    def _enqueue(self, log_group: str, log_stream: str, audit_entry: Dict[str, Any]):
+        """Buffer an audit entry for the next flush."""
 
+        event = {
+            "timestamp": int(time.time() * 1000),
+            "message": json.dumps(audit_entry, separators=(",", ":")),
+        }
+        with self._buffer_lock:
+            self._buffer.setdefault((log_group, log_stream), []).append(event)
+            self._buffered_events += 1
+            buffered = self._buffered_events
+
+        if AUDIT_FLUSH_INTERVAL_SECONDS <= 0:
+            self.flush()
+            return
+
+        self._start_flusher()
+        if buffered >= AUDIT_FLUSH_THRESHOLD_EVENTS:
+            self._wake.set()
+
+    def _start_flusher(self):
+        """Start the background flush thread if it is not running."""
+
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._buffer_lock:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="audit-log-flusher", daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_loop(self):
+        """Background loop shipping buffered events."""
+
+        while True:
+            self._wake.wait(AUDIT_FLUSH_INTERVAL_SECONDS)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Audit log background flush failed: {str(e)}")
+
+    def flush(self) -> int:
+        """
+        Ship all buffered audit events to CloudWatch.
+
+        Call at the end of each invocation: the background thread does not
+        run while a Lambda container is frozen.
+
+        Returns:
+            Number of events shipped
+        """
+
+        with self._flush_lock:
+            with self._buffer_lock:
+                pending = self._buffer
+                self._buffer = {}
+                self._buffered_events = 0
+
+            shipped = 0
+            for (log_group, log_stream), events in pending.items():
+                shipped += self._send_to_cloudwatch(log_group, log_stream, events)
+            return shipped
+
+    def _send_to_cloudwatch(
+        self, log_group: str, log_stream: str, events: List[Dict[str, Any]]
+    ) -> int:
+        """Send buffered events for one stream in PutLogEvents-sized batches."""
+
+        # PutLogEvents requires chronological order within a batch
+        events = sorted(events, key=lambda event: event["timestamp"])
+        shipped = 0
+        for batch in self._batches(events):
+            try:
+                self._put_batch(log_group, log_stream, batch)
+                shipped += len(batch)
+            except Exception as e:
+                logger.error(f"Failed to send audit log to CloudWatch: {str(e)}")
+                # Fallback: Log to application logs as backup
+                for event in batch:
+                    logger.warning(f"AUDIT_FALLBACK: {event['message']}")
+        return shipped
+
+    def _batches(self, events: List[Dict[str, Any]]):
+        """Split events into batches within PutLogEvents count and size limits."""
+
+        batch: List[Dict[str, Any]] = []
+        batch_bytes = 0
+        for event in events:
+            size = len(event["message"].encode("utf-8")) + PUT_LOG_EVENTS_EVENT_OVERHEAD
+            if batch and (
+                len(batch) >= PUT_LOG_EVENTS_MAX_COUNT
+                or batch_bytes + size > PUT_LOG_EVENTS_MAX_BYTES
+            ):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append(event)
+            batch_bytes += size
+        if batch:
+            yield batch
+
+    def _put_batch(self, log_group: str, log_stream: str, batch: List[Dict[str, Any]]):
+        """Put one batch, creating the stream only if it is not known to exist."""
+
+        self._ensure_log_stream_exists(log_group, log_stream)
         try:
-            # Ensure log stream exists
+            self.cloudwatch_logs.put_log_events(
+                logGroupName=log_group, logStreamName=log_stream, logEvents=batch
+            )
+        except self.cloudwatch_logs.exceptions.ResourceNotFoundException:
+            # Stream or group was removed since we last saw it; recreate once
+            _known_streams.discard((log_group, log_stream))
             self._ensure_log_stream_exists(log_group, log_stream)
-
-            # Send log event - AWS handles retention, archival, compliance
             self.cloudwatch_logs.put_log_events(
-                logGroupName=log_group,
-                logStreamName=log_stream,
-                logEvents=[
-                    {
-                        "timestamp": int(time.time() * 1000),
-                        "message": json.dumps(audit_entry, separators=(",", ":")),
-                    }
-                ],
+                logGroupName=log_group, logStreamName=log_stream, logEvents=batch
             )
 
-        except Exception as e:
-            logger.error(f"Failed to send audit log to CloudWatch: {str(e)}")
-            # Fallback: Log to application logs as backup
-            logger.warning(f"AUDIT_FALLBACK: {json.dumps(audit_entry)}")
-
     def _ensure_log_stream_exists(self, log_group: str, log_stream: str):
         """Ensure log stream exists in CloudWatch."""
 
+        if (log_group, log_stream) in _known_streams:
+            return
+
+        self._ensure_log_groups()
         try:
             self.cloudwatch_logs.create_log_stream(logGroupName=log_group, logStreamName=log_stream)
         except self.cloudwatch_logs.exceptions.ResourceAlreadyExistsException:
@@ -400,6 +532,8 @@ class AWSAuditLogger:
             pass
         except Exception as e:
             logger.error(f"Error creating log stream {log_stream}: {str(e)}")
+            return
+        _known_streams.add((log_group, log_stream))
 
 
 class StateChangeTracker:
@@ -534,6 +668,16 @@ audit_logger = AWSAuditLogger()
 state_tracker = StateChangeTracker()
 
 
+def flush_audit_log() -> int:
+    """Ship buffered audit events; call at the end of each Lambda invocation."""
+
+    try:
+        return audit_logger.flush()
+    except Exception as e:
+        logger.critical(f"AUDIT_LOGGING_FAILURE: flush failed: {str(e)}")
+        return 0
+
+
 def log_organization_audit_event(
     event_type: AuditEventType,
     user_context: Dict[str, Any],
@@ -0,0 +1,29 @@
+# file: apps/api/layers/organizations_security/cache_ttl.py
+# author: AI Assistant
+# created: 2026-10-16
+# description: Capped TTL settings for per-container caches
+
+"""
+TTL settings for per-container caches.
+
+Warm containers do not invalidate each other's caches, so a cache TTL is
+how long a change (a revoked key, a removed origin, a lost ownership) can
+go unseen. Caches whose staleness is a security bound read their TTL with
+``capped_ttl_seconds`` so the environment cannot raise it past a cap.
+"""
+
+import os
+
+
+def capped_ttl_seconds(env_var: str, default: str, max_seconds: int) -> int:
+    """Read a cache TTL in seconds from the environment, capped at max_seconds.
+
+    Args:
+        env_var: Environment variable holding the TTL
+        default: TTL used when the variable is unset
+        max_seconds: Upper bound applied whatever the environment says
+
+    Returns:
+        The TTL in seconds
+    """
+    return min(int(os.environ.get(env_var, default)), max_seconds)
@@ -10,7 +10,8 @@ from functools import wraps
 from typing import Dict, Any, Optional, Callable, List
 from dataclasses import dataclass
 
-from rbac_manager import OrganizationRBACManager
+from membership_resolver import get_membership_resolver
+from rbac_manager import OrganizationRBACManager, permission_mask
 from security_manager import OrganizationSecurityManager
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,7 @@ class OrganizationContext:
     is_platform_admin: bool
     cache_hit: bool = False
     performance_metrics: Dict[str, float] = None
+    permission_mask: int = 0
 
     def __post_init__(self):
         if self.performance_metrics is None:
@@ -52,8 +54,11 @@ class OrganizationContextExtractor:
     """Extracts and validates organization context from GraphQL requests."""
 
     def __init__(self):
-        self.security_manager = OrganizationSecurityManager()
-        self.rbac_manager = OrganizationRBACManager()
+        self.membership_resolver = get_membership_resolver()
+        self.security_manager = OrganizationSecurityManager(
+            membership_resolver=self.membership_resolver
+        )
+        self.rbac_manager = OrganizationRBACManager(membership_resolver=self.membership_resolver)
         self._context_cache = {}  # Request-level cache
 
     def extract_organization_id(self, event: Dict[str, Any]) -> str:
@@ -121,7 +126,7 @@ class OrganizationContextExtractor:
 
         try:
             # Validate organization exists and is active
-            organization_data = self._get_organization_data(organization_id)
+            organization_data = self._get_organization_data(user_id, organization_id)
             if not organization_data:
                 raise SecurityViolationError(
                     f"Organization {organization_id} not found or inactive"
@@ -156,6 +161,9 @@ class OrganizationContextExtractor:
                 user_id, organization_id, cognito_groups
             )
             user_permissions = permissions_data.get("permissions", [])
+            user_permission_mask = permissions_data.get(
+                "permissionMask", permission_mask(user_permissions)
+            )
 
             # Build complete context
             end_time = time.time()
@@ -165,6 +173,7 @@ class OrganizationContextExtractor:
                 user_id=user_id,
                 user_role=user_role,
                 user_permissions=user_permissions,
+                permission_mask=user_permission_mask,
                 membership_status=membership_status,
                 cognito_groups=cognito_groups,
                 is_platform_admin=is_platform_admin,
@@ -190,18 +199,13 @@ class OrganizationContextExtractor:
             logger.error(f"Error building organization context: {str(e)}")
             raise ContextExtractionError(f"Failed to build organization context: {str(e)}")
 
-    def _get_organization_data(self, organization_id: str) -> Optional[Dict[str, Any]]:
-        """Get organization data from database."""
+    def _get_organization_data(
+        self, user_id: str, organization_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get organization data (fetched together with the user's membership)."""
         start_time = time.time()
         try:
-            import boto3
-
-            dynamodb = boto3.resource("dynamodb")
-            organizations_table = dynamodb.Table("Organizations")
-
-            response = organizations_table.get_item(Key={"organizationId": organization_id})
-
-            org_data = response.get("Item")
+            org_data = self.membership_resolver.resolve(user_id, organization_id).organization
             if org_data and org_data.get("status") == "ACTIVE":
                 return org_data
             return None
@@ -214,19 +218,10 @@ class OrganizationContextExtractor:
             logger.debug(f"Organization data lookup took {lookup_time:.2f}ms")
 
     def _get_user_membership(self, user_id: str, organization_id: str) -> Optional[Dict[str, Any]]:
-        """Get user membership data from database."""
+        """Get user membership data (fetched together with the organization)."""
         start_time = time.time()
         try:
-            import boto3
-
-            dynamodb = boto3.resource("dynamodb")
-            org_users_table = dynamodb.Table("OrganizationUsers")
-
-            response = org_users_table.get_item(
-                Key={"userId": user_id, "organizationId": organization_id}
-            )
-
-            return response.get("Item")
+            return self.membership_resolver.resolve(user_id, organization_id).membership
 
         except Exception as e:
             logger.error(f"Error getting user membership: {str(e)}")
@@ -245,12 +240,22 @@ class OrganizationContextMiddleware:
 
     def __init__(self):
         self.extractor = OrganizationContextExtractor()
-        self.rbac_manager = OrganizationRBACManager()
+        self.rbac_manager = self.extractor.rbac_manager
 
     def validate_and_inject_context(
         self, event: Dict[str, Any], required_permission: Optional[str] = None
     ) -> OrganizationContext:
-        """Main middleware function to validate and inject organization context."""
+        """Main middleware function to validate and inject organization context.
+
+        Organization and membership rows are memoized for the whole call, so
+        the context, permission and role checks share one lookup.
+        """
+        with self.extractor.membership_resolver.request_scope():
+            return self._validate_and_inject_context(event, required_permission)
+
+    def _validate_and_inject_context(
+        self, event: Dict[str, Any], required_permission: Optional[str] = None
+    ) -> OrganizationContext:
         start_time = time.time()
 
         try:
@@ -415,6 +420,8 @@ def requires_permission(permission: str):
 def requires_any_permission(permissions: List[str]):
     """Decorator to require any of the specified permissions."""
 
+    required_mask = permission_mask(permissions)
+
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(self, event: Dict[str, Any], *args, **kwargs):
@@ -428,8 +435,7 @@ def requires_any_permission(permissions: List[str]):
                     return self._error_response("Organization context required")
 
                 # Check if user has any of the required permissions
-                user_permissions = org_context.user_permissions
-                has_any_permission = any(perm in user_permissions for perm in permissions)
+                has_any_permission = bool(org_context.permission_mask & required_mask)
 
                 if not has_any_permission:
                     raise SecurityViolationError(
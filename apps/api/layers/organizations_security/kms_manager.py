@@ -6,13 +6,127 @@
 import boto3
 import json
 import logging
-from typing import Dict, Any, Optional, List
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 from botocore.exceptions import ClientError
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import base64
 import os
 
 logger = logging.getLogger(__name__)
 
+# Envelope-encrypted values are "env1:" + base64(key length | encrypted data
+# key | nonce | AES-GCM ciphertext). Base64 never contains ":", so values
+# produced by direct KMS Encrypt are never mistaken for envelopes.
+ENVELOPE_PREFIX = "env1:"
+ENVELOPE_NONCE_BYTES = 12
+
+# Plaintext data keys stay in the warm container for a bounded time and
+# number of encryptions, and only for a bounded number of organizations
+DATA_KEY_CACHE_TTL_SECONDS = int(os.environ.get("DATA_KEY_CACHE_TTL_SECONDS", "300"))
+DATA_KEY_MAX_USES = int(os.environ.get("DATA_KEY_MAX_USES", "1000"))
+DATA_KEY_CACHE_MAX_ENTRIES = int(os.environ.get("DATA_KEY_CACHE_MAX_ENTRIES", "256"))
+
+# Concurrent DescribeKey calls when listing organization keys
+KMS_DESCRIBE_CONCURRENCY = int(os.environ.get("KMS_DESCRIBE_CONCURRENCY", "8"))
+
+ORGANIZATION_ALIAS_PREFIX = "alias/org-"
+
+# Organization key metadata (DescribeKey + rotation status) is reused for this long
+KEY_METADATA_CACHE_TTL_SECONDS = int(os.environ.get("KEY_METADATA_CACHE_TTL_SECONDS", "300"))
+KEY_METADATA_CACHE_MAX_ENTRIES = 1024
+
+# The account ID never changes for a container; look it up once
+_account_id: Optional[str] = None
+_account_id_lock = threading.Lock()
+
+
+class DataKeyCache:
+    """
+    Bounded, time- and usage-limited cache of plaintext data keys.
+
+    Holds one encryption key per organization (reused for at most max_uses
+    encryptions) and the decrypted form of encrypted data keys seen on
+    reads. Shared by every OrganizationKMSManager in the container.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = DATA_KEY_CACHE_TTL_SECONDS,
+        max_uses: int = DATA_KEY_MAX_USES,
+        max_entries: int = DATA_KEY_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_uses = max_uses
+        self.max_entries = max_entries
+        # key -> [plaintext key, encrypted key, expires_at, uses]
+        self._entries: "OrderedDict[Tuple, List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take_encryption_key(self, organization_id: str) -> Optional[Tuple[bytes, bytes]]:
+        """Get the organization's current data key, consuming one use."""
+        with self._lock:
+            entry = self._live_entry(("encrypt", organization_id))
+            if entry is None or entry[3] >= self.max_uses:
+                return None
+            entry[3] += 1
+            return entry[0], entry[1]
+
+    def get_decryption_key(self, organization_id: str, encrypted_key: bytes) -> Optional[bytes]:
+        """Get the plaintext form of an encrypted data key, if cached."""
+        with self._lock:
+            entry = self._live_entry(("decrypt", organization_id, encrypted_key))
+            return entry[0] if entry else None
+
+    def put(
+        self, organization_id: str, plaintext_key: bytes, encrypted_key: bytes, for_encryption: bool
+    ) -> None:
+        """Cache a data key for decryption and, optionally, for new encryptions."""
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            keys: List[Tuple] = [("decrypt", organization_id, encrypted_key)]
+            if for_encryption:
+                keys.append(("encrypt", organization_id))
+            for key in keys:
+                self._entries[key] = [plaintext_key, encrypted_key, expires_at, 0]
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, organization_id: Optional[str] = None) -> int:
+        """Drop cached keys for one organization, or all of them."""
+        with self._lock:
+            keys = [
+                key for key in self._entries if organization_id is None or key[1] == organization_id
+            ]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def _live_entry(self, key: Tuple) -> Optional[List[Any]]:
+        """Return an unexpired entry and mark it recently used. Caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+
+_data_key_cache = DataKeyCache()
+
+# alias name -> (key information, expires_at)
+_key_metadata_cache: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+_key_metadata_lock = threading.Lock()
+
 
 class OrganizationKMSManager:
     """
@@ -31,6 +145,7 @@ class OrganizationKMSManager:
         self.dynamodb = boto3.resource("dynamodb", region_name=region)
         self.organizations_table = self.dynamodb.Table("Organizations")
         self.region = region or os.environ.get("AWS_REGION", "us-east-1")
+        self.data_key_cache = _data_key_cache
 
     def create_organization_kms_key(
         self, organization_id: str, organization_name: str, owner_user_id: str
@@ -88,7 +203,7 @@ class OrganizationKMSManager:
             response = self.kms_client.create_key(
                 Policy=json.dumps(key_policy),
                 Description=f"Organization-specific encryption key for {organization_name} ({organization_id})",
-                Usage="ENCRYPT_DECRYPT",
+                KeyUsage="ENCRYPT_DECRYPT",
                 KeySpec="SYMMETRIC_DEFAULT",
                 Origin="AWS_KMS",
                 Tags=[
@@ -119,6 +234,9 @@ class OrganizationKMSManager:
             # Enable automatic key rotation
             self.kms_client.enable_key_rotation(KeyId=key_id)
 
+            # Drop anything cached for a previous key behind this alias
+            self.invalidate_key_metadata(organization_id)
+
             logger.info(f"Created KMS key {key_id} for organization {organization_id}")
 
             return {"keyId": key_id, "keyArn": key_arn, "aliasName": alias_name}
@@ -140,10 +258,18 @@ class OrganizationKMSManager:
         try:
             alias_name = f"alias/org-{organization_id}"
 
+            with _key_metadata_lock:
+                cached = _key_metadata_cache.get(alias_name)
+                if cached is not None:
+                    if cached[1] > time.time():
+                        _key_metadata_cache.move_to_end(alias_name)
+                        return dict(cached[0])
+                    del _key_metadata_cache[alias_name]
+
             response = self.kms_client.describe_key(KeyId=alias_name)
             key_metadata = response["KeyMetadata"]
 
-            return {
+            key_info = {
                 "keyId": key_metadata["KeyId"],
                 "keyArn": key_metadata["Arn"],
                 "aliasName": alias_name,
@@ -151,12 +277,37 @@ class OrganizationKMSManager:
                 "keyRotationEnabled": self._is_key_rotation_enabled(key_metadata["KeyId"]),
             }
 
+            if KEY_METADATA_CACHE_TTL_SECONDS > 0:
+                with _key_metadata_lock:
+                    _key_metadata_cache[alias_name] = (
+                        key_info,
+                        time.time() + KEY_METADATA_CACHE_TTL_SECONDS,
+                    )
+                    _key_metadata_cache.move_to_end(alias_name)
+                    while len(_key_metadata_cache) > KEY_METADATA_CACHE_MAX_ENTRIES:
+                        _key_metadata_cache.popitem(last=False)
+
+            return dict(key_info)
+
         except ClientError as e:
             if e.response["Error"]["Code"] == "NotFoundException":
                 return None
             logger.error(f"Failed to get KMS key for organization {organization_id}: {e}")
             raise
 
+    def invalidate_key_metadata(self, organization_id: Optional[str] = None) -> None:
+        """
+        Drop cached key metadata for one organization, or for all of them.
+
+        Args:
+            organization_id: Organization identifier, None for every organization
+        """
+        with _key_metadata_lock:
+            if organization_id is None:
+                _key_metadata_cache.clear()
+            else:
+                _key_metadata_cache.pop(f"alias/org-{organization_id}", None)
+
     def encrypt_organization_data(
         self,
         organization_id: str,
@@ -166,29 +317,29 @@ class OrganizationKMSManager:
         """
         Encrypt data using the organization's KMS key.
 
+        Uses envelope encryption: a data key from GenerateDataKey (cached for
+        a bounded time and number of uses) encrypts the data locally with
+        AES-GCM, and the encryption context is bound as associated data.
+
         Args:
             organization_id: Organization identifier
             plaintext_data: Data to encrypt
             encryption_context: Additional context for encryption
 
         Returns:
-            Base64-encoded encrypted data
+            Envelope-encrypted data ("env1:" followed by base64)
         """
         try:
-            alias_name = f"alias/org-{organization_id}"
-
-            # Set default encryption context
-            context = encryption_context or {}
-            context.update({"OrganizationId": organization_id, "Purpose": "OrganizationData"})
+            context = self._encryption_context(organization_id, encryption_context)
+            plaintext_key, encrypted_key = self._get_encryption_data_key(organization_id)
 
-            response = self.kms_client.encrypt(
-                KeyId=alias_name,
-                Plaintext=plaintext_data.encode("utf-8"),
-                EncryptionContext=context,
+            nonce = os.urandom(ENVELOPE_NONCE_BYTES)
+            ciphertext = AESGCM(plaintext_key).encrypt(
+                nonce, plaintext_data.encode("utf-8"), self._associated_data(context)
             )
 
-            # Return base64-encoded ciphertext
-            return base64.b64encode(response["CiphertextBlob"]).decode("utf-8")
+            envelope = len(encrypted_key).to_bytes(2, "big") + encrypted_key + nonce + ciphertext
+            return ENVELOPE_PREFIX + base64.b64encode(envelope).decode("utf-8")
 
         except ClientError as e:
             logger.error(f"Failed to encrypt data for organization {organization_id}: {e}")
@@ -203,9 +354,12 @@ class OrganizationKMSManager:
         """
         Decrypt data using the organization's KMS key.
 
+        Accepts both envelope-encrypted values and base64 ciphertext produced
+        by direct KMS Encrypt, so existing data needs no migration.
+
         Args:
             organization_id: Organization identifier
-            encrypted_data: Base64-encoded encrypted data
+            encrypted_data: Encrypted data from encrypt_organization_data
             encryption_context: Expected encryption context
 
         Returns:
@@ -213,8 +367,10 @@ class OrganizationKMSManager:
         """
         try:
             # Set expected encryption context
-            context = encryption_context or {}
-            context.update({"OrganizationId": organization_id, "Purpose": "OrganizationData"})
+            context = self._encryption_context(organization_id, encryption_context)
+
+            if encrypted_data.startswith(ENVELOPE_PREFIX):
+                return self._decrypt_envelope(organization_id, encrypted_data, context)
 
             # Decode base64 data
             ciphertext_blob = base64.b64decode(encrypted_data.encode("utf-8"))
@@ -225,10 +381,72 @@ class OrganizationKMSManager:
 
             return response["Plaintext"].decode("utf-8")
 
-        except ClientError as e:
+        except (ClientError, InvalidTag, ValueError) as e:
             logger.error(f"Failed to decrypt data for organization {organization_id}: {e}")
             raise
 
+    def _encryption_context(
+        self, organization_id: str, encryption_context: Optional[Dict[str, str]]
+    ) -> Dict[str, str]:
+        """Build the full encryption context without mutating the caller's dict."""
+        context = dict(encryption_context or {})
+        context.update({"OrganizationId": organization_id, "Purpose": "OrganizationData"})
+        return context
+
+    @staticmethod
+    def _data_key_context(organization_id: str) -> Dict[str, str]:
+        """KMS encryption context for an organization's data keys."""
+        return {"OrganizationId": organization_id, "Purpose": "OrganizationDataKey"}
+
+    @staticmethod
+    def _associated_data(context: Dict[str, str]) -> bytes:
+        """Canonical form of the encryption context, authenticated by AES-GCM."""
+        return json.dumps(context, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    def _get_encryption_data_key(self, organization_id: str) -> Tuple[bytes, bytes]:
+        """Get a cached data key for the organization or generate a new one."""
+        cached = self.data_key_cache.take_encryption_key(organization_id)
+        if cached:
+            return cached
+
+        response = self.kms_client.generate_data_key(
+            KeyId=f"alias/org-{organization_id}",
+            KeySpec="AES_256",
+            EncryptionContext=self._data_key_context(organization_id),
+        )
+        plaintext_key = response["Plaintext"]
+        encrypted_key = response["CiphertextBlob"]
+        self.data_key_cache.put(organization_id, plaintext_key, encrypted_key, for_encryption=True)
+        # The first use is this encryption
+        self.data_key_cache.take_encryption_key(organization_id)
+        return plaintext_key, encrypted_key
+
+    def _decrypt_envelope(
+        self, organization_id: str, encrypted_data: str, context: Dict[str, str]
+    ) -> str:
+        """Decrypt an envelope, unwrapping its data key through the cache."""
+        envelope = base64.b64decode(encrypted_data[len(ENVELOPE_PREFIX) :].encode("utf-8"))
+        key_length = int.from_bytes(envelope[:2], "big")
+        encrypted_key = envelope[2 : 2 + key_length]
+        nonce = envelope[2 + key_length : 2 + key_length + ENVELOPE_NONCE_BYTES]
+        ciphertext = envelope[2 + key_length + ENVELOPE_NONCE_BYTES :]
+        if len(encrypted_key) != key_length or len(nonce) != ENVELOPE_NONCE_BYTES:
+            raise ValueError("Malformed encrypted organization data")
+
+        plaintext_key = self.data_key_cache.get_decryption_key(organization_id, encrypted_key)
+        if plaintext_key is None:
+            response = self.kms_client.decrypt(
+                CiphertextBlob=encrypted_key,
+                EncryptionContext=self._data_key_context(organization_id),
+            )
+            plaintext_key = response["Plaintext"]
+            self.data_key_cache.put(
+                organization_id, plaintext_key, encrypted_key, for_encryption=False
+            )
+
+        plaintext = AESGCM(plaintext_key).decrypt(nonce, ciphertext, self._associated_data(context))
+        return plaintext.decode("utf-8")
+
     def rotate_organization_key(self, organization_id: str) -> bool:
         """
         Manually trigger key rotation for an organization.
@@ -249,6 +467,9 @@ class OrganizationKMSManager:
             # KMS handles automatic rotation, but we can log this event
             logger.info(f"Key rotation check performed for organization {organization_id}")
 
+            # Re-read key state on the next lookup
+            self.invalidate_key_metadata(organization_id)
+
             # In a real implementation, you might want to:
             # 1. Create a new key version
             # 2. Update application configurations
@@ -280,6 +501,9 @@ class OrganizationKMSManager:
                 logger.warning(f"No KMS key found for organization {organization_id}")
                 return False
 
+            # Forget data keys wrapped by the key being deleted
+            self.data_key_cache.invalidate(organization_id)
+
             # Schedule key deletion
             self.kms_client.schedule_key_deletion(
                 KeyId=key_info["keyId"], PendingWindowInDays=pending_window_days
@@ -291,6 +515,8 @@ class OrganizationKMSManager:
             except ClientError as e:
                 logger.warning(f"Failed to delete alias {alias_name}: {e}")
 
+            self.invalidate_key_metadata(organization_id)
+
             logger.info(
                 f"Scheduled deletion of KMS key for organization {organization_id} in {pending_window_days} days"
             )
@@ -300,60 +526,112 @@ class OrganizationKMSManager:
             logger.error(f"Failed to schedule key deletion for organization {organization_id}: {e}")
             return False
 
-    def list_organization_keys(self) -> List[Dict[str, Any]]:
+    def list_organization_keys(self, include_rotation_status: bool = True) -> List[Dict[str, Any]]:
         """
         List all organization-specific KMS keys.
 
+        Args:
+            include_rotation_status: Also call GetKeyRotationStatus per key
+
         Returns:
             List of organization key information
         """
         try:
-            # Get all aliases starting with 'alias/org-'
-            paginator = self.kms_client.get_paginator("list_aliases")
             org_keys = []
-
-            for page in paginator.paginate():
-                for alias in page["Aliases"]:
-                    if alias["AliasName"].startswith("alias/org-"):
-                        organization_id = alias["AliasName"].replace("alias/org-", "")
-
-                        # Get key details
-                        try:
-                            key_response = self.kms_client.describe_key(KeyId=alias["TargetKeyId"])
-                            key_metadata = key_response["KeyMetadata"]
-
-                            org_keys.append(
-                                {
-                                    "organizationId": organization_id,
-                                    "keyId": key_metadata["KeyId"],
-                                    "keyArn": key_metadata["Arn"],
-                                    "aliasName": alias["AliasName"],
-                                    "enabled": key_metadata["Enabled"],
-                                    "creationDate": key_metadata["CreationDate"],
-                                    "keyRotationEnabled": self._is_key_rotation_enabled(
-                                        key_metadata["KeyId"]
-                                    ),
-                                }
-                            )
-                        except ClientError as e:
-                            logger.warning(
-                                f"Failed to get details for key {alias['TargetKeyId']}: {e}"
-                            )
-
-            return org_keys
+            marker = None
+            while True:
+                page, marker = self.list_organization_keys_page(
+                    marker=marker, include_rotation_status=include_rotation_status
+                )
+                org_keys.extend(page)
+                if not marker:
+                    return org_keys
 
         except ClientError as e:
             logger.error(f"Failed to list organization keys: {e}")
             return []
 
+    def list_organization_keys_page(
+        self,
+        marker: Optional[str] = None,
+        page_size: int = 100,
+        include_rotation_status: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List one page of organization-specific KMS keys.
+
+        Keys on the page are described concurrently (KMS_DESCRIBE_CONCURRENCY
+        at a time). Pass the returned marker back in to continue, which lets
+        large accounts be processed across several invocations.
+
+        Args:
+            marker: Marker returned by the previous page, None to start
+            page_size: Aliases to read per page (1-100)
+            include_rotation_status: Also call GetKeyRotationStatus per key
+
+        Returns:
+            Tuple of (key information for the page, marker for the next page
+            or None when done)
+
+        Raises:
+            ClientError: If the aliases cannot be listed
+        """
+        kwargs: Dict[str, Any] = {"Limit": page_size}
+        if marker:
+            kwargs["Marker"] = marker
+        response = self.kms_client.list_aliases(**kwargs)
+
+        aliases = [
+            alias
+            for alias in response.get("Aliases", [])
+            if alias["AliasName"].startswith(ORGANIZATION_ALIAS_PREFIX) and alias.get("TargetKeyId")
+        ]
+        next_marker = response.get("NextMarker") if response.get("Truncated") else None
+        if not aliases:
+            return [], next_marker
+
+        def describe(alias: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            try:
+                key_response = self.kms_client.describe_key(KeyId=alias["TargetKeyId"])
+            except ClientError as e:
+                logger.warning(f"Failed to get details for key {alias['TargetKeyId']}: {e}")
+                return None
+            key_metadata = key_response["KeyMetadata"]
+            key_info = {
+                "organizationId": alias["AliasName"][len(ORGANIZATION_ALIAS_PREFIX) :],
+                "keyId": key_metadata["KeyId"],
+                "keyArn": key_metadata["Arn"],
+                "aliasName": alias["AliasName"],
+                "enabled": key_metadata["Enabled"],
+                "creationDate": key_metadata["CreationDate"],
+            }
+            if include_rotation_status:
+                key_info["keyRotationEnabled"] = self._is_key_rotation_enabled(
+                    key_metadata["KeyId"]
+                )
+            return key_info
+
+        workers = max(1, min(KMS_DESCRIBE_CONCURRENCY, len(aliases)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            described = list(executor.map(describe, aliases))
+
+        return [key_info for key_info in described if key_info], next_marker
+
     def _get_account_id(self) -> str:
-        """Get the current AWS account ID."""
-        try:
-            sts_client = boto3.client("sts")
-            return sts_client.get_caller_identity()["Account"]
-        except ClientError:
-            # Fallback for testing
-            return "123456789012"
+        """Get the current AWS account ID (looked up once per container)."""
+        global _account_id
+        if _account_id is not None:
+            return _account_id
+
+        with _account_id_lock:
+            if _account_id is None:
+                try:
+                    sts_client = boto3.client("sts")
+                    _account_id = sts_client.get_caller_identity()["Account"]
+                except ClientError:
+                    # Fallback for testing (not memoized)
+                    return "123456789012"
+            return _account_id
 
     def _is_key_rotation_enabled(self, key_id: str) -> bool:
         """Check if key rotation is enabled for a key."""
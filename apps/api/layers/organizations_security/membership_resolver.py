@@ -0,0 +1,304 @@
+# file: apps/api/layers/organizations_security/membership_resolver.py
+# author: AI Assistant
+# created: 2026-10-16
+# description: Shared organization + membership lookup for organization security checks
+
+"""
+Organization membership resolver.
+
+The context middleware, RBAC manager and security manager all need the same
+two rows for an organization-scoped request: the organization and the
+caller's OrganizationUsers membership. The resolver fetches both with a
+single BatchGetItem and serves repeat lookups from:
+
+- a per-request memo, so every check within one request sees the same rows
+  and costs at most one round trip, and
+- a per-container TTL cache shared across warm invocations.
+
+Wrap each request in ``request_scope()`` and call ``invalidate()`` when an
+organization or membership changes. Outside a request scope only the
+container cache applies.
+"""
+
+import contextvars
+import logging
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import boto3
+
+from cache_ttl import capped_ttl_seconds
+
+logger = logging.getLogger(__name__)
+
+ORGANIZATIONS_TABLE = os.environ.get("ORGANIZATIONS_TABLE_NAME", "Organizations")
+ORGANIZATION_USERS_TABLE = os.environ.get("ORGANIZATION_USERS_TABLE_NAME", "OrganizationUsers")
+
+# Membership changes take effect in other warm containers within this TTL,
+# which the environment cannot raise past the cap
+MEMBERSHIP_CACHE_MAX_TTL_SECONDS = 60
+MEMBERSHIP_CACHE_TTL_SECONDS = capped_ttl_seconds(
+    "MEMBERSHIP_CACHE_TTL_SECONDS", "30", MEMBERSHIP_CACHE_MAX_TTL_SECONDS
+)
+MEMBERSHIP_CACHE_MAX_ENTRIES = int(os.environ.get("MEMBERSHIP_CACHE_MAX_ENTRIES", "5000"))
+
+# Retries for UnprocessedKeys returned by BatchGetItem
+BATCH_GET_MAX_RETRIES = 3
+
+# BatchGetItem accepts 100 keys; one is the organization row
+MEMBERSHIPS_PER_BATCH = 99
+
+
+@dataclass(frozen=True)
+class OrganizationMembership:
+    """Organization and membership rows for one (user, organization) pair.
+
+    Either may be None when the row does not exist.
+    """
+
+    organization: Optional[Dict[str, Any]]
+    membership: Optional[Dict[str, Any]]
+
+
+class OrganizationMembershipResolver:
+    """Resolves organization and membership rows with request and container caching."""
+
+    def __init__(
+        self,
+        dynamodb: Any = None,
+        organizations_table: str = ORGANIZATIONS_TABLE,
+        organization_users_table: str = ORGANIZATION_USERS_TABLE,
+        ttl_seconds: int = MEMBERSHIP_CACHE_TTL_SECONDS,
+        max_entries: int = MEMBERSHIP_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Args:
+            dynamodb: boto3 DynamoDB resource, created lazily when omitted
+            organizations_table: Organizations table name
+            organization_users_table: OrganizationUsers table name
+            ttl_seconds: Per-container cache TTL (0 disables the cache)
+            max_entries: Maximum (user, organization) pairs cached
+        """
+        self._dynamodb = dynamodb
+        self.organizations_table = organizations_table
+        self.organization_users_table = organization_users_table
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[OrganizationMembership, float]]" = (
+            OrderedDict()
+        )
+        self._request_memo: contextvars.ContextVar = contextvars.ContextVar(
+            f"organization_membership_memo_{id(self)}", default=None
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def dynamodb(self) -> Any:
+        if self._dynamodb is None:
+            self._dynamodb = boto3.resource("dynamodb")
+        return self._dynamodb
+
+    @contextmanager
+    def request_scope(self) -> Iterator[None]:
+        """Memoize lookups for the duration of one request.
+
+        Nested scopes share the outermost scope's memo.
+        """
+        if self._request_memo.get() is not None:
+            yield
+            return
+
+        token = self._request_memo.set({})
+        try:
+            yield
+        finally:
+            self._request_memo.reset(token)
+
+    def resolve(self, user_id: str, organization_id: str) -> OrganizationMembership:
+        """
+        Get the organization and the user's membership row.
+
+        Args:
+            user_id: The user's ID
+            organization_id: The organization ID
+
+        Returns:
+            OrganizationMembership with the raw items (or None for missing rows)
+
+        Raises:
+            ClientError: If the lookup fails
+        """
+        key = (user_id, organization_id)
+        memo = self._request_memo.get()
+        if memo is not None and key in memo:
+            return memo[key]
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                if cached[1] > time.time():
+                    self._cache.move_to_end(key)
+                    if memo is not None:
+                        memo[key] = cached[0]
+                    return cached[0]
+                del self._cache[key]
+
+        result = self._fetch(user_id, organization_id)
+        if memo is not None:
+            memo[key] = result
+
+        with self._lock:
+            self._remember(key, result)
+        return result
+
+    def _remember(self, key: Tuple[str, str], result: OrganizationMembership) -> None:
+        """Store a result in the container cache. Caller holds the lock."""
+        if self._ttl_seconds > 0 and self._max_entries > 0:
+            self._cache[key] = (result, time.time() + self._ttl_seconds)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+
+    def resolve_many(
+        self, user_ids: List[str], organization_id: str
+    ) -> Dict[str, OrganizationMembership]:
+        """
+        Get the organization and several users' membership rows.
+
+        Pairs that are not already memoized or cached are fetched together,
+        99 memberships per BatchGetItem, and then memoized and cached as if
+        resolved one by one.
+
+        Args:
+            user_ids: The users' IDs
+            organization_id: The organization ID
+
+        Returns:
+            Dict mapping each user ID to its OrganizationMembership
+
+        Raises:
+            ClientError: If the lookup fails
+        """
+        memo = self._request_memo.get()
+        results: Dict[str, OrganizationMembership] = {}
+        missing: List[str] = []
+        now = time.time()
+
+        with self._lock:
+            for user_id in dict.fromkeys(user_ids):
+                key = (user_id, organization_id)
+                if memo is not None and key in memo:
+                    results[user_id] = memo[key]
+                    continue
+                cached = self._cache.get(key)
+                if cached is not None and cached[1] > now:
+                    self._cache.move_to_end(key)
+                    results[user_id] = cached[0]
+                else:
+                    missing.append(user_id)
+
+        for start in range(0, len(missing), MEMBERSHIPS_PER_BATCH):
+            chunk = missing[start : start + MEMBERSHIPS_PER_BATCH]
+            results.update(self._fetch_many(chunk, organization_id))
+
+        with self._lock:
+            for user_id in missing:
+                self._remember((user_id, organization_id), results[user_id])
+        if memo is not None:
+            for user_id, result in results.items():
+                memo[(user_id, organization_id)] = result
+        return results
+
+    def invalidate(
+        self, user_id: Optional[str] = None, organization_id: Optional[str] = None
+    ) -> int:
+        """
+        Drop cached rows after an organization or membership change.
+
+        With both arguments, drops one pair; with one, every pair for that
+        user or organization; with neither, everything.
+
+        Returns:
+            Number of cache entries removed
+        """
+        with self._lock:
+            keys = [
+                key
+                for key in self._cache
+                if (user_id is None or key[0] == user_id)
+                and (organization_id is None or key[1] == organization_id)
+            ]
+            for key in keys:
+                del self._cache[key]
+
+        # A change made during this request must be visible to later checks
+        memo = self._request_memo.get()
+        if memo:
+            for key in list(memo):
+                if (user_id is None or key[0] == user_id) and (
+                    organization_id is None or key[1] == organization_id
+                ):
+                    del memo[key]
+        if keys:
+            logger.info(f"Invalidated {len(keys)} cached organization memberships")
+        return len(keys)
+
+    def _fetch(self, user_id: str, organization_id: str) -> OrganizationMembership:
+        """Fetch the organization and membership rows in one BatchGetItem."""
+        return self._fetch_many([user_id], organization_id)[user_id]
+
+    def _fetch_many(
+        self, user_ids: List[str], organization_id: str
+    ) -> Dict[str, OrganizationMembership]:
+        """Fetch the organization and up to 99 membership rows in one BatchGetItem."""
+        request_items: Dict[str, Any] = {
+            self.organizations_table: {"Keys": [{"organizationId": organization_id}]},
+            self.organization_users_table: {
+                "Keys": [
+                    {"userId": user_id, "organizationId": organization_id} for user_id in user_ids
+                ]
+            },
+        }
+        organization = None
+        memberships: Dict[str, Dict[str, Any]] = {}
+
+        for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+            if attempt:
+                time.sleep(random.uniform(0, 0.05 * 2**attempt))
+
+            response = self.dynamodb.batch_get_item(RequestItems=request_items)
+            responses = response.get("Responses", {})
+            for item in responses.get(self.organizations_table, []):
+                organization = item
+            for item in responses.get(self.organization_users_table, []):
+                memberships[item["userId"]] = item
+
+            request_items = response.get("UnprocessedKeys") or {}
+            if not request_items:
+                return {
+                    user_id: OrganizationMembership(
+                        organization=organization, membership=memberships.get(user_id)
+                    )
+                    for user_id in user_ids
+                }
+
+        raise RuntimeError(
+            f"Organization membership lookup for {organization_id} left unprocessed keys"
+        )
+
+
+_resolver: Optional[OrganizationMembershipResolver] = None
+
+
+def get_membership_resolver() -> OrganizationMembershipResolver:
+    """Get the container-wide resolver (persists across warm invocations)."""
+    global _resolver
+    if _resolver is None:
+        _resolver = OrganizationMembershipResolver()
+    return _resolver
@@ -3,19 +3,70 @@
 # created: 2025-06-23
 # description: GDPR/CCPA compliance framework with automated privacy rights management
 
+import gzip
 import json
 import logging
 import hashlib
+import os
+import random
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from decimal import Decimal
+from functools import partial
+from typing import (
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 from enum import Enum
 from dataclasses import dataclass
 
 import boto3
+from boto3.dynamodb.conditions import Attr, Key
 
 logger = logging.getLogger(__name__)
 
+# Tables searched concurrently during personal data discovery
+PRIVACY_DISCOVERY_CONCURRENCY = int(os.environ.get("PRIVACY_DISCOVERY_CONCURRENCY", "5"))
+
+# Parallel scan segments for lookups that no key or index can serve
+PRIVACY_SCAN_SEGMENTS = int(os.environ.get("PRIVACY_SCAN_SEGMENTS", "4"))
+
+# Concurrent deletion work units (delete batches and record updates)
+PRIVACY_DELETION_CONCURRENCY = int(os.environ.get("PRIVACY_DELETION_CONCURRENCY", "8"))
+
+# BatchWriteItem accepts at most 25 requests
+BATCH_WRITE_CHUNK_SIZE = 25
+
+# Retries for UnprocessedItems, with jittered exponential backoff
+BATCH_WRITE_MAX_RETRIES = int(os.environ.get("BATCH_WRITE_MAX_RETRIES", "8"))
+BATCH_WRITE_BASE_DELAY_SECONDS = 0.05
+BATCH_WRITE_MAX_DELAY_SECONDS = 2.0
+
+# Failed results kept in a deletion summary. The rest are only counted (and
+# passed to the result sink), so a checkpointed summary stays well under the
+# 400 KB DynamoDB item limit however many records fail.
+DELETION_MAX_FAILED_RESULTS = int(os.environ.get("PRIVACY_DELETION_MAX_FAILED_RESULTS", "100"))
+
+# How the deletion proof's verification hashes digest is built (see DeletionProgress)
+VERIFICATION_HASH_ORDER = (
+    "SHA-256 chain over verification hashes in deletion plan order, "
+    "the order in which per-record results are passed to the result sink"
+)
+
+# Fields that hold a user ID rather than an email address
+USER_ID_FIELDS = ["userId", "ownerId", "recipientUserId", "senderUserId"]
+
 
 class PrivacyRequestType(Enum):
     """Types of privacy rights requests."""
@@ -74,10 +125,44 @@ class PersonalDataRecord:
     record_id: str
     data_category: DataCategory
     data_fields: Dict[str, Any]
-    created_at: datetime
-    last_updated: datetime
+    created_at: Optional[datetime]
+    last_updated: Optional[datetime]
     retention_policy: str
     legal_basis: str
+    primary_key: Optional[Dict[str, Any]] = None  # Table key of the source item, when known
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain form of the record, for persisting it between invocations."""
+        return {
+            "system_name": self.system_name,
+            "table_name": self.table_name,
+            "record_id": self.record_id,
+            "data_category": self.data_category.value,
+            "data_fields": self.data_fields,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "last_updated": self.last_updated.isoformat() if self.last_updated else None,
+            "retention_policy": self.retention_policy,
+            "legal_basis": self.legal_basis,
+            "primary_key": self.primary_key,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PersonalDataRecord":
+        """Rebuild a record from to_dict output."""
+        return cls(
+            system_name=data["system_name"],
+            table_name=data["table_name"],
+            record_id=data["record_id"],
+            data_category=DataCategory(data["data_category"]),
+            data_fields=data["data_fields"],
+            created_at=datetime.fromisoformat(data["created_at"]) if data["created_at"] else None,
+            last_updated=(
+                datetime.fromisoformat(data["last_updated"]) if data["last_updated"] else None
+            ),
+            retention_policy=data["retention_policy"],
+            legal_basis=data["legal_basis"],
+            primary_key=data.get("primary_key"),
+        )
 
 
 @dataclass
@@ -92,6 +177,108 @@ class DataDiscoveryResult:
     data_categories: List[DataCategory]
 
 
+def json_default(value: Any) -> Any:
+    """Encode DynamoDB values that json cannot (numbers and sets)."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class PortableDataExporter:
+    """Streams personal data records to a file-like sink as newline-delimited JSON.
+
+    Each record is encoded and written as it arrives, optionally through
+    gzip, so an export never holds more than one record in memory. Records
+    are expected one table at a time (the order discovery produces them
+    in). Only per-table record counts, categories and running SHA-256
+    hashes of the uncompressed lines are kept, and returned as the manifest
+    by close().
+    """
+
+    CONTENT_TYPE = "application/x-ndjson"
+
+    def __init__(self, sink: BinaryIO, compress: bool = False):
+        self.compress = compress
+        self._stream = gzip.GzipFile(fileobj=sink, mode="wb") if compress else sink
+        self._export_hash = hashlib.sha256()
+        self._tables: Dict[str, Dict[str, Any]] = {}
+        self._bytes_written = 0
+
+    def write_records(self, records: Iterable[PersonalDataRecord]) -> None:
+        """Write each record as one JSON line."""
+        for record in records:
+            self.write_record(record)
+
+    def write_record(self, record: PersonalDataRecord) -> None:
+        """Write a record as one JSON line."""
+        line = (
+            json.dumps(
+                {
+                    "table": record.table_name,
+                    "system": record.system_name,
+                    "record_id": record.record_id,
+                    "data_category": record.data_category.value,
+                    "data": record.data_fields,
+                    "created_at": record.created_at.isoformat() if record.created_at else None,
+                    "last_updated": (
+                        record.last_updated.isoformat() if record.last_updated else None
+                    ),
+                    "retention_policy": record.retention_policy,
+                    "legal_basis": record.legal_basis,
+                },
+                default=json_default,
+                sort_keys=True,
+            ).encode("utf-8")
+            + b"\n"
+        )
+
+        table = self._tables.get(record.table_name)
+        if table is None:
+            table = self._tables[record.table_name] = {
+                "system": record.system_name,
+                "record_count": 0,
+                "data_categories": set(),
+                "hash": hashlib.sha256(),
+            }
+        table["record_count"] += 1
+        table["data_categories"].add(record.data_category.value)
+        table["hash"].update(line)
+
+        self._export_hash.update(line)
+        self._bytes_written += len(line)
+        self._stream.write(line)
+
+    def close(self) -> Dict[str, Any]:
+        """Finish the export and return its manifest.
+
+        The sink itself is left open so the caller can upload it.
+        """
+        if self.compress:
+            self._stream.close()
+
+        tables = [
+            {
+                "table": table_name,
+                "system": table["system"],
+                "record_count": table["record_count"],
+                "data_categories": sorted(table["data_categories"]),
+                "sha256": table["hash"].hexdigest(),
+            }
+            for table_name, table in self._tables.items()
+        ]
+        return {
+            "format": "NDJSON",
+            "content_type": self.CONTENT_TYPE,
+            "compression": "gzip" if self.compress else None,
+            "total_records": sum(table["record_count"] for table in tables),
+            "uncompressed_bytes": self._bytes_written,
+            "sha256": self._export_hash.hexdigest(),
+            "tables": tables,
+        }
+
+
 class DataDiscoveryEngine:
     """Automated discovery of personal data across organization systems."""
 
@@ -114,36 +301,37 @@ class DataDiscoveryEngine:
 
         discovery_start = datetime.utcnow()
         all_records = []
-        systems_scanned = []
+        systems_scanned = list(self.data_mappers)
 
         # First, resolve the data subject's user ID
         user_id = self._resolve_user_id_from_email(data_subject_email)
 
-        for system_name, mapper in self.data_mappers.items():
+        # Organization-scoped lookups (find_by_organization) match a subset of
+        # find_by_user_id, so they are not repeated here; organization_id is
+        # kept for callers.
+        def discover_system(system: Tuple[str, "DynamoDBDataMapper"]) -> List[PersonalDataRecord]:
+            system_name, mapper = system
             try:
-                systems_scanned.append(system_name)
-
                 # Discover data by email
-                email_records = mapper.find_by_email(data_subject_email)
-                all_records.extend(email_records)
+                records = mapper.find_by_email(data_subject_email)
 
                 # If we have user ID, discover data by user ID
                 if user_id:
-                    user_id_records = mapper.find_by_user_id(user_id)
-                    all_records.extend(user_id_records)
-
-                # If organization context provided, scope to organization
-                if organization_id:
-                    org_records = mapper.find_by_organization(user_id, organization_id)
-                    all_records.extend(org_records)
+                    records.extend(mapper.find_by_user_id(user_id))
 
-                logger.info(
-                    f"Found {len(email_records + (user_id_records if user_id else []))} records in {system_name}"
-                )
+                logger.info(f"Found {len(records)} records in {system_name}")
+                return records
 
             except Exception as e:
                 logger.error(f"Data discovery failed for {system_name}: {str(e)}")
                 # Continue with other systems even if one fails
+                return []
+
+        systems = list(self.data_mappers.items())
+        workers = max(1, min(PRIVACY_DISCOVERY_CONCURRENCY, len(systems)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for records in executor.map(discover_system, systems):
+                all_records.extend(records)
 
         # Deduplicate records
         unique_records = self._deduplicate_records(all_records)
@@ -160,6 +348,56 @@ class DataDiscoveryEngine:
             data_categories=data_categories,
         )
 
+    def plan_discovery(self, data_subject_email: str) -> Dict[str, Any]:
+        """Plan discovery as independent work units for chunked processing.
+
+        Each unit is one lookup on one table (one segment, for lookups that
+        fall back to a scan) and is read a page at a time with
+        discover_page. Units never overlap: a table searched by email is
+        not searched again by the user ID resolved from that email.
+
+        Returns:
+            dict with 'userId' (resolved user ID or None) and 'units'
+
+        Raises:
+            ClientError: If the user ID lookup fails, so the request is retried
+                rather than planned without the tables keyed by user ID
+        """
+        user_id = self._resolve_user_id_from_email(data_subject_email)
+
+        units = []
+        for system_name, mapper in self.data_mappers.items():
+            for conditions in mapper.lookups(data_subject_email, user_id):
+                total_segments = mapper.scan_segments(conditions)
+                for segment in range(total_segments):
+                    units.append(
+                        {
+                            "table": system_name,
+                            "conditions": conditions,
+                            "segment": segment,
+                            "totalSegments": total_segments,
+                        }
+                    )
+
+        return {"userId": user_id, "units": units}
+
+    def discover_page(
+        self, unit: Dict[str, Any], exclusive_start_key: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[PersonalDataRecord], Optional[Dict[str, Any]]]:
+        """Read one page of a work unit from plan_discovery.
+
+        Returns:
+            (records, last_evaluated_key); the unit is finished when
+            last_evaluated_key is None
+        """
+        mapper = self.data_mappers[unit["table"]]
+        return mapper.find_page(
+            unit["conditions"],
+            exclusive_start_key,
+            segment=int(unit.get("segment", 0)),
+            total_segments=int(unit.get("totalSegments", 1)),
+        )
+
     def _create_organization_mapper(self):
         """Create data mapper for Organizations table."""
         return DynamoDBDataMapper(
@@ -167,6 +405,11 @@ class DataDiscoveryEngine:
             email_field="ownerId",  # Owner email resolution needed
             data_category=DataCategory.COMMERCIAL_INFO,
             personal_data_fields=["name", "description", "ownerId"],
+            key_schema=("organizationId", None),
+            indexes={
+                "OwnerIndex": ("ownerId", "createdAt"),
+                "StatusCreatedIndex": ("status", "createdAt"),
+            },
         )
 
     def _create_organization_users_mapper(self):
@@ -176,6 +419,11 @@ class DataDiscoveryEngine:
             email_field="userId",  # User ID resolution needed
             data_category=DataCategory.PROFESSIONAL_INFO,
             personal_data_fields=["userId", "organizationId", "role", "invitedAt"],
+            key_schema=("userId", "organizationId"),
+            indexes={
+                "OrganizationMembersIndex": ("organizationId", "role"),
+                "UserOrganizationsIndex": ("userId", "role"),
+            },
         )
 
     def _create_applications_mapper(self):
@@ -185,6 +433,8 @@ class DataDiscoveryEngine:
             email_field="userId",  # User ID resolution needed
             data_category=DataCategory.COMMERCIAL_INFO,
             personal_data_fields=["name", "description", "userId", "organizationId"],
+            key_schema=("applicationId", None),
+            indexes={"OrganizationAppsIndex": ("organizationId", "createdAt")},
         )
 
     def _create_users_mapper(self):
@@ -200,6 +450,12 @@ class DataDiscoveryEngine:
                 "createdAt",
                 "lastLoginAt",
             ],
+            key_schema=("userId", None),
+            indexes={
+                "EmailIndex": ("email", None),
+                "CognitoIdIndex": ("cognitoId", None),
+                "CognitoSubIndex": ("cognitoSub", None),
+            },
         )
 
     def _create_notifications_mapper(self):
@@ -214,34 +470,54 @@ class DataDiscoveryEngine:
                 "recipientUserId",
                 "senderUserId",
             ],
+            key_schema=("notificationId", None),
+            indexes={
+                "UserNotificationsIndex": ("recipientUserId", "createdAt"),
+                "TypeStatusIndex": ("type", "status"),
+            },
         )
 
     def _resolve_user_id_from_email(self, email: str) -> Optional[str]:
-        """Resolve user ID from email address."""
-        try:
-            users_table = self.dynamodb.Table("Users")
-            response = users_table.scan(
-                FilterExpression=boto3.dynamodb.conditions.Attr("email").eq(email)
-            )
-
-            users = response.get("Items", [])
-            if users:
-                return users[0]["userId"]
+        """Resolve user ID from email address.
+
+        Returns None only when no user has the email. Lookup errors are
+        raised: planning without the user ID would silently leave out
+        every table searched by it.
+        """
+        users_table = self.dynamodb.Table("Users")
+        response = users_table.query(
+            IndexName="EmailIndex",
+            KeyConditionExpression=Key("email").eq(email),
+            Limit=1,
+        )
 
-            return None
+        users = response.get("Items", [])
+        if users:
+            return users[0]["userId"]
 
-        except Exception as e:
-            logger.error(f"Error resolving user ID from email {email}: {str(e)}")
-            return None
+        return None
 
     def _deduplicate_records(self, records: List[PersonalDataRecord]) -> List[PersonalDataRecord]:
-        """Remove duplicate records based on system, table, and record ID."""
+        """Remove duplicate records based on system, table, and primary key.
+
+        Falls back to the record ID when the primary key is unknown. Rows of
+        composite-key tables (one OrganizationUsers row per organization)
+        share a record ID, so the record ID alone is not enough.
+        """
 
         seen = set()
         unique_records = []
 
         for record in records:
-            record_key = (record.system_name, record.table_name, record.record_id)
+            record_key = (
+                record.system_name,
+                record.table_name,
+                (
+                    tuple(sorted(record.primary_key.items()))
+                    if record.primary_key
+                    else record.record_id
+                ),
+            )
             if record_key not in seen:
                 seen.add(record_key)
                 unique_records.append(record)
@@ -250,7 +526,14 @@ class DataDiscoveryEngine:
 
 
 class DynamoDBDataMapper:
-    """Maps personal data discovery to DynamoDB tables."""
+    """Maps personal data discovery to DynamoDB tables.
+
+    Lookups are planned against the table's key schema and GSIs: a query on
+    the base table or an index whose partition key is one of the lookup
+    attributes, with any other attributes as a filter. Only lookups that no
+    key or index can serve fall back to a parallel segmented scan. Every
+    query and scan follows LastEvaluatedKey to the end.
+    """
 
     def __init__(
         self,
@@ -258,11 +541,15 @@ class DynamoDBDataMapper:
         email_field: str,
         data_category: DataCategory,
         personal_data_fields: List[str],
+        key_schema: Tuple[Optional[str], Optional[str]] = (None, None),
+        indexes: Optional[Dict[str, Tuple[str, Optional[str]]]] = None,
     ):
         self.table_name = table_name
         self.email_field = email_field
         self.data_category = data_category
         self.personal_data_fields = personal_data_fields
+        self.key_schema = key_schema
+        self.indexes = indexes or {}
         self.dynamodb = boto3.resource("dynamodb")
         self.table = self.dynamodb.Table(table_name)
 
@@ -271,14 +558,10 @@ class DynamoDBDataMapper:
         try:
             # If email field is direct email
             if self.email_field == "email":
-                response = self.table.scan(
-                    FilterExpression=boto3.dynamodb.conditions.Attr("email").eq(email)
-                )
-            else:
-                # Email field needs resolution (userId to email lookup)
-                return []  # Handle in find_by_user_id
+                return self._find({"email": email})
 
-            return self._convert_to_personal_data_records(response.get("Items", []))
+            # Email field needs resolution (userId to email lookup)
+            return []  # Handle in find_by_user_id
 
         except Exception as e:
             logger.error(f"Error finding by email in {self.table_name}: {str(e)}")
@@ -287,17 +570,8 @@ class DynamoDBDataMapper:
     def find_by_user_id(self, user_id: str) -> List[PersonalDataRecord]:
         """Find records by user ID."""
         try:
-            if self.email_field in [
-                "userId",
-                "ownerId",
-                "recipientUserId",
-                "senderUserId",
-            ]:
-                response = self.table.scan(
-                    FilterExpression=boto3.dynamodb.conditions.Attr(self.email_field).eq(user_id)
-                )
-
-                return self._convert_to_personal_data_records(response.get("Items", []))
+            if self.email_field in USER_ID_FIELDS:
+                return self._find({self.email_field: user_id})
 
             return []
 
@@ -309,22 +583,176 @@ class DynamoDBDataMapper:
         """Find records by user ID within organization context."""
         try:
             # Only relevant for tables with organizationId field
-            if "organizationId" not in self.personal_data_fields:
+            if "organizationId" not in self.personal_data_fields or not user_id:
                 return []
 
-            response = self.table.scan(
-                FilterExpression=boto3.dynamodb.conditions.Attr("organizationId").eq(
-                    organization_id
-                )
-                & boto3.dynamodb.conditions.Attr(self.email_field).eq(user_id)
-            )
-
-            return self._convert_to_personal_data_records(response.get("Items", []))
+            return self._find({"organizationId": organization_id, self.email_field: user_id})
 
         except Exception as e:
             logger.error(f"Error finding by organization in {self.table_name}: {str(e)}")
             return []
 
+    def lookups(self, email: str, user_id: Optional[str]) -> List[Dict[str, Any]]:
+        """Attribute conditions that locate the data subject's rows in this table."""
+        if self.email_field == "email":
+            return [{"email": email}]
+        if user_id and self.email_field in USER_ID_FIELDS:
+            return [{self.email_field: user_id}]
+        return []
+
+    def scan_segments(self, conditions: Dict[str, Any]) -> int:
+        """Number of segments a lookup is split into (1 unless it needs a scan)."""
+        if self.plan_lookup(conditions)[1] is not None:
+            return 1
+        return max(1, PRIVACY_SCAN_SEGMENTS)
+
+    def find_page(
+        self,
+        conditions: Dict[str, Any],
+        exclusive_start_key: Optional[Dict[str, Any]] = None,
+        segment: int = 0,
+        total_segments: int = 1,
+    ) -> Tuple[List[PersonalDataRecord], Optional[Dict[str, Any]]]:
+        """Read one page of a lookup, resuming from exclusive_start_key.
+
+        Returns:
+            (records, last_evaluated_key); last_evaluated_key is None on the
+            final page
+        """
+        index_name, partition_key, sort_key = self.plan_lookup(conditions)
+
+        if partition_key is None:
+            request_kwargs: Dict[str, Any] = {"FilterExpression": self._equals_all(conditions)}
+            if total_segments > 1:
+                request_kwargs.update(Segment=segment, TotalSegments=total_segments)
+        else:
+            request_kwargs = self._query_kwargs(conditions, index_name, partition_key, sort_key)
+        if exclusive_start_key:
+            request_kwargs["ExclusiveStartKey"] = exclusive_start_key
+
+        if partition_key is None:
+            response = self.table.scan(**request_kwargs)
+        else:
+            response = self.table.query(**request_kwargs)
+
+        return (
+            self._convert_to_personal_data_records(response.get("Items", [])),
+            response.get("LastEvaluatedKey"),
+        )
+
+    def plan_lookup(
+        self, conditions: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Choose how to find items whose attributes equal the given values.
+
+        Picks the base table or a GSI whose partition key is one of the
+        attributes, preferring one whose sort key is also an attribute, and
+        the base table over an index on a tie.
+
+        Returns:
+            (index_name, partition_key, sort_key): index_name is None for the
+            base table, sort_key is None unless it is part of the key
+            condition, and partition_key is None when the table must be
+            scanned.
+        """
+        best = None
+        for index_name, (partition_key, sort_key) in [(None, self.key_schema)] + list(
+            self.indexes.items()
+        ):
+            if partition_key not in conditions:
+                continue
+            score = 2 if sort_key in conditions else 1
+            if best is None or score > best[0]:
+                best = (score, index_name, partition_key, sort_key)
+
+        if best is None:
+            return None, None, None
+
+        _, index_name, partition_key, sort_key = best
+        return index_name, partition_key, sort_key if sort_key in conditions else None
+
+    def _find(self, conditions: Dict[str, Any]) -> List[PersonalDataRecord]:
+        """Find records whose attributes equal the given values."""
+        index_name, partition_key, sort_key = self.plan_lookup(conditions)
+
+        if partition_key is None:
+            items = self._parallel_scan(self._equals_all(conditions))
+        else:
+            items = self._query_all_pages(
+                **self._query_kwargs(conditions, index_name, partition_key, sort_key)
+            )
+
+        return self._convert_to_personal_data_records(items)
+
+    def _query_kwargs(
+        self,
+        conditions: Dict[str, Any],
+        index_name: Optional[str],
+        partition_key: str,
+        sort_key: Optional[str],
+    ) -> Dict[str, Any]:
+        """Build query arguments for a lookup planned by plan_lookup."""
+        key_condition = Key(partition_key).eq(conditions[partition_key])
+        if sort_key:
+            key_condition = key_condition & Key(sort_key).eq(conditions[sort_key])
+        query_kwargs: Dict[str, Any] = {"KeyConditionExpression": key_condition}
+        if index_name:
+            query_kwargs["IndexName"] = index_name
+        remaining = {
+            attribute: value
+            for attribute, value in conditions.items()
+            if attribute not in (partition_key, sort_key)
+        }
+        if remaining:
+            query_kwargs["FilterExpression"] = self._equals_all(remaining)
+        return query_kwargs
+
+    def _equals_all(self, conditions: Dict[str, Any]):
+        """Build a filter expression requiring every attribute to match."""
+        expression = None
+        for attribute, value in conditions.items():
+            condition = Attr(attribute).eq(value)
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def _query_all_pages(self, **query_kwargs: Any) -> List[Dict]:
+        """Run a query and follow LastEvaluatedKey until all pages are read."""
+        response = self.table.query(**query_kwargs)
+        items = response.get("Items", [])
+        while "LastEvaluatedKey" in response:
+            response = self.table.query(
+                ExclusiveStartKey=response["LastEvaluatedKey"], **query_kwargs
+            )
+            items.extend(response.get("Items", []))
+        return items
+
+    def _parallel_scan(self, filter_expression) -> List[Dict]:
+        """Scan the table in PRIVACY_SCAN_SEGMENTS concurrent segments."""
+        total_segments = max(1, PRIVACY_SCAN_SEGMENTS)
+
+        def scan_segment(segment: int) -> List[Dict]:
+            # One Table per worker on the shared resource
+            table = self.dynamodb.Table(self.table_name)
+            scan_kwargs = {
+                "FilterExpression": filter_expression,
+                "Segment": segment,
+                "TotalSegments": total_segments,
+            }
+            response = table.scan(**scan_kwargs)
+            items = response.get("Items", [])
+            while "LastEvaluatedKey" in response:
+                response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"], **scan_kwargs)
+                items.extend(response.get("Items", []))
+            return items
+
+        logger.info(f"No key or index serves this lookup; scanning {self.table_name}")
+        with ThreadPoolExecutor(max_workers=total_segments) as executor:
+            return [
+                item
+                for items in executor.map(scan_segment, range(total_segments))
+                for item in items
+            ]
+
     def _convert_to_personal_data_records(self, items: List[Dict]) -> List[PersonalDataRecord]:
         """Convert DynamoDB items to PersonalDataRecord objects."""
 
@@ -349,12 +777,20 @@ class DynamoDBDataMapper:
                 last_updated=self._parse_timestamp(item.get("updatedAt")),
                 retention_policy=self._get_retention_policy(),
                 legal_basis=self._get_legal_basis(),
+                primary_key=self._get_primary_key(item),
             )
 
             records.append(record)
 
         return records
 
+    def _get_primary_key(self, item: Dict) -> Optional[Dict[str, Any]]:
+        """Get the table key of an item, if the key schema is known."""
+        key_names = [name for name in self.key_schema if name]
+        if not key_names or any(name not in item for name in key_names):
+            return None
+        return {name: item[name] for name in key_names}
+
     def _get_record_id(self, item: Dict) -> str:
         """Get primary key for the record."""
         # Common primary key patterns
@@ -407,6 +843,83 @@ class DynamoDBDataMapper:
         return legal_basis_map.get(self.table_name, "CONTRACT")
 
 
+class DeletionProgress:
+    """Running summary of per-record deletion results.
+
+    Folds results into counts and a digest of verification hashes as they
+    arrive, so memory does not grow with the number of records. Only the
+    first DELETION_MAX_FAILED_RESULTS failures are kept, for reporting;
+    records_failed counts them all. The digest is a hash chain, so the
+    summary can be saved with to_state and resumed with from_state.
+
+    PrivacyDeletionEngine adds results in deletion plan order rather than
+    the order concurrent deletions finish in, so the digest is
+    deterministic. Hashes are chained in the order they are passed to the
+    result sink, so a verifier holding them can recompute the digest.
+    """
+
+    def __init__(self, result_sink: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.records_processed = 0
+        self.records_deleted = 0
+        self.deletion_methods: Set[str] = set()
+        self.failed_results: List[Dict[str, Any]] = []
+        self.verification_hash_count = 0
+        # SHA-256 chained over every verification hash, in VERIFICATION_HASH_ORDER
+        self.verification_hashes_digest = ""
+        self._result_sink = result_sink
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """Record one per-record result and pass it to the result sink."""
+        self.records_processed += 1
+        self.deletion_methods.add(result.get("deletion_method", "UNKNOWN"))
+
+        if result["status"] == "SUCCESS":
+            self.records_deleted += 1
+        elif len(self.failed_results) < DELETION_MAX_FAILED_RESULTS:
+            self.failed_results.append(result)
+
+        if result.get("verification_hash"):
+            self.verification_hashes_digest = hashlib.sha256(
+                (self.verification_hashes_digest + result["verification_hash"]).encode()
+            ).hexdigest()
+            self.verification_hash_count += 1
+
+        if self._result_sink:
+            self._result_sink(result)
+
+    @property
+    def records_failed(self) -> int:
+        """Records that could not be deleted, including any beyond failed_results."""
+        return self.records_processed - self.records_deleted
+
+    def to_state(self) -> Dict[str, Any]:
+        """Summary as a plain dict, for checkpointing."""
+        return {
+            "recordsProcessed": self.records_processed,
+            "recordsDeleted": self.records_deleted,
+            "deletionMethods": sorted(self.deletion_methods),
+            "failedResults": self.failed_results,
+            "verificationHashCount": self.verification_hash_count,
+            "verificationHashesDigest": self.verification_hashes_digest,
+        }
+
+    @classmethod
+    def from_state(
+        cls,
+        state: Dict[str, Any],
+        result_sink: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> "DeletionProgress":
+        """Resume a summary saved with to_state."""
+        progress = cls(result_sink)
+        progress.records_processed = int(state["recordsProcessed"])
+        progress.records_deleted = int(state["recordsDeleted"])
+        progress.deletion_methods = set(state["deletionMethods"])
+        progress.failed_results = list(state["failedResults"])
+        progress.verification_hash_count = int(state["verificationHashCount"])
+        progress.verification_hashes_digest = state["verificationHashesDigest"]
+        return progress
+
+
 class PrivacyDeletionEngine:
     """Automated deletion engine with GDPR/CCPA compliance."""
 
@@ -416,13 +929,22 @@ class PrivacyDeletionEngine:
         self.kms_client = boto3.client("kms")
 
     def execute_data_deletion(
-        self, data_subject_email: str, organization_id: str = None
+        self,
+        data_subject_email: str,
+        organization_id: str = None,
+        result_sink: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> Dict[str, Any]:
-        """Execute comprehensive data deletion with verification."""
+        """Execute comprehensive data deletion with verification.
 
-        deletion_id = (
-            f"del_{int(time.time())}_{hashlib.md5(data_subject_email.encode()).hexdigest()[:8]}"
-        )
+        Hard deletes are sent as BatchWriteItem requests of up to 25 keys, and
+        anonymization/pseudonymization updates run on a bounded thread pool.
+        Per-record results are streamed to result_sink (if given) and into
+        the deletion proof rather than returned; records_failed counts the
+        records that could not be deleted and failed_results lists the first
+        DELETION_MAX_FAILED_RESULTS of them.
+        """
+
+        deletion_id = self.new_deletion_id(data_subject_email)
 
         logger.info(f"Starting data deletion {deletion_id} for {data_subject_email}")
 
@@ -440,53 +962,180 @@ class PrivacyDeletionEngine:
                 "records_deleted": 0,
             }
 
-        # Step 2: Execute deletion by system
-        deletion_results = []
-        total_deleted = 0
+        # Step 2: Execute deletion in batches, streaming per-record results
+        progress = DeletionProgress(result_sink)
+        self.delete_records(discovery_result.records_found, progress)
 
-        for record in discovery_result.records_found:
-            try:
-                deletion_result = self._delete_personal_data_record(record)
-                deletion_results.append(deletion_result)
+        # Steps 3 and 4: backup systems and proof of deletion
+        return self.complete_deletion(
+            deletion_id, data_subject_email, discovery_result.total_records, progress
+        )
 
-                if deletion_result["status"] == "SUCCESS":
-                    total_deleted += 1
+    def new_deletion_id(self, data_subject_email: str) -> str:
+        """Generate an ID for a deletion run."""
+        return f"del_{int(time.time())}_{hashlib.md5(data_subject_email.encode()).hexdigest()[:8]}"
 
-            except Exception as e:
-                logger.error(f"Failed to delete record {record.record_id}: {str(e)}")
-                deletion_results.append(
-                    {
-                        "record_id": record.record_id,
-                        "table_name": record.table_name,
-                        "status": "FAILED",
-                        "error": str(e),
-                    }
-                )
+    def delete_records(
+        self, records: Iterable[PersonalDataRecord], progress: DeletionProgress
+    ) -> None:
+        """Delete, anonymize or pseudonymize records, adding the results to progress.
+
+        Results are streamed into progress in plan order. Can be called once
+        per chunk of records, so a large deletion can be spread over several
+        invocations.
+        """
+        for result in self._execute_deletions(records):
+            progress.add(result)
+
+    def complete_deletion(
+        self,
+        deletion_id: str,
+        data_subject_email: str,
+        total_records_found: int,
+        progress: DeletionProgress,
+    ) -> Dict[str, Any]:
+        """Delete from backup systems and build the final result with its proof."""
 
         # Step 3: Delete from backup systems
         backup_deletion_result = self._delete_from_backup_systems(data_subject_email)
 
         # Step 4: Generate cryptographic proof of deletion
         deletion_proof = self._generate_deletion_proof(
-            deletion_id, data_subject_email, discovery_result, deletion_results
+            deletion_id, data_subject_email, total_records_found, progress
         )
 
         return {
             "deletion_id": deletion_id,
             "data_subject_email": data_subject_email,
             "deletion_timestamp": datetime.utcnow().isoformat(),
-            "total_records_found": discovery_result.total_records,
-            "records_deleted": total_deleted,
-            "deletion_results": deletion_results,
+            "total_records_found": total_records_found,
+            "records_deleted": progress.records_deleted,
+            "records_failed": progress.records_failed,
+            "failed_results": progress.failed_results,
             "backup_deletion": backup_deletion_result,
             "deletion_proof": deletion_proof,
             "compliance_status": {
-                "gdpr_compliant": total_deleted == discovery_result.total_records,
-                "ccpa_compliant": total_deleted == discovery_result.total_records,
+                "gdpr_compliant": progress.records_deleted == total_records_found,
+                "ccpa_compliant": progress.records_deleted == total_records_found,
                 "deletion_verified": True,
             },
         }
 
+    def _execute_deletions(self, records: Iterable[PersonalDataRecord]) -> Iterator[Dict[str, Any]]:
+        """Run deletion work units concurrently and yield per-record results.
+
+        Results are yielded in plan order, not completion order: the oldest
+        unit is waited on first while later ones keep running. At most twice
+        PRIVACY_DELETION_CONCURRENCY units are in flight, so memory stays
+        bounded however many records there are.
+        """
+        workers = max(1, PRIVACY_DELETION_CONCURRENCY)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending: Deque[Future] = deque()
+            for work_unit in self._plan_deletions(records):
+                pending.append(executor.submit(work_unit))
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+
+    def _plan_deletions(
+        self, records: Iterable[PersonalDataRecord]
+    ) -> Iterator[Callable[[], List[Dict[str, Any]]]]:
+        """Split records into work units: delete batches per table and single updates."""
+        hard_deletes: Dict[str, List[PersonalDataRecord]] = {}
+
+        for record in records:
+            if self._deletion_method(record) != "HARD_DELETE":
+                yield partial(self._delete_record_unit, record)
+                continue
+
+            batch = hard_deletes.setdefault(record.table_name, [])
+            batch.append(record)
+            if len(batch) == BATCH_WRITE_CHUNK_SIZE:
+                del hard_deletes[record.table_name]
+                yield partial(self._batch_hard_delete, record.table_name, batch)
+
+        for table_name, batch in hard_deletes.items():
+            yield partial(self._batch_hard_delete, table_name, batch)
+
+    def _delete_record_unit(self, record: PersonalDataRecord) -> List[Dict[str, Any]]:
+        """Delete or anonymize one record as a single-result work unit."""
+        return [self._delete_personal_data_record(record)]
+
+    def _batch_hard_delete(
+        self, table_name: str, records: List[PersonalDataRecord]
+    ) -> List[Dict[str, Any]]:
+        """Hard delete up to 25 records of one table with BatchWriteItem.
+
+        UnprocessedItems are retried with jittered exponential backoff;
+        records still unprocessed after BATCH_WRITE_MAX_RETRIES are reported
+        as failed. A rejected request (for example, a malformed key) falls
+        back to per-record deletes so one bad record cannot fail the batch.
+        """
+        # Duplicate keys are not allowed in one BatchWriteItem request
+        records_by_key: Dict[Tuple, Tuple[Dict[str, Any], List[PersonalDataRecord]]] = {}
+        for record in records:
+            key = self._build_delete_key(record)
+            key_id = tuple(sorted((name, str(value)) for name, value in key.items()))
+            records_by_key.setdefault(key_id, (key, []))[1].append(record)
+
+        request_items = {
+            table_name: [{"DeleteRequest": {"Key": key}} for key, _ in records_by_key.values()]
+        }
+
+        try:
+            for attempt in range(BATCH_WRITE_MAX_RETRIES + 1):
+                if attempt:
+                    # Full jitter spreads retries from concurrent batches apart
+                    delay = min(
+                        BATCH_WRITE_MAX_DELAY_SECONDS,
+                        BATCH_WRITE_BASE_DELAY_SECONDS * 2 ** (attempt - 1),
+                    )
+                    time.sleep(random.uniform(0, delay))
+
+                response = self.dynamodb.batch_write_item(RequestItems=request_items)
+                request_items = response.get("UnprocessedItems") or {}
+                if not request_items:
+                    break
+
+        except Exception as e:
+            logger.warning(
+                f"Batch delete in {table_name} rejected, deleting records one by one: {e}"
+            )
+            return [self._delete_personal_data_record(record) for record in records]
+
+        unprocessed = {
+            tuple(
+                sorted(
+                    (name, str(value)) for name, value in request["DeleteRequest"]["Key"].items()
+                )
+            )
+            for request in request_items.get(table_name, [])
+        }
+        if unprocessed:
+            logger.error(
+                f"BatchWriteItem on {table_name} left {len(unprocessed)} deletes unprocessed "
+                f"after {BATCH_WRITE_MAX_RETRIES} retries"
+            )
+
+        results = []
+        for key_id, (_, key_records) in records_by_key.items():
+            for record in key_records:
+                if key_id in unprocessed:
+                    results.append(
+                        {
+                            "record_id": record.record_id,
+                            "table_name": record.table_name,
+                            "status": "FAILED",
+                            "error": "Delete left unprocessed after retries",
+                        }
+                    )
+                else:
+                    results.append(self._hard_delete_result(record))
+        return results
+
     def _delete_personal_data_record(self, record: PersonalDataRecord) -> Dict[str, Any]:
         """Delete a specific personal data record."""
 
@@ -494,14 +1143,12 @@ class PrivacyDeletionEngine:
             table = self.dynamodb.Table(record.table_name)
 
             # Different deletion strategies based on data type
-            if self._requires_anonymization(record):
-                # Anonymize instead of delete for compliance
+            deletion_method = self._deletion_method(record)
+            if deletion_method == "ANONYMIZATION":
                 return self._anonymize_record(table, record)
-            elif self._has_retention_requirement(record):
-                # Pseudonymize for legal retention requirements
+            elif deletion_method == "PSEUDONYMIZATION":
                 return self._pseudonymize_record(table, record)
             else:
-                # Hard delete
                 return self._hard_delete_record(table, record)
 
         except Exception as e:
@@ -522,6 +1169,10 @@ class PrivacyDeletionEngine:
         # Delete the record
         table.delete_item(Key=key)
 
+        return self._hard_delete_result(record)
+
+    def _hard_delete_result(self, record: PersonalDataRecord) -> Dict[str, Any]:
+        """Result for a successfully hard-deleted record."""
         return {
             "record_id": record.record_id,
             "table_name": record.table_name,
@@ -601,6 +1252,9 @@ class PrivacyDeletionEngine:
     def _build_delete_key(self, record: PersonalDataRecord) -> Dict[str, str]:
         """Build DynamoDB key for deletion operation."""
 
+        if record.primary_key:
+            return dict(record.primary_key)
+
         # Table-specific key patterns
         key_patterns = {
             "Organizations": {"organizationId": record.record_id},
@@ -618,6 +1272,16 @@ class PrivacyDeletionEngine:
 
         return key_patterns.get(record.table_name, {"id": record.record_id})
 
+    def _deletion_method(self, record: PersonalDataRecord) -> str:
+        """Choose how a record is removed."""
+        if self._requires_anonymization(record):
+            # Anonymize instead of delete for compliance
+            return "ANONYMIZATION"
+        if self._has_retention_requirement(record):
+            # Pseudonymize for legal retention requirements
+            return "PSEUDONYMIZATION"
+        return "HARD_DELETE"
+
     def _requires_anonymization(self, record: PersonalDataRecord) -> bool:
         """Check if record requires anonymization instead of deletion."""
         # Anonymize for statistical analysis requirements
@@ -666,23 +1330,26 @@ class PrivacyDeletionEngine:
         self,
         deletion_id: str,
         data_subject_email: str,
-        discovery_result: DataDiscoveryResult,
-        deletion_results: List[Dict],
+        total_records_discovered: int,
+        progress: DeletionProgress,
     ) -> Dict[str, Any]:
-        """Generate cryptographic proof of deletion for legal compliance."""
+        """Generate cryptographic proof of deletion for legal compliance.
+
+        Per-record verification hashes are covered by a single digest, so
+        the proof does not grow with the number of records. The manifest
+        states the order the hashes were chained in.
+        """
 
         deletion_manifest = {
             "deletion_id": deletion_id,
             "data_subject_email": data_subject_email,
             "deletion_timestamp": datetime.utcnow().isoformat(),
-            "total_records_discovered": discovery_result.total_records,
-            "total_records_deleted": len([r for r in deletion_results if r["status"] == "SUCCESS"]),
-            "deletion_methods_used": list(
-                set(r.get("deletion_method", "UNKNOWN") for r in deletion_results)
-            ),
-            "verification_hashes": [
-                r.get("verification_hash") for r in deletion_results if r.get("verification_hash")
-            ],
+            "total_records_discovered": total_records_discovered,
+            "total_records_deleted": progress.records_deleted,
+            "deletion_methods_used": sorted(progress.deletion_methods),
+            "verification_hashes_digest": progress.verification_hashes_digest,
+            "verification_hash_count": progress.verification_hash_count,
+            "verification_hash_order": VERIFICATION_HASH_ORDER,
             "compliance_frameworks": ["GDPR_ARTICLE_17", "CCPA_RIGHT_TO_DELETE"],
             "legal_validity": "COURT_ADMISSIBLE_EVIDENCE",
         }
@@ -705,10 +1372,14 @@ privacy_deletion_engine = PrivacyDeletionEngine()
 
 
 def execute_privacy_data_deletion(
-    data_subject_email: str, organization_id: str = None
+    data_subject_email: str,
+    organization_id: str = None,
+    result_sink: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> Dict[str, Any]:
     """Convenience function for executing privacy data deletion."""
-    return privacy_deletion_engine.execute_data_deletion(data_subject_email, organization_id)
+    return privacy_deletion_engine.execute_data_deletion(
+        data_subject_email, organization_id, result_sink
+    )
 
 
 def discover_personal_data(
@@ -0,0 +1,348 @@
+# file: apps/api/layers/organizations_security/rate_limiter.py
+# author: AI Assistant
+# created: 2026-10-16
+# description: Token-bucket rate limiting for API keys with per-container leasing
+
+"""
+Token-bucket rate limiter backed by DynamoDB.
+
+Each bucket is tracked as a theoretical arrival time (GCRA, the
+token-bucket equivalent): a bucket allowing ``limit`` requests per
+``period`` advances its TAT by ``period / limit`` seconds per token and
+admits a reservation while ``TAT <= now + period``. Both the per-minute
+and per-day buckets of a key live in one item and are reserved with a
+single conditional ``update_item``, so concurrent containers can never
+over-admit.
+
+To keep DynamoDB off most requests, a container leases tokens in chunks
+and serves subsequent requests from the local lease. Leased tokens expire
+after the time they represent at the sustained rate; unused tokens are
+wasted rather than over-admitted.
+
+Rate limit table item:
+    rateLimitKey: bucket key (e.g. "apikey#{applicationApiKeyId}")
+    minuteTat / dayTat: theoretical arrival times (epoch seconds)
+    ttl: DynamoDB TTL for idle buckets
+
+The table's partition key is ``rateLimitKey`` (string), with no sort key.
+The API key authorizer used to key its counters by ``keyId`` and
+``windowStart``; a RATE_LIMIT_TABLE set on the authorizer must use this
+schema, and may be the same table application_api_keys uses.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from decimal import ROUND_FLOOR, Decimal
+from typing import Any, Callable
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+MINUTE_SECONDS = 60
+DAY_SECONDS = 86400
+
+# Maximum tokens leased per DynamoDB call. The effective lease is capped at a
+# tenth of the per-minute limit so a container never strands much capacity.
+RATE_LIMIT_LEASE_SIZE = int(os.environ.get("RATE_LIMIT_LEASE_SIZE", "10"))
+
+# Conditional updates tried per reservation before giving up. Each failed
+# attempt returns the bucket's current state, so every retry is decided by
+# the GCRA math; running out of attempts means sustained contention.
+RATE_LIMIT_RESERVE_ATTEMPTS = int(os.environ.get("RATE_LIMIT_RESERVE_ATTEMPTS", "8"))
+
+_BUCKETS = (
+    ("minuteTat", MINUTE_SECONDS, "minute"),
+    ("dayTat", DAY_SECONDS, "day"),
+)
+
+
+class RateLimitContentionError(Exception):
+    """Every reservation attempt lost a race to another container."""
+
+
+class _Lease:
+    """Tokens reserved in DynamoDB and not yet used by this container."""
+
+    __slots__ = ("tokens", "expires_at", "limits", "tats")
+
+    def __init__(
+        self,
+        tokens: int,
+        expires_at: float,
+        limits: tuple[int, int | None],
+        tats: dict[str, float],
+    ) -> None:
+        self.tokens = tokens
+        self.expires_at = expires_at
+        self.limits = limits
+        self.tats = tats
+
+
+class TokenBucketRateLimiter:
+    """Per-key token-bucket rate limiter with local token leasing.
+
+    Instances are meant to live at module level so leases persist across
+    warm invocations.
+    """
+
+    def __init__(
+        self,
+        table: Any,
+        lease_size: int = RATE_LIMIT_LEASE_SIZE,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            table: boto3 DynamoDB Table with a ``rateLimitKey`` string hash key
+            lease_size: Maximum tokens leased per DynamoDB call
+            clock: Time source (epoch seconds), overridable for tests
+        """
+        self.table = table
+        self._lease_size = max(1, lease_size)
+        self._clock = clock
+        self._leases: dict[str, _Lease] = {}
+        self._known_tats: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def check(
+        self,
+        bucket_key: str,
+        limit_per_minute: int,
+        limit_per_day: int | None = None,
+    ) -> dict[str, Any]:
+        """Consume one token for a bucket key.
+
+        Args:
+            bucket_key: Key identifying the bucket (one per API key)
+            limit_per_minute: Requests allowed per minute
+            limit_per_day: Requests allowed per day, or None for no daily limit
+
+        Returns:
+            dict with 'allowed' (bool), 'message' (str), and 'headers' (dict) keys
+
+        Raises:
+            ClientError: If the rate limit table cannot be updated
+            RateLimitContentionError: If every reservation attempt was overtaken
+        """
+        limits = (int(limit_per_minute), int(limit_per_day) if limit_per_day else None)
+        buckets = self._active_buckets(limits)
+        if limits[0] < 1:
+            return {
+                "allowed": False,
+                "message": "Rate limit exceeded: 0 requests per minute",
+                "headers": {},
+            }
+
+        with self._lock:
+            now = self._clock()
+            lease = self._leases.get(bucket_key)
+            if lease and lease.tokens > 0 and now < lease.expires_at and lease.limits == limits:
+                lease.tokens -= 1
+                return self._result(True, "", buckets, lease.tats, now, lease.tokens)
+
+            # Never lease more than a full bucket holds
+            bucket_limits = [bucket[3] for bucket in buckets]
+            wanted = max(1, min(self._lease_size, limits[0] // 10, *bucket_limits))
+            reserved, tats, denied_by = self._reserve(bucket_key, wanted, buckets, now)
+            if not reserved:
+                self._leases.pop(bucket_key, None)
+                assert denied_by is not None  # _reserve names the bucket when it denies
+                _, period, label = denied_by
+                limit = limits[0] if period == MINUTE_SECONDS else limits[1]
+                return self._result(
+                    False,
+                    f"Rate limit exceeded: {limit} requests per {label}",
+                    buckets,
+                    tats,
+                    now,
+                    0,
+                )
+
+            # Leased tokens are valid for the time they represent at the
+            # sustained per-minute rate
+            expires_at = now + reserved * MINUTE_SECONDS / limits[0]
+            self._leases[bucket_key] = _Lease(reserved - 1, expires_at, limits, tats)
+            return self._result(True, "", buckets, tats, now, reserved - 1)
+
+    def release(self, bucket_key: str) -> None:
+        """Drop the local lease for a bucket key (e.g. after its limits change)."""
+        with self._lock:
+            self._leases.pop(bucket_key, None)
+
+    def _active_buckets(self, limits: tuple[int, int | None]) -> list[tuple[str, int, str, int]]:
+        """Return (attribute, period, label, limit) for each configured bucket."""
+        buckets = []
+        for (attribute, period, label), limit in zip(_BUCKETS, limits):
+            if limit:
+                buckets.append((attribute, period, label, limit))
+        return buckets
+
+    def _reserve(
+        self,
+        bucket_key: str,
+        tokens: int,
+        buckets: list[tuple[str, int, str, int]],
+        now: float,
+    ) -> tuple[int, dict[str, float], tuple[str, int, str] | None]:
+        """Reserve tokens in every bucket with one conditional update.
+
+        The update expression picks, per bucket, whether it continues from
+        the stored TAT or restarts at ``now`` based on the last known state.
+        If that guess is stale the condition fails, the actual state comes
+        back with the error, and the reservation is retried with as many
+        tokens as the buckets can still afford, until it succeeds or the
+        buckets deny it.
+
+        Returns:
+            Tuple of (tokens reserved, bucket TATs, denying bucket or None)
+
+        Raises:
+            RateLimitContentionError: If RATE_LIMIT_RESERVE_ATTEMPTS attempts
+                were all overtaken by other containers
+        """
+        known = self._known_tats.get(bucket_key, {})
+        for _attempt in range(max(1, RATE_LIMIT_RESERVE_ATTEMPTS)):
+            try:
+                tats = self._conditional_reserve(bucket_key, tokens, buckets, known, now)
+                self._known_tats[bucket_key] = tats
+                return tokens, tats, None
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+                known = self._current_tats(bucket_key, e.response.get("Item"), buckets)
+                self._known_tats[bucket_key] = known
+
+            affordable = tokens
+            for attribute, period, label, limit in buckets:
+                interval = period / limit
+                tat = max(known.get(attribute, now), now)
+                bucket_affordable = math.floor((now + period - tat) / interval + 1e-9)
+                if bucket_affordable < 1:
+                    return 0, known, (attribute, period, label)
+                affordable = min(affordable, bucket_affordable)
+            tokens = affordable
+
+        # Never decided by the buckets themselves; callers fail open
+        raise RateLimitContentionError(bucket_key)
+
+    def _conditional_reserve(
+        self,
+        bucket_key: str,
+        tokens: int,
+        buckets: list[tuple[str, int, str, int]],
+        known: dict[str, float],
+        now: float,
+    ) -> dict[str, float]:
+        """Issue the conditional update for one reservation attempt."""
+        names: dict[str, str] = {"#ttl": "ttl"}
+        now_decimal = _to_decimal(now)
+        values: dict[str, Any] = {":now": now_decimal}
+        set_clauses: list[str] = []
+        add_clauses: list[str] = []
+        conditions: list[str] = []
+        tats: dict[str, float] = {}
+
+        for index, (attribute, period, _label, limit) in enumerate(buckets):
+            name = f"#b{index}"
+            cost = _cost(tokens, period, limit)
+            names[name] = attribute
+            known_tat = known.get(attribute)
+            if known_tat is not None and known_tat >= now:
+                add_clauses.append(f"{name} :cost{index}")
+                conditions.append(f"({name} >= :now AND {name} <= :max{index})")
+                values[f":cost{index}"] = cost
+                values[f":max{index}"] = now_decimal + period - cost
+                tats[attribute] = known_tat + float(cost)
+            else:
+                set_clauses.append(f"{name} = :reset{index}")
+                conditions.append(f"(attribute_not_exists({name}) OR {name} < :now)")
+                values[f":reset{index}"] = now_decimal + cost
+                tats[attribute] = now + float(cost)
+
+        set_clauses.append("#ttl = :ttl")
+        values[":ttl"] = int(now) + DAY_SECONDS + 3600
+
+        update_expression = "SET " + ", ".join(set_clauses)
+        if add_clauses:
+            update_expression += " ADD " + ", ".join(add_clauses)
+
+        response = self.table.update_item(
+            Key={"rateLimitKey": bucket_key},
+            UpdateExpression=update_expression,
+            ConditionExpression=" AND ".join(conditions),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+            ReturnValues="ALL_NEW",
+            ReturnValuesOnConditionCheckFailure="ALL_OLD",
+        )
+        attributes = response.get("Attributes", {})
+        for attribute in tats:
+            if attribute in attributes:
+                tats[attribute] = float(attributes[attribute])
+        return tats
+
+    def _current_tats(
+        self,
+        bucket_key: str,
+        item: dict[str, Any] | None,
+        buckets: list[tuple[str, int, str, int]],
+    ) -> dict[str, float]:
+        """Extract bucket TATs from a failed update, reading the item if needed."""
+        if item is None:
+            response = self.table.get_item(Key={"rateLimitKey": bucket_key}, ConsistentRead=True)
+            item = response.get("Item", {})
+            tats = {}
+            for attribute, *_rest in buckets:
+                if attribute in item:
+                    tats[attribute] = float(item[attribute])
+            return tats
+
+        # Low-level attribute values ({"N": "..."}) come back with the error
+        tats = {}
+        for attribute, *_rest in buckets:
+            value = item.get(attribute)
+            if value is not None:
+                tats[attribute] = float(value["N"] if isinstance(value, dict) else value)
+        return tats
+
+    def _result(
+        self,
+        allowed: bool,
+        message: str,
+        buckets: list[tuple[str, int, str, int]],
+        tats: dict[str, float],
+        now: float,
+        leased_tokens: int,
+    ) -> dict[str, Any]:
+        """Build the result dict with X-RateLimit-* headers."""
+        headers: dict[str, str] = {}
+        for attribute, period, label, limit in buckets:
+            interval = period / limit
+            tat = max(tats.get(attribute, now), now)
+            remaining = math.floor((now + period - tat) / interval + 1e-9) + leased_tokens
+            suffix = label.capitalize()
+            headers[f"X-RateLimit-Limit-{suffix}"] = str(limit)
+            headers[f"X-RateLimit-Remaining-{suffix}"] = str(max(0, min(limit, remaining)))
+            headers[f"X-RateLimit-Reset-{suffix}"] = str(math.ceil(tat))
+        return {"allowed": allowed, "message": message, "headers": headers}
+
+
+def _to_decimal(value: float) -> Decimal:
+    """Convert seconds to a DynamoDB number with microsecond precision."""
+    return Decimal(str(round(value, 6)))
+
+
+def _cost(tokens: int, period: int, limit: int) -> Decimal:
+    """Bucket time consumed by tokens, rounded down to the microsecond.
+
+    Costs are summed exactly in DynamoDB, so rounding them down means a
+    full bucket's tokens always fit within its period. Rounding up would
+    push the TAT past the admission bound and deny the last token.
+    """
+    return (Decimal(tokens * period) / Decimal(limit)).quantize(
+        Decimal("0.000001"), rounding=ROUND_FLOOR
+    )
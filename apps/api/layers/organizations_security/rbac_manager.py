@@ -5,10 +5,12 @@
 
 import logging
 import boto3
-from typing import Dict, List, Set, Optional, Tuple, Any
+from typing import Dict, FrozenSet, Iterable, List, Set, Optional, Tuple, Any
 from enum import Enum
 from dataclasses import dataclass
 
+from membership_resolver import OrganizationMembershipResolver, get_membership_resolver
+
 logger = logging.getLogger(__name__)
 
 
@@ -116,12 +118,7 @@ class OrganizationPermissions:
     @classmethod
     def get_all_permissions(cls) -> List[Permission]:
         """Get all defined permissions."""
-        permissions = []
-        for attr_name in dir(cls):
-            attr = getattr(cls, attr_name)
-            if isinstance(attr, Permission):
-                permissions.append(attr)
-        return permissions
+        return list(_ALL_PERMISSIONS)
 
     @classmethod
     def get_permissions_by_category(cls, category: PermissionCategory) -> List[Permission]:
@@ -129,6 +126,32 @@ class OrganizationPermissions:
         return [p for p in cls.get_all_permissions() if p.category == category]
 
 
+# Every permission gets a bit position at import time; permission sets are
+# then plain integers combined and tested with bit operations.
+_ALL_PERMISSIONS: Tuple[Permission, ...] = tuple(
+    attr
+    for attr in (getattr(OrganizationPermissions, name) for name in dir(OrganizationPermissions))
+    if isinstance(attr, Permission)
+)
+PERMISSION_BITS: Dict[str, int] = {
+    permission.key: 1 << index for index, permission in enumerate(_ALL_PERMISSIONS)
+}
+ALL_PERMISSIONS_MASK = (1 << len(_ALL_PERMISSIONS)) - 1
+
+
+def permission_mask(permission_keys: Iterable[str]) -> int:
+    """Compile permission keys into a bitmask. Unknown keys contribute no bits."""
+    mask = 0
+    for key in permission_keys:
+        mask |= PERMISSION_BITS.get(key, 0)
+    return mask
+
+
+def permissions_from_mask(mask: int) -> List[str]:
+    """Expand a bitmask into permission keys, in bit order."""
+    return [key for key, bit in PERMISSION_BITS.items() if mask & bit]
+
+
 class RolePermissionMatrix:
     """Defines which permissions each role has."""
 
@@ -207,6 +230,9 @@ class RolePermissionMatrix:
         OrganizationPermissions.BILLING_READ.key,
     }
 
+    # Role permission sets compiled to bitmasks (filled in below the class)
+    ROLE_MASKS: Dict[OrganizationRole, int] = {}
+
     @classmethod
     def get_role_permissions(cls, role: OrganizationRole) -> Set[str]:
         """Get all permissions for a specific role."""
@@ -219,6 +245,37 @@ class RolePermissionMatrix:
         else:
             return set()
 
+    @classmethod
+    def get_role_mask(cls, role: Optional[OrganizationRole]) -> int:
+        """Get the precompiled permission bitmask for a role (0 if unknown)."""
+        if role is None:
+            return 0
+        return cls.ROLE_MASKS.get(role, 0)
+
+
+RolePermissionMatrix.ROLE_MASKS = {
+    OrganizationRole.OWNER: permission_mask(RolePermissionMatrix.OWNER_PERMISSIONS),
+    OrganizationRole.ADMINISTRATOR: permission_mask(RolePermissionMatrix.ADMINISTRATOR_PERMISSIONS),
+    OrganizationRole.VIEWER: permission_mask(RolePermissionMatrix.VIEWER_PERMISSIONS),
+}
+
+# Permissions whose outcome depends on more than the role's static set
+_SPECIAL_PERMISSION_KEYS = frozenset(
+    {
+        OrganizationPermissions.USERS_REMOVE.key,
+        OrganizationPermissions.USERS_UPDATE_ROLES.key,
+        OrganizationPermissions.APPLICATIONS_DELETE.key,
+    }
+)
+
+# User-management permissions administrators hold, subject to operation-time checks
+_ADMINISTRATOR_CONDITIONAL_MASK = permission_mask(
+    [
+        OrganizationPermissions.USERS_REMOVE.key,
+        OrganizationPermissions.USERS_UPDATE_ROLES.key,
+    ]
+)
+
 
 class OrganizationRBACManager:
     """
@@ -226,16 +283,23 @@ class OrganizationRBACManager:
     Provides fine-grained permission checking with role hierarchy support.
     """
 
-    def __init__(self, region: str = None):
+    def __init__(
+        self,
+        region: str = None,
+        membership_resolver: Optional[OrganizationMembershipResolver] = None,
+    ):
         """
         Initialize the RBAC manager.
 
         Args:
             region: AWS region, defaults to None (uses AWS_REGION env var)
+            membership_resolver: Organization/membership lookup, defaults to the
+                container-wide resolver
         """
         self.dynamodb = boto3.resource("dynamodb", region_name=region)
         self.organizations_table = self.dynamodb.Table("Organizations")
         self.org_users_table = self.dynamodb.Table("OrganizationUsers")
+        self.membership_resolver = membership_resolver or get_membership_resolver()
 
         # Cache for user roles and permissions (in production, use Redis)
         self._permission_cache = {}
@@ -278,16 +342,9 @@ class OrganizationRBACManager:
                     "organizationId": organization_id,
                 }
 
-            # Check if role has the requested permission
-            role_permissions = RolePermissionMatrix.get_role_permissions(user_role)
-
-            # Special permission logic for certain actions
-            if permission_key in self._get_special_permission_rules():
-                has_permission = self._check_special_permission(
-                    user_id, organization_id, permission_key, user_role, role_context
-                )
-            else:
-                has_permission = permission_key in role_permissions
+            has_permission = self._evaluate_permission(
+                user_id, organization_id, permission_key, user_role, role_context
+            )
 
             context = {
                 "organizationId": organization_id,
@@ -337,26 +394,22 @@ class OrganizationRBACManager:
 
             # Platform-level access override
             if cognito_groups and self._has_platform_override(cognito_groups):
-                all_permissions = [p.key for p in OrganizationPermissions.get_all_permissions()]
                 return {
                     "role": "PLATFORM_ADMIN",
-                    "permissions": all_permissions,
+                    "permissions": permissions_from_mask(ALL_PERMISSIONS_MASK),
+                    "permissionMask": ALL_PERMISSIONS_MASK,
                     "organizationId": organization_id,
                     "isMember": True,
                     "isPlatformAdmin": True,
                 }
 
-            # Get role-based permissions
-            base_permissions = list(RolePermissionMatrix.get_role_permissions(user_role))
-
-            # Add special permissions based on role and context
-            effective_permissions = self._calculate_effective_permissions(
-                user_id, organization_id, user_role, base_permissions, role_context
-            )
+            # Role-based permissions plus special permissions based on role
+            effective_mask = self._calculate_effective_mask(user_role)
 
             return {
                 "role": user_role.value,
-                "permissions": effective_permissions,
+                "permissions": permissions_from_mask(effective_mask),
+                "permissionMask": effective_mask,
                 "organizationId": organization_id,
                 "isMember": True,
                 "isOwner": user_role == OrganizationRole.OWNER,
@@ -376,15 +429,13 @@ class OrganizationRBACManager:
     ) -> Tuple[Optional[OrganizationRole], Dict[str, Any]]:
         """Get user's role in an organization."""
         try:
-            # Check if user is the organization owner
-            org_response = self.organizations_table.get_item(
-                Key={"organizationId": organization_id}
-            )
+            # Organization and membership rows come back from one shared lookup
+            resolved = self.membership_resolver.resolve(user_id, organization_id)
 
-            if not org_response.get("Item"):
+            if not resolved.organization:
                 return None, {"reason": "organization_not_found"}
 
-            organization = org_response["Item"]
+            organization = resolved.organization
 
             # Check ownership first
             if organization.get("ownerId") == user_id:
@@ -394,15 +445,11 @@ class OrganizationRBACManager:
                 }
 
             # Check organization membership
-            member_response = self.org_users_table.get_item(
-                Key={"userId": user_id, "organizationId": organization_id}
-            )
+            member = resolved.membership
 
-            if not member_response.get("Item"):
+            if not member:
                 return None, {"reason": "not_member"}
 
-            member = member_response["Item"]
-
             # Check if membership is active
             if member.get("status") != "ACTIVE":
                 return None, {
@@ -434,13 +481,26 @@ class OrganizationRBACManager:
         """Check if user has platform-level override access."""
         return "OWNER" in cognito_groups or "EMPLOYEE" in cognito_groups
 
-    def _get_special_permission_rules(self) -> Set[str]:
+    def _get_special_permission_rules(self) -> FrozenSet[str]:
         """Get permissions that have special logic."""
-        return {
-            OrganizationPermissions.USERS_REMOVE.key,
-            OrganizationPermissions.USERS_UPDATE_ROLES.key,
-            OrganizationPermissions.APPLICATIONS_DELETE.key,
-        }
+        return _SPECIAL_PERMISSION_KEYS
+
+    def _evaluate_permission(
+        self,
+        user_id: str,
+        organization_id: str,
+        permission_key: str,
+        user_role: OrganizationRole,
+        role_context: Dict[str, Any],
+    ) -> bool:
+        """Evaluate one permission for a resolved role."""
+        # Special permission logic for certain actions
+        if permission_key in _SPECIAL_PERMISSION_KEYS:
+            return self._check_special_permission(
+                user_id, organization_id, permission_key, user_role, role_context
+            )
+        bit = PERMISSION_BITS.get(permission_key, 0)
+        return bool(bit and RolePermissionMatrix.get_role_mask(user_role) & bit)
 
     def _check_special_permission(
         self,
@@ -475,25 +535,74 @@ class OrganizationRBACManager:
 
         return False
 
-    def _calculate_effective_permissions(
+    def _calculate_effective_mask(self, user_role: OrganizationRole) -> int:
+        """Calculate the effective permission bitmask including special rules."""
+        effective_mask = RolePermissionMatrix.get_role_mask(user_role)
+
+        # Administrators can remove/update users (with restrictions checked at operation time)
+        if user_role == OrganizationRole.ADMINISTRATOR:
+            effective_mask |= _ADMINISTRATOR_CONDITIONAL_MASK
+
+        return effective_mask
+
+    def check_permissions(
         self,
         user_id: str,
         organization_id: str,
-        user_role: OrganizationRole,
-        base_permissions: List[str],
-        role_context: Dict[str, Any],
-    ) -> List[str]:
-        """Calculate effective permissions including special rules."""
-        effective_permissions = base_permissions.copy()
+        permission_keys: List[str],
+        cognito_groups: Optional[List[str]] = None,
+    ) -> Dict[str, bool]:
+        """
+        Check many permissions for one user with a single role lookup.
 
-        # Add conditional permissions for administrators
-        if user_role == OrganizationRole.ADMINISTRATOR:
-            # Can remove/update users (with restrictions checked at operation time)
-            effective_permissions.extend(
-                [
-                    OrganizationPermissions.USERS_REMOVE.key,
-                    OrganizationPermissions.USERS_UPDATE_ROLES.key,
-                ]
-            )
+        Args:
+            user_id: The user's ID
+            organization_id: The organization ID
+            permission_keys: Permission keys in format 'category.action'
+            cognito_groups: User's Cognito groups for platform-level access
+
+        Returns:
+            Dict mapping each permission key to whether the user has it
+        """
+        try:
+            user_role, role_context = self._get_user_organization_role(user_id, organization_id)
+        except Exception as e:
+            logger.error(f"Error checking permissions for user {user_id}: {str(e)}")
+            user_role, role_context = None, {}
 
-        return effective_permissions
+        if not user_role:
+            return {key: False for key in permission_keys}
+
+        if cognito_groups and self._has_platform_override(cognito_groups):
+            return {key: True for key in permission_keys}
+
+        return {
+            key: self._evaluate_permission(user_id, organization_id, key, user_role, role_context)
+            for key in permission_keys
+        }
+
+    def check_permission_for_users(
+        self,
+        user_ids: List[str],
+        organization_id: str,
+        permission_key: str,
+    ) -> Dict[str, bool]:
+        """
+        Check one permission for many users of an organization.
+
+        Memberships are fetched together (one BatchGetItem per 99 users), so
+        this is much cheaper than calling check_permission per user.
+
+        Args:
+            user_ids: The users' IDs
+            organization_id: The organization ID
+            permission_key: Permission key in format 'category.action'
+
+        Returns:
+            Dict mapping each user ID to whether they have the permission
+        """
+        self.membership_resolver.resolve_many(user_ids, organization_id)
+        return {
+            user_id: self.check_permission(user_id, organization_id, permission_key)[0]
+            for user_id in user_ids
+        }
@@ -0,0 +1,126 @@
+# file: apps/api/layers/organizations_security/rotation_lookup.py
+# author: AI Assistant
+# created: 2026-10-16
+# description: Rotation-lookup resolution of pending API keys by nextKeyHash
+
+"""
+Rotation-lookup items for API key rotation.
+
+While a key is ROTATING, its pending next key is found through a lookup
+item in the application API keys table:
+
+    applicationApiKeyId: "ROTATION#{nextKeyHash}"
+    rotatingKeyId: ID of the ROTATING key record
+    createdAt: epoch seconds
+
+Lookup items carry no applicationId/keyHash, so they stay out of every
+GSI. A miss costs a single keyed read, and the key record is always
+re-checked so a stale lookup item never validates.
+
+Keys already ROTATING when lookup items were introduced have none until
+BACKFILL_ROTATION_LOOKUPS runs in application_api_keys. Set
+ROTATION_LOOKUP_SCAN_FALLBACK to "true" only for the migration window
+before the backfill: each container then scans for ROTATING keys on a
+lookup miss, at most once per ROTATION_LOOKUP_SCAN_REFRESH_SECONDS.
+"""
+
+import logging
+import os
+import time
+from typing import Any, Callable
+
+from boto3.dynamodb.conditions import Attr
+
+logger = logging.getLogger(__name__)
+
+# Primary-key prefix of rotation-lookup items: {prefix}{nextKeyHash} -> key ID
+ROTATION_LOOKUP_PREFIX = "ROTATION#"
+
+ROTATION_LOOKUP_SCAN_FALLBACK = (
+    os.environ.get("ROTATION_LOOKUP_SCAN_FALLBACK", "false").lower() == "true"
+)
+ROTATION_LOOKUP_SCAN_REFRESH_SECONDS = int(
+    os.environ.get("ROTATION_LOOKUP_SCAN_REFRESH_SECONDS", "300")
+)
+
+
+def rotation_lookup_key(next_key_hash: str) -> dict[str, str]:
+    """Primary key of the rotation-lookup item for a nextKeyHash."""
+    return {"applicationApiKeyId": f"{ROTATION_LOOKUP_PREFIX}{next_key_hash}"}
+
+
+def scan_rotating_keys(table: Any) -> dict[str, str]:
+    """Map nextKeyHash to key ID for every ROTATING key record (all pages)."""
+    rotating: dict[str, str] = {}
+    scan_kwargs: dict[str, Any] = {
+        "FilterExpression": Attr("status").eq("ROTATING") & Attr("nextKeyHash").exists(),
+        "ProjectionExpression": "applicationApiKeyId, nextKeyHash",
+    }
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            rotating[item["nextKeyHash"]] = item["applicationApiKeyId"]
+        if "LastEvaluatedKey" not in response:
+            return rotating
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+class RotationKeyLookup:
+    """Resolves a key hash to the ROTATING key record whose nextKeyHash it is.
+
+    Holds the fallback scan snapshot, so keep one instance per container.
+    """
+
+    def __init__(
+        self,
+        scan_fallback: bool = ROTATION_LOOKUP_SCAN_FALLBACK,
+        scan_refresh_seconds: int = ROTATION_LOOKUP_SCAN_REFRESH_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            scan_fallback: Whether a lookup miss falls back to the table scan
+            scan_refresh_seconds: Maximum age of the fallback scan snapshot
+            clock: Time source (epoch seconds), overridable for tests
+        """
+        self.scan_fallback = scan_fallback
+        self.scan_refresh_seconds = scan_refresh_seconds
+        self._clock = clock
+        # nextKeyHash -> key ID of ROTATING keys, from the last fallback scan
+        self._legacy_keys: dict[str, str] | None = None
+        self._scanned_at = 0.0
+
+    def find(self, table: Any, key_hash: str) -> tuple[dict[str, Any] | None, bool]:
+        """Find the ROTATING key record whose nextKeyHash matches a hash.
+
+        Args:
+            table: boto3 DynamoDB Table of application API keys
+            key_hash: SHA-256 hash of the presented key
+
+        Returns:
+            Tuple of (key record or None, whether a lookup item was found)
+        """
+        lookup = table.get_item(Key=rotation_lookup_key(key_hash)).get("Item")
+        key_id = lookup["rotatingKeyId"] if lookup else self.find_legacy(table, key_hash)
+        if not key_id:
+            return None, lookup is not None
+
+        key_record = table.get_item(Key={"applicationApiKeyId": key_id}).get("Item")
+        if (
+            key_record
+            and key_record.get("status") == "ROTATING"
+            and key_record.get("nextKeyHash") == key_hash
+        ):
+            return key_record, lookup is not None
+        return None, lookup is not None
+
+    def find_legacy(self, table: Any, key_hash: str) -> str | None:
+        """Find a ROTATING key without a lookup item (scans at most once per refresh)."""
+        if not self.scan_fallback:
+            return None
+        now = self._clock()
+        if self._legacy_keys is None or now - self._scanned_at >= self.scan_refresh_seconds:
+            self._legacy_keys = scan_rotating_keys(table)
+            self._scanned_at = now
+            logger.info(f"Loaded {len(self._legacy_keys)} ROTATING keys by fallback scan")
+        return self._legacy_keys.get(key_hash)
@@ -5,10 +5,11 @@
 
 import boto3
 import logging
-from typing import Dict, Any, List, Tuple
-from botocore.exceptions import ClientError
+from typing import Dict, Any, List, Optional, Tuple
 from boto3.dynamodb.conditions import Attr
 
+from membership_resolver import OrganizationMembershipResolver, get_membership_resolver
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,16 +19,23 @@ class OrganizationSecurityManager:
     Implements defense-in-depth security for organization operations.
     """
 
-    def __init__(self, region: str = None):
+    def __init__(
+        self,
+        region: str = None,
+        membership_resolver: Optional[OrganizationMembershipResolver] = None,
+    ):
         """
         Initialize the organization security manager.
 
         Args:
             region: AWS region, defaults to None (uses AWS_REGION env var)
+            membership_resolver: Organization/membership lookup, defaults to the
+                container-wide resolver
         """
         self.dynamodb = boto3.resource("dynamodb", region_name=region)
         self.organizations_table = self.dynamodb.Table("Organizations")
         self.org_users_table = self.dynamodb.Table("OrganizationUsers")
+        self.membership_resolver = membership_resolver or get_membership_resolver()
 
     def validate_organization_access(
         self,
@@ -105,13 +113,11 @@ class OrganizationSecurityManager:
         }
 
         try:
-            # Check if user is the organization owner
-            org_response = self.organizations_table.get_item(
-                Key={"organizationId": organization_id}
-            )
+            # Organization and membership rows come back from one shared lookup
+            resolved = self.membership_resolver.resolve(user_id, organization_id)
 
-            if org_response.get("Item"):
-                org_data = org_response["Item"]
+            if resolved.organization:
+                org_data = resolved.organization
                 context["organization_exists"] = True
                 context["organization_status"] = org_data.get("status")
 
@@ -120,19 +126,10 @@ class OrganizationSecurityManager:
                     context["is_organization_owner"] = True
                     context["organization_role"] = "OWNER"
                 else:
-                    # Check OrganizationUsers table for role assignment
-                    try:
-                        org_user_response = self.org_users_table.get_item(
-                            Key={"userId": user_id, "organizationId": organization_id}
-                        )
-
-                        if org_user_response.get("Item"):
-                            org_user_data = org_user_response["Item"]
-                            if org_user_data.get("status") == "ACTIVE":
-                                context["organization_role"] = org_user_data.get("role")
-                    except ClientError:
-                        # OrganizationUsers table might not exist yet
-                        pass
+                    # Fall back to the OrganizationUsers role assignment
+                    org_user_data = resolved.membership
+                    if org_user_data and org_user_data.get("status") == "ACTIVE":
+                        context["organization_role"] = org_user_data.get("role")
             else:
                 context["organization_exists"] = False
 
@@ -15,9 +15,11 @@ Task 15.1: End-to-end test
 """
 
 import os
+import sys
 import uuid
 from datetime import datetime, timezone
 from decimal import Decimal
+from pathlib import Path
 from typing import Any, Dict, List
 from unittest.mock import patch
 
@@ -25,6 +27,11 @@ import boto3
 import pytest
 from moto import mock_aws
 
+# Add the organizations_security layer directory to path for the lambda's layer imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
 
 # Test constants
 TEST_ORG_ID = f"org-test-{uuid.uuid4().hex[:8]}"
@@ -171,21 +178,22 @@ def dynamodb_tables(aws_credentials):
 
         # Create OrganizationUsers table (for authorization)
         org_users_table = dynamodb.create_table(
-            TableName="orb-integration-hub-dev-organization-users",
+            TableName="test-organization-users",
             KeySchema=[
-                {"AttributeName": "organizationUserId", "KeyType": "HASH"},
+                {"AttributeName": "userId", "KeyType": "HASH"},
+                {"AttributeName": "organizationId", "KeyType": "RANGE"},
             ],
             AttributeDefinitions=[
-                {"AttributeName": "organizationUserId", "AttributeType": "S"},
                 {"AttributeName": "userId", "AttributeType": "S"},
                 {"AttributeName": "organizationId", "AttributeType": "S"},
+                {"AttributeName": "role", "AttributeType": "S"},
             ],
             GlobalSecondaryIndexes=[
                 {
-                    "IndexName": "UserOrgIndex",
+                    "IndexName": "UserOrganizationsIndex",
                     "KeySchema": [
                         {"AttributeName": "userId", "KeyType": "HASH"},
-                        {"AttributeName": "organizationId", "KeyType": "RANGE"},
+                        {"AttributeName": "role", "KeyType": "RANGE"},
                     ],
                     "Projection": {"ProjectionType": "ALL"},
                     "ProvisionedThroughput": {
@@ -201,6 +209,18 @@ def dynamodb_tables(aws_credentials):
         )
         org_users_table.wait_until_exists()
 
+        # Owned organization IDs are cached per container; start each test cold
+        import lambdas.get_application_users.index as lambda_module
+        lambda_module._owned_orgs_cache.clear()
+
+        # Pagination tokens are signed with a key from Secrets Manager
+        boto3.client("secretsmanager", region_name="us-east-1").create_secret(
+            Name="test-pagination-token",
+            SecretString='{"secret_key": "test-pagination-key"}',
+        )
+        os.environ["PAGINATION_TOKEN_SECRET_NAME"] = "test-pagination-token"
+        lambda_module._pagination_token_key = None
+
         yield {
             "app_user_roles": app_user_roles_table,
             "users": users_table,
@@ -281,7 +301,6 @@ def create_org_user_ownership(
     """Create organization user ownership record."""
     now = datetime.now(timezone.utc)
     org_user = {
-        "organizationUserId": f"ou-{uuid.uuid4().hex[:12]}",
         "userId": user_id,
         "organizationId": org_id,
         "role": role,
@@ -344,6 +363,7 @@ class TestGetApplicationUsersIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             # Reset the cached DynamoDB resource
             import lambdas.get_application_users.index as lambda_module
@@ -424,6 +444,7 @@ class TestGetApplicationUsersIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -502,6 +523,7 @@ class TestGetApplicationUsersIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -569,6 +591,7 @@ class TestGetApplicationUsersIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -628,6 +651,7 @@ class TestGetApplicationUsersIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -666,6 +690,7 @@ class TestGetApplicationUsersIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -702,6 +727,7 @@ class TestGetApplicationUsersIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -743,6 +769,7 @@ class TestGetApplicationUsersIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -800,6 +827,7 @@ class TestGetApplicationUsersIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -905,6 +933,7 @@ class TestGetApplicationUsersIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -957,6 +986,7 @@ class TestGetApplicationUsersIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -1029,6 +1059,7 @@ class TestGetApplicationUsersIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -1109,6 +1140,7 @@ class TestGetApplicationUsersAuthorizationIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -1179,6 +1211,7 @@ class TestGetApplicationUsersAuthorizationIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -1217,6 +1250,7 @@ class TestGetApplicationUsersAuthorizationIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -1286,6 +1320,7 @@ class TestGetApplicationUsersAuthorizationIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -1360,6 +1395,7 @@ class TestGetApplicationUsersAuthorizationIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -1420,6 +1456,7 @@ class TestGetApplicationUsersAuthorizationIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -1460,6 +1497,7 @@ class TestGetApplicationUsersAuthorizationIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -1542,6 +1580,7 @@ class TestGetApplicationUsersMultiFilterIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -1628,6 +1667,7 @@ class TestGetApplicationUsersMultiFilterIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -1711,6 +1751,7 @@ class TestGetApplicationUsersMultiFilterIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -1793,6 +1834,7 @@ class TestGetApplicationUsersMultiFilterIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -1887,6 +1929,7 @@ class TestGetApplicationUsersMultiFilterIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -2041,6 +2084,7 @@ class TestGetApplicationUsersMultiFilterIntegration:
             "USERS_TABLE_NAME": "test-users",
             "APPLICATIONS_TABLE_NAME": "test-applications",
             "ORGANIZATIONS_TABLE_NAME": "test-organizations",
+            "ORGANIZATION_USERS_TABLE_NAME": "test-organization-users",
         }):
             import lambdas.get_application_users.index as lambda_module
             lambda_module._dynamodb = tables["dynamodb"]
@@ -0,0 +1,198 @@
+"""
+API Key Authorizer Cache Property Tests
+
+Validates:
+- KeyContextCache evicts least recently used entries beyond its bound
+- Positive and negative entries expire after their TTLs and never outlive
+  the key's own expiresAt
+- The handler serves repeat lookups of valid and unknown keys from the
+  cache, and denies a revoked key once its entry expires
+"""
+
+import hashlib
+import importlib.util
+import os
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+from unittest.mock import patch
+
+import boto3
+import pytest
+from botocore.client import BaseClient
+from hypothesis import given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+_authorizer_dir = Path(__file__).parent.parent.parent / "lambdas" / "api_key_authorizer"
+_spec = importlib.util.spec_from_file_location(
+    "api_key_authorizer_index", _authorizer_dir / "index.py"
+)
+assert _spec is not None and _spec.loader is not None
+authorizer = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(authorizer)
+
+TABLE_NAME = "orb-integration-hub-dev-application-api-keys"
+
+
+def context_for(key_id: str) -> dict:
+    return {"applicationApiKeyId": key_id, "applicationId": "app-1"}
+
+
+def later(seconds: float):
+    """Patch time.time to run ``seconds`` ahead of the real clock."""
+    real_time = time.time
+    return patch.object(authorizer.time, "time", lambda: real_time() + seconds)
+
+
+_make_api_call = BaseClient._make_api_call
+api_calls: list[str] = []
+
+
+def counting_api_call(self, operation_name, api_params):
+    api_calls.append(operation_name)
+    return _make_api_call(self, operation_name, api_params)
+
+
+def create_keys_table(dynamodb) -> None:
+    dynamodb.create_table(
+        TableName=TABLE_NAME,
+        KeySchema=[{"AttributeName": "applicationApiKeyId", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": "applicationApiKeyId", "AttributeType": "S"},
+            {"AttributeName": "keyHash", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "KeyLookupIndex",
+                "KeySchema": [{"AttributeName": "keyHash", "KeyType": "HASH"}],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def authorize(key: str) -> dict:
+    return authorizer.lambda_handler({"authorizationToken": key, "methodArn": "arn"}, None)
+
+
+def effect(result: dict) -> str:
+    return result["policyDocument"]["Statement"][0]["Effect"]
+
+
+class TestKeyContextCache:
+    """Property tests for the warm-container key cache."""
+
+    @settings(max_examples=50, deadline=None)
+    @given(operations=st.lists(st.tuples(st.booleans(), st.integers(0, 6)), max_size=40))
+    def test_lru_eviction_matches_model(self, operations) -> None:
+        """Entries beyond max_entries are evicted least recently used first."""
+        cache = authorizer.KeyContextCache(ttl_seconds=60, negative_ttl_seconds=60, max_entries=3)
+        model: OrderedDict[str, dict] = OrderedDict()
+
+        for is_set, index in operations:
+            key_hash = f"hash-{index}"
+            if is_set:
+                cache.set(key_hash, context_for(f"key-{index}"))
+                model.pop(key_hash, None)
+                model[key_hash] = context_for(f"key-{index}")
+                while len(model) > 3:
+                    model.popitem(last=False)
+            else:
+                expected = model.get(key_hash)
+                if expected is not None:
+                    model.move_to_end(key_hash)
+                assert cache.get(key_hash) == (expected is not None, expected)
+
+        assert len(cache) == len(model)
+
+    def test_entries_expire_after_their_ttl(self) -> None:
+        """Positive, negative and key-expiry bounds each end an entry."""
+        cache = authorizer.KeyContextCache(ttl_seconds=30, negative_ttl_seconds=5, max_entries=10)
+        now = time.time()
+        cache.set("valid", context_for("key-1"))
+        cache.set("unknown", None)
+        cache.set("expiring", context_for("key-2"), key_expires_at=int(now) + 10)
+        cache.set("expired", context_for("key-3"), key_expires_at=int(now) - 1)
+
+        assert cache.get("unknown") == (True, None)
+        assert cache.get("expired") == (False, None)
+
+        with later(6):
+            assert cache.get("unknown") == (False, None)
+            assert cache.get("valid")[0]
+        with later(11):
+            assert cache.get("expiring") == (False, None)
+            assert cache.get("valid")[0]
+        with later(31):
+            assert cache.get("valid") == (False, None)
+
+    def test_invalidate_by_key_id_drops_every_hash(self) -> None:
+        """Invalidating a key ID removes each hash cached for it."""
+        cache = authorizer.KeyContextCache(ttl_seconds=30, negative_ttl_seconds=5, max_entries=10)
+        cache.set("current", context_for("key-1"))
+        cache.set("next", context_for("key-1"))
+        cache.set("other", context_for("key-2"))
+
+        assert cache.invalidate(key_id="key-1") == 2
+        assert cache.get("current") == (False, None)
+        assert cache.get("other")[0]
+
+    def test_positive_ttl_is_capped(self) -> None:
+        """Revocation latency never exceeds the TTL cap."""
+        assert authorizer.KEY_CACHE_TTL_SECONDS <= authorizer.KEY_CACHE_MAX_TTL_SECONDS
+
+
+class TestAuthorizerHandler:
+    """Tests for cached key lookups through the Lambda handler."""
+
+    def test_repeat_lookups_served_from_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Valid and unknown keys reach DynamoDB once; revocation applies after the TTL."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            create_keys_table(dynamodb)
+            key = "sk_prod_" + "a" * 32
+            dynamodb.Table(TABLE_NAME).put_item(
+                Item={
+                    "applicationApiKeyId": "key-1",
+                    "applicationId": "app-1",
+                    "organizationId": "org-1",
+                    "environment": "PRODUCTION",
+                    "keyHash": hashlib.sha256(key.encode()).hexdigest(),
+                    "status": "ACTIVE",
+                }
+            )
+
+            monkeypatch.setattr(authorizer, "_authorizer", None)
+            authorizer._key_cache.clear()
+            with patch.object(BaseClient, "_make_api_call", counting_api_call):
+                api_calls.clear()
+                assert effect(authorize(key)) == "Allow"
+                assert effect(authorize(key)) == "Allow"
+                assert api_calls.count("Query") == 1
+
+                api_calls.clear()
+                assert effect(authorize("sk_prod_unknown")) == "Deny"
+                assert effect(authorize("sk_prod_unknown")) == "Deny"
+                assert api_calls == ["Query", "GetItem"]
+
+            dynamodb.Table(TABLE_NAME).update_item(
+                Key={"applicationApiKeyId": "key-1"},
+                UpdateExpression="SET #status = :revoked",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={":revoked": "REVOKED"},
+            )
+
+            # Still cached until the positive TTL runs out
+            assert effect(authorize(key)) == "Allow"
+            with later(authorizer.KEY_CACHE_TTL_SECONDS + 1):
+                assert effect(authorize(key)) == "Deny"
@@ -0,0 +1,284 @@
+"""
+API Key Rotation Lookup Property Tests
+
+Validates:
+- During rotation both keys validate, in the service and the authorizer,
+  through the ROTATION# lookup item
+- Re-rotating replaces the pending key: only the latest next key
+  validates and exactly one lookup item remains
+- A failed re-rotation leaves the pending key and its lookup intact
+- Completing or revoking a rotation removes the lookup item
+- Keys ROTATING without a lookup item (rotated before lookups existed)
+  still validate through the opt-in fallback scan, which is refreshed
+  periodically, and the backfill writes their lookup items
+"""
+
+import hashlib
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+import boto3
+import rotation_lookup
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+_lambdas_dir = Path(__file__).parent.parent.parent / "lambdas"
+
+
+def load_module(name: str, directory: str):
+    spec = importlib.util.spec_from_file_location(name, _lambdas_dir / directory / "index.py")
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+api_keys = load_module("application_api_keys_index_rotation", "application_api_keys")
+authorizer = load_module("api_key_authorizer_index_rotation", "api_key_authorizer")
+
+TABLE_NAME = "orb-integration-hub-dev-application-api-keys"
+
+
+def create_keys_table() -> None:
+    boto3.resource("dynamodb").create_table(
+        TableName=TABLE_NAME,
+        KeySchema=[{"AttributeName": "applicationApiKeyId", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": "applicationApiKeyId", "AttributeType": "S"},
+            {"AttributeName": "applicationId", "AttributeType": "S"},
+            {"AttributeName": "environment", "AttributeType": "S"},
+            {"AttributeName": "keyHash", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "AppEnvKeyIndex",
+                "KeySchema": [
+                    {"AttributeName": "applicationId", "KeyType": "HASH"},
+                    {"AttributeName": "environment", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+            {
+                "IndexName": "KeyLookupIndex",
+                "KeySchema": [{"AttributeName": "keyHash", "KeyType": "HASH"}],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def key_input(**extra) -> dict:
+    return {
+        "arguments": {"input": {"applicationId": "app-1", "environment": "PRODUCTION", **extra}}
+    }
+
+
+def generate(service) -> dict:
+    result = service.generate_key(key_input(organizationId="org-1"))
+    assert result["success"], result
+    return result["item"]
+
+
+def rotate(service) -> str:
+    result = service.rotate_key(key_input())
+    assert result["success"], result
+    return result["item"]["newKey"]
+
+
+def service_accepts(service, key: str) -> bool:
+    return service.validate_key({"arguments": {"key": key}})["success"]
+
+
+def authorizer_accepts(key: str) -> bool:
+    key_authorizer = authorizer.ApiKeyAuthorizer(key_cache=authorizer.KeyContextCache())
+    context, _ = key_authorizer._lookup_key(hashlib.sha256(key.encode()).hexdigest())
+    return context is not None
+
+
+def accepted(service, key: str) -> bool:
+    in_service = service_accepts(service, key)
+    assert authorizer_accepts(key) == in_service
+    return in_service
+
+
+def lookup_items() -> list[dict]:
+    items = boto3.resource("dynamodb").Table(TABLE_NAME).scan()["Items"]
+    return [item for item in items if item["applicationApiKeyId"].startswith("ROTATION#")]
+
+
+def reset_fallback(enabled: bool = True) -> None:
+    for module in (api_keys, authorizer):
+        module._rotation_lookup = rotation_lookup.RotationKeyLookup(scan_fallback=enabled)
+
+
+class FailingUpdates:
+    """Wraps a Table and fails every update_item."""
+
+    def __init__(self, table) -> None:
+        self._table = table
+
+    def __getattr__(self, name):
+        return getattr(self._table, name)
+
+    def update_item(self, **kwargs):
+        raise RuntimeError("update failed")
+
+
+class TestRotationLookup:
+    """Tests for rotation-lookup items across rotate, re-rotate, complete and revoke."""
+
+    @settings(max_examples=8, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(rotations=st.integers(min_value=1, max_value=4))
+    def test_only_latest_next_key_validates(self, rotations) -> None:
+        """After any number of rotations, the current and latest next key validate."""
+        with mock_aws():
+            create_keys_table()
+            reset_fallback()
+            service = api_keys.ApiKeyService()
+            current_key = generate(service)["key"]
+
+            next_keys = [rotate(service) for _ in range(rotations)]
+
+            assert accepted(service, current_key)
+            assert accepted(service, next_keys[-1])
+            for replaced in next_keys[:-1]:
+                assert not accepted(service, replaced)
+            assert len(lookup_items()) == 1
+
+    def test_failed_rerotation_keeps_pending_lookup(self) -> None:
+        """If the record update fails, the pending next key still validates."""
+        with mock_aws():
+            create_keys_table()
+            reset_fallback()
+            service = api_keys.ApiKeyService()
+            generate(service)
+            pending_key = rotate(service)
+
+            table = service.api_keys_table
+            service.api_keys_table = FailingUpdates(table)
+            assert not service.rotate_key(key_input())["success"]
+            service.api_keys_table = table
+
+            assert accepted(service, pending_key)
+
+    def test_complete_rotation_removes_lookup(self) -> None:
+        """The new key becomes primary and the old key stops validating."""
+        with mock_aws():
+            create_keys_table()
+            reset_fallback()
+            service = api_keys.ApiKeyService()
+            item = generate(service)
+            new_key = rotate(service)
+
+            result = service.complete_rotation(
+                {"arguments": {"input": {"applicationApiKeyId": item["applicationApiKeyId"]}}}
+            )
+            assert result["success"]
+            assert lookup_items() == []
+            assert accepted(service, new_key)
+            assert not accepted(service, item["key"])
+
+    def test_revoke_during_rotation_removes_lookup(self) -> None:
+        """Revoking a rotating key invalidates both keys."""
+        with mock_aws():
+            create_keys_table()
+            reset_fallback()
+            service = api_keys.ApiKeyService()
+            item = generate(service)
+            new_key = rotate(service)
+
+            result = service.revoke_key(
+                {"arguments": {"input": {"applicationApiKeyId": item["applicationApiKeyId"]}}}
+            )
+            assert result["success"]
+            assert lookup_items() == []
+            assert not accepted(service, new_key)
+            assert not accepted(service, item["key"])
+
+
+class TestLegacyRotatingKeys:
+    """Tests for keys that were ROTATING before lookup items existed."""
+
+    def make_legacy_rotation(self, service, next_key: str = "sk_prod_" + "b" * 32) -> str:
+        item = generate(service)
+        boto3.resource("dynamodb").Table(TABLE_NAME).update_item(
+            Key={"applicationApiKeyId": item["applicationApiKeyId"]},
+            UpdateExpression="SET nextKeyHash = :next, #status = :rotating",
+            ExpressionAttributeNames={"#status": "status"},
+            ExpressionAttributeValues={
+                ":next": hashlib.sha256(next_key.encode()).hexdigest(),
+                ":rotating": "ROTATING",
+            },
+        )
+        return next_key
+
+    def test_fallback_scan_validates_and_backfills(self) -> None:
+        """The pending key validates without a lookup item, which is then written."""
+        with mock_aws():
+            create_keys_table()
+            reset_fallback()
+            service = api_keys.ApiKeyService()
+            next_key = self.make_legacy_rotation(service)
+
+            assert authorizer_accepts(next_key)
+            assert service_accepts(service, next_key)
+            assert len(lookup_items()) == 1
+
+    def test_backfill_writes_missing_lookups_once(self) -> None:
+        """The backfill event writes each missing lookup item and is idempotent."""
+        with mock_aws():
+            create_keys_table()
+            reset_fallback()
+            service = api_keys.ApiKeyService()
+            next_key = self.make_legacy_rotation(service)
+
+            event = {"type": "BACKFILL_ROTATION_LOOKUPS"}
+            assert api_keys.lambda_handler(event, None) == {"rotatingKeys": 1, "lookupsWritten": 1}
+            assert api_keys.lambda_handler(event, None) == {"rotatingKeys": 1, "lookupsWritten": 0}
+
+            # With the fallback disabled, the backfilled lookup item is enough
+            reset_fallback(enabled=False)
+            assert accepted(service, next_key)
+
+    def test_fallback_is_off_by_default(self) -> None:
+        """Without the migration flag, a miss never scans the table."""
+        assert os.environ.get("ROTATION_LOOKUP_SCAN_FALLBACK") is None
+        with mock_aws():
+            create_keys_table()
+            reset_fallback(enabled=False)
+            service = api_keys.ApiKeyService()
+            next_key = self.make_legacy_rotation(service)
+
+            assert not rotation_lookup.ROTATION_LOOKUP_SCAN_FALLBACK
+            assert not authorizer_accepts(next_key)
+            assert not service_accepts(service, next_key)
+            assert authorizer._rotation_lookup._legacy_keys is None
+            assert api_keys._rotation_lookup._legacy_keys is None
+
+    def test_fallback_snapshot_is_refreshed(self) -> None:
+        """A legacy rotation made after the first scan is found once the snapshot expires."""
+        with mock_aws():
+            create_keys_table()
+            now = [time.time()]
+            lookup = rotation_lookup.RotationKeyLookup(scan_fallback=True, clock=lambda: now[0])
+            table = boto3.resource("dynamodb").Table(TABLE_NAME)
+            assert lookup.find_legacy(table, "unknown") is None
+
+            next_key = self.make_legacy_rotation(api_keys.ApiKeyService())
+            next_hash = hashlib.sha256(next_key.encode()).hexdigest()
+            assert lookup.find_legacy(table, next_hash) is None
+
+            now[0] += lookup.scan_refresh_seconds + 1
+            assert lookup.find_legacy(table, next_hash) is not None
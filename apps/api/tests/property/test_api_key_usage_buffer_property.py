@@ -0,0 +1,224 @@
+"""
+API Key Usage Buffer Property Tests
+
+Validates:
+- lastUsedAt updates are coalesced to the latest timestamp per key and
+  written at most once per key per interval, and per-key write times are
+  dropped once the interval has passed
+- Audit rows are written in one batch once the batch size is reached or
+  the flush interval has passed, and the buffer never holds more than its
+  row cap
+- flush_if_due writes on a background thread and runs one flush at a time,
+  and is not due while lastUsedAt updates are only held back by the interval
+"""
+
+import importlib.util
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+_authorizer_dir = Path(__file__).parent.parent.parent / "lambdas" / "api_key_authorizer"
+_spec = importlib.util.spec_from_file_location(
+    "api_key_authorizer_usage", _authorizer_dir / "index.py"
+)
+assert _spec is not None and _spec.loader is not None
+authorizer = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(authorizer)
+
+
+class RecordingTable:
+    """Stands in for both tables and records the writes made to it."""
+
+    def __init__(self, release: threading.Event | None = None) -> None:
+        self.last_used: list[tuple[str, int]] = []
+        self.batches: list[list[dict]] = []
+        self._release = release
+
+    def update_item(self, **kwargs) -> None:
+        if self._release is not None:
+            self._release.wait(5)
+        self.last_used.append(
+            (kwargs["Key"]["applicationApiKeyId"], kwargs["ExpressionAttributeValues"][":now"])
+        )
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        table = self
+
+        class Writer:
+            def __enter__(self):
+                self.items = []
+                return self
+
+            def put_item(self, Item):
+                self.items.append(Item)
+
+            def __exit__(self, *exc):
+                table.batches.append(self.items)
+
+        return Writer()
+
+
+def make_buffer(table: RecordingTable, **kwargs):
+    options = {"last_used_interval": 60, "flush_interval": 10, "audit_batch_size": 3}
+    options.update(kwargs)
+    return authorizer.UsageWriteBuffer(table, table, **options)
+
+
+def later(seconds: float):
+    """Patch time.time to run ``seconds`` ahead of the real clock."""
+    real_time = time.time
+    return patch.object(authorizer.time, "time", lambda: real_time() + seconds)
+
+
+class TestUsageCoalescing:
+    """Property tests for coalescing lastUsedAt updates."""
+
+    @settings(max_examples=50, deadline=None)
+    @given(
+        uses=st.lists(
+            st.tuples(st.sampled_from(["key-1", "key-2", "key-3"]), st.integers(1, 10_000)),
+            min_size=1,
+            max_size=40,
+        )
+    )
+    def test_one_write_per_key_with_latest_timestamp(self, uses) -> None:
+        """A flush writes each used key once, with its latest timestamp."""
+        table = RecordingTable()
+        buffer = make_buffer(table)
+        for key_id, timestamp in uses:
+            buffer.record_last_used(key_id, timestamp)
+
+        buffer.flush()
+
+        latest: dict[str, int] = {}
+        for key_id, timestamp in uses:
+            latest[key_id] = max(latest.get(key_id, 0), timestamp)
+        assert sorted(table.last_used) == sorted(latest.items())
+
+    def test_writes_at_most_once_per_interval(self) -> None:
+        """Uses inside the interval stay buffered until it passes."""
+        table = RecordingTable()
+        buffer = make_buffer(table, last_used_interval=60)
+        now = int(time.time())
+
+        buffer.record_last_used("key-1", now)
+        buffer.flush()
+        buffer.record_last_used("key-1", now + 30)
+        buffer.flush()
+        assert table.last_used == [("key-1", now)]
+
+        buffer.record_last_used("key-1", now + 60)
+        buffer.flush()
+        assert table.last_used == [("key-1", now), ("key-1", now + 60)]
+
+        buffer.record_last_used("key-1", now + 70)
+        buffer.flush(force=True)
+        assert table.last_used[-1] == ("key-1", now + 70)
+
+    def test_written_keys_are_forgotten_after_the_interval(self) -> None:
+        """Per-key write times are only kept while they can hold a write back."""
+        table = RecordingTable()
+        buffer = make_buffer(table, last_used_interval=60)
+        now = int(time.time())
+        for index in range(5):
+            buffer.record_last_used(f"key-{index}", now)
+        buffer.flush()
+        assert len(buffer._last_used_written) == 5
+
+        with later(61):
+            buffer.flush()
+        assert buffer._last_used_written == {}
+
+
+class TestBackgroundFlush:
+    """Tests for when and how buffered usage is flushed."""
+
+    def test_full_batch_flushes_in_one_write(self) -> None:
+        """Reaching the batch size triggers a single batched audit write."""
+        table = RecordingTable()
+        buffer = make_buffer(table, audit_batch_size=3)
+
+        buffer.record_audit({"logId": "1"})
+        buffer.record_audit({"logId": "2"})
+        assert buffer.flush_if_due() is None
+
+        buffer.record_audit({"logId": "3"})
+        thread = buffer.flush_if_due()
+        assert thread is not None
+        thread.join(5)
+        assert table.batches == [[{"logId": "1"}, {"logId": "2"}, {"logId": "3"}]]
+
+    def test_interval_flushes_partial_batch(self) -> None:
+        """A partial batch is written once the flush interval has passed."""
+        table = RecordingTable()
+        buffer = make_buffer(table, flush_interval=10)
+        buffer.record_audit({"logId": "1"})
+
+        assert buffer.flush_if_due() is None
+        with later(11):
+            thread = buffer.flush_if_due()
+        assert thread is not None
+        thread.join(5)
+        assert table.batches == [[{"logId": "1"}]]
+
+    def test_held_back_last_used_is_not_due(self) -> None:
+        """A lastUsedAt held back by its interval does not start empty flushes."""
+        table = RecordingTable()
+        buffer = make_buffer(table, last_used_interval=60, flush_interval=10)
+        now = int(time.time())
+        buffer.record_last_used("key-1", now)
+        buffer.flush()
+
+        buffer.record_last_used("key-1", now + 5)
+        with later(11):
+            assert buffer.flush_if_due() is None
+        with later(61):
+            thread = buffer.flush_if_due()
+            assert thread is not None
+            thread.join(5)
+        assert table.last_used == [("key-1", now), ("key-1", now + 5)]
+
+    def test_flush_runs_off_the_caller_thread(self) -> None:
+        """flush_if_due returns while the write is in flight, one flush at a time."""
+        release = threading.Event()
+        table = RecordingTable(release)
+        buffer = make_buffer(table, audit_batch_size=1)
+        buffer.record_last_used("key-1", 1000)
+        buffer.record_audit({"logId": "1"})
+
+        thread = buffer.flush_if_due()
+        assert thread is not None and thread.is_alive()
+        buffer.record_audit({"logId": "2"})
+        assert buffer.flush_if_due() is None
+
+        release.set()
+        thread.join(5)
+        buffer.flush()
+        assert table.last_used == [("key-1", 1000)]
+        assert [item for batch in table.batches for item in batch] == [
+            {"logId": "1"},
+            {"logId": "2"},
+        ]
+
+    def test_buffer_drops_oldest_rows_beyond_cap(self) -> None:
+        """The audit buffer never holds more than max_audit_rows."""
+        table = RecordingTable()
+        buffer = make_buffer(table, audit_batch_size=100, max_audit_rows=3)
+        for index in range(5):
+            buffer.record_audit({"logId": str(index)})
+
+        buffer.flush()
+        assert table.batches == [[{"logId": "2"}, {"logId": "3"}, {"logId": "4"}]]
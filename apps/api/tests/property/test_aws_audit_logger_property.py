@@ -0,0 +1,147 @@
+"""
+AWS Audit Logger Buffering Property Tests
+
+Validates:
+- Buffered events are shipped exactly once, grouped by (group, stream)
+- Every PutLogEvents batch respects the count and size limits and is
+  in chronological order
+- Log streams are created once per container, not once per event
+- Log group setup is deferred until the first flush
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import boto3
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import aws_audit_logger  # noqa: E402
+from aws_audit_logger import AWSAuditLogger, AuditEventType  # noqa: E402
+
+
+class RecordingLogsClient:
+    """Records CloudWatch Logs calls made by the audit logger."""
+
+    def __init__(self) -> None:
+        self.exceptions = boto3.client("logs").exceptions
+        self.calls: list = []
+        self.batches: list = []
+
+    def describe_log_groups(self, **kwargs):
+        self.calls.append("describe_log_groups")
+
+    def put_retention_policy(self, **kwargs):
+        self.calls.append("put_retention_policy")
+
+    def create_log_stream(self, **kwargs):
+        self.calls.append("create_log_stream")
+
+    def put_log_events(self, **kwargs):
+        self.calls.append("put_log_events")
+        self.batches.append(kwargs)
+
+
+def reset_process_state() -> None:
+    aws_audit_logger._log_groups_ready = False
+    aws_audit_logger._known_streams.clear()
+
+
+event_types = st.sampled_from(
+    [
+        AuditEventType.ORGANIZATION_UPDATED,
+        AuditEventType.LOGIN_SUCCESS,
+        AuditEventType.SECURITY_VIOLATION,
+        AuditEventType.API_KEY_ROTATED,
+    ]
+)
+
+
+class TestAuditLoggerBuffering:
+    """Property tests for buffered CloudWatch shipping."""
+
+    @settings(max_examples=30, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(
+        events=st.lists(
+            st.tuples(event_types, st.sampled_from(["org-1", "org-2", None])), max_size=40
+        ),
+        max_count=st.integers(min_value=1, max_value=7),
+        max_bytes=st.integers(min_value=1500, max_value=6000),
+    )
+    def test_batches_respect_limits(self, events, max_count, max_bytes) -> None:
+        """Every event is shipped once in limit-respecting, ordered batches."""
+        reset_process_state()
+        with mock_aws():
+            logger = AWSAuditLogger()
+            client = RecordingLogsClient()
+            logger.cloudwatch_logs = client
+
+            original_count = aws_audit_logger.PUT_LOG_EVENTS_MAX_COUNT
+            original_bytes = aws_audit_logger.PUT_LOG_EVENTS_MAX_BYTES
+            original_interval = aws_audit_logger.AUDIT_FLUSH_INTERVAL_SECONDS
+            aws_audit_logger.PUT_LOG_EVENTS_MAX_COUNT = max_count
+            aws_audit_logger.PUT_LOG_EVENTS_MAX_BYTES = max_bytes
+            aws_audit_logger.AUDIT_FLUSH_INTERVAL_SECONDS = 3600
+            try:
+                event_ids = [
+                    logger.log_audit_event(
+                        event_type,
+                        {"user_id": "user-1"},
+                        {"organization_id": org_id},
+                        {"operation": "test"},
+                    )
+                    for event_type, org_id in events
+                ]
+                assert "put_log_events" not in client.calls
+                assert logger.flush() == len(events)
+            finally:
+                aws_audit_logger.PUT_LOG_EVENTS_MAX_COUNT = original_count
+                aws_audit_logger.PUT_LOG_EVENTS_MAX_BYTES = original_bytes
+                aws_audit_logger.AUDIT_FLUSH_INTERVAL_SECONDS = original_interval
+
+        shipped = []
+        streams = set()
+        for batch in client.batches:
+            log_events = batch["logEvents"]
+            streams.add((batch["logGroupName"], batch["logStreamName"]))
+            assert 1 <= len(log_events) <= max_count
+            size = sum(len(e["message"].encode("utf-8")) + 26 for e in log_events)
+            assert size <= max_bytes or len(log_events) == 1
+            timestamps = [e["timestamp"] for e in log_events]
+            assert timestamps == sorted(timestamps)
+            shipped.extend(log_events)
+
+        assert len(shipped) == len(event_ids)
+        assert client.calls.count("create_log_stream") == len(streams)
+        assert client.calls.count("describe_log_groups") == (5 if events else 0)
+
+    def test_streams_known_across_flushes(self) -> None:
+        """A later flush reuses the known stream and skips setup calls."""
+        reset_process_state()
+        with mock_aws():
+            logger = AWSAuditLogger()
+            client = RecordingLogsClient()
+            logger.cloudwatch_logs = client
+            assert client.calls == []
+
+            for _ in range(2):
+                logger.log_audit_event(
+                    AuditEventType.ORGANIZATION_UPDATED,
+                    {"user_id": "user-1"},
+                    {"organization_id": "org-1"},
+                    {"operation": "test"},
+                )
+                logger.flush()
+
+        assert client.calls.count("create_log_stream") == 1
+        assert client.calls.count("describe_log_groups") == 5
+        assert client.calls.count("put_log_events") == 2
@@ -0,0 +1,194 @@
+"""
+Environment Config Cache and Origin Matcher Property Tests
+
+Validates:
+- The compiled origin matcher agrees with pairwise origin matching for
+  exact, wildcard-subdomain and localhost origins
+- Validating a publishable key reads the environment config once for both
+  the origin and rate limit checks
+- A changed config takes effect once the cache TTL runs out, and the TTL
+  is capped
+"""
+
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import boto3
+from hypothesis import given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+_lambdas_dir = Path(__file__).parent.parent.parent / "lambdas"
+
+
+def load_module(name: str, directory: str):
+    spec = importlib.util.spec_from_file_location(name, _lambdas_dir / directory / "index.py")
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+api_keys = load_module("application_api_keys_index", "application_api_keys")
+
+TABLE_NAME = "test-environment-config"
+
+
+def origin_matches(request_origin: str, allowed_origin: str, environment: str) -> bool:
+    """Reference: compare a request origin against one allowed origin."""
+    if api_keys.LOCALHOST_PATTERN.match(request_origin):
+        if environment in {"DEVELOPMENT", "TEST"} and api_keys.LOCALHOST_PATTERN.match(
+            allowed_origin
+        ):
+            return request_origin == allowed_origin
+        return False
+    if allowed_origin.startswith("https://*."):
+        base_domain = allowed_origin[10:]
+        if request_origin.startswith("https://"):
+            origin_domain = request_origin[8:]
+            return origin_domain.endswith(f".{base_domain}") or origin_domain == base_domain
+        return False
+    return request_origin == allowed_origin
+
+
+labels = st.sampled_from(["a", "b", "app", "example", "com", "io"])
+domains = st.lists(labels, min_size=1, max_size=4).map(".".join)
+ports = st.sampled_from(["", ":3000", ":8443"])
+origin_strategy = st.one_of(
+    st.builds(
+        lambda scheme, domain, port: f"{scheme}://{domain}{port}",
+        st.sampled_from(["http", "https"]),
+        domains,
+        ports,
+    ),
+    st.builds(lambda domain, port: f"https://*.{domain}{port}", domains, ports),
+    st.builds(
+        lambda host, port: f"http://{host}{port}",
+        st.sampled_from(["localhost", "127.0.0.1"]),
+        ports,
+    ),
+)
+
+
+class CountingDynamoDB:
+    """Wraps a DynamoDB resource and counts config reads."""
+
+    def __init__(self, resource) -> None:
+        self._resource = resource
+        self.get_item_calls = 0
+
+    def Table(self, name):  # noqa: N802
+        table = self._resource.Table(name)
+        counter = self
+
+        class CountingTable:
+            def get_item(self, **kwargs):
+                counter.get_item_calls += 1
+                return table.get_item(**kwargs)
+
+        return CountingTable()
+
+
+class TestOriginMatcher:
+    """Property tests for the compiled origin matcher."""
+
+    @settings(max_examples=300, deadline=None)
+    @given(
+        allowed=st.lists(origin_strategy, max_size=8),
+        request_origin=origin_strategy,
+        environment=st.sampled_from(["PRODUCTION", "DEVELOPMENT", "TEST"]),
+    )
+    def test_matcher_agrees_with_pairwise_matching(
+        self, allowed, request_origin, environment
+    ) -> None:
+        """A compiled matcher accepts exactly what some allowed origin accepts."""
+        matcher = api_keys.OriginMatcher(allowed, environment)
+        expected = any(origin_matches(request_origin, a, environment) for a in allowed)
+        assert matcher.matches(request_origin) == expected
+
+
+class TestEnvironmentConfigCache:
+    """Tests for the per-container environment config cache."""
+
+    def test_single_read_per_validation_until_ttl_expires(self) -> None:
+        """Origin and rate limit checks share one read until the TTL runs out."""
+        with mock_aws(), patch.dict(os.environ, {"ENVIRONMENT_CONFIG_TABLE": TABLE_NAME}):
+            dynamodb = boto3.resource("dynamodb")
+            dynamodb.create_table(
+                TableName=TABLE_NAME,
+                KeySchema=[
+                    {"AttributeName": "applicationId", "KeyType": "HASH"},
+                    {"AttributeName": "environment", "KeyType": "RANGE"},
+                ],
+                AttributeDefinitions=[
+                    {"AttributeName": "applicationId", "AttributeType": "S"},
+                    {"AttributeName": "environment", "AttributeType": "S"},
+                ],
+                BillingMode="PAY_PER_REQUEST",
+            )
+            dynamodb.Table(TABLE_NAME).put_item(
+                Item={
+                    "applicationId": "app-1",
+                    "environment": "PRODUCTION",
+                    "allowedOrigins": ["https://*.example.com"],
+                    "rateLimitPerMinute": 120,
+                }
+            )
+            api_keys._environment_config_cache.clear()
+
+            service = api_keys.ApiKeyService()
+            counting = CountingDynamoDB(dynamodb)
+            service.dynamodb = counting
+
+            assert service._validate_origin_for_key(
+                "app-1", "PRODUCTION", "https://app.example.com"
+            )["valid"]
+            assert not service._validate_origin_for_key("app-1", "PRODUCTION", "https://evil.com")[
+                "valid"
+            ]
+            assert service._get_rate_limits("app-1", "PRODUCTION") == (
+                120,
+                api_keys.DEFAULT_RATE_LIMIT_PER_DAY,
+            )
+            assert counting.get_item_calls == 1
+
+            dynamodb.Table(TABLE_NAME).put_item(
+                Item={
+                    "applicationId": "app-1",
+                    "environment": "PRODUCTION",
+                    "allowedOrigins": ["https://evil.com"],
+                }
+            )
+            # Still cached until the TTL runs out
+            assert not service._validate_origin_for_key("app-1", "PRODUCTION", "https://evil.com")[
+                "valid"
+            ]
+            assert counting.get_item_calls == 1
+
+            real_time = time.time
+            with patch.object(
+                api_keys.time,
+                "time",
+                lambda: real_time() + api_keys.ENVIRONMENT_CONFIG_TTL_SECONDS + 1,
+            ):
+                assert service._validate_origin_for_key("app-1", "PRODUCTION", "https://evil.com")[
+                    "valid"
+                ]
+            assert counting.get_item_calls == 2
+
+    def test_ttl_is_capped(self) -> None:
+        """A removed allowed origin never stays valid longer than the TTL cap."""
+        assert (
+            api_keys.ENVIRONMENT_CONFIG_TTL_SECONDS <= api_keys.ENVIRONMENT_CONFIG_MAX_TTL_SECONDS
+        )
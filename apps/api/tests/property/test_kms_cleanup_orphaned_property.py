@@ -0,0 +1,170 @@
+"""
+Orphaned KMS Key Sweep Property Tests
+
+Validates:
+- Exactly the keys of missing or DELETED organizations are scheduled for
+  deletion
+- A sweep checkpointed across several invocations covers every key once
+"""
+
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import boto3
+from botocore.client import BaseClient
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+_cleanup_dir = Path(__file__).parent.parent.parent / "lambdas" / "kms_cleanup_orphaned"
+_spec = importlib.util.spec_from_file_location(
+    "kms_cleanup_orphaned_index", _cleanup_dir / "index.py"
+)
+assert _spec is not None and _spec.loader is not None
+cleanup_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(cleanup_module)
+
+
+class LowTimeContext:
+    """Lambda context that always reports little remaining time."""
+
+    invoked_function_arn = "arn:aws:lambda:us-east-1:123456789012:function:kms-cleanup"
+
+    def get_remaining_time_in_millis(self) -> int:
+        return 0
+
+
+_make_api_call = BaseClient._make_api_call
+
+
+def paginated_list_aliases(self, operation_name, api_params):
+    """Apply Limit/Marker to ListAliases, which the mock ignores.
+
+    The marker is the last alias name returned, so deleting aliases already
+    listed does not shift later pages.
+    """
+    if operation_name != "ListAliases":
+        return _make_api_call(self, operation_name, api_params)
+    params = dict(api_params)
+    limit = params.pop("Limit", 100)
+    after = params.pop("Marker", "")
+    aliases = sorted(
+        (
+            a
+            for a in _make_api_call(self, operation_name, params)["Aliases"]
+            if a["AliasName"] > after
+        ),
+        key=lambda a: a["AliasName"],
+    )
+    page = aliases[:limit]
+    truncated = len(aliases) > limit
+    response = {"Aliases": page, "Truncated": truncated}
+    if truncated:
+        response["NextMarker"] = page[-1]["AliasName"]
+    return response
+
+
+# Each organization: None (missing), or its status
+organization_strategy = st.one_of(st.none(), st.sampled_from(["ACTIVE", "DELETED"]))
+
+
+class TestOrphanedKeySweep:
+    """Property tests for the paged, checkpointed KMS key sweep."""
+
+    @settings(max_examples=10, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(organizations=st.lists(organization_strategy, max_size=12), page_size=st.integers(1, 5))
+    def test_checkpointed_sweep_deletes_orphans_once(self, organizations, page_size) -> None:
+        """Across checkpointed invocations, only orphaned keys are scheduled."""
+        with mock_aws():
+            kms = boto3.client("kms")
+            dynamodb = boto3.resource("dynamodb")
+            dynamodb.create_table(
+                TableName="Organizations",
+                KeySchema=[{"AttributeName": "organizationId", "KeyType": "HASH"}],
+                AttributeDefinitions=[{"AttributeName": "organizationId", "AttributeType": "S"}],
+                BillingMode="PAY_PER_REQUEST",
+            )
+
+            expected = set()
+            for index, status in enumerate(organizations):
+                organization_id = f"org-{index:02d}"
+                key_id = kms.create_key()["KeyMetadata"]["KeyId"]
+                kms.create_alias(AliasName=f"alias/org-{organization_id}", TargetKeyId=key_id)
+                if status:
+                    dynamodb.Table("Organizations").put_item(
+                        Item={"organizationId": organization_id, "status": status}
+                    )
+                if status != "ACTIVE":
+                    expected.add(organization_id)
+
+            scheduled = []
+            original_delete = cleanup_module.OrganizationKMSManager.delete_organization_key
+
+            def record_delete(self, organization_id, pending_window_days=30):
+                scheduled.append(organization_id)
+                return original_delete(self, organization_id, pending_window_days)
+
+            checkpoints = []
+            invocations = 1
+            with patch.object(cleanup_module, "KEY_PAGE_SIZE", page_size), patch.object(
+                cleanup_module.OrganizationKMSManager, "delete_organization_key", record_delete
+            ), patch.object(BaseClient, "_make_api_call", paginated_list_aliases), patch.object(
+                cleanup_module,
+                "continue_in_new_invocation",
+                lambda context, marker, totals: checkpoints.append(
+                    {"marker": marker, "totals": totals}
+                ),
+            ):
+                response = cleanup_module.lambda_handler({}, LowTimeContext())
+                while checkpoints:
+                    invocations += 1
+                    response = cleanup_module.lambda_handler(checkpoints.pop(), LowTimeContext())
+
+            body = json.loads(response["body"])
+            assert response["statusCode"] == 200
+            assert sorted(scheduled) == sorted(expected)
+            assert body["totalKeysChecked"] == len(organizations)
+            assert body["keysScheduledForDeletion"] == len(expected)
+            assert body["nextMarker"] is None
+            # One page per invocation, since the context always reports low time
+            assert invocations > 1 or not organizations
+
+    def test_failed_checkpoint_continues_inline(self) -> None:
+        """A failed self-invoke finishes the sweep in the same invocation."""
+        with mock_aws():
+            kms = boto3.client("kms")
+            dynamodb = boto3.resource("dynamodb")
+            dynamodb.create_table(
+                TableName="Organizations",
+                KeySchema=[{"AttributeName": "organizationId", "KeyType": "HASH"}],
+                AttributeDefinitions=[{"AttributeName": "organizationId", "AttributeType": "S"}],
+                BillingMode="PAY_PER_REQUEST",
+            )
+            for index in range(4):
+                key_id = kms.create_key()["KeyMetadata"]["KeyId"]
+                kms.create_alias(AliasName=f"alias/org-org-{index:02d}", TargetKeyId=key_id)
+
+            def failing_invoke(context, marker, totals):
+                raise RuntimeError("invoke failed")
+
+            with patch.object(cleanup_module, "KEY_PAGE_SIZE", 1), patch.object(
+                BaseClient, "_make_api_call", paginated_list_aliases
+            ), patch.object(cleanup_module, "continue_in_new_invocation", failing_invoke):
+                response = cleanup_module.lambda_handler({}, LowTimeContext())
+
+            body = json.loads(response["body"])
+            assert response["statusCode"] == 200
+            assert body["totalKeysChecked"] == 4
+            assert body["keysScheduledForDeletion"] == 4
+            assert body["nextMarker"] is None
@@ -0,0 +1,142 @@
+"""
+Organization KMS Envelope Encryption Property Tests
+
+Validates:
+- Envelope-encrypted data round-trips for any plaintext and context
+- Ciphertext produced by direct KMS Encrypt still decrypts
+- Data keys are reused from the container cache within their use limit,
+  so repeated encrypt/decrypt calls do not each call KMS
+- A mismatched encryption context is rejected
+"""
+
+import base64
+import os
+import sys
+from pathlib import Path
+
+import boto3
+import pytest
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from cryptography.exceptions import InvalidTag  # noqa: E402
+from kms_manager import DataKeyCache, OrganizationKMSManager  # noqa: E402
+
+ORG_ID = "org-1"
+
+
+class CountingKMS:
+    """Wraps a KMS client and counts data-plane calls."""
+
+    def __init__(self, client) -> None:
+        self._client = client
+        self.calls: list[str] = []
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name in ("encrypt", "decrypt", "generate_data_key"):
+
+            def wrapper(**kwargs):
+                self.calls.append(name)
+                return attr(**kwargs)
+
+            return wrapper
+        return attr
+
+
+def make_manager(max_uses: int = 1000) -> tuple[OrganizationKMSManager, CountingKMS]:
+    """Create a manager for an organization key in the active mock."""
+    client = boto3.client("kms")
+    key_id = client.create_key()["KeyMetadata"]["KeyId"]
+    client.create_alias(AliasName=f"alias/org-{ORG_ID}", TargetKeyId=key_id)
+
+    manager = OrganizationKMSManager()
+    counting = CountingKMS(client)
+    manager.kms_client = counting
+    manager.data_key_cache = DataKeyCache(ttl_seconds=300, max_uses=max_uses, max_entries=16)
+    return manager, counting
+
+
+contexts = st.dictionaries(
+    st.sampled_from(["Field", "Resource"]), st.text(min_size=1, max_size=10), max_size=2
+)
+
+
+class TestEnvelopeEncryption:
+    """Property tests for envelope encryption with cached data keys."""
+
+    @settings(max_examples=25, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(plaintexts=st.lists(st.text(max_size=200), min_size=1, max_size=8), context=contexts)
+    def test_round_trip_with_cached_key(self, plaintexts: list[str], context: dict) -> None:
+        """All values round-trip and share one GenerateDataKey call."""
+        with mock_aws():
+            manager, counting = make_manager()
+            encrypted = [
+                manager.encrypt_organization_data(ORG_ID, text, dict(context))
+                for text in plaintexts
+            ]
+            for text, value in zip(plaintexts, encrypted):
+                assert value.startswith("env1:")
+                assert manager.decrypt_organization_data(ORG_ID, value, dict(context)) == text
+
+            assert counting.calls == ["generate_data_key"]
+
+    @settings(max_examples=10, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(
+        count=st.integers(min_value=1, max_value=7), max_uses=st.integers(min_value=1, max_value=3)
+    )
+    def test_data_key_use_limit(self, count: int, max_uses: int) -> None:
+        """A data key encrypts at most max_uses values before a new one is generated."""
+        with mock_aws():
+            manager, counting = make_manager(max_uses=max_uses)
+            for index in range(count):
+                manager.encrypt_organization_data(ORG_ID, f"value-{index}")
+            assert counting.calls.count("generate_data_key") == -(-count // max_uses)
+
+    def test_legacy_ciphertext_decrypts(self) -> None:
+        """Values encrypted directly with KMS remain readable."""
+        with mock_aws():
+            manager, counting = make_manager()
+            blob = boto3.client("kms").encrypt(
+                KeyId=f"alias/org-{ORG_ID}",
+                Plaintext=b"legacy description",
+                EncryptionContext={"OrganizationId": ORG_ID, "Purpose": "OrganizationData"},
+            )["CiphertextBlob"]
+            legacy = base64.b64encode(blob).decode("utf-8")
+
+            assert manager.decrypt_organization_data(ORG_ID, legacy) == "legacy description"
+            assert counting.calls == ["decrypt"]
+
+    def test_context_mismatch_rejected(self) -> None:
+        """Decrypting with a different encryption context fails."""
+        with mock_aws():
+            manager, _ = make_manager()
+            value = manager.encrypt_organization_data(ORG_ID, "secret", {"Field": "description"})
+            with pytest.raises(InvalidTag):
+                manager.decrypt_organization_data(ORG_ID, value, {"Field": "name"})
+
+    def test_fresh_container_unwraps_data_key_once(self) -> None:
+        """Without a cached key, reads call KMS Decrypt once per data key."""
+        with mock_aws():
+            manager, _ = make_manager()
+            values = [manager.encrypt_organization_data(ORG_ID, f"v{i}") for i in range(3)]
+
+            reader = OrganizationKMSManager()
+            counting = CountingKMS(boto3.client("kms"))
+            reader.kms_client = counting
+            reader.data_key_cache = DataKeyCache(ttl_seconds=300, max_uses=1000, max_entries=16)
+
+            assert [reader.decrypt_organization_data(ORG_ID, v) for v in values] == [
+                "v0",
+                "v1",
+                "v2",
+            ]
+            assert counting.calls == ["decrypt"]
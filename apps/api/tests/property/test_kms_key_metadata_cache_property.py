@@ -0,0 +1,97 @@
+"""
+Organization KMS Key Metadata Cache Tests
+
+Validates:
+- The account ID is looked up once per container
+- Repeated key lookups reuse cached metadata
+- Deleting or rotating a key invalidates its cached metadata
+"""
+
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import kms_manager  # noqa: E402
+from kms_manager import OrganizationKMSManager  # noqa: E402
+
+ORG_ID = "org-1"
+
+
+class CountingKMS:
+    """Wraps a KMS client and counts control-plane lookups."""
+
+    def __init__(self, client) -> None:
+        self._client = client
+        self.calls: list[str] = []
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if name in ("describe_key", "get_key_rotation_status"):
+
+            def wrapper(**kwargs):
+                self.calls.append(name)
+                return attr(**kwargs)
+
+            return wrapper
+        return attr
+
+
+def make_manager() -> tuple[OrganizationKMSManager, CountingKMS]:
+    kms_manager._key_metadata_cache.clear()
+    manager = OrganizationKMSManager()
+    counting = CountingKMS(boto3.client("kms"))
+    manager.kms_client = counting
+    return manager, counting
+
+
+class TestKeyMetadataCache:
+    """Tests for account ID memoization and key metadata caching."""
+
+    def test_account_id_looked_up_once(self) -> None:
+        """create_organization_kms_key no longer calls STS per policy principal."""
+        with mock_aws():
+            kms_manager._account_id = None
+            manager, _ = make_manager()
+            with patch.object(kms_manager.boto3, "client", wraps=boto3.client) as client:
+                manager.create_organization_kms_key(ORG_ID, "Org", "owner-1")
+                manager.create_organization_kms_key("org-2", "Org 2", "owner-1")
+            sts_clients = [c for c in client.call_args_list if c.args == ("sts",)]
+            assert len(sts_clients) == 1
+
+    def test_lookups_cached_until_delete(self) -> None:
+        """Key lookups hit KMS once; deletion forgets the key."""
+        with mock_aws():
+            manager, counting = make_manager()
+            manager.create_organization_kms_key(ORG_ID, "Org", "owner-1")
+
+            first = manager.get_organization_kms_key(ORG_ID)
+            second = manager.get_organization_kms_key(ORG_ID)
+            assert first == second
+            assert counting.calls == ["describe_key", "get_key_rotation_status"]
+
+            second["enabled"] = False
+            assert manager.get_organization_kms_key(ORG_ID)["enabled"] is True
+
+            assert manager.delete_organization_key(ORG_ID, pending_window_days=7)
+            assert manager.get_organization_kms_key(ORG_ID) is None
+
+    def test_rotate_invalidates(self) -> None:
+        """A rotation check forces the next lookup back to KMS."""
+        with mock_aws():
+            manager, counting = make_manager()
+            manager.create_organization_kms_key(ORG_ID, "Org", "owner-1")
+
+            assert manager.rotate_organization_key(ORG_ID)
+            manager.get_organization_kms_key(ORG_ID)
+            assert counting.calls.count("describe_key") == 2
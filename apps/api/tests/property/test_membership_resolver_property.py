@@ -0,0 +1,270 @@
+"""
+Organization Membership Resolver Property Tests
+
+Validates:
+- Within one request scope, the context, RBAC and security checks share a
+  single BatchGetItem round trip
+- The resolved role matches the organization and membership rows
+- Invalidation makes membership changes visible in the same container
+- The container cache TTL cannot be raised past its cap
+- Organization updates, deletes and ownership transfers invalidate the
+  container cache, so the next resolve reads the changed rows
+"""
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import boto3
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import membership_resolver  # noqa: E402
+from membership_resolver import OrganizationMembershipResolver  # noqa: E402
+from rbac_manager import OrganizationRBACManager, OrganizationRole  # noqa: E402
+from security_manager import OrganizationSecurityManager  # noqa: E402
+
+ORG_ID = "org-1"
+OWNER_ID = "owner-1"
+USER_ID = "user-1"
+
+_lambdas_dir = Path(__file__).parent.parent.parent / "lambdas"
+
+
+def load_lambda(name: str, directory: str):
+    spec = importlib.util.spec_from_file_location(name, _lambdas_dir / directory / "index.py")
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class CountingDynamoDB:
+    """Wraps a DynamoDB resource and counts batch_get_item calls."""
+
+    def __init__(self, resource) -> None:
+        self._resource = resource
+        self.batch_get_calls = 0
+
+    def batch_get_item(self, **kwargs):
+        self.batch_get_calls += 1
+        return self._resource.batch_get_item(**kwargs)
+
+
+def create_tables(dynamodb) -> None:
+    """Create the Organizations and OrganizationUsers tables in the active mock."""
+    dynamodb.create_table(
+        TableName="Organizations",
+        KeySchema=[{"AttributeName": "organizationId", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "organizationId", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    dynamodb.create_table(
+        TableName="OrganizationUsers",
+        KeySchema=[
+            {"AttributeName": "userId", "KeyType": "HASH"},
+            {"AttributeName": "organizationId", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "userId", "AttributeType": "S"},
+            {"AttributeName": "organizationId", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+class TestMembershipResolverProperty:
+    """Property tests for OrganizationMembershipResolver."""
+
+    @settings(max_examples=20, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(
+        org_exists=st.booleans(),
+        membership=st.one_of(
+            st.none(),
+            st.tuples(
+                st.sampled_from(["ADMINISTRATOR", "VIEWER"]),
+                st.sampled_from(["ACTIVE", "SUSPENDED"]),
+            ),
+        ),
+        user_id=st.sampled_from([OWNER_ID, USER_ID]),
+    )
+    def test_one_round_trip_per_request(self, org_exists, membership, user_id) -> None:
+        """All checks in a request scope agree and cost one BatchGetItem."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            create_tables(dynamodb)
+            if org_exists:
+                dynamodb.Table("Organizations").put_item(
+                    Item={"organizationId": ORG_ID, "ownerId": OWNER_ID, "status": "ACTIVE"}
+                )
+            if membership:
+                role, status = membership
+                dynamodb.Table("OrganizationUsers").put_item(
+                    Item={
+                        "userId": user_id,
+                        "organizationId": ORG_ID,
+                        "role": role,
+                        "status": status,
+                    }
+                )
+
+            counting = CountingDynamoDB(dynamodb)
+            resolver = OrganizationMembershipResolver(dynamodb=counting, ttl_seconds=0)
+            rbac = OrganizationRBACManager(membership_resolver=resolver)
+            security = OrganizationSecurityManager(membership_resolver=resolver)
+
+            with resolver.request_scope():
+                role, _ = rbac._get_user_organization_role(user_id, ORG_ID)
+                rbac.check_permission(user_id, ORG_ID, "organization.read", ["CUSTOMER"])
+                context = security._get_organization_context(user_id, ORG_ID, ["CUSTOMER"])
+
+            assert counting.batch_get_calls == 1
+
+            if not org_exists:
+                expected = None
+            elif user_id == OWNER_ID:
+                expected = OrganizationRole.OWNER
+            elif membership and membership[1] == "ACTIVE":
+                expected = OrganizationRole(membership[0])
+            else:
+                expected = None
+            assert role == expected
+            assert context["organization_role"] == (expected.value if expected else None)
+
+    def test_container_cache_and_invalidation(self) -> None:
+        """Cached rows are reused across requests until invalidated."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            create_tables(dynamodb)
+            dynamodb.Table("Organizations").put_item(
+                Item={"organizationId": ORG_ID, "ownerId": OWNER_ID, "status": "ACTIVE"}
+            )
+
+            counting = CountingDynamoDB(dynamodb)
+            resolver = OrganizationMembershipResolver(dynamodb=counting, ttl_seconds=60)
+
+            assert resolver.resolve(USER_ID, ORG_ID).membership is None
+            dynamodb.Table("OrganizationUsers").put_item(
+                Item={
+                    "userId": USER_ID,
+                    "organizationId": ORG_ID,
+                    "role": "VIEWER",
+                    "status": "ACTIVE",
+                }
+            )
+            assert resolver.resolve(USER_ID, ORG_ID).membership is None
+            assert counting.batch_get_calls == 1
+
+            assert resolver.invalidate(user_id=USER_ID) == 1
+            assert resolver.resolve(USER_ID, ORG_ID).membership["role"] == "VIEWER"
+            assert counting.batch_get_calls == 2
+
+    def test_container_cache_ttl_is_capped(self) -> None:
+        """Membership changes reach other containers within the TTL cap."""
+        assert (
+            membership_resolver.MEMBERSHIP_CACHE_TTL_SECONDS
+            <= membership_resolver.MEMBERSHIP_CACHE_MAX_TTL_SECONDS
+        )
+
+
+class UnconditionalUpdates:
+    """Wraps a Table and applies update_item without its condition."""
+
+    def __init__(self, table) -> None:
+        self._table = table
+
+    def update_item(self, **kwargs):
+        kwargs.pop("ConditionExpression", None)
+        kwargs.pop("ExpressionAttributeNames", None)
+        return self._table.update_item(**kwargs)
+
+
+class DiscardingTable:
+    """Accepts and drops writes."""
+
+    def put_item(self, **kwargs) -> None:
+        pass
+
+
+class TestMutationInvalidation:
+    """Mutations invalidate the container cache for the organization."""
+
+    def setup_resolver(self, dynamodb) -> CountingDynamoDB:
+        create_tables(dynamodb)
+        dynamodb.Table("Organizations").put_item(
+            Item={"organizationId": ORG_ID, "ownerId": OWNER_ID, "status": "ACTIVE", "name": "Old"}
+        )
+        counting = CountingDynamoDB(dynamodb)
+        membership_resolver._resolver = OrganizationMembershipResolver(
+            dynamodb=counting, ttl_seconds=60
+        )
+        # Prime the container cache
+        membership_resolver.get_membership_resolver().resolve(OWNER_ID, ORG_ID)
+        membership_resolver.get_membership_resolver().resolve(OWNER_ID, ORG_ID)
+        assert counting.batch_get_calls == 1
+        return counting
+
+    def org_context(self) -> SimpleNamespace:
+        return SimpleNamespace(
+            organization_id=ORG_ID,
+            organization_data={"organizationId": ORG_ID, "ownerId": OWNER_ID},
+            user_id=OWNER_ID,
+            cognito_groups=["CUSTOMER"],
+        )
+
+    def test_update_and_delete_organization(self) -> None:
+        """After an update or delete, resolve reads the organization again."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            counting = self.setup_resolver(dynamodb)
+            organizations = load_lambda("organizations_index_invalidation", "organizations")
+            resolver = organizations.OrganizationsResolver()
+            resolver.kms_manager = SimpleNamespace(delete_organization_key=lambda *a, **k: True)
+
+            try:
+                update = organizations.OrganizationsResolver.update_organization.__wrapped__
+                response = update(resolver, {"arguments": {"name": "New"}}, self.org_context())
+                assert response["statusCode"] == 200
+                resolved = membership_resolver.get_membership_resolver().resolve(OWNER_ID, ORG_ID)
+                assert counting.batch_get_calls == 2
+                assert resolved.organization["name"] == "New"
+
+                delete = organizations.OrganizationsResolver.delete_organization.__wrapped__
+                response = delete(resolver, {}, self.org_context())
+                assert response["statusCode"] == 200
+                resolved = membership_resolver.get_membership_resolver().resolve(OWNER_ID, ORG_ID)
+                assert counting.batch_get_calls == 3
+                assert resolved.organization["status"] == "DELETED"
+            finally:
+                membership_resolver._resolver = None
+
+    def test_ownership_transfer(self) -> None:
+        """After an ownership transfer, resolve reads the new owner."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            counting = self.setup_resolver(dynamodb)
+            transfers = load_lambda(
+                "ownership_transfer_index_invalidation", "ownership_transfer_service"
+            )
+            service = transfers.OwnershipTransferResolver()
+            service.organizations_table = UnconditionalUpdates(dynamodb.Table("Organizations"))
+            service.transfer_requests_table = DiscardingTable()
+            service.notifications_table = DiscardingTable()
+
+            try:
+                service._execute_immediate_transfer(OWNER_ID, USER_ID, ORG_ID)
+                resolved = membership_resolver.get_membership_resolver().resolve(OWNER_ID, ORG_ID)
+                assert counting.batch_get_calls == 2
+                assert resolved.organization["ownerId"] == USER_ID
+            finally:
+                membership_resolver._resolver = None
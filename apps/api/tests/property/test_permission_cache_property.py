@@ -0,0 +1,137 @@
+# file: apps/api/tests/property/test_permission_cache_property.py
+# author: AI Assistant
+# created: 2026-10-16
+# description: Property tests for the bounded PermissionCache
+# Feature: application-access-management, Property 4: Permission Resolution Determinism
+
+"""
+PermissionCache Property Tests
+
+Validates:
+- The cache never exceeds its entry or byte bounds
+- Invalidation by user and by (user, application) removes exactly the
+  matching entries and nothing else
+- Expired entries are swept on write without being read again
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+_permission_resolution_dir = (
+    Path(__file__).parent.parent.parent / "lambdas" / "permission_resolution"
+)
+sys.path.insert(0, str(_permission_resolution_dir))
+
+_spec = importlib.util.spec_from_file_location(
+    "permission_resolution_index", _permission_resolution_dir / "index.py"
+)
+assert _spec is not None and _spec.loader is not None
+_perm_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_perm_module)
+sys.modules["permission_resolution_index"] = _perm_module
+PermissionCache = _perm_module.PermissionCache
+
+users = st.sampled_from(["u1", "u2", "u3"])
+apps = st.sampled_from(["a1", "a2"])
+envs = st.sampled_from(["PRODUCTION", "STAGING"])
+
+operation_strategy = st.one_of(
+    st.tuples(st.just("set"), users, apps, envs, st.integers(min_value=0, max_value=20)),
+    st.tuples(st.just("get"), users, apps, envs),
+    st.tuples(st.just("invalidate"), users, apps),
+    st.tuples(st.just("invalidate_user"), users),
+)
+
+
+def payload(size: int) -> dict[str, Any]:
+    """Build a cached result whose serialized size grows with size."""
+    return {"effectivePermissions": [f"perm:{i}" for i in range(size)]}
+
+
+class TestPermissionCacheProperty:
+    """Property tests for PermissionCache bounds and invalidation."""
+
+    @settings(max_examples=100, deadline=None)
+    @given(
+        operations=st.lists(operation_strategy, max_size=60),
+        max_entries=st.integers(min_value=1, max_value=6),
+        max_bytes=st.integers(min_value=50, max_value=600),
+    )
+    def test_bounds_and_invalidation(
+        self, operations: list[tuple], max_entries: int, max_bytes: int
+    ) -> None:
+        """Cached entries are always a bounded subset of the reference model."""
+        cache = PermissionCache(ttl_seconds=300, max_entries=max_entries, max_bytes=max_bytes)
+        model: dict[tuple[str, str, str], dict[str, Any]] = {}
+
+        for operation in operations:
+            kind = operation[0]
+            if kind == "set":
+                _, user_id, app_id, env, size = operation
+                cache.set(user_id, app_id, env, payload(size))
+                model[(user_id, app_id, env)] = payload(size)
+            elif kind == "get":
+                _, user_id, app_id, env = operation
+                result = cache.get(user_id, app_id, env)
+                if result is not None:
+                    assert result == model[(user_id, app_id, env)]
+            elif kind == "invalidate":
+                _, user_id, app_id = operation
+                cache.invalidate(user_id, app_id)
+                model = {k: v for k, v in model.items() if k[:2] != (user_id, app_id)}
+            else:
+                _, user_id = operation
+                cache.invalidate_all_for_user(user_id)
+                model = {k: v for k, v in model.items() if k[0] != user_id}
+
+            stats = cache.stats()
+            assert stats["entries"] <= max_entries
+            assert stats["bytes"] <= max_bytes
+
+        for user_id in ("u1", "u2", "u3"):
+            for app_id in ("a1", "a2"):
+                for env in ("PRODUCTION", "STAGING"):
+                    if (user_id, app_id, env) not in model:
+                        assert cache.get(user_id, app_id, env) is None
+
+    def test_expired_entries_swept_on_write(self) -> None:
+        """Entries past their TTL are dropped by later writes, not only by reads."""
+        cache = PermissionCache(ttl_seconds=10, max_entries=100)
+        with patch.object(_perm_module.time, "time", return_value=1000.0):
+            cache.set("u1", "a1", "PRODUCTION", payload(1))
+            cache.set("u2", "a1", "PRODUCTION", payload(1))
+
+        with patch.object(_perm_module.time, "time", return_value=1011.0):
+            cache.set("u3", "a1", "PRODUCTION", payload(1))
+
+        stats = cache.stats()
+        assert stats["entries"] == 1
+        assert stats["expirations"] == 2
+
+    def test_oversized_result_replaces_cached_entry(self) -> None:
+        """A result too large to cache still drops the entry it replaces."""
+        cache = PermissionCache(ttl_seconds=300, max_entries=10, max_bytes=50)
+        cache.set("u1", "a1", "PRODUCTION", payload(0))
+        cache.set("u1", "a1", "PRODUCTION", payload(10))
+
+        assert cache.get("u1", "a1", "PRODUCTION") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_evicts_least_recently_used(self) -> None:
+        """A read refreshes recency, so the other entry is evicted first."""
+        cache = PermissionCache(ttl_seconds=300, max_entries=2)
+        cache.set("u1", "a1", "PRODUCTION", payload(1))
+        cache.set("u2", "a1", "PRODUCTION", payload(1))
+        assert cache.get("u1", "a1", "PRODUCTION") is not None
+
+        cache.set("u3", "a1", "PRODUCTION", payload(1))
+
+        assert cache.get("u2", "a1", "PRODUCTION") is None
+        assert cache.get("u1", "a1", "PRODUCTION") is not None
+        assert cache.stats()["evictions"] == 1
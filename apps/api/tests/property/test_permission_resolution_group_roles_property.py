@@ -0,0 +1,264 @@
+# file: apps/api/tests/property/test_permission_resolution_group_roles_property.py
+# author: AI Assistant
+# created: 2026-10-16
+# description: Property test for batched group-inherited role resolution
+# Feature: application-access-management, Property 6: Permission Union
+
+"""
+Group Role Resolution Property Tests
+
+*For any* set of group memberships, resolving group-inherited roles with
+BatchGetItem and concurrent GroupEnvRoleIndex queries must return exactly
+the roles of the user's ACTIVE groups in the application and environment.
+"""
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import boto3
+from botocore.exceptions import ClientError
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+_permission_resolution_dir = (
+    Path(__file__).parent.parent.parent / "lambdas" / "permission_resolution"
+)
+sys.path.insert(0, str(_permission_resolution_dir))
+
+_spec = importlib.util.spec_from_file_location(
+    "permission_resolution_index", _permission_resolution_dir / "index.py"
+)
+assert _spec is not None and _spec.loader is not None
+_perm_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_perm_module)
+sys.modules["permission_resolution_index"] = _perm_module
+PermissionResolutionService = _perm_module.PermissionResolutionService
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+USER_ID = "user-1"
+APPLICATION_ID = "app-1"
+ENVIRONMENT = "PRODUCTION"
+
+
+def create_tables() -> None:
+    """Create the group tables in the active moto mock."""
+    dynamodb = boto3.resource("dynamodb")
+    dynamodb.create_table(
+        TableName=os.environ["APPLICATION_GROUPS_TABLE"],
+        KeySchema=[{"AttributeName": "applicationGroupId", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "applicationGroupId", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    dynamodb.create_table(
+        TableName=os.environ["APPLICATION_GROUP_USERS_TABLE"],
+        KeySchema=[{"AttributeName": "applicationGroupUserId", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": "applicationGroupUserId", "AttributeType": "S"},
+            {"AttributeName": "userId", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "UserGroupsIndex",
+                "KeySchema": [{"AttributeName": "userId", "KeyType": "HASH"}],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    dynamodb.create_table(
+        TableName=os.environ["APPLICATION_GROUP_ROLES_TABLE"],
+        KeySchema=[{"AttributeName": "applicationGroupRoleId", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": "applicationGroupRoleId", "AttributeType": "S"},
+            {"AttributeName": "applicationGroupId", "AttributeType": "S"},
+            {"AttributeName": "environment", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": "GroupEnvRoleIndex",
+                "KeySchema": [
+                    {"AttributeName": "applicationGroupId", "KeyType": "HASH"},
+                    {"AttributeName": "environment", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+# Each group: (exists, group status, membership app, roles as (environment, status))
+group_strategy = st.tuples(
+    st.booleans(),
+    st.sampled_from(["ACTIVE", "DELETED"]),
+    st.sampled_from([APPLICATION_ID, "app-2"]),
+    st.lists(
+        st.tuples(
+            st.sampled_from([ENVIRONMENT, "STAGING"]), st.sampled_from(["ACTIVE", "DELETED"])
+        ),
+        max_size=3,
+    ),
+)
+
+
+class TestGroupRoleResolution:
+    """Property tests for batched group and group-role resolution."""
+
+    @settings(max_examples=25, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(groups=st.lists(group_strategy, max_size=12))
+    def test_group_roles_match_active_memberships(self, groups: list[Any]) -> None:
+        """Resolved group roles are exactly the ACTIVE roles of ACTIVE groups."""
+        os.environ["APPLICATION_GROUPS_TABLE"] = "test-groups"
+        os.environ["APPLICATION_GROUP_USERS_TABLE"] = "test-group-users"
+        os.environ["APPLICATION_GROUP_ROLES_TABLE"] = "test-group-roles"
+
+        with mock_aws():
+            create_tables()
+            dynamodb = boto3.resource("dynamodb")
+            groups_table = dynamodb.Table("test-groups")
+            group_users_table = dynamodb.Table("test-group-users")
+            group_roles_table = dynamodb.Table("test-group-roles")
+
+            expected = set()
+            for index, (exists, status, app_id, roles) in enumerate(groups):
+                group_id = f"group-{index:02d}"
+                if exists:
+                    groups_table.put_item(
+                        Item={
+                            "applicationGroupId": group_id,
+                            "name": f"Group {index}",
+                            "status": status,
+                        }
+                    )
+                group_users_table.put_item(
+                    Item={
+                        "applicationGroupUserId": f"membership-{index}",
+                        "applicationGroupId": group_id,
+                        "userId": USER_ID,
+                        "applicationId": app_id,
+                        "status": "ACTIVE",
+                    }
+                )
+                for role_index, (environment, role_status) in enumerate(roles):
+                    role_id = f"role-{index}-{role_index}"
+                    group_roles_table.put_item(
+                        Item={
+                            "applicationGroupRoleId": f"{group_id}-{role_id}",
+                            "applicationGroupId": group_id,
+                            "environment": environment,
+                            "roleId": role_id,
+                            "permissions": [f"perm:{role_id}"],
+                            "status": role_status,
+                        }
+                    )
+                    if (
+                        exists
+                        and status == "ACTIVE"
+                        and app_id == APPLICATION_ID
+                        and environment == ENVIRONMENT
+                        and role_status == "ACTIVE"
+                    ):
+                        expected.add((group_id, role_id))
+
+            service = PermissionResolutionService()
+            user_groups = service._get_user_groups(USER_ID, APPLICATION_ID)
+            group_roles = service._get_group_roles(user_groups, ENVIRONMENT)
+
+            assert {(r["applicationGroupId"], r["roleId"]) for r in group_roles} == expected
+            assert group_roles == sorted(
+                group_roles, key=lambda r: (r["applicationGroupId"], r["roleId"])
+            )
+
+    def test_unprocessed_groups_fail_resolution_uncached(self) -> None:
+        """Groups left unprocessed after retries fail the resolution and are not cached."""
+        os.environ["APPLICATION_GROUPS_TABLE"] = "test-groups"
+        os.environ["APPLICATION_GROUP_USERS_TABLE"] = "test-group-users"
+        os.environ["APPLICATION_GROUP_ROLES_TABLE"] = "test-group-roles"
+
+        with mock_aws():
+            create_tables()
+            boto3.resource("dynamodb").Table("test-group-users").put_item(
+                Item={
+                    "applicationGroupUserId": "membership-0",
+                    "applicationGroupId": "group-00",
+                    "userId": USER_ID,
+                    "applicationId": APPLICATION_ID,
+                    "status": "ACTIVE",
+                }
+            )
+
+            service = PermissionResolutionService()
+
+            def throttled(RequestItems):
+                return {"Responses": {}, "UnprocessedKeys": RequestItems}
+
+            event = {
+                "arguments": {
+                    "userId": USER_ID,
+                    "applicationId": APPLICATION_ID,
+                    "environment": ENVIRONMENT,
+                }
+            }
+            with patch.object(service.dynamodb, "batch_get_item", throttled), patch.object(
+                _perm_module.time, "sleep"
+            ):
+                result = service.resolve_permissions(event)
+
+            assert not result["success"]
+            assert _perm_module._permission_cache.get(USER_ID, APPLICATION_ID, ENVIRONMENT) is None
+
+    def test_failed_group_role_query_fails_resolution_uncached(self) -> None:
+        """A failed GroupEnvRoleIndex query fails the resolution and is not cached."""
+        os.environ["APPLICATION_GROUPS_TABLE"] = "test-groups"
+        os.environ["APPLICATION_GROUP_USERS_TABLE"] = "test-group-users"
+        os.environ["APPLICATION_GROUP_ROLES_TABLE"] = "test-group-roles"
+
+        with mock_aws():
+            create_tables()
+            dynamodb = boto3.resource("dynamodb")
+            for index in range(2):
+                group_id = f"group-{index:02d}"
+                dynamodb.Table("test-groups").put_item(
+                    Item={"applicationGroupId": group_id, "name": group_id, "status": "ACTIVE"}
+                )
+                dynamodb.Table("test-group-users").put_item(
+                    Item={
+                        "applicationGroupUserId": f"membership-{index}",
+                        "applicationGroupId": group_id,
+                        "userId": USER_ID,
+                        "applicationId": APPLICATION_ID,
+                        "status": "ACTIVE",
+                    }
+                )
+
+            service = PermissionResolutionService()
+            original_query = service.group_roles_table.query
+            calls: list[dict[str, Any]] = []
+
+            def throttled_for_one_group(**kwargs: Any) -> dict[str, Any]:
+                calls.append(kwargs)
+                if len(calls) == 1:
+                    raise ClientError(
+                        {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+                        "Query",
+                    )
+                return original_query(**kwargs)
+
+            event = {
+                "arguments": {
+                    "userId": USER_ID,
+                    "applicationId": APPLICATION_ID,
+                    "environment": ENVIRONMENT,
+                }
+            }
+            with patch.object(service.group_roles_table, "query", throttled_for_one_group):
+                result = service.resolve_permissions(event)
+
+            assert not result["success"]
+            assert _perm_module._permission_cache.get(USER_ID, APPLICATION_ID, ENVIRONMENT) is None
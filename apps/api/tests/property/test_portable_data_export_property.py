@@ -0,0 +1,103 @@
+"""
+Portable Data Export Property Tests
+
+Validates:
+- Every record is written to the sink as one NDJSON line, in order, with
+  or without gzip
+- The manifest's per-table record counts and SHA-256 hashes match the
+  lines written for each table
+- Numbers and sets read from DynamoDB are encoded as plain JSON
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import sys
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+from privacy_rights_manager import (  # noqa: E402
+    DataCategory,
+    PersonalDataRecord,
+    PortableDataExporter,
+)
+
+TABLES = ["Users", "Notifications", "OrganizationUsers"]
+
+
+def make_record(table: str, index: int, value: str) -> PersonalDataRecord:
+    return PersonalDataRecord(
+        system_name="DynamoDB",
+        table_name=table,
+        record_id=f"{table}-{index}",
+        data_category=DataCategory.IDENTIFIERS,
+        data_fields={"value": value, "count": Decimal(index), "tags": {"b", "a"}},
+        created_at=datetime(2025, 1, 1),
+        last_updated=None,
+        retention_policy="30_DAYS",
+        legal_basis="CONSENT",
+    )
+
+
+class TestPortableDataExporter:
+    """Property tests for the streaming NDJSON exporter."""
+
+    @settings(max_examples=25, deadline=None)
+    @given(
+        counts=st.lists(
+            st.integers(min_value=0, max_value=20), min_size=len(TABLES), max_size=len(TABLES)
+        ),
+        value=st.text(max_size=50),
+        compress=st.booleans(),
+    )
+    def test_manifest_matches_lines_written(self, counts, value, compress) -> None:
+        """Lines round-trip, and the manifest counts and hashes them per table."""
+        records = [
+            make_record(table, index, value)
+            for table, count in zip(TABLES, counts)
+            for index in range(count)
+        ]
+
+        sink = io.BytesIO()
+        exporter = PortableDataExporter(sink, compress=compress)
+        exporter.write_records(iter(records))
+        manifest = exporter.close()
+
+        payload = gzip.decompress(sink.getvalue()) if compress else sink.getvalue()
+        lines = payload.splitlines(keepends=True)
+        decoded = [json.loads(line) for line in lines]
+
+        assert [(d["table"], d["record_id"]) for d in decoded] == [
+            (r.table_name, r.record_id) for r in records
+        ]
+        assert all(d["data"]["value"] == value for d in decoded)
+        assert all(d["data"]["tags"] == ["a", "b"] for d in decoded)
+        assert [d["data"]["count"] for d in decoded] == [
+            int(r.data_fields["count"]) for r in records
+        ]
+
+        assert manifest["compression"] == ("gzip" if compress else None)
+        assert manifest["total_records"] == len(records)
+        assert manifest["uncompressed_bytes"] == len(payload)
+        assert manifest["sha256"] == hashlib.sha256(payload).hexdigest()
+        assert [t["table"] for t in manifest["tables"]] == [
+            table for table, count in zip(TABLES, counts) if count
+        ]
+        for table in manifest["tables"]:
+            table_lines = [line for line, d in zip(lines, decoded) if d["table"] == table["table"]]
+            assert table["record_count"] == len(table_lines)
+            assert table["sha256"] == hashlib.sha256(b"".join(table_lines)).hexdigest()
+            assert table["data_categories"] == ["IDENTIFIERS"]
+
+        # The sink stays open for the caller to upload
+        assert not sink.closed
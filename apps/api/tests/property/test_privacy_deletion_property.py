@@ -0,0 +1,332 @@
+"""
+Privacy Deletion Engine Property Tests
+
+Validates:
+- Every discovered record is removed and reported exactly once through the
+  result sink
+- Hard deletes go out as BatchWriteItem requests of at most 25 keys, with
+  no per-record delete_item calls
+- UnprocessedItems are retried until drained
+- Results are chained and streamed in deletion plan order, so the
+  verification hashes digest does not depend on the order deletions finish
+  in and can be recomputed from the hashes passed to the result sink
+- A deletion summary keeps a bounded number of failed results, so its
+  checkpoint stays small however many records fail
+"""
+
+import hashlib
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import boto3
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import privacy_rights_manager  # noqa: E402
+from privacy_rights_manager import DeletionProgress, PrivacyDeletionEngine  # noqa: E402
+
+SUBJECT_EMAIL = "subject@example.com"
+SUBJECT_ID = "user-0"
+
+
+def create_table(dynamodb, name, keys, indexes=None) -> None:
+    attributes = set(keys)
+    for index_keys in (indexes or {}).values():
+        attributes.update(index_keys)
+    kwargs = {}
+    if indexes:
+        kwargs["GlobalSecondaryIndexes"] = [
+            {
+                "IndexName": index_name,
+                "KeySchema": [
+                    {"AttributeName": attribute, "KeyType": key_type}
+                    for attribute, key_type in zip(index_keys, ["HASH", "RANGE"])
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+            for index_name, index_keys in indexes.items()
+        ]
+    dynamodb.create_table(
+        TableName=name,
+        KeySchema=[
+            {"AttributeName": attribute, "KeyType": key_type}
+            for attribute, key_type in zip(keys, ["HASH", "RANGE"])
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": a, "AttributeType": "S"} for a in sorted(attributes)
+        ],
+        BillingMode="PAY_PER_REQUEST",
+        **kwargs,
+    )
+
+
+def seed(dynamodb, notifications: int, memberships: int, organizations: int) -> None:
+    create_table(dynamodb, "Users", ["userId"], {"EmailIndex": ["email"]})
+    create_table(
+        dynamodb,
+        "Notifications",
+        ["notificationId"],
+        {"UserNotificationsIndex": ["recipientUserId"]},
+    )
+    create_table(dynamodb, "OrganizationUsers", ["userId", "organizationId"])
+    create_table(dynamodb, "Organizations", ["organizationId"], {"OwnerIndex": ["ownerId"]})
+    create_table(dynamodb, "Applications", ["applicationId"])
+
+    dynamodb.Table("Users").put_item(
+        Item={"userId": SUBJECT_ID, "email": SUBJECT_EMAIL, "name": "Subject"}
+    )
+    with dynamodb.Table("Notifications").batch_writer() as batch:
+        for index in range(notifications):
+            batch.put_item(
+                Item={"notificationId": f"n-{index}", "recipientUserId": SUBJECT_ID, "title": "t"}
+            )
+    with dynamodb.Table("OrganizationUsers").batch_writer() as batch:
+        for index in range(memberships):
+            batch.put_item(
+                Item={"userId": SUBJECT_ID, "organizationId": f"org-{index}", "role": "MEMBER"}
+            )
+    for index in range(organizations):
+        dynamodb.Table("Organizations").put_item(
+            Item={"organizationId": f"owned-{index}", "ownerId": SUBJECT_ID, "name": "Org"}
+        )
+
+
+class RecordingDynamoDB:
+    """Wraps a DynamoDB resource, recording writes and optionally deferring deletes."""
+
+    def __init__(self, resource, defer_notifications: int = 0) -> None:
+        self._resource = resource
+        self._defer = defer_notifications
+        self.batch_sizes: list[int] = []
+        self.delete_item_calls = 0
+
+    def batch_write_item(self, RequestItems):  # noqa: N803
+        requests = [r for table_requests in RequestItems.values() for r in table_requests]
+        self.batch_sizes.append(len(requests))
+        ((table_name, table_requests),) = RequestItems.items()
+        defer = self._defer if table_name == "Notifications" else 0
+        deferred, sent = table_requests[:defer], table_requests[defer:]
+        if defer:
+            self._defer = 0
+        if sent:
+            self._resource.batch_write_item(RequestItems={table_name: sent})
+        return {"UnprocessedItems": {table_name: deferred} if deferred else {}}
+
+    def Table(self, name):  # noqa: N802
+        table = self._resource.Table(name)
+        recorder = self
+
+        class RecordingTable:
+            def __getattr__(self, attribute):
+                return getattr(table, attribute)
+
+            def delete_item(self, **kwargs):
+                recorder.delete_item_calls += 1
+                return table.delete_item(**kwargs)
+
+        return RecordingTable()
+
+
+def run_deletion(dynamodb, defer_notifications: int = 0):
+    engine = PrivacyDeletionEngine()
+    recording = RecordingDynamoDB(dynamodb, defer_notifications)
+    engine.dynamodb = recording
+    streamed: list[dict[str, Any]] = []
+    with patch.object(privacy_rights_manager.time, "sleep", lambda seconds: None):
+        result = engine.execute_data_deletion(SUBJECT_EMAIL, result_sink=streamed.append)
+    return result, streamed, recording
+
+
+class FrozenDatetime(datetime):
+    """datetime whose utcnow is fixed, so verification hashes are reproducible."""
+
+    @classmethod
+    def utcnow(cls):
+        return cls(2024, 1, 1)
+
+
+def chain(digest: str, hashes: list[str]) -> str:
+    for verification_hash in hashes:
+        digest = hashlib.sha256((digest + verification_hash).encode()).hexdigest()
+    return digest
+
+
+def make_result(table: str, index: int) -> dict:
+    return {
+        "record_id": f"{table}-{index}",
+        "table_name": table,
+        "status": "SUCCESS",
+        "deletion_method": "HARD_DELETE",
+        "verification_hash": hashlib.sha256(f"{table}-{index}".encode()).hexdigest(),
+    }
+
+
+class TestDeletionProgress:
+    """Property tests for the deletion summary digest."""
+
+    @settings(max_examples=50, deadline=None)
+    @given(page_sizes=st.lists(st.integers(min_value=0, max_value=12), max_size=5))
+    def test_digest_recomputable_from_sink(self, page_sizes) -> None:
+        """The digest chains hashes in sink order and survives a checkpoint."""
+        pages = [
+            [make_result(table, i) for table in ("Notifications", "Users") for i in range(size)]
+            for size in page_sizes
+        ]
+        streamed: list[dict] = []
+        progress = DeletionProgress(result_sink=streamed.append)
+        for page in pages:
+            resumed = DeletionProgress.from_state(progress.to_state(), streamed.append)
+            for result in page:
+                resumed.add(result)
+            progress = resumed
+
+        assert streamed == [result for page in pages for result in page]
+        assert progress.verification_hash_count == len(streamed)
+        assert progress.verification_hashes_digest == chain(
+            "", [r["verification_hash"] for r in streamed]
+        )
+
+    @settings(max_examples=20, deadline=None)
+    @given(failures=st.integers(min_value=0, max_value=40), limit=st.integers(0, 10))
+    def test_failed_results_capped(self, failures, limit) -> None:
+        """Failures beyond the limit are counted and streamed but not kept."""
+        streamed: list[dict] = []
+        with patch.object(privacy_rights_manager, "DELETION_MAX_FAILED_RESULTS", limit):
+            progress = DeletionProgress(result_sink=streamed.append)
+            for index in range(failures):
+                progress.add({**make_result("Users", index), "status": "FAILED"})
+            progress = DeletionProgress.from_state(progress.to_state())
+
+        assert len(streamed) == failures
+        assert progress.records_failed == failures
+        assert progress.failed_results == streamed[:limit]
+
+
+class TestPrivacyDeletionEngine:
+    """Property tests for batched, parallel deletion."""
+
+    @settings(max_examples=10, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(
+        notifications=st.integers(min_value=0, max_value=60),
+        memberships=st.integers(min_value=0, max_value=30),
+        organizations=st.integers(min_value=0, max_value=3),
+    )
+    def test_records_removed_in_batches(self, notifications, memberships, organizations) -> None:
+        """Hard deletes are batched; retained records are pseudonymized."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            seed(dynamodb, notifications, memberships, organizations)
+
+            result, streamed, recording = run_deletion(dynamodb)
+
+            total = result["total_records_found"]
+            assert result["records_deleted"] == total
+            assert result["failed_results"] == []
+            assert len(streamed) == total
+            assert (
+                Counter(r["table_name"] for r in streamed)
+                == Counter(
+                    {
+                        "Users": 1,
+                        "Notifications": notifications,
+                        "OrganizationUsers": memberships,
+                        "Organizations": organizations,
+                    }
+                )
+                - Counter()
+            )
+            manifest = result["deletion_proof"]["deletion_manifest"]
+            assert manifest["verification_hash_count"] == total
+            assert manifest["verification_hashes_digest"] == chain(
+                "", [r["verification_hash"] for r in streamed]
+            )
+
+            assert recording.delete_item_calls == 0
+            assert all(1 <= size <= 25 for size in recording.batch_sizes)
+            assert dynamodb.Table("Notifications").scan()["Count"] == 0
+            assert dynamodb.Table("OrganizationUsers").scan()["Count"] == 0
+            assert dynamodb.Table("Users").scan()["Count"] == 0
+
+            # Organizations carry a 7 year retention and are pseudonymized in place
+            assert dynamodb.Table("Organizations").scan()["Count"] == organizations
+
+    def test_unprocessed_items_retried(self) -> None:
+        """Deletes returned as UnprocessedItems are resent."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            seed(dynamodb, notifications=10, memberships=0, organizations=0)
+
+            result, _, recording = run_deletion(dynamodb, defer_notifications=4)
+
+            assert result["records_deleted"] == 11
+            assert dynamodb.Table("Notifications").scan()["Count"] == 0
+            assert sorted(recording.batch_sizes) == [1, 4, 10]
+
+    @settings(max_examples=20, deadline=None)
+    @given(delays=st.lists(st.integers(min_value=0, max_value=3), min_size=1, max_size=12))
+    def test_results_yielded_in_plan_order(self, delays) -> None:
+        """Units finishing out of order still yield their results in plan order."""
+        engine = PrivacyDeletionEngine()
+
+        def plan(records):
+            for index, delay in enumerate(delays):
+                yield lambda index=index, delay=delay: (time.sleep(delay / 1000) or [index, index])
+
+        with patch.object(engine, "_plan_deletions", plan), patch.object(
+            privacy_rights_manager, "PRIVACY_DELETION_CONCURRENCY", 4
+        ):
+            results = list(engine._execute_deletions([]))
+
+        assert results == [index for index in range(len(delays)) for _ in range(2)]
+
+    def test_digest_independent_of_concurrency(self) -> None:
+        """Concurrent and sequential runs give the same digest, even when
+        batches of OrganizationUsers rows share a record ID and finish out
+        of order."""
+        digests = []
+        for concurrency in (1, 8):
+            with mock_aws():
+                dynamodb = boto3.resource("dynamodb")
+                seed(dynamodb, notifications=30, memberships=60, organizations=2)
+                engine = PrivacyDeletionEngine()
+                batch_hard_delete = engine._batch_hard_delete
+                calls = []
+
+                def slow_first_batch(table_name, records):
+                    calls.append(table_name)
+                    if len(calls) == 1:
+                        time.sleep(0.2)
+                    return batch_hard_delete(table_name, records)
+
+                with patch.object(
+                    privacy_rights_manager, "PRIVACY_DELETION_CONCURRENCY", concurrency
+                ), patch.object(privacy_rights_manager, "datetime", FrozenDatetime), patch.object(
+                    engine, "_batch_hard_delete", slow_first_batch
+                ):
+                    streamed: list[dict[str, Any]] = []
+                    result = engine.execute_data_deletion(
+                        SUBJECT_EMAIL, result_sink=streamed.append
+                    )
+
+            manifest = result["deletion_proof"]["deletion_manifest"]
+            assert result["records_deleted"] == 93
+            assert manifest["verification_hashes_digest"] == chain(
+                "", [r["verification_hash"] for r in streamed]
+            )
+            digests.append(manifest["verification_hashes_digest"])
+
+        assert digests[0] == digests[1]
@@ -0,0 +1,228 @@
+"""
+Personal Data Discovery Property Tests
+
+Validates:
+- Discovery finds every row that a full scan of each table would find,
+  once each
+- Lookups are served by keys and GSIs; only tables without a usable index
+  are scanned
+- Results spanning several 1 MB pages are not truncated
+- A failed user ID lookup fails planning instead of dropping the tables
+  searched by user ID
+"""
+
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
+
+import boto3
+import pytest
+from botocore.client import BaseClient
+from botocore.exceptions import ClientError
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import privacy_rights_manager  # noqa: E402
+from privacy_rights_manager import DataDiscoveryEngine  # noqa: E402
+
+SUBJECT_EMAIL = "subject@example.com"
+SUBJECT_ID = "user-0"
+
+# (partition key, sort key) of a table or GSI
+KeyPair = tuple[str, Optional[str]]
+
+# Key schema and GSIs per table, as deployed
+TABLES: dict[str, tuple[KeyPair, dict[str, KeyPair]]] = {
+    "Users": (("userId", None), {"EmailIndex": ("email", None)}),
+    "Organizations": (("organizationId", None), {"OwnerIndex": ("ownerId", "createdAt")}),
+    "OrganizationUsers": (
+        ("userId", "organizationId"),
+        {"OrganizationMembersIndex": ("organizationId", "role")},
+    ),
+    "Applications": (
+        ("applicationId", None),
+        {"OrganizationAppsIndex": ("organizationId", "createdAt")},
+    ),
+    "Notifications": (
+        ("notificationId", None),
+        {"UserNotificationsIndex": ("recipientUserId", "createdAt")},
+    ),
+}
+
+# The user-ID attribute each table is searched by
+SUBJECT_FIELDS = {
+    "Users": "userId",
+    "Organizations": "ownerId",
+    "OrganizationUsers": "userId",
+    "Applications": "userId",
+    "Notifications": "recipientUserId",
+}
+
+
+def key_schema(partition_key, sort_key):
+    schema = [{"AttributeName": partition_key, "KeyType": "HASH"}]
+    if sort_key:
+        schema.append({"AttributeName": sort_key, "KeyType": "RANGE"})
+    return schema
+
+
+def create_tables(dynamodb) -> None:
+    for table_name, (keys, indexes) in TABLES.items():
+        attributes = {name for name in keys if name}
+        for index_keys in indexes.values():
+            attributes.update(name for name in index_keys if name)
+        dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=key_schema(*keys),
+            AttributeDefinitions=[
+                {"AttributeName": name, "AttributeType": "S"} for name in sorted(attributes)
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": index_name,
+                    "KeySchema": key_schema(*index_keys),
+                    "Projection": {"ProjectionType": "ALL"},
+                }
+                for index_name, index_keys in indexes.items()
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+
+
+def build_items(owners: dict[str, list[int]]) -> dict[str, list[dict]]:
+    """Items per table; each row is owned by user-{n} (user-0 is the subject)."""
+    items: dict[str, list[dict]] = {
+        "Users": [
+            {"userId": f"user-{n}", "email": SUBJECT_EMAIL if n == 0 else f"u{n}@example.com"}
+            for n in range(3)
+        ]
+    }
+    for table_name, row_owners in owners.items():
+        rows = []
+        for index, owner in enumerate(row_owners):
+            row = {
+                SUBJECT_FIELDS[table_name]: f"user-{owner}",
+                "createdAt": f"2026-01-{index + 1:02d}",
+            }
+            if table_name == "Organizations":
+                row["organizationId"] = f"org-{index}"
+            elif table_name == "OrganizationUsers":
+                row.update(organizationId=f"org-{index}", role="MEMBER")
+            elif table_name == "Applications":
+                row.update(applicationId=f"app-{index}", organizationId=f"org-{index % 2}")
+            else:
+                row["notificationId"] = f"n-{index}"
+            rows.append(row)
+        items[table_name] = rows
+    return items
+
+
+def record_operations(calls: list[tuple[str, str]]):
+    """Patch target recording (operation, table) for every DynamoDB call."""
+    make_api_call = BaseClient._make_api_call
+
+    def recording_api_call(client, operation_name, api_params):
+        calls.append((operation_name, api_params.get("TableName")))
+        return make_api_call(client, operation_name, api_params)
+
+    return recording_api_call
+
+
+owners_strategy = st.fixed_dictionaries(
+    {
+        table_name: st.lists(st.integers(min_value=0, max_value=2), max_size=8)
+        for table_name in ["Organizations", "OrganizationUsers", "Applications", "Notifications"]
+    }
+)
+
+
+class TestPersonalDataDiscovery:
+    """Property tests for index-backed personal data discovery."""
+
+    @settings(max_examples=10, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(owners=owners_strategy)
+    def test_discovery_matches_full_scan(self, owners) -> None:
+        """Discovery returns what a full scan would, scanning only unindexed tables."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            create_tables(dynamodb)
+            items = build_items(owners)
+            for table_name, rows in items.items():
+                for row in rows:
+                    dynamodb.Table(table_name).put_item(Item=row)
+
+            engine = DataDiscoveryEngine()
+            expected = Counter(
+                table_name
+                for table_name, rows in items.items()
+                for row in rows
+                if row.get(SUBJECT_FIELDS[table_name]) == SUBJECT_ID
+            )
+
+            calls: list[tuple[str, str]] = []
+            with patch.object(BaseClient, "_make_api_call", record_operations(calls)):
+                result = engine.discover_personal_data(SUBJECT_EMAIL, organization_id="org-0")
+
+            assert Counter(r.table_name for r in result.records_found) == expected
+            assert result.total_records == sum(expected.values())
+            assert {table for operation, table in calls if operation == "Scan"} <= {"Applications"}
+
+    def test_results_not_truncated_at_page_boundary(self) -> None:
+        """Every page of a large query is read."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            create_tables(dynamodb)
+            dynamodb.Table("Users").put_item(Item={"userId": SUBJECT_ID, "email": SUBJECT_EMAIL})
+            with dynamodb.Table("Notifications").batch_writer() as batch:
+                for index in range(30):
+                    batch.put_item(
+                        Item={
+                            "notificationId": f"n-{index:02d}",
+                            "recipientUserId": SUBJECT_ID,
+                            "createdAt": f"2026-01-01T00:00:{index:02d}",
+                            "message": "x" * 100_000,
+                        }
+                    )
+
+            with patch.object(privacy_rights_manager, "PRIVACY_SCAN_SEGMENTS", 3):
+                result = DataDiscoveryEngine().discover_personal_data(SUBJECT_EMAIL)
+
+            notifications = [r for r in result.records_found if r.table_name == "Notifications"]
+            assert len(notifications) == 30
+
+    def test_user_id_lookup_error_fails_planning(self) -> None:
+        """A throttled Users lookup is raised; only a missing user plans without an ID."""
+        make_api_call = BaseClient._make_api_call
+
+        def throttled_users_query(client, operation_name, api_params):
+            if operation_name == "Query" and api_params.get("TableName") == "Users":
+                raise ClientError(
+                    {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}},
+                    operation_name,
+                )
+            return make_api_call(client, operation_name, api_params)
+
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            create_tables(dynamodb)
+            engine = DataDiscoveryEngine()
+
+            assert engine.plan_discovery(SUBJECT_EMAIL)["userId"] is None
+
+            dynamodb.Table("Users").put_item(Item={"userId": SUBJECT_ID, "email": SUBJECT_EMAIL})
+            assert engine.plan_discovery(SUBJECT_EMAIL)["userId"] == SUBJECT_ID
+
+            with patch.object(BaseClient, "_make_api_call", throttled_users_query):
+                with pytest.raises(ClientError):
+                    engine.plan_discovery(SUBJECT_EMAIL)
@@ -0,0 +1,605 @@
+"""
+Privacy Request Checkpoint Property Tests
+
+Validates:
+- A request processed a page per invocation, resuming from its saved
+  checkpoint, covers every record exactly once (access, portability and
+  deletion)
+- Access and portability exports hold every record, and staged records
+  and the checkpoint are cleaned up on completion
+- An invocation whose checkpoint was overtaken by another stops without
+  scheduling a continuation
+- A request whose processing could not be started or continued is still
+  confirmed and is re-driven by the stale request sweep
+- A retryable error (such as throttling) leaves the request PROCESSING at
+  its last checkpoint, until its retry budget runs out
+- Staged records are deleted before a request is marked COMPLETED
+- Without an export bucket configured, access and portability requests
+  stay PROCESSING with their staged records and complete once it is
+- A failed request's staged records are removed, by the stale request
+  sweep if removing them fails at first
+"""
+
+import gzip
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import boto3
+from botocore.client import BaseClient
+from botocore.exceptions import ClientError
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("PRIVACY_EXPORT_BUCKET_NAME", "test-privacy-exports")
+
+_resolver_dir = Path(__file__).parent.parent.parent / "lambdas" / "privacy_rights_resolver"
+_spec = importlib.util.spec_from_file_location(
+    "privacy_rights_resolver_index", _resolver_dir / "index.py"
+)
+assert _spec is not None and _spec.loader is not None
+resolver_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(resolver_module)
+
+SUBJECT_EMAIL = "subject@example.com"
+SUBJECT_ID = "user-0"
+REQUEST_ID = "req-1"
+
+
+class LowTimeContext:
+    """Lambda context that always reports little remaining time."""
+
+    invoked_function_arn = "arn:aws:lambda:us-east-1:123456789012:function:privacy-rights"
+
+    def get_remaining_time_in_millis(self) -> int:
+        return 0
+
+
+_make_api_call = BaseClient._make_api_call
+page_size = {"limit": 1}
+
+
+def limited_pages(self, operation_name, api_params):
+    """Cap discovery queries and scans at page_size items per page."""
+    if operation_name in ("Query", "Scan") and api_params.get("TableName") != "PrivacyRequests":
+        api_params = {"Limit": page_size["limit"], **api_params}
+    return _make_api_call(self, operation_name, api_params)
+
+
+def create_table(dynamodb, name, keys, indexes=None) -> None:
+    attributes = set(keys)
+    for index_keys in (indexes or {}).values():
+        attributes.update(index_keys)
+    kwargs = {}
+    if indexes:
+        kwargs["GlobalSecondaryIndexes"] = [
+            {
+                "IndexName": index_name,
+                "KeySchema": [
+                    {"AttributeName": attribute, "KeyType": key_type}
+                    for attribute, key_type in zip(index_keys, ["HASH", "RANGE"])
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+            for index_name, index_keys in indexes.items()
+        ]
+    dynamodb.create_table(
+        TableName=name,
+        KeySchema=[
+            {"AttributeName": attribute, "KeyType": key_type}
+            for attribute, key_type in zip(keys, ["HASH", "RANGE"])
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": a, "AttributeType": "S"} for a in sorted(attributes)
+        ],
+        BillingMode="PAY_PER_REQUEST",
+        **kwargs,
+    )
+
+
+def seed(dynamodb, request_type: str, notifications: int, memberships: int) -> None:
+    boto3.client("s3").create_bucket(Bucket=resolver_module.PRIVACY_EXPORT_BUCKET_NAME)
+    create_table(
+        dynamodb, "PrivacyRequests", ["requestId"], {"StatusIndex": ["status", "deadline"]}
+    )
+    create_table(dynamodb, "Users", ["userId"], {"EmailIndex": ["email"]})
+    create_table(
+        dynamodb,
+        "Notifications",
+        ["notificationId"],
+        {"UserNotificationsIndex": ["recipientUserId"]},
+    )
+    create_table(dynamodb, "OrganizationUsers", ["userId", "organizationId"])
+    create_table(dynamodb, "Organizations", ["organizationId"], {"OwnerIndex": ["ownerId"]})
+    create_table(dynamodb, "Applications", ["applicationId"])
+
+    dynamodb.Table("Users").put_item(
+        Item={"userId": SUBJECT_ID, "email": SUBJECT_EMAIL, "score": "1.5"}
+    )
+    with dynamodb.Table("Notifications").batch_writer() as batch:
+        for index in range(notifications):
+            batch.put_item(
+                Item={
+                    "notificationId": f"n-{index:03d}",
+                    "recipientUserId": SUBJECT_ID,
+                    "title": "t",
+                }
+            )
+    with dynamodb.Table("OrganizationUsers").batch_writer() as batch:
+        for index in range(memberships):
+            batch.put_item(
+                Item={"userId": SUBJECT_ID, "organizationId": f"org-{index}", "role": "MEMBER"}
+            )
+
+    dynamodb.Table("PrivacyRequests").put_item(
+        Item={
+            "requestId": REQUEST_ID,
+            "requestType": request_type,
+            "dataSubjectEmail": SUBJECT_EMAIL,
+            "legalBasis": "GDPR_ARTICLE_15",
+            "status": "RECEIVED",
+            "deadline": "2030-01-01T00:00:00",
+            "updatedAt": "2020-01-01T00:00:00",
+        }
+    )
+
+
+def run_until_done(continuations: list) -> tuple[dict, int]:
+    """Invoke the driver, then every continuation it schedules."""
+    invocations = 0
+    event = {"type": resolver_module.PROCESS_REQUEST_EVENT_TYPE, "requestId": REQUEST_ID}
+    while True:
+        invocations += 1
+        response = resolver_module.lambda_handler(event, LowTimeContext())
+        if not continuations:
+            return response, invocations
+        request_id = continuations.pop()
+        event = {"type": resolver_module.PROCESS_REQUEST_EVENT_TYPE, "requestId": request_id}
+
+
+class TestPrivacyRequestCheckpoints:
+    """Property tests for chunked, resumable privacy request processing."""
+
+    @settings(max_examples=12, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(
+        request_type=st.sampled_from(["DATA_ACCESS", "DATA_PORTABILITY", "DATA_DELETION"]),
+        notifications=st.integers(min_value=0, max_value=12),
+        memberships=st.integers(min_value=0, max_value=4),
+        limit=st.integers(min_value=1, max_value=5),
+    )
+    def test_resumed_processing_covers_every_record_once(
+        self, request_type, notifications, memberships, limit
+    ) -> None:
+        """Processing resumed across invocations sees each record once."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            seed(dynamodb, request_type, notifications, memberships)
+            total = 1 + notifications + memberships
+
+            continuations = []
+            page_size["limit"] = limit
+            with patch.object(BaseClient, "_make_api_call", limited_pages), patch.object(
+                resolver_module,
+                "continue_in_new_invocation",
+                lambda context, request_id: continuations.append(request_id),
+            ):
+                response, invocations = run_until_done(continuations)
+
+            assert response == {"requestId": REQUEST_ID, "status": "COMPLETED"}
+            # One page per invocation, since the context always reports low time
+            assert invocations > notifications // limit
+
+            item = dynamodb.Table("PrivacyRequests").get_item(Key={"requestId": REQUEST_ID})["Item"]
+            assert item["status"] == "COMPLETED"
+            assert "processingState" not in item
+            # Staged records are removed once the request completes
+            assert dynamodb.Table("PrivacyRequests").scan()["Count"] == 1
+
+            if request_type == "DATA_DELETION":
+                assert item["deletionResult"]["total_records_found"] == total
+                assert item["deletionResult"]["records_deleted"] == total
+                assert (
+                    item["deletionResult"]["deletion_proof"]["deletion_manifest"][
+                        "verification_hash_count"
+                    ]
+                    == total
+                )
+                assert dynamodb.Table("Notifications").scan()["Count"] == 0
+                assert dynamodb.Table("OrganizationUsers").scan()["Count"] == 0
+                assert dynamodb.Table("Users").scan()["Count"] == 0
+            else:
+                report = item["accessReport" if request_type == "DATA_ACCESS" else "portableData"]
+                location = report["records_location"]
+                body = boto3.client("s3").get_object(Bucket=location["bucket"], Key=location["key"])
+                lines = gzip.decompress(body["Body"].read()).decode("utf-8").splitlines()
+                records = [json.loads(line) for line in lines]
+
+                assert report["manifest"]["total_records"] == total
+                assert sorted(r["table"] for r in records) == sorted(
+                    ["Users"]
+                    + ["Notifications"] * notifications
+                    + ["OrganizationUsers"] * memberships
+                )
+                assert sorted(r["record_id"] for r in records if r["table"] == "Notifications") == [
+                    f"n-{i:03d}" for i in range(notifications)
+                ]
+
+    def test_overtaken_checkpoint_stops_without_continuing(self) -> None:
+        """A stale invocation loses the conditional checkpoint write and stops."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            seed(dynamodb, "DATA_ACCESS", notifications=3, memberships=0)
+            table = dynamodb.Table("PrivacyRequests")
+
+            original_next_page = resolver_module.PrivacyRightsResolver._process_next_page
+
+            def overtaken(self, request_data, state):
+                # Another invocation saves a checkpoint while this page is read
+                table.update_item(
+                    Key={"requestId": REQUEST_ID},
+                    UpdateExpression="SET processingState.#sequence = :other",
+                    ExpressionAttributeNames={"#sequence": "sequence"},
+                    ExpressionAttributeValues={":other": 99},
+                )
+                return original_next_page(self, request_data, state)
+
+            continuations = []
+            with patch.object(
+                resolver_module.PrivacyRightsResolver, "_process_next_page", overtaken
+            ), patch.object(
+                resolver_module,
+                "continue_in_new_invocation",
+                lambda context, request_id: continuations.append(request_id),
+            ):
+                response = resolver_module.lambda_handler(
+                    {"type": resolver_module.PROCESS_REQUEST_EVENT_TYPE, "requestId": REQUEST_ID},
+                    LowTimeContext(),
+                )
+
+            assert response == {"requestId": REQUEST_ID, "status": "PROCESSING"}
+            assert continuations == []
+            assert table.get_item(Key={"requestId": REQUEST_ID})["Item"]["status"] == "PROCESSING"
+
+
+class FailingContext(LowTimeContext):
+    """Lambda context whose self-invocations fail."""
+
+
+def failing_invoke(context, request_id):
+    raise RuntimeError("invoke failed")
+
+
+def lost_invoke(context, request_id):
+    """An asynchronous invocation that is accepted but never runs."""
+
+
+def throttled(*args, **kwargs):
+    raise ClientError(
+        {"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "Slow down"}},
+        "Query",
+    )
+
+
+class TestStalledRequests:
+    """Tests for requests whose processing stopped before completing."""
+
+    def test_submit_processes_inline_when_invoke_fails(self) -> None:
+        """A failed self-invoke processes the request inline and still sends the email."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            seed(dynamodb, "DATA_ACCESS", notifications=0, memberships=0)
+            confirmations = []
+
+            with patch.object(
+                resolver_module, "continue_in_new_invocation", failing_invoke
+            ), patch.object(
+                resolver_module.PrivacyRightsResolver,
+                "_send_request_confirmation",
+                lambda self, email, request_id, deadline: confirmations.append(request_id),
+            ):
+                response = resolver_module.PrivacyRightsResolver(
+                    FailingContext()
+                ).submit_privacy_request(
+                    {
+                        "identity": {"sub": "requester-1"},
+                        "arguments": {
+                            "requestType": "DATA_ACCESS",
+                            "dataSubjectEmail": SUBJECT_EMAIL,
+                            "legalBasis": "GDPR_ARTICLE_15_RIGHT_OF_ACCESS",
+                        },
+                    }
+                )
+
+            assert response["statusCode"] == 200
+            request_id = response["body"]["requestId"]
+            assert confirmations == [request_id]
+            item = dynamodb.Table("PrivacyRequests").get_item(Key={"requestId": request_id})["Item"]
+            assert item["status"] == "COMPLETED"
+
+    def test_failed_continuation_continues_inline(self) -> None:
+        """A failed continuation finishes the request in the same invocation."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            seed(dynamodb, "DATA_ACCESS", notifications=3, memberships=0)
+
+            page_size["limit"] = 1
+            with patch.object(BaseClient, "_make_api_call", limited_pages), patch.object(
+                resolver_module, "continue_in_new_invocation", failing_invoke
+            ):
+                response = resolver_module.lambda_handler(
+                    {"type": resolver_module.PROCESS_REQUEST_EVENT_TYPE, "requestId": REQUEST_ID},
+                    FailingContext(),
+                )
+
+            assert response == {"requestId": REQUEST_ID, "status": "COMPLETED"}
+            item = dynamodb.Table("PrivacyRequests").get_item(Key={"requestId": REQUEST_ID})["Item"]
+            assert item["status"] == "COMPLETED"
+            assert "processingState" not in item
+
+    @settings(max_examples=6, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(request_type=st.sampled_from(["DATA_ACCESS", "DATA_PORTABILITY", "DATA_DELETION"]))
+    def test_sweep_resumes_only_stale_requests(self, request_type) -> None:
+        """The sweep completes a stalled request and leaves recently updated ones alone."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            seed(dynamodb, request_type, notifications=3, memberships=1)
+            table = dynamodb.Table("PrivacyRequests")
+
+            page_size["limit"] = 1
+            with patch.object(BaseClient, "_make_api_call", limited_pages), patch.object(
+                resolver_module, "continue_in_new_invocation", lost_invoke
+            ):
+                # The first page is checkpointed, then the continuation is lost
+                resolver_module.lambda_handler(
+                    {"type": resolver_module.PROCESS_REQUEST_EVENT_TYPE, "requestId": REQUEST_ID},
+                    FailingContext(),
+                )
+            table.put_item(
+                Item={
+                    "requestId": "req-recent",
+                    "requestType": "DATA_ACCESS",
+                    "dataSubjectEmail": "recent@example.com",
+                    "legalBasis": "GDPR_ARTICLE_15",
+                    "status": "RECEIVED",
+                    "deadline": "2030-01-01T00:00:00",
+                    "updatedAt": "2999-01-01T00:00:00",
+                }
+            )
+            # Age the stalled request past the staleness threshold
+            table.update_item(
+                Key={"requestId": REQUEST_ID},
+                UpdateExpression="SET updatedAt = :old",
+                ExpressionAttributeValues={":old": "2020-01-01T00:00:00"},
+            )
+
+            result = resolver_module.lambda_handler(
+                {"type": resolver_module.RESUME_STALE_REQUESTS_EVENT_TYPE}, None
+            )
+
+            assert result == {"resumed": [REQUEST_ID]}
+            assert table.get_item(Key={"requestId": REQUEST_ID})["Item"]["status"] == "COMPLETED"
+            assert table.get_item(Key={"requestId": "req-recent"})["Item"]["status"] == "RECEIVED"
+
+    def test_retryable_error_keeps_checkpoint(self) -> None:
+        """A throttled page leaves the request PROCESSING for the sweep to finish."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            seed(dynamodb, "DATA_DELETION", notifications=3, memberships=0)
+            table = dynamodb.Table("PrivacyRequests")
+            original_next_page = resolver_module.PrivacyRightsResolver._process_next_page
+            calls = []
+
+            def throttled_second_page(self, request_data, state):
+                calls.append(state["unitIndex"])
+                if len(calls) == 2:
+                    throttled()
+                return original_next_page(self, request_data, state)
+
+            page_size["limit"] = 1
+            with patch.object(BaseClient, "_make_api_call", limited_pages), patch.object(
+                resolver_module.PrivacyRightsResolver, "_process_next_page", throttled_second_page
+            ):
+                response = resolver_module.lambda_handler(
+                    {"type": resolver_module.PROCESS_REQUEST_EVENT_TYPE, "requestId": REQUEST_ID},
+                    None,
+                )
+
+            assert response == {"requestId": REQUEST_ID, "status": "PROCESSING"}
+            item = table.get_item(Key={"requestId": REQUEST_ID})["Item"]
+            assert item["status"] == "PROCESSING"
+            assert item["processingRetries"] == 1
+            assert item["processingState"]["sequence"] == 1
+
+            table.update_item(
+                Key={"requestId": REQUEST_ID},
+                UpdateExpression="SET updatedAt = :old",
+                ExpressionAttributeValues={":old": "2020-01-01T00:00:00"},
+            )
+            result = resolver_module.lambda_handler(
+                {"type": resolver_module.RESUME_STALE_REQUESTS_EVENT_TYPE}, None
+            )
+
+            assert result == {"resumed": [REQUEST_ID]}
+            item = table.get_item(Key={"requestId": REQUEST_ID})["Item"]
+            assert item["status"] == "COMPLETED"
+            assert item["deletionResult"]["records_deleted"] == 4
+            assert dynamodb.Table("Notifications").scan()["Count"] == 0
+
+    def test_retryable_errors_fail_request_after_retry_budget(self) -> None:
+        """A request that keeps hitting retryable errors is eventually failed."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            seed(dynamodb, "DATA_DELETION", notifications=1, memberships=0)
+            event = {"type": resolver_module.PROCESS_REQUEST_EVENT_TYPE, "requestId": REQUEST_ID}
+
+            with patch.object(
+                resolver_module.PrivacyRightsResolver, "_process_next_page", throttled
+            ), patch.object(resolver_module, "MAX_PROCESSING_RETRIES", 2):
+                responses = [resolver_module.lambda_handler(event, None) for _ in range(3)]
+
+            assert [response["status"] for response in responses] == [
+                "PROCESSING",
+                "PROCESSING",
+                "FAILED",
+            ]
+            item = dynamodb.Table("PrivacyRequests").get_item(Key={"requestId": REQUEST_ID})["Item"]
+            assert item["status"] == "FAILED"
+
+    def test_only_transient_errors_are_retryable(self) -> None:
+        """Throttling and item-size errors are retried; other client errors are not."""
+
+        def client_error(code, message=""):
+            return ClientError({"Error": {"Code": code, "Message": message}}, "UpdateItem")
+
+        assert resolver_module.is_retryable_error(client_error("ThrottlingException"))
+        assert resolver_module.is_retryable_error(
+            client_error("ValidationException", "Item size has exceeded the maximum allowed size")
+        )
+        assert not resolver_module.is_retryable_error(
+            client_error("ValidationException", "Invalid UpdateExpression")
+        )
+        assert not resolver_module.is_retryable_error(client_error("AccessDeniedException"))
+        assert not resolver_module.is_retryable_error(ValueError("bad request"))
+
+    @settings(max_examples=4, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(request_type=st.sampled_from(["DATA_ACCESS", "DATA_PORTABILITY"]))
+    def test_staged_records_deleted_before_completion(self, request_type) -> None:
+        """By the time a request is marked COMPLETED, its staged records are gone."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            seed(dynamodb, request_type, notifications=4, memberships=1)
+            table = dynamodb.Table("PrivacyRequests")
+            items_at_completion = []
+
+            method = (
+                "_complete_data_access_request"
+                if request_type == "DATA_ACCESS"
+                else "_complete_data_portability_request"
+            )
+            original_complete = getattr(resolver_module.PrivacyRightsResolver, method)
+
+            def complete(self, request_data, export):
+                items_at_completion.append(table.scan()["Count"])
+                return original_complete(self, request_data, export)
+
+            with patch.object(resolver_module.PrivacyRightsResolver, method, complete):
+                response = resolver_module.lambda_handler(
+                    {"type": resolver_module.PROCESS_REQUEST_EVENT_TYPE, "requestId": REQUEST_ID},
+                    None,
+                )
+
+            assert response == {"requestId": REQUEST_ID, "status": "COMPLETED"}
+            assert items_at_completion == [1]
+
+    def test_missing_export_bucket_retried(self) -> None:
+        """An unset export bucket leaves the request and its staged records for a retry."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            seed(dynamodb, "DATA_PORTABILITY", notifications=2, memberships=0)
+            table = dynamodb.Table("PrivacyRequests")
+
+            with patch.object(resolver_module, "PRIVACY_EXPORT_BUCKET_NAME", None):
+                response = resolver_module.lambda_handler(
+                    {"type": resolver_module.PROCESS_REQUEST_EVENT_TYPE, "requestId": REQUEST_ID},
+                    None,
+                )
+
+            assert response == {"requestId": REQUEST_ID, "status": "PROCESSING"}
+            item = table.get_item(Key={"requestId": REQUEST_ID})["Item"]
+            assert item["status"] == "PROCESSING"
+            assert item["processingRetries"] == 1
+            assert table.scan()["Count"] > 1
+
+            # Once the bucket is configured, the sweep finishes the request
+            table.update_item(
+                Key={"requestId": REQUEST_ID},
+                UpdateExpression="SET updatedAt = :old",
+                ExpressionAttributeValues={":old": "2020-01-01T00:00:00"},
+            )
+            result = resolver_module.lambda_handler(
+                {"type": resolver_module.RESUME_STALE_REQUESTS_EVENT_TYPE}, None
+            )
+
+            assert result == {"resumed": [REQUEST_ID]}
+            item = table.get_item(Key={"requestId": REQUEST_ID})["Item"]
+            assert item["status"] == "COMPLETED"
+            assert item["portableData"]["manifest"]["total_records"] == 3
+            assert table.scan()["Count"] == 1
+
+    def test_failed_request_removes_staged_records(self) -> None:
+        """A request that fails after staging records does not leave them behind."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            seed(dynamodb, "DATA_ACCESS", notifications=2, memberships=0)
+            table = dynamodb.Table("PrivacyRequests")
+
+            def broken_export(self, request_data, part_count):
+                assert table.scan()["Count"] > 1
+                raise ValueError("export failed")
+
+            with patch.object(
+                resolver_module.PrivacyRightsResolver, "_export_staged_records", broken_export
+            ):
+                response = resolver_module.lambda_handler(
+                    {"type": resolver_module.PROCESS_REQUEST_EVENT_TYPE, "requestId": REQUEST_ID},
+                    None,
+                )
+
+            assert response == {"requestId": REQUEST_ID, "status": "FAILED"}
+            item = table.get_item(Key={"requestId": REQUEST_ID})["Item"]
+            assert item["status"] == "FAILED"
+            assert item["errorDetails"] == "export failed"
+            assert "processingState" not in item
+            assert table.scan()["Count"] == 1
+
+    def test_sweep_removes_staged_records_of_failed_requests(self) -> None:
+        """Staged records a failed request could not remove are removed by the sweep."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            seed(dynamodb, "DATA_ACCESS", notifications=2, memberships=0)
+            table = dynamodb.Table("PrivacyRequests")
+
+            def broken_export(self, request_data, part_count):
+                raise ValueError("export failed")
+
+            def broken_delete(self, request_id, part_count):
+                raise ValueError("delete failed")
+
+            with patch.object(
+                resolver_module.PrivacyRightsResolver, "_export_staged_records", broken_export
+            ), patch.object(
+                resolver_module.PrivacyRightsResolver, "_delete_staged_records", broken_delete
+            ):
+                response = resolver_module.lambda_handler(
+                    {"type": resolver_module.PROCESS_REQUEST_EVENT_TYPE, "requestId": REQUEST_ID},
+                    None,
+                )
+
+            assert response == {"requestId": REQUEST_ID, "status": "FAILED"}
+            assert "processingState" in table.get_item(Key={"requestId": REQUEST_ID})["Item"]
+            assert table.scan()["Count"] > 1
+
+            table.update_item(
+                Key={"requestId": REQUEST_ID},
+                UpdateExpression="SET updatedAt = :old",
+                ExpressionAttributeValues={":old": "2020-01-01T00:00:00"},
+            )
+            result = resolver_module.lambda_handler(
+                {"type": resolver_module.RESUME_STALE_REQUESTS_EVENT_TYPE}, None
+            )
+
+            assert result == {"resumed": []}
+            item = table.get_item(Key={"requestId": REQUEST_ID})["Item"]
+            assert item["status"] == "FAILED"
+            assert "processingState" not in item
+            assert table.scan()["Count"] == 1
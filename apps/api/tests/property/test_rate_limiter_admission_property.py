@@ -0,0 +1,194 @@
+"""
+Rate Limiter Admission Property Tests
+
+Validates:
+- Containers sharing one bucket never admit more than the per-minute limit
+  within a minute, however their leases interleave
+- The per-day limit holds across minutes
+- A bucket refills at the sustained rate after a burst
+- A single container admits exactly the limit, even when a token's cost
+  is not a whole number of microseconds
+- A request lost to repeated races is still decided by the bucket state,
+  and only sustained contention gives up
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+import rate_limiter  # noqa: E402
+from rate_limiter import RateLimitContentionError, TokenBucketRateLimiter  # noqa: E402
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+TABLE_NAME = "test-rate-limits"
+
+
+def create_rate_limit_table():
+    """Create the rate limit table in the active moto mock."""
+    dynamodb = boto3.resource("dynamodb")
+    return dynamodb.create_table(
+        TableName=TABLE_NAME,
+        KeySchema=[{"AttributeName": "rateLimitKey", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "rateLimitKey", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+class FakeClock:
+    """Manually advanced clock shared by all limiters in a test."""
+
+    def __init__(self, start: float = 1_700_000_000.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class OvertakenTable:
+    """Wraps a Table and fails the first ``races`` updates as if another
+    container had written first."""
+
+    def __init__(self, table, races: int) -> None:
+        self._table = table
+        self.races = races
+        self.updates = 0
+
+    def __getattr__(self, name):
+        return getattr(self._table, name)
+
+    def update_item(self, **kwargs):
+        self.updates += 1
+        if self.races > 0:
+            self.races -= 1
+            raise ClientError({"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem")
+        return self._table.update_item(**kwargs)
+
+
+class TestRateLimiterAdmissionProperty:
+    """Property tests for TokenBucketRateLimiter admission bounds."""
+
+    @settings(max_examples=20, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(
+        limit=st.integers(min_value=1, max_value=200),
+        containers=st.integers(min_value=1, max_value=4),
+        schedule=st.lists(st.integers(min_value=0, max_value=3), min_size=1, max_size=400),
+    )
+    def test_never_over_admits_per_minute(
+        self, limit: int, containers: int, schedule: list[int]
+    ) -> None:
+        """Requests within one instant never exceed the per-minute limit."""
+        with mock_aws():
+            table = create_rate_limit_table()
+            clock = FakeClock()
+            limiters = [TokenBucketRateLimiter(table, clock=clock) for _ in range(containers)]
+
+            admitted = 0
+            for container_index in schedule:
+                limiter = limiters[container_index % containers]
+                if limiter.check("apikey#k1", limit)["allowed"]:
+                    admitted += 1
+
+            assert admitted <= limit
+            assert admitted == min(limit, len(schedule)) or containers > 1
+
+    @settings(max_examples=10, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(
+        per_minute=st.integers(min_value=10, max_value=100),
+        per_day=st.integers(min_value=1, max_value=150),
+    )
+    def test_daily_limit_holds_across_minutes(self, per_minute: int, per_day: int) -> None:
+        """Admissions over several minutes never exceed the per-day limit."""
+        with mock_aws():
+            table = create_rate_limit_table()
+            clock = FakeClock()
+            limiter = TokenBucketRateLimiter(table, clock=clock)
+
+            admitted = 0
+            for _minute in range(5):
+                for _ in range(per_minute):
+                    if limiter.check("apikey#k1", per_minute, per_day)["allowed"]:
+                        admitted += 1
+                clock.now += 60
+
+            assert admitted <= per_day
+
+    def test_bucket_refills_after_burst(self) -> None:
+        """A drained bucket admits again after the refill interval."""
+        with mock_aws():
+            table = create_rate_limit_table()
+            clock = FakeClock()
+            limiter = TokenBucketRateLimiter(table, clock=clock)
+
+            for _ in range(6):
+                limiter.check("apikey#k1", 6)
+            result = limiter.check("apikey#k1", 6)
+            assert not result["allowed"]
+            assert result["headers"]["X-RateLimit-Remaining-Minute"] == "0"
+
+            clock.now += 10
+            assert limiter.check("apikey#k1", 6)["allowed"]
+
+    @pytest.mark.parametrize("limit", [7, 9, 11, 29, 97, 197])
+    def test_admits_full_limit_with_inexact_costs(self, limit: int) -> None:
+        """Rounded token costs never push the last token of a bucket out of reach."""
+        with mock_aws():
+            table = create_rate_limit_table()
+            limiter = TokenBucketRateLimiter(table, clock=FakeClock())
+
+            admitted = sum(
+                limiter.check("apikey#k1", limit, limit * 2)["allowed"] for _ in range(limit + 1)
+            )
+
+            assert admitted == limit
+
+
+class TestReservationRaces:
+    """Tests for reservations that lose the conditional update to another container."""
+
+    @settings(max_examples=10, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(races=st.integers(min_value=1, max_value=rate_limiter.RATE_LIMIT_RESERVE_ATTEMPTS - 1))
+    def test_in_limit_request_survives_races(self, races: int) -> None:
+        """Losing several races does not deny a request the bucket can afford."""
+        with mock_aws():
+            table = OvertakenTable(create_rate_limit_table(), races)
+            limiter = TokenBucketRateLimiter(table, clock=FakeClock())
+
+            assert limiter.check("apikey#k1", 100)["allowed"]
+            assert table.updates == races + 1
+
+    def test_full_bucket_denies_after_race(self) -> None:
+        """A retry the bucket cannot afford is denied, not retried."""
+        with mock_aws():
+            table = create_rate_limit_table()
+            clock = FakeClock()
+            rival = TokenBucketRateLimiter(table, lease_size=1, clock=clock)
+            for _ in range(10):
+                assert rival.check("apikey#k1", 10)["allowed"]
+            overtaken = OvertakenTable(table, races=1)
+            limiter = TokenBucketRateLimiter(overtaken, clock=clock)
+
+            assert not limiter.check("apikey#k1", 10)["allowed"]
+            assert overtaken.updates == 1
+
+    def test_sustained_contention_raises(self) -> None:
+        """Running out of attempts raises so callers can fail open."""
+        with mock_aws():
+            table = OvertakenTable(create_rate_limit_table(), races=10_000)
+            limiter = TokenBucketRateLimiter(table, clock=FakeClock())
+
+            with pytest.raises(RateLimitContentionError):
+                limiter.check("apikey#k1", 100)
+            assert table.updates == rate_limiter.RATE_LIMIT_RESERVE_ATTEMPTS
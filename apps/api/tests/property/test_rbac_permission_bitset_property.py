@@ -0,0 +1,133 @@
+"""
+RBAC Permission Bitset Property Tests
+
+Validates:
+- Precompiled role bitmasks grant exactly the role permission sets
+- Bitmask-based checks agree with the set-based permission matrix
+- Batch permission checks agree with one-at-a-time checks and use one
+  membership round trip for many users
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import boto3
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+# Add the layer directory to path for imports
+layer_path = Path(__file__).parent.parent.parent / "layers" / "organizations_security"
+if str(layer_path) not in sys.path:
+    sys.path.insert(0, str(layer_path))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from membership_resolver import OrganizationMembershipResolver  # noqa: E402
+from rbac_manager import (  # noqa: E402
+    ALL_PERMISSIONS_MASK,
+    OrganizationPermissions,
+    OrganizationRBACManager,
+    OrganizationRole,
+    RolePermissionMatrix,
+    permission_mask,
+    permissions_from_mask,
+)
+from test_membership_resolver_property import (  # noqa: E402
+    ORG_ID,
+    OWNER_ID,
+    CountingDynamoDB,
+    create_tables,
+)
+
+ALL_KEYS = [p.key for p in OrganizationPermissions.get_all_permissions()]
+ADMIN_EXTRAS = {
+    OrganizationPermissions.USERS_REMOVE.key,
+    OrganizationPermissions.USERS_UPDATE_ROLES.key,
+}
+
+permission_keys = st.lists(
+    st.one_of(st.sampled_from(ALL_KEYS), st.just("unknown.permission")), max_size=10
+)
+
+
+class TestPermissionBitsetProperty:
+    """Property tests for precompiled permission bitmasks."""
+
+    def test_role_masks_match_permission_sets(self) -> None:
+        """Each role mask expands back to exactly the role's permission set."""
+        assert len(set(ALL_KEYS)) == len(ALL_KEYS)
+        assert permissions_from_mask(ALL_PERMISSIONS_MASK) == ALL_KEYS
+        for role in OrganizationRole:
+            mask = RolePermissionMatrix.get_role_mask(role)
+            assert set(permissions_from_mask(mask)) == RolePermissionMatrix.get_role_permissions(
+                role
+            )
+
+    @given(keys=permission_keys)
+    def test_mask_round_trip(self, keys: list[str]) -> None:
+        """Compiling keys to a mask keeps exactly the known keys."""
+        assert set(permissions_from_mask(permission_mask(keys))) == set(keys) & set(ALL_KEYS)
+
+    @settings(max_examples=20, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(
+        members=st.lists(
+            st.one_of(st.none(), st.sampled_from(["ADMINISTRATOR", "VIEWER"])),
+            min_size=1,
+            max_size=6,
+        ),
+        keys=permission_keys,
+    )
+    def test_batch_checks_match_single_checks(self, members: list, keys: list[str]) -> None:
+        """Batch checks agree with check_permission and the set-based matrix."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            create_tables(dynamodb)
+            dynamodb.Table("Organizations").put_item(
+                Item={"organizationId": ORG_ID, "ownerId": OWNER_ID, "status": "ACTIVE"}
+            )
+            user_ids = [OWNER_ID]
+            roles = {OWNER_ID: OrganizationRole.OWNER}
+            for index, role in enumerate(members):
+                user_id = f"user-{index}"
+                user_ids.append(user_id)
+                roles[user_id] = OrganizationRole(role) if role else None
+                if role:
+                    dynamodb.Table("OrganizationUsers").put_item(
+                        Item={
+                            "userId": user_id,
+                            "organizationId": ORG_ID,
+                            "role": role,
+                            "status": "ACTIVE",
+                        }
+                    )
+
+            counting = CountingDynamoDB(dynamodb)
+            resolver = OrganizationMembershipResolver(dynamodb=counting, ttl_seconds=0)
+            rbac = OrganizationRBACManager(membership_resolver=resolver)
+
+            with resolver.request_scope():
+                for key in keys:
+                    by_user = rbac.check_permission_for_users(user_ids, ORG_ID, key)
+                    for user_id in user_ids:
+                        assert by_user[user_id] == rbac.check_permission(user_id, ORG_ID, key)[0]
+
+                for user_id in user_ids:
+                    by_key = rbac.check_permissions(user_id, ORG_ID, keys)
+                    for key in keys:
+                        assert by_key[key] == rbac.check_permission(user_id, ORG_ID, key)[0]
+
+                    role = roles[user_id]
+                    permissions = rbac.get_user_permissions(user_id, ORG_ID)
+                    if role is None:
+                        assert permissions["isMember"] is False
+                        continue
+                    expected = RolePermissionMatrix.get_role_permissions(role)
+                    if role == OrganizationRole.ADMINISTRATOR:
+                        expected |= ADMIN_EXTRAS
+                    assert set(permissions["permissions"]) == expected
+                    assert permissions["permissionMask"] == permission_mask(expected)
+
+            # One round trip fetched every membership for the request
+            assert counting.batch_get_calls == (1 if keys else len(user_ids))
@@ -0,0 +1,128 @@
+"""
+Webhook Config Cache Property Tests
+
+Validates:
+- A batch of events fetches each distinct (application, environment)
+  config at most once, through BatchGetItem
+- Cached and freshly read configs agree with the table, including
+  negative results for disabled or unconfigured environments
+"""
+
+import importlib.util
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import boto3
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+_webhooks_dir = Path(__file__).parent.parent.parent / "lambdas" / "webhooks"
+
+TABLE_NAME = "test-environment-config"
+
+# Per application: None (no config), or (webhookEnabled, has URL)
+config_strategy = st.one_of(st.none(), st.tuples(st.booleans(), st.booleans()))
+
+
+def load_webhooks_module():
+    """Load a fresh copy of the webhooks module inside the active mock."""
+    spec = importlib.util.spec_from_file_location(
+        "webhooks_index_cache", _webhooks_dir / "index.py"
+    )
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    with patch.dict(os.environ, {"ENVIRONMENT_CONFIG_TABLE_NAME": TABLE_NAME}):
+        spec.loader.exec_module(module)
+    return module
+
+
+class CountingDynamoDB:
+    """Wraps a DynamoDB resource and counts reads."""
+
+    def __init__(self, resource) -> None:
+        self._resource = resource
+        self.batch_get_keys: list[tuple[str, str]] = []
+        self.get_item_calls = 0
+
+    def batch_get_item(self, **kwargs):
+        for key in kwargs["RequestItems"][TABLE_NAME]["Keys"]:
+            self.batch_get_keys.append((key["applicationId"], key["environment"]))
+        return self._resource.batch_get_item(**kwargs)
+
+    def Table(self, name):  # noqa: N802
+        table = self._resource.Table(name)
+        counter = self
+
+        class CountingTable:
+            def get_item(self, **kwargs):
+                counter.get_item_calls += 1
+                return table.get_item(**kwargs)
+
+        return CountingTable()
+
+
+class TestWebhookConfigCache:
+    """Property tests for the per-container webhook config cache."""
+
+    @settings(max_examples=15, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(
+        configs=st.lists(config_strategy, min_size=1, max_size=5),
+        events=st.lists(st.integers(min_value=0, max_value=4), max_size=20),
+    )
+    def test_batch_reads_each_config_once(self, configs, events) -> None:
+        """Each distinct config is read once per batch and matches the table."""
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb")
+            dynamodb.create_table(
+                TableName=TABLE_NAME,
+                KeySchema=[
+                    {"AttributeName": "applicationId", "KeyType": "HASH"},
+                    {"AttributeName": "environment", "KeyType": "RANGE"},
+                ],
+                AttributeDefinitions=[
+                    {"AttributeName": "applicationId", "AttributeType": "S"},
+                    {"AttributeName": "environment", "AttributeType": "S"},
+                ],
+                BillingMode="PAY_PER_REQUEST",
+            )
+            expected: dict[str, Any] = {}
+            for index, config in enumerate(configs):
+                application_id = f"app-{index}"
+                expected[application_id] = None
+                if config is None:
+                    continue
+                enabled, has_url = config
+                item = {
+                    "applicationId": application_id,
+                    "environment": "PRODUCTION",
+                    "webhookEnabled": enabled,
+                }
+                if has_url:
+                    item["webhookUrl"] = f"https://example.com/{application_id}"
+                dynamodb.Table(TABLE_NAME).put_item(Item=item)
+                if enabled and has_url:
+                    expected[application_id] = item["webhookUrl"]
+
+            webhooks = load_webhooks_module()
+            counting = CountingDynamoDB(dynamodb)
+            webhooks.dynamodb = counting
+
+            keys = [(f"app-{i % len(configs)}", "PRODUCTION") for i in events]
+            webhooks.prefetch_webhook_configs(keys)
+            assert sorted(counting.batch_get_keys) == sorted(set(keys))
+
+            for application_id, environment in keys + [(a, "PRODUCTION") for a in expected]:
+                config = webhooks.get_webhook_config(application_id, environment)
+                assert (config["url"] if config else None) == expected[application_id]
+
+            # Only configs not in the batch needed a single read
+            assert counting.get_item_calls == len(set(expected) - {a for a, _ in keys})
+
+            # A second batch is served entirely from the cache
+            webhooks.prefetch_webhook_configs(keys)
+            assert len(counting.batch_get_keys) == len(set(keys))
@@ -0,0 +1,252 @@
+"""
+Webhook Delivery Concurrency Property Tests
+
+Validates:
+- Every record's outcome is reported: failed deliveries (and only those)
+  appear in batchItemFailures, whatever order deliveries finish in
+- Concurrent deliveries never exceed the per-endpoint cap
+- A slow endpoint host does not hold up deliveries to a fast one
+- Deliveries that cannot finish before the Lambda deadline are reported
+  as failures for SQS to retry
+- Metrics for a batch are aggregated into one PutMetricData call whose
+  totals match the deliveries, with count statistics that match the
+  values added
+"""
+
+import importlib.util
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+_webhooks_dir = Path(__file__).parent.parent.parent / "lambdas" / "webhooks"
+_spec = importlib.util.spec_from_file_location("webhooks_index", _webhooks_dir / "index.py")
+assert _spec is not None and _spec.loader is not None
+webhooks = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(webhooks)
+
+
+class EndpointState:
+    """Tracks in-flight requests seen by the test endpoint."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+
+
+class WebhookEndpoint(BaseHTTPRequestHandler):
+    """POST /ok returns 200, /fail returns 500; ?delay= sleeps first."""
+
+    protocol_version = "HTTP/1.1"
+    state: EndpointState
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.state.lock:
+            self.state.in_flight += 1
+            self.state.requests += 1
+            self.state.max_in_flight = max(self.state.max_in_flight, self.state.in_flight)
+        try:
+            path, _, query = self.path.partition("?")
+            if query.startswith("delay="):
+                time.sleep(float(query.split("=", 1)[1]))
+            status = 200 if path == "/ok" else 500
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        finally:
+            with self.state.lock:
+                self.state.in_flight -= 1
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def endpoint():
+    state = EndpointState()
+    handler = type("Handler", (WebhookEndpoint,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", state
+    server.shutdown()
+
+
+class RecordingCloudWatch:
+    """Stands in for the CloudWatch client and records PutMetricData calls."""
+
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    def put_metric_data(self, **kwargs) -> None:
+        self.calls.append(kwargs)
+
+
+class FakeContext:
+    def __init__(self, remaining_ms: int) -> None:
+        self._deadline = time.time() + remaining_ms / 1000
+
+    def get_remaining_time_in_millis(self) -> int:
+        return int((self._deadline - time.time()) * 1000)
+
+
+def make_records(outcomes: list[str]) -> list[dict]:
+    return [
+        {
+            "messageId": f"msg-{index}",
+            "body": json.dumps(
+                {
+                    "applicationId": outcome,
+                    "environment": "PRODUCTION",
+                    "eventType": "USER_ROLE_ASSIGNED",
+                }
+            ),
+        }
+        for index, outcome in enumerate(outcomes)
+    ]
+
+
+class TestWebhookDelivery:
+    """Property tests for concurrent webhook delivery."""
+
+    @settings(
+        max_examples=15, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture]
+    )
+    @given(outcomes=st.lists(st.sampled_from(["ok", "fail"]), max_size=12))
+    def test_failures_reported_per_record(self, endpoint, outcomes) -> None:
+        """batchItemFailures lists exactly the records whose delivery failed."""
+        base_url, state = endpoint
+
+        def config(application_id, environment):
+            return {"url": f"{base_url}/{application_id}?delay=0.01", "secret": "s", "events": []}
+
+        with patch.object(webhooks, "get_webhook_config", config), patch.object(
+            webhooks, "cloudwatch", RecordingCloudWatch()
+        ):
+            state.max_in_flight = 0
+            result = webhooks.lambda_handler(
+                {"Records": make_records(outcomes)}, FakeContext(30000)
+            )
+
+        expected = [f"msg-{i}" for i, outcome in enumerate(outcomes) if outcome == "fail"]
+        assert [f["itemIdentifier"] for f in result["batchItemFailures"]] == expected
+        assert state.max_in_flight <= webhooks.ENDPOINT_CONCURRENCY
+
+    @settings(
+        max_examples=15, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture]
+    )
+    @given(outcomes=st.lists(st.sampled_from(["ok", "fail"]), min_size=1, max_size=12))
+    def test_metrics_aggregated_per_batch(self, endpoint, outcomes) -> None:
+        """One PutMetricData call carries totals and latency for the batch."""
+        base_url, _ = endpoint
+
+        def config(application_id, environment):
+            return {"url": f"{base_url}/{application_id}", "secret": "s", "events": []}
+
+        cloudwatch = RecordingCloudWatch()
+        with patch.object(webhooks, "get_webhook_config", config), patch.object(
+            webhooks, "cloudwatch", cloudwatch
+        ):
+            webhooks.lambda_handler({"Records": make_records(outcomes)}, FakeContext(30000))
+
+        assert len(cloudwatch.calls) == 1
+        totals: dict[str, float] = {}
+        latency_samples = 0.0
+        for datum in cloudwatch.calls[0]["MetricData"]:
+            if "StatisticValues" in datum:
+                totals[datum["MetricName"]] = (
+                    totals.get(datum["MetricName"], 0) + datum["StatisticValues"]["Sum"]
+                )
+            else:
+                assert datum["MetricName"] == "DeliveryLatency"
+                assert len(datum["Values"]) <= webhooks.METRIC_VALUES_PER_DATUM
+                latency_samples += sum(datum["Counts"])
+
+        assert totals.get("DeliveryAttempts", 0) == len(outcomes)
+        assert totals.get("DeliverySuccess", 0) == outcomes.count("ok")
+        assert totals.get("DeliveryFailure", 0) == outcomes.count("fail")
+        assert latency_samples == len(outcomes)
+
+    @given(values=st.lists(st.integers(min_value=0, max_value=50), min_size=1, max_size=20))
+    def test_count_statistics_match_values(self, values) -> None:
+        """Count statistics describe the values added, not just their sum."""
+        aggregator = webhooks.MetricsAggregator("Test")
+        for value in values:
+            aggregator.count("Events", [{"Name": "Endpoint", "Value": "e"}], value)
+
+        cloudwatch = RecordingCloudWatch()
+        with patch.object(webhooks, "cloudwatch", cloudwatch):
+            aggregator.flush()
+
+        (datum,) = cloudwatch.calls[0]["MetricData"]
+        assert datum["StatisticValues"] == {
+            "SampleCount": len(values),
+            "Sum": sum(values),
+            "Minimum": min(values),
+            "Maximum": max(values),
+        }
+
+    def test_slow_endpoint_runs_concurrently_within_budget(self, endpoint) -> None:
+        """Slow deliveries overlap, and those out of time budget are retried."""
+        base_url, state = endpoint
+
+        def config(application_id, environment):
+            return {"url": f"{base_url}/ok?delay=0.4", "secret": "s", "events": []}
+
+        records = make_records(["ok"] * (webhooks.ENDPOINT_CONCURRENCY * 2))
+        with patch.object(webhooks, "get_webhook_config", config), patch.object(
+            webhooks, "cloudwatch", RecordingCloudWatch()
+        ), patch.object(webhooks, "TIME_RESERVE_MS", 0):
+            start = time.time()
+            result = webhooks.lambda_handler({"Records": records}, FakeContext(600))
+            elapsed = time.time() - start
+
+        # The first wave fits in the budget; the second cannot finish in time
+        failures = {f["itemIdentifier"] for f in result["batchItemFailures"]}
+        assert len(failures) == webhooks.ENDPOINT_CONCURRENCY
+        assert elapsed < 1.0
+
+    def test_slow_host_does_not_delay_fast_host(self, endpoint) -> None:
+        """Records for a fast host are delivered while a slow host's queue drains."""
+        base_url, _ = endpoint
+        port = base_url.rsplit(":", 1)[1]
+
+        def config(application_id, environment):
+            if application_id == "slow":
+                return {"url": f"http://127.0.0.1:{port}/ok?delay=0.4", "secret": "s", "events": []}
+            return {"url": f"http://localhost:{port}/ok", "secret": "s", "events": []}
+
+        finished: dict[str, list[float]] = {"slow": [], "fast": []}
+        deliver = webhooks.deliver_webhook
+
+        def timed_deliver(url, payload, secret, timeout):
+            result = deliver(url=url, payload=payload, secret=secret, timeout=timeout)
+            finished[payload["applicationId"]].append(time.time())
+            return result
+
+        # Slow records first, so a FIFO pool would hand them every worker
+        records = make_records(["slow"] * (webhooks.ENDPOINT_CONCURRENCY * 2) + ["fast"] * 4)
+        with patch.object(webhooks, "get_webhook_config", config), patch.object(
+            webhooks, "cloudwatch", RecordingCloudWatch()
+        ), patch.object(webhooks, "deliver_webhook", timed_deliver), patch.object(
+            webhooks, "DELIVERY_CONCURRENCY", webhooks.ENDPOINT_CONCURRENCY + 1
+        ):
+            start = time.time()
+            result = webhooks.lambda_handler({"Records": records}, FakeContext(30000))
+
+        assert result["batchItemFailures"] == []
+        assert len(finished["fast"]) == 4 and len(finished["slow"]) == len(records) - 4
+        assert max(finished["fast"]) - start < 0.3
+        assert max(finished["slow"]) - start >= 0.8
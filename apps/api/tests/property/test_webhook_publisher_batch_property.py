@@ -0,0 +1,139 @@
+"""
+Webhook Publisher Batching Property Tests
+
+Validates:
+- Events published in a buffered scope all reach the queue, once each
+- Every SendMessageBatch call stays within 10 entries and 256 KiB
+- Entries failed without a sender fault are retried; sender faults are not
+"""
+
+import importlib.util
+import json
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import boto3
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from moto import mock_aws
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+_webhooks_dir = Path(__file__).parent.parent.parent / "lambdas" / "webhooks"
+_spec = importlib.util.spec_from_file_location("webhooks_publisher", _webhooks_dir / "publisher.py")
+assert _spec is not None and _spec.loader is not None
+publisher = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(publisher)
+
+
+class RecordingSQS:
+    """Wraps an SQS client, recording batches and optionally failing entries."""
+
+    def __init__(self, client, failures: list[dict] | None = None) -> None:
+        self._client = client
+        self.batches: list[list[dict]] = []
+        self._failures = list(failures or [])
+
+    def send_message_batch(self, **kwargs):
+        entries = kwargs["Entries"]
+        self.batches.append(entries)
+        if self._failures:
+            failure = self._failures.pop(0)
+            kept = [e for e in entries if e["Id"] != failure["Id"]]
+            response = (
+                self._client.send_message_batch(QueueUrl=kwargs["QueueUrl"], Entries=kept)
+                if kept
+                else {}
+            )
+            return {"Successful": response.get("Successful", []), "Failed": [failure]}
+        return self._client.send_message_batch(**kwargs)
+
+
+def drain(client, queue_url: str) -> list[dict]:
+    messages: list[dict[str, Any]] = []
+    while True:
+        response = client.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10)
+        if not response.get("Messages"):
+            return messages
+        for message in response["Messages"]:
+            messages.append(json.loads(message["Body"]))
+            client.delete_message(QueueUrl=queue_url, ReceiptHandle=message["ReceiptHandle"])
+
+
+class TestWebhookPublisherBatching:
+    """Property tests for buffered SendMessageBatch publishing."""
+
+    @settings(max_examples=15, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(sizes=st.lists(st.integers(min_value=0, max_value=120000), max_size=25))
+    def test_buffered_events_published_once_within_limits(self, sizes) -> None:
+        """All buffered events arrive once, in batches within SQS limits."""
+        with mock_aws():
+            client = boto3.client("sqs")
+            queue_url = client.create_queue(
+                QueueName="webhooks.fifo",
+                Attributes={"FifoQueue": "true"},
+            )["QueueUrl"]
+            recording = RecordingSQS(client)
+
+            with patch.object(publisher, "_sqs_client", recording):
+                with publisher.buffered_webhook_events(queue_url) as buffer:
+                    for index, size in enumerate(sizes):
+                        assert publisher.publish_user_event(
+                            "app-1",
+                            "org-1",
+                            "PRODUCTION",
+                            "USER_UPDATED",
+                            f"user-{index}",
+                            {"blob": "x" * size},
+                        )
+                    assert recording.batches == []
+                    assert len(buffer) == len(sizes)
+
+            for batch in recording.batches:
+                assert 1 <= len(batch) <= publisher.SEND_BATCH_MAX_ENTRIES
+                assert (
+                    sum(len(e["MessageBody"].encode()) for e in batch)
+                    <= publisher.SEND_BATCH_MAX_BYTES
+                )
+
+            received = drain(client, queue_url)
+            assert sorted(m["resource"]["id"] for m in received) == sorted(
+                f"user-{i}" for i in range(len(sizes))
+            )
+
+    def test_failed_entries_retried_unless_sender_fault(self) -> None:
+        """Throttled entries are resent; invalid ones are reported as failed."""
+        with mock_aws():
+            client = boto3.client("sqs")
+            queue_url = client.create_queue(
+                QueueName="webhooks.fifo", Attributes={"FifoQueue": "true"}
+            )["QueueUrl"]
+            recording = RecordingSQS(
+                client,
+                failures=[
+                    {"Id": "1", "SenderFault": False, "Code": "ServiceUnavailable"},
+                    {"Id": "1", "SenderFault": True, "Code": "InvalidParameterValue"},
+                ],
+            )
+
+            buffer = publisher.WebhookEventBuffer(queue_url)
+            events = [
+                publisher.build_webhook_event(
+                    "app-1", "org-1", "PRODUCTION", "USER_CREATED", "user", f"u{i}"
+                )
+                for i in range(3)
+            ]
+            for event in events:
+                buffer.add(event)
+
+            with patch.object(publisher, "_sqs_client", recording), patch.object(
+                publisher.time, "sleep", lambda seconds: None
+            ):
+                failed = buffer.flush()
+
+            # u1 was retried alone, then rejected as a sender fault
+            assert [len(b) for b in recording.batches] == [3, 1]
+            assert failed == [events[1]["eventId"]]
+            assert sorted(m["resource"]["id"] for m in drain(client, queue_url)) == ["u0", "u2"]
@@ -481,7 +481,20 @@ Please login at: https://orb-integration-hub.com/authenticate/""",
         - Handles invalid/expired/revoked keys with 401
         - Supports rate limiting
         - Audit logging for key usage
+
+        The rate limiter is imported from the organizations-security layer,
+        whose ARN is read from SSM like the compute stack's layer users.
         """
+        organizations_security_layer_arn = ssm.StringParameter.value_for_string_parameter(
+            self,
+            self.config.ssm_parameter_name("lambda-layers/organizations-security/arn"),
+        )
+        organizations_security_layer = lambda_.LayerVersion.from_layer_version_arn(
+            self,
+            "OrganizationsSecurityLayerRef",
+            organizations_security_layer_arn,
+        )
+
         # Create a dedicated role for the authorizer with minimal permissions
         authorizer_role = iam.Role(
             self,
@@ -552,6 +565,7 @@ Please login at: https://orb-integration-hub.com/authenticate/""",
             timeout=Duration.seconds(10),
             memory_size=128,
             role=authorizer_role,
+            layers=[organizations_security_layer],
             environment={
                 "APPLICATION_API_KEYS_TABLE": api_keys_table_name,
                 "LOGGING_LEVEL": "INFO",
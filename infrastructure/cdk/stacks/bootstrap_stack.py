@@ -2,6 +2,7 @@
 
 Creates:
 - S3 buckets for build artifacts and templates
+- S3 bucket for privacy request exports
 - IAM user and policies for GitHub Actions
 - SQS queues (alerts, dead-letter)
 - SMS verification secret
@@ -47,6 +48,7 @@ class BootstrapStack(Stack):
         # S3 Buckets
         self.build_artifacts_bucket = self._create_build_artifacts_bucket()
         self.build_templates_bucket = self._create_build_templates_bucket()
+        self.privacy_exports_bucket = self._create_privacy_exports_bucket()
 
         # SQS Queues
         self.dead_letter_queue = self._create_dead_letter_queue()
@@ -89,6 +91,39 @@ class BootstrapStack(Stack):
         )
         return bucket
 
+    def _create_privacy_exports_bucket(self) -> s3.Bucket:
+        """Create S3 bucket for privacy request exports.
+
+        Exports hold a data subject's personal data, so the bucket is
+        encrypted, SSL-only and expires objects after 30 days.
+        """
+        bucket = s3.Bucket(
+            self,
+            "PrivacyExportsBucket",
+            bucket_name=self.config.resource_name("privacy-exports"),
+            encryption=s3.BucketEncryption.S3_MANAGED,
+            enforce_ssl=True,
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            lifecycle_rules=[
+                s3.LifecycleRule(
+                    id=self.config.resource_name("privacy-exports-expiration"),
+                    expiration=Duration.days(30),
+                    enabled=True,
+                )
+            ],
+            removal_policy=RemovalPolicy.RETAIN,
+        )
+
+        # Export name to SSM with path-based naming
+        ssm.StringParameter(
+            self,
+            "PrivacyExportsBucketNameParameter",
+            parameter_name=self.config.ssm_parameter_name("s3/privacy-exports/name"),
+            string_value=bucket.bucket_name,
+        )
+
+        return bucket
+
     def _create_dead_letter_queue(self) -> sqs.Queue:
         """Create dead letter queue for failed messages."""
         queue = sqs.Queue(
@@ -9,7 +9,7 @@ Creates:
 - CheckEmailExistsLambda
 - CreateUserFromCognitoLambda
 - GetCurrentUserLambda
-- GetApplicationUsersLambda
+- GetApplicationUsersLambda with its pagination token signing secret
 - SSM parameters for Lambda ARNs
 
 Note: Lambda layers are referenced via SSM parameters to avoid CloudFormation
@@ -30,6 +30,7 @@ from aws_cdk import (
     aws_iam as iam,
     aws_lambda as lambda_,
     aws_lambda_event_sources as lambda_event_sources,
+    aws_secretsmanager as secretsmanager,
     aws_ssm as ssm,
 )
 from constructs import Construct
@@ -112,6 +113,7 @@ class ComputeStack(Stack):
                     "dynamodb:DeleteItem",
                     "dynamodb:Query",
                     "dynamodb:Scan",
+                    "dynamodb:BatchGetItem",
                 ],
                 resources=[
                     f"arn:aws:dynamodb:{self.region}:{self.account}:table/{self.config.prefix}-*",
@@ -648,7 +650,24 @@ class ComputeStack(Stack):
         organization, application, and environment.
 
         Uses Cognito authentication with authorization rules based on user groups.
+        Pagination tokens are signed with a generated secret; the Lambda refuses
+        to issue or accept tokens without it.
+
+        Uses the organizations-security layer for shared cache settings.
         """
+        # Read layer ARN from SSM parameter (set by lambda-layers stack)
+        organizations_security_layer_arn = ssm.StringParameter.value_for_string_parameter(
+            self,
+            self.config.ssm_parameter_name("lambda-layers/organizations-security/arn"),
+        )
+
+        # Create layer reference from ARN
+        organizations_security_layer = lambda_.LayerVersion.from_layer_version_arn(
+            self,
+            "GetApplicationUsersSecurityLayerRef",
+            organizations_security_layer_arn,
+        )
+
         # Read table names from SSM parameters
         users_table_name = ssm.StringParameter.value_for_string_parameter(
             self,
@@ -670,6 +689,25 @@ class ComputeStack(Stack):
             self.config.ssm_parameter_name("dynamodb/applications/table-name"),
         )
 
+        organization_users_table_name = ssm.StringParameter.value_for_string_parameter(
+            self,
+            self.config.ssm_parameter_name("dynamodb/organizationusers/table-name"),
+        )
+
+        # Read by the Lambda through the execution role's secrets/* access
+        pagination_token_secret = secretsmanager.Secret(
+            self,
+            "PaginationTokenSecret",
+            secret_name=self.config.secret_name("get-application-users", "pagination-token"),
+            description="Key for signing GetApplicationUsers pagination tokens",
+            generate_secret_string=secretsmanager.SecretStringGenerator(
+                secret_string_template="{}",
+                generate_string_key="secret_key",
+                password_length=64,
+                exclude_characters='"@/\\',
+            ),
+        )
+
         function = lambda_.Function(
             self,
             "GetApplicationUsersLambda",
@@ -681,6 +719,7 @@ class ComputeStack(Stack):
             timeout=Duration.seconds(30),
             memory_size=256,
             role=self.lambda_execution_role,
+            layers=[organizations_security_layer],
             environment={
                 "ALERTS_QUEUE": f"arn:aws:sqs:{self.region}:{self.account}:{self.config.prefix}-alerts-queue",
                 "LOGGING_LEVEL": "INFO",
@@ -689,6 +728,8 @@ class ComputeStack(Stack):
                 "APPLICATION_USER_ROLES_TABLE_NAME": application_user_roles_table_name,
                 "ORGANIZATIONS_TABLE_NAME": organizations_table_name,
                 "APPLICATIONS_TABLE_NAME": applications_table_name,
+                "ORGANIZATION_USERS_TABLE_NAME": organization_users_table_name,
+                "PAGINATION_TOKEN_SECRET_NAME": pagination_token_secret.secret_name,
             },
             dead_letter_queue_enabled=True,
         )
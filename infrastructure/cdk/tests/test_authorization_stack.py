@@ -402,6 +402,16 @@ class TestAuthorizationStackApiKeyAuthorizer:
             },
         )
 
+    def test_api_key_authorizer_has_security_layer(self, template: Template) -> None:
+        """Verify API Key Authorizer Lambda has the organizations-security layer."""
+        template.has_resource_properties(
+            "AWS::Lambda::Function",
+            {
+                "FunctionName": "test-project-dev-api-key-authorizer",
+                "Layers": Match.any_value(),
+            },
+        )
+
     def test_api_key_authorizer_has_dlq_enabled(self, template: Template) -> None:
         """Verify API Key Authorizer Lambda has DLQ enabled."""
         template.has_resource_properties(
@@ -67,9 +67,26 @@ class TestBootstrapStackBuckets:
             },
         )
 
-    def test_creates_two_buckets(self, template: Template) -> None:
-        """Verify exactly two S3 buckets are created."""
-        template.resource_count_is("AWS::S3::Bucket", 2)
+    def test_creates_privacy_exports_bucket(self, template: Template) -> None:
+        """Verify privacy exports bucket is encrypted and expires objects."""
+        template.has_resource_properties(
+            "AWS::S3::Bucket",
+            {
+                "BucketName": "test-project-dev-privacy-exports",
+                "BucketEncryption": {
+                    "ServerSideEncryptionConfiguration": [
+                        {"ServerSideEncryptionByDefault": {"SSEAlgorithm": "AES256"}}
+                    ]
+                },
+                "LifecycleConfiguration": {
+                    "Rules": [Match.object_like({"ExpirationInDays": 30, "Status": "Enabled"})]
+                },
+            },
+        )
+
+    def test_creates_three_buckets(self, template: Template) -> None:
+        """Verify exactly three S3 buckets are created."""
+        template.resource_count_is("AWS::S3::Bucket", 3)
 
 
 class TestBootstrapStackQueues:
@@ -117,6 +134,16 @@ class TestBootstrapStackSSMParameters:
             },
         )
 
+    def test_exports_privacy_exports_bucket_name(self, template: Template) -> None:
+        """Verify privacy exports bucket name is exported to SSM with path-based naming."""
+        template.has_resource_properties(
+            "AWS::SSM::Parameter",
+            {
+                "Name": "/test/project/dev/s3/privacy-exports/name",
+                "Type": "String",
+            },
+        )
+
     def test_exports_cloudwatch_logging_policy_arn(self, template: Template) -> None:
         """Verify CloudWatch logging policy ARN is exported to SSM with path-based naming."""
         template.has_resource_properties(
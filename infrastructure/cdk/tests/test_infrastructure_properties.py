@@ -316,6 +316,38 @@ class TestComputeStackResourcePreservation:
         """Verify ComputeStack has exactly 8 Lambda functions (no API Key Authorizer)."""
         compute_template.resource_count_is("AWS::Lambda::Function", 8)
 
+    def test_get_application_users_has_pagination_secret(
+        self, compute_template: Template
+    ) -> None:
+        """Verify pagination tokens are signed with a generated secret."""
+        compute_template.has_resource_properties(
+            "AWS::SecretsManager::Secret",
+            {"Name": "test/project/dev/secrets/get-application-users/pagination-token"},
+        )
+        compute_template.has_resource_properties(
+            "AWS::Lambda::Function",
+            {
+                "FunctionName": "test-project-dev-get-application-users",
+                "Environment": {
+                    "Variables": Match.object_like(
+                        {"PAGINATION_TOKEN_SECRET_NAME": Match.any_value()}
+                    )
+                },
+            },
+        )
+
+    def test_get_application_users_has_security_layer(
+        self, compute_template: Template
+    ) -> None:
+        """Verify GetApplicationUsers Lambda has the organizations-security layer."""
+        compute_template.has_resource_properties(
+            "AWS::Lambda::Function",
+            {
+                "FunctionName": "test-project-dev-get-application-users",
+                "Layers": Match.any_value(),
+            },
+        )
+
 
 # ============================================================================
 # Task 4.3: Unit test for SDK API creation